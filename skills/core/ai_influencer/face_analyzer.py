@@ -10,17 +10,18 @@ VLM 얼굴 특징 분석기
 HairAnalyzer와 동일한 패턴.
 """
 
-import json
-from io import BytesIO
 from typing import Dict, Any, Optional, Union, List
 from dataclasses import dataclass, field
 from pathlib import Path
 
 from PIL import Image
-from google import genai
 from google.genai import types
 
 from core.config import VISION_MODEL
+from core.structured import parse_or_repair
+from core.api import get_client
+from core.utils import encode_image_part
+from core.vlm_cache import cached_generate_text, is_json_response
 
 
 @dataclass
@@ -114,17 +115,19 @@ class FaceAnalyzer:
 
             api_key = _get_next_api_key()
 
-        self.client = genai.Client(api_key=api_key)
+        self.client = get_client(api_key)
 
     def analyze(
         self,
         face_image: Union[str, Path, Image.Image],
+        use_cache: bool = True,
     ) -> FaceAnalysisResult:
         """
         얼굴 이미지에서 특징 분석
 
         Args:
             face_image: 얼굴 레퍼런스 이미지
+            use_cache: VLM 응답 캐시 사용 여부 (False면 항상 새로 분석)
 
         Returns:
             FaceAnalysisResult: 분석 결과
@@ -143,22 +146,20 @@ class FaceAnalyzer:
 
         # API 호출
         try:
-            response = self.client.models.generate_content(
+            result_text = cached_generate_text(
+                self.client,
                 model=VISION_MODEL,
                 contents=[types.Content(role="user", parts=parts)],
                 config=types.GenerateContentConfig(
                     temperature=0.1,
                     response_mime_type="application/json",
                 ),
+                use_cache=use_cache,
+                cache_if=is_json_response,
             )
 
             # JSON 파싱
-            result_text = response.text.strip()
-            if result_text.startswith("```"):
-                result_text = result_text.split("```")[1]
-                if result_text.startswith("json"):
-                    result_text = result_text[4:]
-            result_json = json.loads(result_text)
+            result_json = parse_or_repair(self.client, result_text)
 
         except Exception as e:
             print(f"[FaceAnalyzer] API error: {e}")
@@ -194,21 +195,13 @@ class FaceAnalyzer:
 
     def _pil_to_part(self, img: Image.Image, max_size: int = 1024) -> types.Part:
         """PIL Image를 Gemini Part로 변환"""
-        if max(img.size) > max_size:
-            img = img.copy()
-            img.thumbnail((max_size, max_size), Image.LANCZOS)
-
-        buffer = BytesIO()
-        img.save(buffer, format="PNG")
-
-        return types.Part(
-            inline_data=types.Blob(mime_type="image/png", data=buffer.getvalue())
-        )
+        return encode_image_part(img, max_size=max_size)
 
 
 def analyze_face(
     face_image: Union[str, Path, Image.Image],
     api_key: Optional[str] = None,
+    use_cache: bool = True,
 ) -> FaceAnalysisResult:
     """
     얼굴 특징 분석 (편의 함수)
@@ -216,9 +209,10 @@ def analyze_face(
     Args:
         face_image: 얼굴 레퍼런스 이미지
         api_key: Gemini API 키
+        use_cache: VLM 응답 캐시 사용 여부
 
     Returns:
         FaceAnalysisResult: 분석 결과
     """
     analyzer = FaceAnalyzer(api_key=api_key)
-    return analyzer.analyze(face_image)
+    return analyzer.analyze(face_image, use_cache=use_cache)
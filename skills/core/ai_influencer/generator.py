@@ -15,10 +15,12 @@ from pathlib import Path
 from typing import Optional, List, Union, Dict, Any
 
 from PIL import Image
-from google import genai
 from google.genai import types
 
 from core.config import IMAGE_MODEL
+from core.api import get_client
+from core.utils import encode_image_part
+from core.payload import PayloadBuilder
 from .character import Character
 
 
@@ -30,16 +32,7 @@ PRESET_IMAGE_BASE = Path(
 
 def pil_to_part(img: Image.Image, max_size: int = 1024) -> types.Part:
     """PIL Image를 Gemini Part로 변환"""
-    if max(img.size) > max_size:
-        img = img.copy()
-        img.thumbnail((max_size, max_size), Image.LANCZOS)
-
-    buffer = BytesIO()
-    img.save(buffer, format="PNG")
-
-    return types.Part(
-        inline_data=types.Blob(mime_type="image/png", data=buffer.getvalue())
-    )
+    return encode_image_part(img, max_size=max_size)
 
 
 def _load_image(img_input: Union[str, Path, Image.Image]) -> Image.Image:
@@ -183,10 +176,10 @@ def generate_ai_influencer(
         api_key = _get_next_api_key()
 
     # 클라이언트 생성
-    client = genai.Client(api_key=api_key)
+    client = get_client(api_key)
 
-    # API 파트 구성
-    parts = []
+    # API 파트 구성 (레퍼런스 역할별 인코딩, 요청 바이트 예산 적용)
+    parts = PayloadBuilder()
 
     # 1. 프롬프트 구성 (역할 설명 + 추가 프롬프트)
     prompt_text = _build_simple_prompt(
@@ -209,7 +202,7 @@ def generate_ai_influencer(
 
     if pose_img:
         parts.append(types.Part(text="[POSE REFERENCE]"))
-        parts.append(pil_to_part(pose_img))
+        parts.add_image(pose_img, role="pose")
 
     # 3. 표정 레퍼런스 (포즈와 별도로 항상 전송)
     expr_img = None
@@ -222,7 +215,7 @@ def generate_ai_influencer(
 
     if expr_img:
         parts.append(types.Part(text="[EXPRESSION REFERENCE]"))
-        parts.append(pil_to_part(expr_img))
+        parts.add_image(expr_img, role="expression")
 
     # 4. 얼굴 이미지 (캐릭터에서 - 여러 장)
     face_images = character.face_images
@@ -230,14 +223,14 @@ def generate_ai_influencer(
         img = Image.open(face_path).convert("RGB")
         face_type = _get_face_type(face_path.name)
         parts.append(types.Part(text=f"[FACE {i+1}] {face_type}"))
-        parts.append(pil_to_part(img))
+        parts.add_image(img, role="face")
 
     # 5. 착장 이미지 (선택적)
     if outfit_images:
         for i, img_input in enumerate(outfit_images):
             img = _load_image(img_input)
             parts.append(types.Part(text=f"[OUTFIT {i+1}]"))
-            parts.append(pil_to_part(img))
+            parts.add_image(img, role="outfit")
 
     # 6. 배경 이미지 (선택적)
     bg_img = None
@@ -250,7 +243,9 @@ def generate_ai_influencer(
 
     if bg_img:
         parts.append(types.Part(text="[BACKGROUND REFERENCE]"))
-        parts.append(pil_to_part(bg_img))
+        parts.add_image(bg_img, role="background")
+
+    request_parts = parts.build()
 
     # API 호출 (재시도 로직)
     max_retries = 3
@@ -260,7 +255,7 @@ def generate_ai_influencer(
         try:
             response = client.models.generate_content(
                 model=IMAGE_MODEL,
-                contents=[types.Content(role="user", parts=parts)],
+                contents=[types.Content(role="user", parts=request_parts)],
                 config=types.GenerateContentConfig(
                     temperature=temperature,
                     response_modalities=["IMAGE", "TEXT"],
@@ -24,10 +24,10 @@ from pathlib import Path
 from typing import Optional, List, Union, Dict, Any
 
 from PIL import Image
-from google import genai
 from google.genai import types
 
 from core.config import IMAGE_MODEL
+from core.api import get_client
 from core.ai_influencer.hair_analyzer import analyze_hair, HairAnalysisResult
 from core.ai_influencer.face_analyzer import analyze_face, FaceAnalysisResult
 from core.ai_influencer.expression_analyzer import (
@@ -41,10 +41,37 @@ from core.ai_influencer.background_analyzer import (
 )
 from core.ai_influencer.compatibility import check_compatibility, CompatibilityResult
 from core.ai_influencer.prompt_builder import build_schema_prompt
-from core.ai_influencer.generator import pil_to_part
+from core.payload import PayloadBuilder
+from core.validators.base import ReferenceBundle, WorkflowType
+from core.validators.prefilter import build_prefilter
+from core.generators.prefetch import AttemptPrefetcher
+from core.telemetry import STEP_GENERATE, STEP_VALIDATE, telemetry_context
 from core.outfit_analyzer import OutfitAnalyzer
 
 
+def _load_references(
+    face_images: List[Path],
+    outfit_images: List[Path],
+    pose_image: Optional[Path],
+    expression_image: Optional[Path],
+    background_image: Optional[Path],
+) -> ReferenceBundle:
+    """존재하는 레퍼런스 파일만 ReferenceBundle로 로드"""
+
+    def existing(paths):
+        return [p for p in paths if p and Path(p).exists()]
+
+    return ReferenceBundle(
+        {
+            "face": existing(face_images),
+            "outfit": existing(outfit_images),
+            "pose": existing([pose_image]),
+            "expression": existing([expression_image]),
+            "background": existing([background_image]),
+        }
+    )
+
+
 def send_image_request(
     client,
     prompt: str,
@@ -56,6 +83,7 @@ def send_image_request(
     aspect_ratio: str = "9:16",
     resolution: str = "2K",
     temperature: float = 0.7,
+    references: Optional[ReferenceBundle] = None,
 ) -> Optional[Image.Image]:
     """
     이미지 생성 API 호출 - 모든 레퍼런스 이미지 포함
@@ -68,66 +96,71 @@ def send_image_request(
     5. [OUTFIT 1~N] 착장 이미지
     6. [BACKGROUND REFERENCE] 배경 이미지
     7. [POSE REMINDER] 포즈 재강조
+
+    이미지는 역할별(포즈/표정/얼굴/착장/배경)로 인코딩되어 요청 전체가
+    config.REQUEST_BYTE_BUDGET 안에 들어가도록 조정된다.
+
+    references가 주어지면 경로 대신 이미 디코딩된 이미지를 사용한다
+    (재시도마다 파일을 다시 열지 않음).
     """
+    if references is None:
+        references = _load_references(
+            face_images, outfit_images, pose_image, expression_image, background_image
+        )
 
-    parts = []
+    parts = PayloadBuilder()
 
     # 1. 프롬프트
     parts.append(types.Part(text=prompt))
 
     # 2. 포즈 레퍼런스
-    if pose_image and Path(pose_image).exists():
-        img = Image.open(pose_image).convert("RGB")
+    pose_img = references.first("pose")
+    if pose_img is not None:
         parts.append(types.Part(text="[POSE REFERENCE]"))
-        parts.append(pil_to_part(img))
+        parts.add_image(pose_img, role="pose")
 
     # 3. 표정 레퍼런스
-    if expression_image and Path(expression_image).exists():
-        img = Image.open(expression_image).convert("RGB")
+    expression_img = references.first("expression")
+    if expression_img is not None:
         parts.append(
             types.Part(text="[EXPRESSION REFERENCE] - Copy expression only, NOT hair")
         )
-        parts.append(pil_to_part(img))
+        parts.add_image(expression_img, role="expression")
 
     # 4. 얼굴 이미지
-    for i, face_path in enumerate(face_images):
-        if Path(face_path).exists():
-            img = Image.open(face_path).convert("RGB")
-            parts.append(
-                types.Part(text=f"[FACE {i+1}] - Use this person's identity and hair")
-            )
-            parts.append(pil_to_part(img))
+    for i, img in enumerate(references.images("face")):
+        parts.append(
+            types.Part(text=f"[FACE {i+1}] - Use this person's identity and hair")
+        )
+        parts.add_image(img, role="face")
 
     # 5. 착장 이미지
-    for i, outfit_path in enumerate(outfit_images):
-        if Path(outfit_path).exists():
-            img = Image.open(outfit_path).convert("RGB")
-            parts.append(types.Part(text=f"[OUTFIT {i+1}]"))
-            parts.append(pil_to_part(img))
+    for i, img in enumerate(references.images("outfit")):
+        parts.append(types.Part(text=f"[OUTFIT {i+1}]"))
+        parts.add_image(img, role="outfit")
 
     # 6. 배경 이미지
-    if background_image and Path(background_image).exists():
-        img = Image.open(background_image).convert("RGB")
+    background_img = references.first("background")
+    if background_img is not None:
         parts.append(
             types.Part(text="[BACKGROUND REFERENCE] - Ignore person in this image")
         )
-        parts.append(pil_to_part(img))
+        parts.add_image(background_img, role="background")
 
     # 7. 포즈 재강조 (마지막에 다시 전송)
-    if pose_image and Path(pose_image).exists():
-        img = Image.open(pose_image).convert("RGB")
+    if pose_img is not None:
         parts.append(
             types.Part(
                 text="[POSE REMINDER] *** CRITICAL: Copy this EXACT pose! Pay attention to leg shape: if knee points SIDEWAYS (figure-4), do NOT lift it FORWARD. Match the exact direction! ***"
             )
         )
-        parts.append(pil_to_part(img))
+        parts.add_image(pose_img, role="pose")
 
     # API 호출
     try:
         response = client.models.generate_content(
             model=IMAGE_MODEL,
-            contents=[types.Content(role="user", parts=parts)],
+            contents=[types.Content(role="user", parts=parts.build())],
             config=types.GenerateContentConfig(
                 temperature=temperature,
                 response_modalities=["IMAGE", "TEXT"],
@@ -162,6 +195,8 @@ def generate_full_pipeline(
     client=None,
     max_retries: int = 2,
     validate: bool = True,
+    use_prefilter: bool = True,
+    pipelined: bool = False,
 ) -> Dict[str, Any]:
     """
     AI 인플루언서 풀 파이프라인 실행 (검증+재생성 루프 포함)
@@ -189,6 +224,9 @@ def generate_full_pipeline(
         client: genai.Client (None이면 자동 생성)
         max_retries: 검증 실패 시 최대 재시도 횟수 (기본 2)
         validate: 검증 활성화 여부 (기본 True)
+        use_prefilter: 검증 전 로컬 사전 필터 사용 여부 (기본 True, validate=True일 때만)
+        pipelined: 시도 N 검증 중에 시도 N+1을 미리 생성 (기본 False, validate=True일 때만)
+            N이 통과하면 N+1은 버리고, 실패하면 N+1을 다음 시도로 사용
 
     Returns:
         dict: {
@@ -227,12 +265,17 @@ def generate_full_pipeline(
     expression_image = Path(expression_image)
     background_image = Path(background_image)
 
+    # 레퍼런스 로드 (1회만 - 재시도마다 생성/검증에 재사용)
+    references = _load_references(
+        face_images, outfit_images, pose_image, expression_image, background_image
+    )
+
     # 클라이언트 생성
     if client is None:
         from core.api import _get_next_api_key
 
         api_key = _get_next_api_key()
-        client = genai.Client(api_key=api_key)
+        client = get_client(api_key)
 
     # =========================================================
     # VLM 분석 (1회만 실행 - 재시도 시 결과 재사용)
@@ -300,10 +343,7 @@ def generate_full_pipeline(
     validator = None
     if validate:
         try:
-            from core.validators import ValidatorRegistry, WorkflowType
-
-            # 모듈 import로 등록 트리거
-            import core.ai_influencer.validator  # noqa: F401
+            from core.validators import ValidatorRegistry
 
             validator = ValidatorRegistry.get(WorkflowType.AI_INFLUENCER, client)
             print("\n[Validator] AI Influencer validator loaded")
@@ -323,49 +363,77 @@ def generate_full_pipeline(
     enhancement_text = ""  # 재시도 시 추가할 보강 텍스트
 
     total_attempts = (max_retries + 1) if validator else 1
+    prefilter = (
+        build_prefilter(WorkflowType.AI_INFLUENCER) if validator and use_prefilter else None
+    )
+
+    workflow_name = WorkflowType.AI_INFLUENCER.value
+
+    def generate(gen_prompt: str, temp: float) -> Optional[Image.Image]:
+        # 프리페치 스레드에서도 태그가 붙도록 함수 안에서 컨텍스트 지정
+        with telemetry_context(workflow=workflow_name, step=STEP_GENERATE):
+            return send_image_request(
+                client=client,
+                prompt=gen_prompt,
+                face_images=face_images,
+                outfit_images=outfit_images,
+                pose_image=pose_image,
+                expression_image=expression_image,
+                background_image=background_image,
+                aspect_ratio=aspect_ratio,
+                resolution=resolution,
+                temperature=temp,
+                references=references,
+            )
+
+    # 파이프라인 모드: 검증 중에 다음 시도를 미리 생성 (검증기 있을 때만)
+    prefetcher = AttemptPrefetcher(max_retries, enabled=pipelined and validator is not None)
+    prefetched_prompt = ""
 
     for attempt in range(total_attempts):
+        # 이전 시도 검증 중에 미리 생성된 이미지가 있으면 사용
+        prefetched = prefetcher.take(attempt)
+        if prefetched is not None:
+            current_temp = prefetched.temperature
+
         print(f"\n{'#' * 60}")
         print(
             f"# ATTEMPT {attempt + 1}/{total_attempts} | Temperature: {current_temp:.2f}"
+            + (" | prefetched" if prefetched is not None else "")
         )
         print(f"{'#' * 60}")
 
-        # STEP 7: 프롬프트 조립 (v3: 이미지 우선 + 계층적 포즈)
-        print("\n[7/9] Building schema prompt (v3: image-first + hierarchical pose)...")
-        prompt = build_schema_prompt(
-            hair_result=hair_result,
-            expression_result=expression_result,
-            pose_result=pose_result,
-            background_result=background_result,
-            outfit_result=outfit_result,
-            compatibility_result=compatibility_result,
-            pose_format="H",
-            face_result=face_result,
-        )
+        if prefetched is not None:
+            # 미리 생성된 시도는 시작 시점의 프롬프트를 그대로 사용
+            prompt = prefetched_prompt
+            print("\n[7-8/9] Using prefetched image (generated during previous validation)")
+            image = prefetched.image
+        else:
+            # STEP 7: 프롬프트 조립 (v3: 이미지 우선 + 계층적 포즈)
+            print("\n[7/9] Building schema prompt (v3: image-first + hierarchical pose)...")
+            prompt = build_schema_prompt(
+                hair_result=hair_result,
+                expression_result=expression_result,
+                pose_result=pose_result,
+                background_result=background_result,
+                outfit_result=outfit_result,
+                compatibility_result=compatibility_result,
+                pose_format="H",
+                face_result=face_result,
+            )
 
-        # 재시도 시 enhancement 텍스트 추가
-        if enhancement_text:
-            prompt = prompt + enhancement_text
-            print(f"  [Enhancement] Added retry enhancement rules")
+            # 재시도 시 enhancement 텍스트 추가
+            if enhancement_text:
+                prompt = prompt + enhancement_text
+                print(f"  [Enhancement] Added retry enhancement rules")
 
-        print(f"  Prompt length: {len(prompt.splitlines())} lines")
-        best_prompt = prompt
+            print(f"  Prompt length: {len(prompt.splitlines())} lines")
 
-        # STEP 8: 이미지 생성
-        print("\n[8/9] Generating image (all references included)...")
-        image = send_image_request(
-            client=client,
-            prompt=prompt,
-            face_images=face_images,
-            outfit_images=outfit_images,
-            pose_image=pose_image,
-            expression_image=expression_image,
-            background_image=background_image,
-            aspect_ratio=aspect_ratio,
-            resolution=resolution,
-            temperature=current_temp,
-        )
+            # STEP 8: 이미지 생성
+            print("\n[8/9] Generating image (all references included)...")
+            image = generate(prompt, current_temp)
+
+        best_prompt = prompt
 
         if image is None:
             print("  [FAIL] Image generation failed")
@@ -395,17 +463,32 @@ def generate_full_pipeline(
             )
             break
 
+        # 다음 시도를 현재 프롬프트 + 다음 온도로 미리 생성 (이번 검증 결과는 N+2부터 반영)
+        next_temp = max(0.2, current_temp - 0.05)
+        if prefetcher.start(attempt + 1, next_temp, generate, prompt, next_temp):
+            prefetched_prompt = prompt
+
+        # 로컬 사전 필터 - 명백한 불량은 VLM 검증 없이 재생성
+        if prefilter:
+            precheck = prefilter.check(image, references, aspect_ratio=aspect_ratio)
+            if not precheck.passed:
+                history.append(
+                    {
+                        "attempt": attempt + 1,
+                        "temperature": current_temp,
+                        **precheck.to_history(),
+                    }
+                )
+                continue
+
         # STEP 9: 검증
         print("\n[9] Validating generated image...")
         try:
-            validation_result = validator.validate(
-                generated_img=image,
-                reference_images={
-                    "face": [str(p) for p in face_images],
-                    "outfit": [str(p) for p in outfit_images],
-                    "pose": [str(pose_image)],
-                },
-            )
+            with telemetry_context(workflow=workflow_name, step=STEP_VALIDATE):
+                validation_result = validator.validate(
+                    generated_img=image,
+                    reference_images=references,
+                )
 
             score = validation_result.total_score
             passed = validation_result.passed
@@ -449,6 +532,7 @@ def generate_full_pipeline(
                     "grade": grade,
                     "passed": passed,
                     "criteria": criteria_detail,
+                    "prefetched": prefetched is not None,
                 }
             )
 
@@ -461,11 +545,13 @@ def generate_full_pipeline(
             if passed:
                 print(f"[Validation] PASSED at attempt {attempt + 1}!")
                 best_image = image
+                prefetcher.discard()
                 break
 
             # 재시도 여부 판단
             if not validator.should_retry(validation_result):
                 print(f"[Validation] Auto-fail detected, not retryable - stopping")
+                prefetcher.discard()
                 break
 
         except Exception as e:
@@ -499,7 +585,10 @@ def generate_full_pipeline(
             # temperature 낮춤 (일관성 향상)
             current_temp = max(0.2, current_temp - 0.05)
             print(f"  [Retry] Next temperature: {current_temp:.2f}")
-            time.sleep(2)
+            if not pipelined:
+                time.sleep(2)
+
+    prefetcher.discard()
 
     # =========================================================
     # 최종 결과 반환
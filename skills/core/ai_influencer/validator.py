@@ -7,17 +7,17 @@ AI 인플루언서 검증기
 - 동일 캐릭터 유지 + 포즈 정확도가 핵심
 """
 
-import json
-from io import BytesIO
 from typing import Dict, Any, Optional, Union, List
 from dataclasses import dataclass
 from pathlib import Path
 
 from PIL import Image
-from google import genai
 from google.genai import types
 
 from core.config import VISION_MODEL
+from core.structured import parse_or_repair
+from core.api import get_client
+from core.utils import encode_image_part
 from .character import Character
 from core.validators.base import (
     WorkflowType,
@@ -204,7 +204,7 @@ class AIInfluencerValidator:
 
             api_key = _get_next_api_key()
 
-        self.client = genai.Client(api_key=api_key)
+        self.client = get_client(api_key)
 
     def validate(
         self,
@@ -259,12 +259,7 @@ class AIInfluencerValidator:
             )
 
             # JSON 파싱
-            result_text = response.text.strip()
-            if result_text.startswith("```"):
-                result_text = result_text.split("```")[1]
-                if result_text.startswith("json"):
-                    result_text = result_text[4:]
-            result_json = json.loads(result_text)
+            result_json = parse_or_repair(self.client, response.text)
 
         except Exception as e:
             print(f"[Validator] API 호출 실패: {e}")
@@ -356,16 +351,7 @@ class AIInfluencerValidator:
 
     def _pil_to_part(self, img: Image.Image, max_size: int = 1024) -> types.Part:
         """PIL Image를 Gemini Part로 변환"""
-        if max(img.size) > max_size:
-            img = img.copy()
-            img.thumbnail((max_size, max_size), Image.LANCZOS)
-
-        buffer = BytesIO()
-        img.save(buffer, format="PNG")
-
-        return types.Part(
-            inline_data=types.Blob(mime_type="image/png", data=buffer.getvalue())
-        )
+        return encode_image_part(img, max_size=max_size)
 
 
 def validate_ai_influencer(
@@ -557,13 +543,7 @@ class AIInfluencerWorkflowValidator(WorkflowValidator):
                     response_mime_type="application/json",
                 ),
             )
-            result_text = response.text.strip()
-            if result_text.startswith("```"):
-                result_text = result_text.split("```")[1]
-                if result_text.startswith("json"):
-                    result_text = result_text[4:]
-
-            result_json = json.loads(result_text)
+            result_json = parse_or_repair(self.client, response.text)
         except Exception as e:
             print(f"[Validator] API call failed: {e}")
             return ValidationResult(
@@ -584,14 +564,7 @@ class AIInfluencerWorkflowValidator(WorkflowValidator):
     @staticmethod
     def _pil_to_part_static(img, max_size=1024):
         """PIL Image를 Gemini Part로 변환 (static)"""
-        if max(img.size) > max_size:
-            img = img.copy()
-            img.thumbnail((max_size, max_size), Image.LANCZOS)
-        buffer = BytesIO()
-        img.save(buffer, format="PNG")
-        return types.Part(
-            inline_data=types.Blob(mime_type="image/png", data=buffer.getvalue())
-        )
+        return encode_image_part(img, max_size=max_size)
 
     def _convert_result(self, inner_result):
         """ValidationResult -> CommonValidationResult 변환"""
@@ -8,17 +8,17 @@ AI 인플루언서 검증기 v2.0
 4. step-by-step 강제 비교 프롬프트
 """
 
-import json
-from io import BytesIO
 from typing import Dict, Any, Optional, Union, List
 from dataclasses import dataclass
 from pathlib import Path
 
 from PIL import Image
-from google import genai
 from google.genai import types
 
 from core.config import VISION_MODEL
+from core.structured import parse_or_repair
+from core.api import get_client
+from core.utils import encode_image_part
 from .character import Character
 from .pose_analyzer import PoseAnalysisResult, PoseAnalyzer
 from .background_analyzer import BackgroundAnalysisResult, BackgroundAnalyzer
@@ -289,7 +289,7 @@ class AIInfluencerValidatorV2:
 
             api_key = _get_next_api_key()
 
-        self.client = genai.Client(api_key=api_key)
+        self.client = get_client(api_key)
         self.api_key = api_key
         self.pose_analyzer = PoseAnalyzer(api_key=api_key)
         self.background_analyzer = BackgroundAnalyzer(api_key=api_key)
@@ -392,12 +392,7 @@ class AIInfluencerValidatorV2:
                 ),
             )
 
-            result_text = response.text.strip()
-            if result_text.startswith("```"):
-                result_text = result_text.split("```")[1]
-                if result_text.startswith("json"):
-                    result_text = result_text[4:]
-            result_json = json.loads(result_text)
+            result_json = parse_or_repair(self.client, response.text)
 
         except Exception as e:
             print(f"[ValidatorV2] API 호출 실패: {e}")
@@ -515,16 +510,7 @@ class AIInfluencerValidatorV2:
 
     def _pil_to_part(self, img: Image.Image, max_size: int = 1024) -> types.Part:
         """PIL Image를 Gemini Part로 변환"""
-        if max(img.size) > max_size:
-            img = img.copy()
-            img.thumbnail((max_size, max_size), Image.LANCZOS)
-
-        buffer = BytesIO()
-        img.save(buffer, format="PNG")
-
-        return types.Part(
-            inline_data=types.Blob(mime_type="image/png", data=buffer.getvalue())
-        )
+        return encode_image_part(img, max_size=max_size)
 
 
 def validate_ai_influencer_v2(
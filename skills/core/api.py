@@ -5,21 +5,40 @@ This module provides centralized functions for:
 - Image generation via Gemini
 - Vision analysis (VLM) via Gemini
 - Proper error handling and retries
+- Health-aware API key scheduling (core.key_scheduler)
+- Shared client pool (one warm connection pool per API key)
+- Async counterparts with bounded per-key / per-model concurrency
+- Optional hedged vision requests for tail latency
+- Per-call telemetry on every pooled client (core.telemetry)
+- Cost metering with job/daily budgets on every pooled client (core.metering)
 - Configuration management from core.config
 """
 
+import asyncio
 import base64
+import contextvars
 import io
 import os
+import threading
 import time
+import weakref
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, as_completed, wait as wait_futures
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
 from pathlib import Path
-from typing import Optional, Union, List, Any
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, Iterator, List, Optional, Union
 
+import httpx
 from PIL import Image
 from google import genai
 from google.genai import types
 
+from core import metering, telemetry
 from core.config import IMAGE_MODEL, VISION_MODEL
+from core.key_scheduler import KeyScheduler, get_scheduler
+from core.payload import PayloadBuilder
+from core.retry_policy import ErrorClass, RetryBudget, classify_error, get_retry_policy
 
 
 # ============================================================
@@ -65,20 +84,174 @@ def _get_api_keys() -> List[str]:
     return keys
 
 
-_api_key_index = 0
 _api_keys = None
 
 
-def _get_next_api_key() -> str:
-    """Get next API key using round-robin strategy."""
-    global _api_keys, _api_key_index
+def get_key_scheduler() -> KeyScheduler:
+    """Get the shared key scheduler for the keys in GEMINI_API_KEY."""
+    global _api_keys
 
     if _api_keys is None:
         _api_keys = _get_api_keys()
 
-    key = _api_keys[_api_key_index]
-    _api_key_index = (_api_key_index + 1) % len(_api_keys)
-    return key
+    return get_scheduler(_api_keys)
+
+
+def get_key_stats() -> List[Dict[str, Any]]:
+    """Live per-key stats (load, cooldown, rate limits) without exposing keys."""
+    return get_key_scheduler().stats()
+
+
+def _get_next_api_key() -> str:
+    """
+    Get the least-loaded healthy API key.
+
+    Keys in rate-limit cooldown or out of budget are skipped; if every key
+    is blocked, waits until the first one becomes available. Picking a key
+    does not count as a request; the pooled client charges the key when it
+    actually sends one.
+    """
+    return get_key_scheduler().acquire()
+
+
+async def _get_next_api_key_async() -> str:
+    """Async variant of _get_next_api_key that waits without blocking the loop."""
+    scheduler = get_key_scheduler()
+    while True:
+        key, wait = scheduler.try_acquire()
+        if key is not None:
+            return key
+        await asyncio.sleep(max(wait, 0.01))
+
+
+def _report_response(api_key: str, response: Any) -> None:
+    """Report a successful call (and its token usage) to the scheduler."""
+    usage = getattr(response, "usage_metadata", None)
+    tokens = getattr(usage, "total_token_count", None) or 0
+    get_key_scheduler().record_success(api_key, tokens=tokens)
+
+
+# ============================================================
+# Client Pool
+# ============================================================
+
+# Keep-alive settings for the pooled HTTP connections
+CLIENT_MAX_CONNECTIONS = 32
+CLIENT_MAX_KEEPALIVE_CONNECTIONS = 16
+CLIENT_KEEPALIVE_EXPIRY = 120.0  # seconds
+
+_client_pool: Dict[str, genai.Client] = {}
+_client_pool_lock = threading.Lock()
+
+
+def _build_http_options() -> types.HttpOptions:
+    """Build HTTP options that keep connections warm between requests."""
+    limits = httpx.Limits(
+        max_connections=CLIENT_MAX_CONNECTIONS,
+        max_keepalive_connections=CLIENT_MAX_KEEPALIVE_CONNECTIONS,
+        keepalive_expiry=CLIENT_KEEPALIVE_EXPIRY,
+    )
+    sync_hooks, async_hooks = telemetry.http_event_hooks()
+    return types.HttpOptions(
+        client_args={"limits": limits, "event_hooks": sync_hooks},
+        async_client_args={"limits": limits, "event_hooks": async_hooks},
+    )
+
+
+def get_client(api_key: Optional[str] = None) -> genai.Client:
+    """
+    Get the shared Gemini client for an API key.
+
+    Clients are created once per key and reused for the lifetime of the
+    process, so repeated calls share one keep-alive connection pool instead
+    of opening a new connection (and TLS handshake) per request.
+    genai.Client is safe to share across threads.
+
+    Every pooled client is instrumented by core.telemetry and
+    core.metering, so all generate_content calls made through it are
+    recorded and charged against the active job/daily budget.
+
+    Args:
+        api_key: API key to use (defaults to next key in rotation)
+
+    Returns:
+        Pooled genai.Client for the key
+    """
+    key = api_key or _get_next_api_key()
+
+    client = _client_pool.get(key)
+    if client is not None:
+        return client
+
+    with _client_pool_lock:
+        client = _client_pool.get(key)
+        if client is None:
+            client = genai.Client(api_key=key, http_options=_build_http_options())
+            _instrument_key_requests(client, key)
+            telemetry.instrument_client(client, key_index=_key_index(key))
+            metering.instrument_client(client)
+            _client_pool[key] = client
+    return client
+
+
+def _instrument_key_requests(client: genai.Client, api_key: str) -> None:
+    """Charge the key's request bucket each time the client sends a request.
+
+    Installed innermost, so calls refused by metering are not charged.
+    """
+    models = client.models
+    sync_generate = models.generate_content
+
+    def generate_content(*, model: str, contents: Any, **kwargs: Any) -> Any:
+        _record_key_request(api_key)
+        return sync_generate(model=model, contents=contents, **kwargs)
+
+    aio_models = client.aio.models
+    async_generate = aio_models.generate_content
+
+    async def generate_content_async(*, model: str, contents: Any, **kwargs: Any) -> Any:
+        _record_key_request(api_key)
+        return await async_generate(model=model, contents=contents, **kwargs)
+
+    models.generate_content = generate_content
+    aio_models.generate_content = generate_content_async
+
+
+def _record_key_request(api_key: str) -> None:
+    try:
+        get_key_scheduler().record_request(api_key)
+    except AuthenticationError:
+        pass
+
+
+def _key_index(api_key: str) -> int:
+    """Index of a key in GEMINI_API_KEY (-1 for keys outside the scheduler)."""
+    try:
+        return get_key_scheduler().key_index(api_key)
+    except AuthenticationError:
+        return -1
+
+
+def get_client_key(client: Any) -> Optional[str]:
+    """Return the API key a pooled client was created for (None if not pooled)."""
+    with _client_pool_lock:
+        for key, pooled in _client_pool.items():
+            if pooled is client:
+                return key
+    return None
+
+
+def close_clients() -> None:
+    """Close all pooled clients and release their connections."""
+    with _client_pool_lock:
+        clients = list(_client_pool.values())
+        _client_pool.clear()
+
+    for client in clients:
+        try:
+            client.close()
+        except Exception:
+            pass
 
 
 # ============================================================
@@ -157,6 +330,365 @@ def _base64_to_part(image_data: str) -> types.Part:
     return types.Part(inline_data=types.Blob(mime_type=mime_type, data=img_bytes))
 
 
+# ============================================================
+# Request Helpers
+# ============================================================
+
+def _raise_api_error(e: Exception, action: str) -> None:
+    """
+    Re-raise a failed API call as the matching APIError subclass.
+
+    Called once the retry policy has given up (non-retryable error,
+    attempts exhausted or retry budget spent).
+
+    Raises:
+        RateLimitError, AuthenticationError, SafetyBlockError, APIError,
+        or the original BudgetExceededError unchanged
+    """
+    if isinstance(e, APIError):
+        raise e
+
+    info = classify_error(e)
+    if info.error_class == ErrorClass.BUDGET:
+        raise e
+    if info.error_class == ErrorClass.RATE_LIMIT:
+        raise RateLimitError(f"Rate limit exceeded: {e}") from e
+    if info.error_class == ErrorClass.AUTH:
+        raise AuthenticationError(f"Authentication failed: {e}") from e
+    if info.error_class == ErrorClass.SAFETY:
+        raise SafetyBlockError(f"Content blocked by safety filters: {e}") from e
+    if info.error_class == ErrorClass.SERVER:
+        raise APIError(f"Server overloaded: {e}", error_code="SERVER_ERROR", retryable=True) from e
+    raise APIError(f"{action} failed: {e}") from e
+
+
+def _build_vision_contents(prompt: str, image_data: str) -> List[types.Content]:
+    """Build the user content (prompt + image) for a vision request."""
+    return [
+        types.Content(
+            role="user",
+            parts=[
+                types.Part(text=prompt),
+                _base64_to_part(image_data)
+            ]
+        )
+    ]
+
+
+def _extract_text(response: Any) -> str:
+    """
+    Extract the text answer from a generate_content response.
+
+    Raises:
+        APIError: If the response has no text part
+    """
+    if hasattr(response, 'text') and response.text:
+        return response.text
+
+    # Fallback: extract from parts
+    for candidate in response.candidates:
+        for part in candidate.content.parts:
+            if hasattr(part, 'text') and part.text:
+                return part.text
+
+    raise APIError("No text response received from vision API")
+
+
+def _build_image_parts(
+    prompt: str,
+    negative_prompt: Optional[str] = None,
+    reference_images: Optional[List[Union[str, Path, Image.Image]]] = None,
+) -> List[types.Part]:
+    """Build request parts: reference images first, then the prompt.
+
+    Reference images are encoded through PayloadBuilder so the whole request
+    stays within config.REQUEST_BYTE_BUDGET.
+    """
+    parts = PayloadBuilder()
+
+    # Add reference images first
+    if reference_images:
+        for i, ref_img in enumerate(reference_images):
+            parts.append(types.Part(text=f"[Reference Image {i+1}]"))
+            parts.add_image(ref_img, role="reference")
+
+    # Add prompt
+    full_prompt = prompt
+    if negative_prompt:
+        full_prompt += f"\n\nDO NOT GENERATE: {negative_prompt}"
+    parts.append(types.Part(text=full_prompt))
+
+    return parts.build()
+
+
+def _image_generation_config(
+    temperature: float, aspect_ratio: str, image_size: str
+) -> types.GenerateContentConfig:
+    """Build the generation config for an image request."""
+    return types.GenerateContentConfig(
+        temperature=temperature,
+        response_modalities=["IMAGE", "TEXT"],
+        image_config=types.ImageConfig(
+            aspect_ratio=aspect_ratio,
+            image_size=image_size
+        )
+    )
+
+
+def _save_image_from_response(response: Any, output_path: Path) -> str:
+    """
+    Save the first inline image of a response to output_path.
+
+    Raises:
+        APIError: If the response has no image data
+    """
+    for candidate in response.candidates:
+        for part in candidate.content.parts:
+            if hasattr(part, 'inline_data') and part.inline_data:
+                img = Image.open(io.BytesIO(part.inline_data.data))
+                img.save(output_path)
+                return str(output_path)
+
+    raise APIError("No image data in response")
+
+
+# ============================================================
+# Request Hedging (Vision)
+# ============================================================
+# A vision call that runs past a percentile of recent latency gets a
+# duplicate on a different healthy key; the first response wins and the
+# loser is cancelled (async) or discarded (sync). Hedges are capped by a
+# budget relative to the number of calls so hedging cannot double spend.
+
+HEDGE_ENABLED = os.getenv("FNF_VLM_HEDGE", "0").strip().lower() in ("1", "true", "on", "yes")
+HEDGE_PERCENTILE = 0.95
+HEDGE_MIN_SAMPLES = 20  # no hedging until this many latencies are known
+HEDGE_MIN_DELAY = 1.0  # seconds; never hedge earlier than this
+HEDGE_BUDGET_RATIO = 0.1  # at most ~10% of calls get a hedge
+HEDGE_LATENCY_WINDOW = 200
+
+
+class LatencyTracker:
+    """Sliding window of recent call latencies per model (thread-safe)."""
+
+    def __init__(self, window: int = HEDGE_LATENCY_WINDOW):
+        self.window = window
+        self._samples: Dict[str, deque] = {}
+        self._lock = threading.Lock()
+
+    def record(self, model: str, seconds: float) -> None:
+        with self._lock:
+            samples = self._samples.get(model)
+            if samples is None:
+                samples = self._samples[model] = deque(maxlen=self.window)
+            samples.append(seconds)
+
+    def percentile(self, model: str, q: float, min_samples: int = 1) -> Optional[float]:
+        """Latency at quantile q (0-1), or None with fewer than min_samples."""
+        with self._lock:
+            samples = sorted(self._samples.get(model, ()))
+        if len(samples) < max(min_samples, 1):
+            return None
+        index = min(len(samples) - 1, int(round(q * (len(samples) - 1))))
+        return samples[index]
+
+
+_latency_tracker = LatencyTracker()
+_hedge_lock = threading.Lock()
+_hedge_settings = {
+    "enabled": HEDGE_ENABLED,
+    "percentile": HEDGE_PERCENTILE,
+    "min_samples": HEDGE_MIN_SAMPLES,
+    "min_delay": HEDGE_MIN_DELAY,
+}
+_hedge_budget = RetryBudget(ratio=HEDGE_BUDGET_RATIO, min_retries=1)
+_hedge_stats = {"calls": 0, "hedged": 0, "hedge_wins": 0}
+_hedge_executor: Optional[ThreadPoolExecutor] = None
+
+
+def configure_hedging(
+    enabled: bool = True,
+    percentile: float = HEDGE_PERCENTILE,
+    budget_ratio: float = HEDGE_BUDGET_RATIO,
+    min_samples: int = HEDGE_MIN_SAMPLES,
+    min_delay: float = HEDGE_MIN_DELAY,
+) -> None:
+    """
+    Configure hedged vision requests (disabled unless FNF_VLM_HEDGE=1).
+
+    Args:
+        enabled: Turn hedging on or off
+        percentile: Hedge once a call exceeds this quantile of recent latency
+        budget_ratio: Maximum hedges as a fraction of calls in the last minute
+        min_samples: Latency samples required before hedging starts
+        min_delay: Lower bound on the hedge delay in seconds
+    """
+    global _hedge_budget
+    with _hedge_lock:
+        _hedge_settings.update(
+            enabled=enabled,
+            percentile=percentile,
+            min_samples=min_samples,
+            min_delay=min_delay,
+        )
+        _hedge_budget = RetryBudget(ratio=budget_ratio, min_retries=1)
+
+
+def get_hedge_stats() -> Dict[str, Any]:
+    """Hedging counters and the current hedge delay per tracked model."""
+    with _hedge_lock:
+        stats = dict(_hedge_stats)
+    stats["budget"] = _hedge_budget.stats()
+    return stats
+
+
+def _hedge_delay(model: str, hedge: Optional[bool]) -> Optional[float]:
+    """Seconds to wait before hedging, or None if hedging is off for this call."""
+    enabled = _hedge_settings["enabled"] if hedge is None else hedge
+    if not enabled or get_key_scheduler().key_count < 2:
+        return None
+    threshold = _latency_tracker.percentile(
+        model, _hedge_settings["percentile"], _hedge_settings["min_samples"]
+    )
+    if threshold is None:
+        return None
+    return max(threshold, _hedge_settings["min_delay"])
+
+
+def _acquire_hedge_key(primary_key: str) -> Optional[str]:
+    """Pick a different healthy key for the hedge if the budget allows."""
+    if not _hedge_budget.try_spend():
+        return None
+    key, _ = get_key_scheduler().try_acquire(exclude=(primary_key,))
+    if key is not None:
+        with _hedge_lock:
+            _hedge_stats["hedged"] += 1
+    return key
+
+
+def _record_hedge_winner() -> None:
+    with _hedge_lock:
+        _hedge_stats["hedge_wins"] += 1
+
+
+def _get_hedge_executor() -> ThreadPoolExecutor:
+    global _hedge_executor
+    with _hedge_lock:
+        if _hedge_executor is None:
+            _hedge_executor = ThreadPoolExecutor(
+                max_workers=CLIENT_MAX_CONNECTIONS, thread_name_prefix="vlm-hedge"
+            )
+        return _hedge_executor
+
+
+def _hedged_request(
+    api_key: str, request: Callable[[str], Any], model: str, hedge: Optional[bool] = None
+) -> Any:
+    """
+    Run request(api_key), hedging on a second key if it runs long.
+
+    A sync HTTP call cannot be interrupted, so the losing request is left
+    to finish in its worker thread and its result is discarded.
+
+    The success (and token usage) is reported here, to the key that served
+    the response, so callers must run this with report_success=False.
+    """
+    with _hedge_lock:
+        _hedge_stats["calls"] += 1
+    delay = _hedge_delay(model, hedge)
+    start = time.monotonic()
+
+    if delay is None:
+        response = request(api_key)
+        _latency_tracker.record(model, time.monotonic() - start)
+        _report_response(api_key, response)
+        return response
+
+    _hedge_budget.record_request()
+    executor = _get_hedge_executor()
+    primary = executor.submit(contextvars.copy_context().run, request, api_key)
+    done, _ = wait_futures([primary], timeout=delay)
+    hedge_key = None if done else _acquire_hedge_key(api_key)
+
+    if hedge_key is None:
+        response = primary.result()
+        _latency_tracker.record(model, time.monotonic() - start)
+        _report_response(api_key, response)
+        return response
+
+    backup = executor.submit(contextvars.copy_context().run, request, hedge_key)
+    pending = {primary, backup}
+    while pending:
+        done, pending = wait_futures(pending, return_when=FIRST_COMPLETED)
+        for future in done:
+            if future.exception() is None:
+                for loser in pending:
+                    loser.cancel()
+                response = future.result()
+                _latency_tracker.record(model, time.monotonic() - start)
+                if future is backup:
+                    _record_hedge_winner()
+                _report_response(hedge_key if future is backup else api_key, response)
+                return response
+
+    raise primary.exception()
+
+
+async def _hedged_request_async(
+    api_key: str,
+    request: Callable[[str], Awaitable[Any]],
+    model: str,
+    hedge: Optional[bool] = None,
+) -> Any:
+    """Async counterpart of _hedged_request; the losing task is cancelled.
+
+    Reports the success to the serving key, like _hedged_request.
+    """
+    with _hedge_lock:
+        _hedge_stats["calls"] += 1
+    delay = _hedge_delay(model, hedge)
+    start = time.monotonic()
+
+    if delay is None:
+        response = await request(api_key)
+        _latency_tracker.record(model, time.monotonic() - start)
+        _report_response(api_key, response)
+        return response
+
+    _hedge_budget.record_request()
+    primary = asyncio.ensure_future(request(api_key))
+    tasks = {primary}
+    try:
+        done, _ = await asyncio.wait(tasks, timeout=delay)
+        hedge_key = None if done else _acquire_hedge_key(api_key)
+
+        if hedge_key is None:
+            response = await primary
+            _latency_tracker.record(model, time.monotonic() - start)
+            _report_response(api_key, response)
+            return response
+
+        backup = asyncio.ensure_future(request(hedge_key))
+        tasks.add(backup)
+        pending = set(tasks)
+        while pending:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                if not task.cancelled() and task.exception() is None:
+                    response = task.result()
+                    _latency_tracker.record(model, time.monotonic() - start)
+                    if task is backup:
+                        _record_hedge_winner()
+                    _report_response(hedge_key if task is backup else api_key, response)
+                    return response
+
+        raise primary.exception()
+    finally:
+        for task in tasks:
+            if not task.done():
+                task.cancel()
+
+
 # ============================================================
 # Vision API (VLM)
 # ============================================================
@@ -166,7 +698,8 @@ def call_gemini_vision(
     image_data: str,
     model: Optional[str] = None,
     temperature: float = 0.1,
-    max_retries: int = 3
+    max_retries: int = 3,
+    hedge: Optional[bool] = None
 ) -> str:
     """
     Call Gemini Vision API for image analysis.
@@ -177,6 +710,7 @@ def call_gemini_vision(
         model: Model to use (defaults to VISION_MODEL from config)
         temperature: Generation temperature (0.0-1.0)
         max_retries: Maximum number of retry attempts
+        hedge: Hedge slow calls on a second key (None = configure_hedging setting)
 
     Returns:
         Text response from the model
@@ -187,77 +721,28 @@ def call_gemini_vision(
         SafetyBlockError: If content is blocked by safety filters
     """
     model = model or VISION_MODEL
-
-    for attempt in range(max_retries):
-        try:
-            api_key = _get_next_api_key()
-            client = genai.Client(api_key=api_key)
-
-            # Convert base64 image to Part
-            image_part = _base64_to_part(image_data)
-
-            # Create content
-            contents = [
-                types.Content(
-                    role="user",
-                    parts=[
-                        types.Part(text=prompt),
-                        image_part
-                    ]
-                )
-            ]
-
-            # Call API
-            response = client.models.generate_content(
-                model=model,
-                contents=contents,
-                config=types.GenerateContentConfig(
-                    temperature=temperature
-                )
+    contents = _build_vision_contents(prompt, image_data)
+
+    def _request(api_key: str) -> Any:
+        return get_client(api_key).models.generate_content(
+            model=model,
+            contents=contents,
+            config=types.GenerateContentConfig(
+                temperature=temperature
             )
+        )
 
-            # Extract text from response
-            if hasattr(response, 'text') and response.text:
-                return response.text
+    try:
+        response = get_retry_policy().call(
+            lambda api_key: _hedged_request(api_key, _request, model, hedge),
+            action="Vision API call",
+            max_attempts=max_retries,
+            report_success=False,
+        )
+    except Exception as e:
+        _raise_api_error(e, "Vision API call")
 
-            # Fallback: extract from parts
-            for candidate in response.candidates:
-                for part in candidate.content.parts:
-                    if hasattr(part, 'text') and part.text:
-                        return part.text
-
-            raise APIError("No text response received from vision API")
-
-        except Exception as e:
-            error_str = str(e).lower()
-
-            # Check for specific error types
-            if '429' in error_str or 'rate' in error_str or 'quota' in error_str:
-                if attempt < max_retries - 1:
-                    wait_time = (2 ** attempt) * 5  # Exponential backoff: 5, 10, 20 seconds
-                    time.sleep(wait_time)
-                    continue
-                raise RateLimitError(f"Rate limit exceeded: {e}")
-
-            if '401' in error_str or 'auth' in error_str or 'api key' in error_str:
-                raise AuthenticationError(f"Authentication failed: {e}")
-
-            if 'safety' in error_str or 'blocked' in error_str:
-                raise SafetyBlockError(f"Content blocked by safety filters: {e}")
-
-            if '503' in error_str or 'overload' in error_str:
-                if attempt < max_retries - 1:
-                    time.sleep(10)
-                    continue
-                raise APIError(f"Server overloaded: {e}", error_code="SERVER_ERROR", retryable=True)
-
-            # Generic error
-            if attempt < max_retries - 1:
-                time.sleep(5)
-                continue
-            raise APIError(f"Vision API call failed: {e}")
-
-    raise APIError(f"Vision API call failed after {max_retries} attempts")
+    return _extract_text(response)
 
 
 # ============================================================
@@ -303,99 +788,385 @@ def generate_image(
     # Ensure output directory exists
     output_path.parent.mkdir(parents=True, exist_ok=True)
 
-    # Build parts list
-    parts: List[Any] = []
+    parts = _build_image_parts(prompt, negative_prompt, reference_images)
 
-    # Add reference images first
-    if reference_images:
-        for i, ref_img in enumerate(reference_images):
-            parts.append(f"[Reference Image {i+1}]")
-            img = _load_image(ref_img, max_size=2048)
-            parts.append(_pil_to_part(img))
+    def _request(api_key: str) -> str:
+        response = get_client(api_key).models.generate_content(
+            model=model,
+            contents=[types.Content(role="user", parts=parts)],
+            config=_image_generation_config(temperature, aspect_ratio, image_size)
+        )
+        _report_response(api_key, response)
+        return _save_image_from_response(response, output_path)
+
+    try:
+        return get_retry_policy().call(
+            _request, action="Image generation", max_attempts=max_retries
+        )
+    except Exception as e:
+        _raise_api_error(e, "Image generation")
 
-    # Add prompt
-    full_prompt = prompt
-    if negative_prompt:
-        full_prompt += f"\n\nDO NOT GENERATE: {negative_prompt}"
-    parts.append(full_prompt)
 
-    for attempt in range(max_retries):
+# ============================================================
+# Batch Generation Helper
+# ============================================================
+
+MAX_BATCH_WORKERS_PER_KEY = 2
+MAX_BATCH_WORKERS = 16
+
+
+@dataclass
+class BatchItemResult:
+    """Completion event for one prompt of a batch."""
+    index: int  # 0-based position in the prompt list
+    prompt: str
+    output_path: Path
+    path: Optional[Path] = None  # set when the image was saved
+    error: Optional[str] = None
+    elapsed: float = 0.0
+
+    @property
+    def success(self) -> bool:
+        return self.path is not None
+
+
+def _default_batch_workers() -> int:
+    return max(1, min(get_key_scheduler().key_count * MAX_BATCH_WORKERS_PER_KEY, MAX_BATCH_WORKERS))
+
+
+def iter_batch_images(
+    prompts: List[str],
+    output_dir: Union[str, Path],
+    model: Optional[str] = None,
+    aspect_ratio: str = "3:4",
+    temperature: float = 0.3,
+    image_size: str = "2K",
+    prefix: str = "generated",
+    max_workers: Optional[int] = None
+) -> Iterator[BatchItemResult]:
+    """
+    Generate images concurrently and yield each result as it completes.
+
+    File names follow prompt order ({prefix}_{i+1:03d}.png) regardless of
+    completion order. A failed prompt yields a result with error set and
+    does not stop the rest of the batch. Closing the iterator early cancels
+    prompts that have not started yet.
+
+    Args:
+        prompts: List of generation prompts
+        output_dir: Directory to save generated images
+        model: Model to use (defaults to IMAGE_MODEL from config)
+        aspect_ratio: Image aspect ratio
+        temperature: Generation temperature
+        image_size: Image size
+        prefix: Filename prefix for generated images
+        max_workers: Concurrent generations (defaults to 2 per API key, max 16)
+
+    Yields:
+        BatchItemResult in completion order
+    """
+    output_dir = Path(output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+
+    def _run(i: int, prompt: str) -> BatchItemResult:
+        output_path = output_dir / f"{prefix}_{i+1:03d}.png"
+        start = time.monotonic()
         try:
-            api_key = _get_next_api_key()
-            client = genai.Client(api_key=api_key)
+            result_path = generate_image(
+                prompt=prompt,
+                output_path=output_path,
+                model=model,
+                aspect_ratio=aspect_ratio,
+                temperature=temperature,
+                image_size=image_size
+            )
+            path = Path(result_path) if result_path else None
+            error = None if path else "No image generated"
+        except Exception as e:
+            path, error = None, str(e)
+        return BatchItemResult(i, prompt, output_path, path, error, time.monotonic() - start)
+
+    executor = ThreadPoolExecutor(
+        max_workers=max_workers or _default_batch_workers(), thread_name_prefix="batch-gen"
+    )
+    futures = [
+        executor.submit(contextvars.copy_context().run, _run, i, prompt)
+        for i, prompt in enumerate(prompts)
+    ]
+    try:
+        for future in as_completed(futures):
+            yield future.result()
+    finally:
+        executor.shutdown(wait=False, cancel_futures=True)
+
+
+def generate_batch_images(
+    prompts: List[str],
+    output_dir: Union[str, Path],
+    model: Optional[str] = None,
+    aspect_ratio: str = "3:4",
+    temperature: float = 0.3,
+    image_size: str = "2K",
+    prefix: str = "generated",
+    max_workers: Optional[int] = None,
+    on_progress: Optional[Callable[[BatchItemResult, int, int], None]] = None
+) -> List[Path]:
+    """
+    Generate multiple images in batch.
+
+    Prompts run concurrently across the available API keys (see
+    iter_batch_images). Failed prompts are skipped, so the returned list
+    holds every image that was generated.
+
+    Args:
+        prompts: List of generation prompts
+        output_dir: Directory to save generated images
+        model: Model to use (defaults to IMAGE_MODEL from config)
+        aspect_ratio: Image aspect ratio
+        temperature: Generation temperature
+        image_size: Image size
+        prefix: Filename prefix for generated images
+        max_workers: Concurrent generations (defaults to 2 per API key, max 16)
+        on_progress: Called as on_progress(result, completed, total) after each prompt
+
+    Returns:
+        List of paths to successfully generated images (in prompt order)
+    """
+    results: Dict[int, BatchItemResult] = {}
+    total = len(prompts)
+
+    for result in iter_batch_images(
+        prompts,
+        output_dir,
+        model=model,
+        aspect_ratio=aspect_ratio,
+        temperature=temperature,
+        image_size=image_size,
+        prefix=prefix,
+        max_workers=max_workers,
+    ):
+        results[result.index] = result
+        if result.success:
+            print(f"Generated {result.index+1}/{total}: {result.path.name}")
+        else:
+            print(f"✗ Error {result.index+1}/{total}: {result.error}")
+        if on_progress is not None:
+            on_progress(result, len(results), total)
+
+    return [results[i].path for i in sorted(results) if results[i].success]
+
+
+# ============================================================
+# Async Concurrency Limits
+# ============================================================
+
+# Maximum in-flight async requests (shared by all coroutines in a process)
+MAX_CONCURRENT_PER_KEY = 8
+MAX_CONCURRENT_PER_MODEL = 32
+
+
+class ConcurrencyLimiter:
+    """
+    Bounds in-flight async requests per API key and per model.
+
+    Semaphores are created lazily for each running event loop, so the
+    limiter can be shared across separate asyncio.run() invocations.
+    The model slot is always acquired before the key slot to keep the
+    lock order consistent.
+    """
+
+    def __init__(
+        self,
+        per_key: int = MAX_CONCURRENT_PER_KEY,
+        per_model: int = MAX_CONCURRENT_PER_MODEL,
+    ):
+        self.per_key = per_key
+        self.per_model = per_model
+        self._semaphores: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Dict[tuple, asyncio.Semaphore]]" = (
+            weakref.WeakKeyDictionary()
+        )
+        self._lock = threading.Lock()
+
+    def _semaphore(self, scope: str, name: str, limit: int) -> asyncio.Semaphore:
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            loop_semaphores = self._semaphores.setdefault(loop, {})
+            sem = loop_semaphores.get((scope, name))
+            if sem is None:
+                sem = asyncio.Semaphore(limit)
+                loop_semaphores[(scope, name)] = sem
+        return sem
+
+    @asynccontextmanager
+    async def acquire(self, api_key: str, model: str) -> AsyncIterator[None]:
+        """Hold one model slot and one key slot for the duration of a request."""
+        async with self._semaphore("model", model, self.per_model):
+            async with self._semaphore("key", api_key, self.per_key):
+                yield
+
+
+_async_limiter = ConcurrencyLimiter()
+
+
+def configure_async_limits(
+    per_key: Optional[int] = None, per_model: Optional[int] = None
+) -> None:
+    """
+    Replace the shared async limiter with new limits.
+
+    Call before starting async work; requests already in flight keep
+    using the previous limiter.
+
+    Args:
+        per_key: Max in-flight requests per API key
+        per_model: Max in-flight requests per model
+    """
+    global _async_limiter
+    _async_limiter = ConcurrencyLimiter(
+        per_key=per_key or _async_limiter.per_key,
+        per_model=per_model or _async_limiter.per_model,
+    )
+
+
+# ============================================================
+# Async API
+# ============================================================
+
+async def call_gemini_vision_async(
+    prompt: str,
+    image_data: str,
+    model: Optional[str] = None,
+    temperature: float = 0.1,
+    max_retries: int = 3,
+    hedge: Optional[bool] = None
+) -> str:
+    """
+    Async counterpart of call_gemini_vision.
+
+    Uses the pooled client's async surface (client.aio) and the shared
+    per-key / per-model concurrency limiter.
+
+    Args:
+        prompt: Analysis prompt
+        image_data: Base64 encoded image data
+        model: Model to use (defaults to VISION_MODEL from config)
+        temperature: Generation temperature (0.0-1.0)
+        max_retries: Maximum number of retry attempts
+        hedge: Hedge slow calls on a second key (None = configure_hedging setting)
+
+    Returns:
+        Text response from the model
+
+    Raises:
+        APIError: If API call fails after all retries
+        AuthenticationError: If authentication fails
+        SafetyBlockError: If content is blocked by safety filters
+    """
+    model = model or VISION_MODEL
+    contents = _build_vision_contents(prompt, image_data)
 
-            # Call API
-            response = client.models.generate_content(
+    async def _request(api_key: str) -> Any:
+        async with _async_limiter.acquire(api_key, model):
+            return await get_client(api_key).aio.models.generate_content(
                 model=model,
-                contents=[types.Content(role="user", parts=parts)],
+                contents=contents,
                 config=types.GenerateContentConfig(
-                    temperature=temperature,
-                    response_modalities=["IMAGE", "TEXT"],
-                    image_config=types.ImageConfig(
-                        aspect_ratio=aspect_ratio,
-                        image_size=image_size
-                    )
+                    temperature=temperature
                 )
             )
 
-            # Extract image from response
-            for candidate in response.candidates:
-                for part in candidate.content.parts:
-                    if hasattr(part, 'inline_data') and part.inline_data:
-                        # Save image
-                        img = Image.open(io.BytesIO(part.inline_data.data))
-                        img.save(output_path)
-                        return str(output_path)
+    try:
+        response = await get_retry_policy().call_async(
+            lambda api_key: _hedged_request_async(api_key, _request, model, hedge),
+            action="Vision API call",
+            max_attempts=max_retries,
+            report_success=False,
+        )
+    except Exception as e:
+        _raise_api_error(e, "Vision API call")
 
-            raise APIError("No image data in response")
+    return _extract_text(response)
 
-        except Exception as e:
-            error_str = str(e).lower()
-
-            # Check for specific error types
-            if '429' in error_str or 'rate' in error_str or 'quota' in error_str:
-                if attempt < max_retries - 1:
-                    wait_time = (2 ** attempt) * 5  # Exponential backoff
-                    time.sleep(wait_time)
-                    continue
-                raise RateLimitError(f"Rate limit exceeded: {e}")
-
-            if '401' in error_str or 'auth' in error_str or 'api key' in error_str:
-                raise AuthenticationError(f"Authentication failed: {e}")
-
-            if 'safety' in error_str or 'blocked' in error_str:
-                raise SafetyBlockError(f"Content blocked by safety filters: {e}")
-
-            if '503' in error_str or 'overload' in error_str:
-                if attempt < max_retries - 1:
-                    time.sleep(10)
-                    continue
-                raise APIError(f"Server overloaded: {e}", error_code="SERVER_ERROR", retryable=True)
-
-            # Generic error
-            if attempt < max_retries - 1:
-                time.sleep(5)
-                continue
-            raise APIError(f"Image generation failed: {e}")
 
-    return None
+async def generate_image_async(
+    prompt: str,
+    output_path: Union[str, Path],
+    model: Optional[str] = None,
+    aspect_ratio: str = "3:4",
+    negative_prompt: Optional[str] = None,
+    temperature: float = 0.3,
+    image_size: str = "2K",
+    reference_images: Optional[List[Union[str, Path, Image.Image]]] = None,
+    max_retries: int = 3
+) -> Optional[str]:
+    """
+    Async counterpart of generate_image.
 
+    Reference loading and image saving run in a worker thread so the
+    event loop is never blocked on disk I/O or PIL encoding.
 
-# ============================================================
-# Batch Generation Helper
-# ============================================================
+    Args:
+        prompt: Generation prompt
+        output_path: Path to save generated image
+        model: Model to use (defaults to IMAGE_MODEL from config)
+        aspect_ratio: Image aspect ratio (e.g., "1:1", "3:4", "16:9")
+        negative_prompt: Optional negative prompt to avoid certain features
+        temperature: Generation temperature (0.0-1.0)
+        image_size: Image size ("2K" or "1K")
+        reference_images: Optional list of reference images (paths or PIL Images)
+        max_retries: Maximum number of retry attempts
 
-def generate_batch_images(
+    Returns:
+        Path to saved image (as string) if successful, None otherwise
+
+    Raises:
+        APIError: If generation fails after all retries
+        AuthenticationError: If authentication fails
+        SafetyBlockError: If content is blocked by safety filters
+    """
+    model = model or IMAGE_MODEL
+    output_path = Path(output_path)
+
+    # Ensure output directory exists
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+
+    parts = await asyncio.to_thread(
+        _build_image_parts, prompt, negative_prompt, reference_images
+    )
+
+    async def _request(api_key: str) -> str:
+        async with _async_limiter.acquire(api_key, model):
+            response = await get_client(api_key).aio.models.generate_content(
+                model=model,
+                contents=[types.Content(role="user", parts=parts)],
+                config=_image_generation_config(temperature, aspect_ratio, image_size)
+            )
+        _report_response(api_key, response)
+        return await asyncio.to_thread(_save_image_from_response, response, output_path)
+
+    try:
+        return await get_retry_policy().call_async(
+            _request, action="Image generation", max_attempts=max_retries
+        )
+    except Exception as e:
+        _raise_api_error(e, "Image generation")
+
+
+async def generate_batch_images_async(
     prompts: List[str],
     output_dir: Union[str, Path],
     model: Optional[str] = None,
     aspect_ratio: str = "3:4",
     temperature: float = 0.3,
     image_size: str = "2K",
-    prefix: str = "generated"
+    prefix: str = "generated",
+    on_progress: Optional[Callable[[BatchItemResult, int, int], None]] = None
 ) -> List[Path]:
     """
-    Generate multiple images in batch.
+    Async counterpart of generate_batch_images.
+
+    All prompts are scheduled at once; the shared concurrency limiter
+    decides how many are actually in flight.
 
     Args:
         prompts: List of generation prompts
@@ -405,20 +1176,23 @@ def generate_batch_images(
         temperature: Generation temperature
         image_size: Image size
         prefix: Filename prefix for generated images
+        on_progress: Called as on_progress(result, completed, total) after each prompt
 
     Returns:
-        List of paths to successfully generated images
+        List of paths to successfully generated images (in prompt order)
     """
     output_dir = Path(output_dir)
     output_dir.mkdir(parents=True, exist_ok=True)
 
-    generated_paths = []
+    total = len(prompts)
+    completed = 0
 
-    for i, prompt in enumerate(prompts):
+    async def _run(i: int, prompt: str) -> BatchItemResult:
+        nonlocal completed
         output_path = output_dir / f"{prefix}_{i+1:03d}.png"
-
+        start = time.monotonic()
         try:
-            result_path = generate_image(
+            result_path = await generate_image_async(
                 prompt=prompt,
                 output_path=output_path,
                 model=model,
@@ -426,15 +1200,21 @@ def generate_batch_images(
                 temperature=temperature,
                 image_size=image_size
             )
+            path = Path(result_path) if result_path else None
+            error = None if path else "No image generated"
+        except Exception as e:
+            path, error = None, str(e)
+        result = BatchItemResult(i, prompt, output_path, path, error, time.monotonic() - start)
 
-            if result_path:
-                generated_paths.append(Path(result_path))
-                print(f"Generated {i+1}/{len(prompts)}: {Path(result_path).name}")
-            else:
-                print(f"Failed {i+1}/{len(prompts)}")
+        completed += 1
+        if result.success:
+            print(f"Generated {i+1}/{total}: {path.name}")
+        else:
+            print(f"✗ Error {i+1}/{total}: {error}")
+        if on_progress is not None:
+            on_progress(result, completed, total)
+        return result
 
-        except Exception as e:
-            print(f"✗ Error {i+1}/{len(prompts)}: {e}")
-            continue
+    results = await asyncio.gather(*[_run(i, prompt) for i, prompt in enumerate(prompts)])
 
-    return generated_paths
+    return [result.path for result in results if result.success]
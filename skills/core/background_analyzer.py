@@ -66,11 +66,12 @@ def analyze_background(image_pil: Image.Image, api_key: str) -> str:
     Returns:
         배경 설명 텍스트 (영문)
     """
-    from google import genai
     from google.genai import types
 
+    from core.api import get_client
+
     try:
-        client = genai.Client(api_key=api_key)
+        client = get_client(api_key)
 
         # 512px 다운샘플링 (텍스트 추출이므로 낮은 해상도 가능)
         img = image_pil.copy().convert('RGB')
@@ -117,11 +118,12 @@ def analyze_for_background_swap(image_pil: Image.Image, api_key: str) -> Dict[st
     Returns:
         분석 결과 딕셔너리
     """
-    from google import genai
     from google.genai import types
 
+    from core.api import get_client
+
     try:
-        client = genai.Client(api_key=api_key)
+        client = get_client(api_key)
 
         # 1024px 다운샘플링
         img = image_pil.copy().convert('RGB')
@@ -9,11 +9,12 @@ import json
 from PIL import Image
 from typing import Dict, Any
 
-from google import genai
 from google.genai import types
 
 from core.config import VISION_MODEL
+from core.api import get_client
 from core.utils import pil_to_part
+from core.vlm_cache import cached_generate_text
 
 # ============================================================
 # 기존 함수 IMPORT 및 RE-EXPORT (복사 아님!)
@@ -58,7 +59,7 @@ def analyze_model_physics(
         }
     """
     try:
-        client = genai.Client(api_key=api_key)
+        client = get_client(api_key)
 
         # 1024px 다운샘플링 (공간 분석이므로 높은 해상도)
         image_part = pil_to_part(image_pil, max_size=1024)
@@ -232,7 +233,7 @@ The person is SITTING. You MUST:
     return "\n\n".join(parts)
 
 
-def detect_source_type(image_pil: Image.Image, api_key: str) -> str:
+def detect_source_type(image_pil: Image.Image, api_key: str, use_cache: bool = True) -> str:
     """
     스튜디오/야외 자동 감지 (StudioRelight 라우팅용).
 
@@ -253,17 +254,19 @@ def detect_source_type(image_pil: Image.Image, api_key: str) -> str:
     Args:
         image_pil: PIL Image 객체
         api_key: Gemini API 키
+        use_cache: VLM 응답 캐시 사용 여부
 
     Returns:
         "outdoor" | "white_studio" | "colored_studio" | "indoor"
     """
     try:
-        client = genai.Client(api_key=api_key)
+        client = get_client(api_key)
 
         # 512px 다운샘플링 (분류용이므로 저해상도)
         image_part = pil_to_part(image_pil, max_size=512)
 
-        response = client.models.generate_content(
+        text = cached_generate_text(
+            client,
             model=VISION_MODEL,
             contents=[
                 types.Content(
@@ -274,13 +277,14 @@ def detect_source_type(image_pil: Image.Image, api_key: str) -> str:
                 temperature=0.1,
                 max_output_tokens=20,  # 단일 단어만 반환
             ),
+            use_cache=use_cache,
         )
 
         # None 체크
-        if response is None or response.text is None:
+        if text is None:
             return "outdoor"
 
-        result = response.text.strip().lower()
+        result = text.strip().lower()
 
         # 유효한 값인지 확인
         valid_types = ["outdoor", "white_studio", "colored_studio", "indoor"]
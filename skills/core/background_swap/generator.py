@@ -12,12 +12,14 @@ from typing import Union, Optional, List, Dict, Any
 from concurrent.futures import ThreadPoolExecutor, as_completed
 from PIL import Image
 
-from google import genai
 from google.genai import types
 
 from core.config import IMAGE_MODEL, VISION_MODEL
-from core.api import _get_next_api_key as get_next_api_key
+from core.api import _get_next_api_key as get_next_api_key, get_client
 from core.utils import pil_to_part
+from core.retry_policy import get_retry_policy
+from core.telemetry import STEP_GENERATE, STEP_VALIDATE, telemetry_context
+from core.validators.base import WorkflowType
 
 
 # ============================================================
@@ -76,6 +78,9 @@ from .prompt_builder import (
 )
 from .templates import BASE_PRESERVATION_PROMPT
 
+# 텔레메트리 workflow 태그
+WORKFLOW_NAME = WorkflowType.BACKGROUND_SWAP.value
+
 
 # ============================================================
 # 메인 진입점
@@ -159,6 +164,8 @@ def swap(
                 # Sweep 모드: Fast 생성 후 일괄 검증
                 result = _fast_generate(img, background_style, api_key, image_size)
 
+            result["source_index"] = i
+
             # 결과 저장
             if result.get("image"):
                 output_path = os.path.join(
@@ -216,8 +223,6 @@ def generate_background_swap(
         생성된 PIL Image 또는 None
     """
     try:
-        client = genai.Client(api_key=api_key)
-
         # 원본 비율 계산 및 가장 가까운 aspect_ratio 선택
         aspect_ratio = _get_closest_aspect_ratio(source_image)
 
@@ -230,17 +235,22 @@ def generate_background_swap(
             source_part,
         ]
 
-        response = client.models.generate_content(
-            model=IMAGE_MODEL,
-            contents=[types.Content(role="user", parts=parts)],
-            config=types.GenerateContentConfig(
-                temperature=temperature,
-                response_modalities=["IMAGE", "TEXT"],
-                image_config=types.ImageConfig(
-                    aspect_ratio=aspect_ratio,
-                    image_size=image_size,
+        # 429 시 다른 키로 교체, 그 외 재시도 가능 에러는 지터 백오프
+        response = get_retry_policy().call(
+            lambda key: get_client(key).models.generate_content(
+                model=IMAGE_MODEL,
+                contents=[types.Content(role="user", parts=parts)],
+                config=types.GenerateContentConfig(
+                    temperature=temperature,
+                    response_modalities=["IMAGE", "TEXT"],
+                    image_config=types.ImageConfig(
+                        aspect_ratio=aspect_ratio,
+                        image_size=image_size,
+                    ),
                 ),
             ),
+            api_key=api_key,
+            action="[BG-SWAP] 생성",
         )
 
         # 이미지 추출
@@ -330,16 +340,18 @@ def generate_with_validation(
                 prompt = enhancement + "\n\n" + prompt
 
         # 생성
-        image = generate_background_swap(
-            source_image, prompt, api_key, temp, image_size
-        )
+        with telemetry_context(workflow=WORKFLOW_NAME, step=STEP_GENERATE):
+            image = generate_background_swap(
+                source_image, prompt, api_key, temp, image_size
+            )
 
         if image is None:
             history.append({"attempt": attempt + 1, "status": "generation_failed"})
             continue
 
         # 검증
-        result = validator.validate(image, source_image)
+        with telemetry_context(workflow=WORKFLOW_NAME, step=STEP_VALIDATE):
+            result = validator.validate(image, source_image)
 
         # 검증 결과 출력 (검수표 템플릿 형식)
         print(f"\n{'=' * 60}")
@@ -486,29 +498,24 @@ class BatchProcessor:
         }
 
     def _process_with_retry(self, item, process_func, idx, output_dir):
-        """재시도 로직 포함 단일 아이템 처리"""
-        last_error = None
-
-        for attempt in range(self.retry_count):
-            try:
-                result_image = process_func(item)
+        """재시도 로직 포함 단일 아이템 처리
 
-                if output_dir and result_image:
-                    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S_%f")[:20]
-                    filepath = os.path.join(
-                        output_dir, f"result_{idx:04d}_{timestamp}.png"
-                    )
-                    result_image.save(filepath, "PNG")
-                    return {"index": idx, "filepath": filepath, "status": "success"}
-
-                return {"index": idx, "status": "success"}
+        재시도 여부/대기 시간은 공유 재시도 정책이 결정한다
+        (인증/안전 필터 에러는 즉시 실패, 서버 힌트 우선 지터 백오프, 전역 예산).
+        """
+        result_image = get_retry_policy().run(
+            lambda: process_func(item),
+            action=f"[BATCH] item {idx}",
+            max_attempts=self.retry_count,
+        )
 
-            except Exception as e:
-                last_error = e
-                if attempt < self.retry_count - 1:
-                    time.sleep((attempt + 1) * 3)
+        if output_dir and result_image:
+            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S_%f")[:20]
+            filepath = os.path.join(output_dir, f"result_{idx:04d}_{timestamp}.png")
+            result_image.save(filepath, "PNG")
+            return {"index": idx, "filepath": filepath, "status": "success"}
 
-        raise last_error
+        return {"index": idx, "status": "success"}
 
 
 # ============================================================
@@ -586,7 +593,8 @@ def _fast_generate(
     )
 
     # 생성
-    image = generate_background_swap(source_image, prompt, api_key, 0.2, image_size)
+    with telemetry_context(workflow=WORKFLOW_NAME, step=STEP_GENERATE):
+        image = generate_background_swap(source_image, prompt, api_key, 0.2, image_size)
 
     return {
         "image": image,
@@ -604,31 +612,49 @@ def _sweep_validate_and_retry(
     image_size: str,
     output_dir: str,
 ) -> List[Dict]:
-    """Sweep 모드: 일괄 검증 + 실패분 재생성"""
-    from .validator import get_validator
+    """Sweep 모드: 일괄 검증 + 실패분 재생성
+
+    같은 소스의 후보들은 core.validators.result_cache를 거쳐 캐시부터 조회하고,
+    미스된 후보만 validate_batch로 소스를 한 번만 보내 함께 채점한다. 라운드 사이에
+    바뀌지 않은 이미지(재생성 실패분)나 재실행 시 이미 채점된 이미지는 VLM 호출
+    없이 조회된다.
+    """
+    from core.validators import ValidatorRegistry, cached_validate_batch
 
     # 일괄 검증
     api_key = get_next_api_key()
+    validator = ValidatorRegistry.get(WorkflowType.BACKGROUND_SWAP, get_client(api_key))
 
     for round_num in range(max_rounds):
         failed_indices = []
 
+        # 미검증/실패 결과를 소스 이미지별로 묶음 (같은 소스의 variations는 한 번에 채점)
+        # 생성 직후 PIL 객체는 저장 후 제거되므로 output_path로 검증
+        groups: Dict[int, List[int]] = {}
         for i, result in enumerate(results):
             if result.get("passed") is None or not result.get("passed"):
-                # 검증 수행
-                if result.get("image"):
-                    source_type = detect_source_type(images[i % len(images)], api_key)
-                    validator, _ = get_validator(source_type, api_key)
-                    val_result = validator.validate(
-                        result["image"], images[i % len(images)]
-                    )
-                    result["score"] = val_result.total_score
-                    result["passed"] = val_result.passed
-                    result["grade"] = val_result.grade
-                    result["issues"] = val_result.issues
-
-                    if not val_result.passed:
-                        failed_indices.append(i)
+                if result.get("image") or result.get("output_path"):
+                    source_index = result.get("source_index", i % len(images))
+                    groups.setdefault(source_index, []).append(i)
+
+        for source_index, indices in groups.items():
+            references = {"original": [images[source_index]]}
+            candidates = [
+                results[i].get("image") or results[i].get("output_path") for i in indices
+            ]
+            # 캐시 미스된 후보만 소스 1회 + 후보 N장 단일 호출로 채점
+            with telemetry_context(workflow=WORKFLOW_NAME, step=STEP_VALIDATE):
+                val_results = cached_validate_batch(validator, candidates, references).results
+
+            for i, val_result in zip(indices, val_results):
+                result = results[i]
+                result["score"] = val_result.total_score
+                result["passed"] = val_result.passed
+                result["grade"] = val_result.grade
+                result["issues"] = val_result.issues
+
+                if not val_result.passed:
+                    failed_indices.append(i)
 
         if not failed_indices:
             print(f"[SWEEP] Round {round_num + 1}: All passed!")
@@ -642,7 +668,7 @@ def _sweep_validate_and_retry(
         for idx in failed_indices:
             api_key = get_next_api_key()
             new_result = generate_with_validation(
-                images[idx % len(images)],
+                images[results[idx].get("source_index", idx % len(images))],
                 background_style,
                 api_key,
                 max_retries=1,
@@ -659,6 +685,7 @@ def _sweep_validate_and_retry(
                 new_result["output_path"] = output_path
                 del new_result["image"]
 
+            new_result["source_index"] = results[idx].get("source_index", idx % len(images))
             results[idx] = new_result
 
     return results
@@ -25,7 +25,6 @@ from typing import List, Dict, Any, Tuple, Union
 from pathlib import Path
 from PIL import Image
 
-from google import genai
 from google.genai import types
 
 from core.config import VISION_MODEL
@@ -349,7 +348,7 @@ class BackgroundSwapValidator:
 
     def __init__(self, api_key: str):
         self.api_key = api_key
-        self.client = genai.Client(api_key=api_key)
+        self.client = get_client(api_key)
         self._vfx_analysis = None  # VFX 분석 결과 저장
 
     def set_vfx_analysis(self, vfx_analysis: dict):
@@ -388,23 +387,7 @@ class BackgroundSwapValidator:
             )
 
             data = json.loads(response.text)
-
-            return BackgroundSwapValidationResult(
-                model_preservation=data.get("model_preservation", 0),
-                relight_naturalness=data.get("relight_naturalness", 0),
-                lighting_match=data.get("lighting_match", 0),
-                ground_contact=data.get("ground_contact", 0),
-                physics_plausibility=data.get("physics_plausibility", 0),
-                edge_quality=data.get("edge_quality", 0),
-                prop_style_consistency=data.get("prop_style_consistency", 0),
-                color_temperature_compliance=data.get(
-                    "color_temperature_compliance", 0
-                ),
-                perspective_match=data.get("perspective_match", 0),
-                perspective_reason=data.get("perspective_reason", ""),
-                issues=data.get("issues", []),
-                raw_response=response.text,
-            )
+            return self.result_from_data(data, response.text)
 
         except Exception as e:
             return BackgroundSwapValidationResult(
@@ -412,6 +395,24 @@ class BackgroundSwapValidator:
                 raw_response=str(e),
             )
 
+    @staticmethod
+    def result_from_data(data: Dict[str, Any], raw_response: str = "") -> BackgroundSwapValidationResult:
+        """검증 응답 JSON → 검증 결과 (단일 검증/토너먼트 공용)"""
+        return BackgroundSwapValidationResult(
+            model_preservation=data.get("model_preservation", 0),
+            relight_naturalness=data.get("relight_naturalness", 0),
+            lighting_match=data.get("lighting_match", 0),
+            ground_contact=data.get("ground_contact", 0),
+            physics_plausibility=data.get("physics_plausibility", 0),
+            edge_quality=data.get("edge_quality", 0),
+            prop_style_consistency=data.get("prop_style_consistency", 0),
+            color_temperature_compliance=data.get("color_temperature_compliance", 0),
+            perspective_match=data.get("perspective_match", 0),
+            perspective_reason=data.get("perspective_reason", ""),
+            issues=data.get("issues", []),
+            raw_response=raw_response,
+        )
+
     def get_enhancement_prompt(
         self, result: BackgroundSwapValidationResult
     ) -> Tuple[str, List[str]]:
@@ -486,7 +487,8 @@ from core.validators.base import (
     QualityTier,
 )
 from core.validators.registry import ValidatorRegistry
-from core.api import _get_next_api_key
+from core.validators.tournament import TournamentRubric
+from core.api import _get_next_api_key, get_client
 
 
 @ValidatorRegistry.register(WorkflowType.BACKGROUND_SWAP)
@@ -546,7 +548,10 @@ class BackgroundSwapWorkflowValidator(WorkflowValidator):
             original = self._load_image(original_images[0])
 
         result = self._validator.validate(generated, original)
+        return self._to_common(result)
 
+    def _to_common(self, result: BackgroundSwapValidationResult) -> CommonValidationResult:
+        """배경교체 검증 결과 → CommonValidationResult"""
         # Tier 결정
         if not result.passed or result.grade == "F":
             tier = QualityTier.REGENERATE
@@ -588,6 +593,18 @@ class BackgroundSwapWorkflowValidator(WorkflowValidator):
             raw_response=result.raw_response,
         )
 
+    def tournament_rubric(self) -> TournamentRubric:
+        """토너먼트 채점 루브릭 - validate와 같은 프롬프트/항목/판정"""
+        return TournamentRubric(
+            prompt=build_validation_prompt(self._validator._vfx_analysis),
+            criteria=list(self.config.weights),
+            text_fields=["perspective_reason"],
+            build_result=lambda data, raw: self._to_common(
+                BackgroundSwapValidator.result_from_data(data, raw)
+            ),
+            reference_labels={"original": "Original Image - 원본 (카메라 앵글/포즈 비교 기준)"},
+        )
+
     def get_enhancement_rules(self, failed_criteria: List[str]) -> str:
         """실패 기준에 따른 프롬프트 강화"""
         lines = []
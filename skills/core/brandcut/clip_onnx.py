@@ -0,0 +1,400 @@
+"""
+clip_onnx.py
+
+CLIPValidator용 CPU 추론 백엔드 - CLIP 비전 타워를 ONNX로 내보내고 int8 동적
+양자화한 모델을 onnxruntime으로 실행한다.
+
+GPU 없는 렌더 워커에서 torch + transformers 로드(수 초, 수백 MB)를 피하기 위한 것.
+실행 시에는 onnxruntime + numpy + Pillow만 필요하고, 내보내기(export)에만
+torch + transformers + onnx가 필요하다.
+
+- 전처리: CLIPImageProcessor와 동일 (짧은 변 224 BICUBIC → 중앙 224 크롭 →
+  /255 → OpenAI CLIP mean/std 정규화)를 numpy로 구현
+- 출력: visual_projection까지 거친 image_embeds (L2 정규화)
+- 허용 오차: torch fp32 경로 대비 A급 점수(0-100) 차이 CLIP_ONNX_SCORE_TOLERANCE점 이내,
+  임베딩 코사인 유사도 CLIP_ONNX_MIN_COSINE 이상. 벤치마크가 같은 이미지로 두 경로를
+  비교해 초과 시 실패로 표시한다. 모델 식별자가 달라(+onnx-int8) A급 임베딩 캐시는
+  백엔드별로 따로 만들어진다.
+- 실험 단계: 내보낸 모델마다 벤치마크 결과를 메타데이터(.json)에 기록하고, 허용 오차
+  이내로 기록된 모델만 사용 가능(clip_backend_available)으로 본다. 기록 없이 직접
+  지정하면 경고 후 실행한다. 다시 내보내면 기록이 지워진다.
+
+사용법:
+    # 1회 내보내기 (torch/transformers/onnx 있는 머신에서)
+    python -m core.brandcut.clip_onnx export
+
+    # 워커에서 사용
+    FNF_CLIP_BACKEND=onnx  (또는 CLIPValidator(backend="onnx"))
+
+    # torch vs onnx 비교 (시작 시간, 메모리, images/sec, 점수 차이) + 결과 기록
+    python -m core.brandcut.clip_onnx benchmark --images db/mlb_style --limit 64
+"""
+
+import json
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Union
+
+import numpy as np
+from PIL import Image
+
+try:
+    import onnxruntime as ort
+
+    ONNX_AVAILABLE = True
+except ImportError:
+    ONNX_AVAILABLE = False
+
+
+# ============================================================
+# PATHS & CONSTANTS
+# ============================================================
+DEFAULT_ONNX_PATH = Path(
+    os.environ.get("FNF_CLIP_ONNX_PATH", "db/clip_onnx/clip_vision_int8.onnx")
+)
+ONNX_MODEL_TAG = "onnx-int8"
+
+# onnxruntime intra-op 스레드 수 (0이면 onnxruntime 기본값 = 물리 코어 수)
+ONNX_THREADS = int(os.environ.get("FNF_CLIP_ONNX_THREADS", "0"))
+
+# torch fp32 경로 대비 허용 오차
+CLIP_ONNX_SCORE_TOLERANCE = 3  # A급 점수 (0-100) 절대 차이
+CLIP_ONNX_MIN_COSINE = 0.98  # 같은 이미지의 두 임베딩 간 코사인 유사도
+
+# CLIPImageProcessor (openai/clip-vit-base-patch32) 설정
+CLIP_IMAGE_SIZE = 224
+CLIP_MEAN = np.array([0.48145466, 0.4578275, 0.40821073], dtype=np.float32)
+CLIP_STD = np.array([0.26862954, 0.26130258, 0.27577711], dtype=np.float32)
+
+
+# ============================================================
+# PREPROCESSING
+# ============================================================
+def preprocess_image(image: Image.Image, size: int = CLIP_IMAGE_SIZE) -> np.ndarray:
+    """CLIPImageProcessor와 같은 전처리 → pixel_values (3, size, size) float32"""
+    if image.mode != "RGB":
+        image = image.convert("RGB")
+
+    # 짧은 변을 size로 (긴 변은 비율 유지, transformers와 같은 int 절사)
+    width, height = image.size
+    if width <= height:
+        new_width, new_height = size, int(size * height / width)
+    else:
+        new_width, new_height = int(size * width / height), size
+    image = image.resize((new_width, new_height), Image.BICUBIC)
+
+    # 중앙 크롭
+    top = (new_height - size) // 2
+    left = (new_width - size) // 2
+    image = image.crop((left, top, left + size, top + size))
+
+    pixels = np.asarray(image, dtype=np.float32) / 255.0
+    pixels = (pixels - CLIP_MEAN) / CLIP_STD
+    return np.ascontiguousarray(pixels.transpose(2, 0, 1))
+
+
+# ============================================================
+# ENCODER
+# ============================================================
+class ONNXImageEncoder:
+    """int8 ONNX CLIP 비전 인코더 (onnxruntime CPU)"""
+
+    def __init__(self, model_path: Union[str, Path] = DEFAULT_ONNX_PATH, threads: int = ONNX_THREADS):
+        if not ONNX_AVAILABLE:
+            raise ImportError("onnxruntime not available. Install with: pip install onnxruntime")
+        self.model_path = Path(model_path)
+        if not self.model_path.exists():
+            raise FileNotFoundError(
+                f"ONNX CLIP model not found: {self.model_path} "
+                "(run: python -m core.brandcut.clip_onnx export)"
+            )
+
+        options = ort.SessionOptions()
+        options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        if threads:
+            options.intra_op_num_threads = threads
+        self.session = ort.InferenceSession(
+            str(self.model_path), options, providers=["CPUExecutionProvider"]
+        )
+        self.input_name = self.session.get_inputs()[0].name
+        self.metadata = read_export_metadata(self.model_path)
+
+    def __call__(self, pixel_values: np.ndarray) -> np.ndarray:
+        """pixel_values (B, 3, H, W) → L2 정규화 임베딩 (B, D)"""
+        (embeddings,) = self.session.run(
+            None, {self.input_name: np.asarray(pixel_values, dtype=np.float32)}
+        )
+        norms = np.linalg.norm(embeddings, axis=-1, keepdims=True)
+        return embeddings / np.maximum(norms, 1e-12)
+
+
+_encoders = {}
+_encoders_lock = threading.Lock()
+
+
+def get_onnx_encoder(model_path: Union[str, Path] = DEFAULT_ONNX_PATH) -> ONNXImageEncoder:
+    """경로별 공유 ONNXImageEncoder (InferenceSession은 스레드 안전)"""
+    key = str(Path(model_path).resolve())
+    with _encoders_lock:
+        encoder = _encoders.get(key)
+        if encoder is None:
+            encoder = ONNXImageEncoder(model_path)
+            _encoders[key] = encoder
+        return encoder
+
+
+# ============================================================
+# EXPORT
+# ============================================================
+def _metadata_path(model_path: Path) -> Path:
+    return model_path.with_suffix(".json")
+
+
+def read_export_metadata(model_path: Union[str, Path]) -> dict:
+    """내보내기 메타데이터 (모델명/리비전/양자화), 없으면 빈 dict"""
+    try:
+        with open(_metadata_path(Path(model_path)), "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def _write_export_metadata(model_path: Path, metadata: dict) -> None:
+    path = _metadata_path(model_path)
+    tmp_path = path.with_suffix(f".{os.getpid()}.tmp")
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(metadata, f, indent=2)
+    os.replace(tmp_path, path)
+
+
+def record_benchmark(model_path: Union[str, Path], comparison: dict) -> None:
+    """벤치마크 비교 결과를 내보내기 메타데이터에 기록"""
+    metadata = read_export_metadata(model_path)
+    metadata["benchmark"] = dict(
+        comparison, recorded_at=time.strftime("%Y-%m-%dT%H:%M:%S%z")
+    )
+    _write_export_metadata(Path(model_path), metadata)
+
+
+def benchmark_passed(model_path: Union[str, Path] = DEFAULT_ONNX_PATH) -> bool:
+    """이 모델에 허용 오차 이내 벤치마크가 기록되어 있는지"""
+    benchmark = read_export_metadata(model_path).get("benchmark") or {}
+    return benchmark.get("within_tolerance") is True
+
+
+def export_vision_onnx(
+    model_name: str,
+    revision: str = "main",
+    output_path: Union[str, Path] = DEFAULT_ONNX_PATH,
+    quantize: bool = True,
+    opset: int = 17,
+) -> Path:
+    """
+    CLIP 비전 타워(+ visual_projection)를 ONNX로 내보내고 int8 동적 양자화
+
+    Args:
+        model_name: Hugging Face 모델명 (예: openai/clip-vit-base-patch32)
+        revision: 모델 리비전
+        output_path: 최종 ONNX 경로 (quantize=False면 fp32 그대로)
+        quantize: int8 동적 양자화 여부 (MatMul/Gemm 가중치 QInt8)
+        opset: ONNX opset
+
+    Returns:
+        저장된 ONNX 경로
+    """
+    import torch
+    from transformers import CLIPModel
+
+    output_path = Path(output_path)
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    fp32_path = output_path.with_name(output_path.stem + ".fp32.onnx")
+
+    model = CLIPModel.from_pretrained(model_name, revision=revision).eval()
+
+    class VisionEmbed(torch.nn.Module):
+        def __init__(self, clip_model):
+            super().__init__()
+            self.vision_model = clip_model.vision_model
+            self.visual_projection = clip_model.visual_projection
+
+        def forward(self, pixel_values):
+            pooled = self.vision_model(pixel_values=pixel_values).pooler_output
+            return self.visual_projection(pooled)
+
+    dummy = torch.zeros(1, 3, CLIP_IMAGE_SIZE, CLIP_IMAGE_SIZE)
+    print(f"[CLIP-ONNX] Exporting {model_name}@{revision} -> {fp32_path}")
+    torch.onnx.export(
+        VisionEmbed(model),
+        dummy,
+        str(fp32_path),
+        input_names=["pixel_values"],
+        output_names=["image_embeds"],
+        dynamic_axes={"pixel_values": {0: "batch"}, "image_embeds": {0: "batch"}},
+        opset_version=opset,
+    )
+
+    if quantize:
+        from onnxruntime.quantization import QuantType, quantize_dynamic
+
+        print(f"[CLIP-ONNX] Quantizing (int8 dynamic) -> {output_path}")
+        quantize_dynamic(str(fp32_path), str(output_path), weight_type=QuantType.QInt8)
+        fp32_path.unlink()
+    else:
+        os.replace(fp32_path, output_path)
+
+    # 새 모델이므로 이전 벤치마크 기록은 남기지 않는다
+    _write_export_metadata(
+        output_path,
+        {
+            "model_name": model_name,
+            "revision": revision,
+            "quantization": "int8-dynamic" if quantize else "fp32",
+            "opset": opset,
+        },
+    )
+    size_mb = output_path.stat().st_size / 1e6
+    print(f"[CLIP-ONNX] Saved {output_path} ({size_mb:.1f} MB)")
+    return output_path
+
+
+# ============================================================
+# BENCHMARK
+# ============================================================
+def _rss_mb() -> float:
+    """현재 프로세스 최대 RSS (MB)"""
+    import resource
+
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024.0
+
+
+def _bench_worker(backend: str, image_paths: list, batch_size: int) -> dict:
+    """단일 백엔드 측정 (깨끗한 프로세스에서 실행)"""
+    rss_before = _rss_mb()
+    started = time.perf_counter()
+
+    from core.brandcut.clip_validator import CLIPValidator
+
+    validator = CLIPValidator(backend=backend, batch_size=batch_size)
+    validator.embed_images(image_paths[:1])  # 모델 로드 + 첫 forward
+    startup = time.perf_counter() - started
+
+    started = time.perf_counter()
+    embeddings, _ = validator.embed_images(image_paths)
+    elapsed = time.perf_counter() - started
+
+    scores = validator.score_images(image_paths)
+    return {
+        "backend": backend,
+        "startup_sec": round(startup, 3),
+        "rss_mb": round(_rss_mb() - rss_before, 1),
+        "images_per_sec": round(len(image_paths) / elapsed, 2),
+        "embeddings": embeddings.tolist(),
+        "scores": [r["score"] for r in scores],
+        "grades": [r["grade"] for r in scores],
+    }
+
+
+def run_benchmark(images_dir: Union[str, Path], limit: int = 64, batch_size: int = 32) -> dict:
+    """torch vs onnx 백엔드 비교 (각각 별도 프로세스에서 측정, DEFAULT_ONNX_PATH 모델)"""
+    import subprocess
+    import sys
+
+    image_paths = []
+    for ext in ("*.jpg", "*.jpeg", "*.png", "*.webp"):
+        image_paths.extend(sorted(str(p) for p in Path(images_dir).glob(ext)))
+    image_paths = image_paths[:limit]
+    if not image_paths:
+        raise ValueError(f"No images found in {images_dir}")
+
+    results = {}
+    for backend in ("torch", "onnx"):
+        proc = subprocess.run(
+            [sys.executable, "-m", "core.brandcut.clip_onnx", "_worker", backend, str(batch_size)],
+            input=json.dumps(image_paths),
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+        results[backend] = json.loads(proc.stdout.strip().splitlines()[-1])
+
+    torch_result, onnx_result = results["torch"], results["onnx"]
+    a = np.asarray(torch_result.pop("embeddings"), dtype=np.float32)
+    b = np.asarray(onnx_result.pop("embeddings"), dtype=np.float32)
+    cosines = np.sum(a * b, axis=1)
+    score_diffs = np.abs(np.subtract(torch_result["scores"], onnx_result["scores"]))
+    grade_agreement = float(
+        np.mean(np.equal(torch_result["grades"], onnx_result["grades"]))
+    )
+
+    comparison = {
+        "images": len(image_paths),
+        "min_embedding_cosine": round(float(cosines.min()), 4),
+        "max_score_diff": int(score_diffs.max()),
+        "mean_score_diff": round(float(score_diffs.mean()), 2),
+        "grade_agreement": round(grade_agreement, 3),
+        "within_tolerance": bool(
+            score_diffs.max() <= CLIP_ONNX_SCORE_TOLERANCE
+            and cosines.min() >= CLIP_ONNX_MIN_COSINE
+        ),
+    }
+    return {"torch": torch_result, "onnx": onnx_result, "comparison": comparison}
+
+
+# ============================================================
+# CLI
+# ============================================================
+if __name__ == "__main__":
+    import argparse
+    import sys
+
+    if len(sys.argv) > 1 and sys.argv[1] == "_worker":
+        # run_benchmark가 띄우는 측정 프로세스 (stdin: 이미지 경로 JSON)
+        paths = json.loads(sys.stdin.read())
+        print(json.dumps(_bench_worker(sys.argv[2], paths, int(sys.argv[3]))))
+        sys.exit(0)
+
+    parser = argparse.ArgumentParser(description="CLIP ONNX int8 backend")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    export_parser = sub.add_parser("export", help="비전 타워 ONNX 내보내기 + int8 양자화")
+    export_parser.add_argument("--output", default=str(DEFAULT_ONNX_PATH))
+    export_parser.add_argument("--no-quantize", action="store_true")
+
+    bench_parser = sub.add_parser("benchmark", help="torch vs onnx 비교")
+    bench_parser.add_argument("--images", default="db/mlb_style")
+    bench_parser.add_argument("--limit", type=int, default=64)
+    bench_parser.add_argument("--batch-size", type=int, default=32)
+
+    args = parser.parse_args()
+
+    if args.command == "export":
+        from core.brandcut.clip_validator import CLIP_MODEL_NAME, CLIP_MODEL_REVISION
+
+        export_vision_onnx(
+            CLIP_MODEL_NAME,
+            CLIP_MODEL_REVISION,
+            output_path=args.output,
+            quantize=not args.no_quantize,
+        )
+    else:
+        report = run_benchmark(args.images, limit=args.limit, batch_size=args.batch_size)
+        print("\n[CLIP-ONNX] Benchmark")
+        print("=" * 60)
+        for backend in ("torch", "onnx"):
+            r = report[backend]
+            print(
+                f"  {backend:5s}  startup {r['startup_sec']:6.2f}s  "
+                f"RSS +{r['rss_mb']:7.1f} MB  {r['images_per_sec']:7.2f} img/s"
+            )
+        c = report["comparison"]
+        print(
+            f"\n  images={c['images']}  min cosine={c['min_embedding_cosine']}  "
+            f"max score diff={c['max_score_diff']} (tolerance {CLIP_ONNX_SCORE_TOLERANCE})  "
+            f"grade agreement={c['grade_agreement']:.1%}"
+        )
+        print(f"  within tolerance: {c['within_tolerance']}")
+        record_benchmark(DEFAULT_ONNX_PATH, c)
+        print(f"  recorded in {_metadata_path(DEFAULT_ONNX_PATH)}")
+        sys.exit(0 if c["within_tolerance"] else 1)
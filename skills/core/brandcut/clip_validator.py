@@ -10,11 +10,22 @@ Usage:
     validator = get_clip_validator()
     score = validator.score_image(generated_image)
     # score: 0-100 (100에 가까울수록 A급 유사)
+
+    # 여러 장은 배치로 (디코드/전처리 스레드 풀 + 배치 forward + 유사도 행렬곱 1회)
+    results = validator.score_images(images)
+
+    # GPU 없는 워커: int8 ONNX 백엔드 (torch 없이 onnxruntime만, clip_onnx.py 참고)
+    # 실험 단계 - 허용 오차 이내 벤치마크가 기록된 모델만 사용 가능으로 본다
+    validator = CLIPValidator(backend="onnx")   # 또는 FNF_CLIP_BACKEND=onnx
 """
 
+import hashlib
+import os
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 import numpy as np
 from pathlib import Path
-from typing import List, Optional, Tuple, Union
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple, Union
 from PIL import Image
 import warnings
 
@@ -26,7 +37,21 @@ try:
     CLIP_AVAILABLE = True
 except ImportError:
     CLIP_AVAILABLE = False
-    warnings.warn("CLIP not available. Install with: pip install torch transformers")
+
+from .clip_onnx import (
+    DEFAULT_ONNX_PATH,
+    ONNX_AVAILABLE,
+    ONNX_MODEL_TAG,
+    benchmark_passed,
+    get_onnx_encoder,
+    preprocess_image,
+)
+
+if not CLIP_AVAILABLE and not ONNX_AVAILABLE:
+    warnings.warn(
+        "CLIP not available. Install with: pip install torch transformers "
+        "(or onnxruntime for the ONNX backend)"
+    )
 
 
 # ============================================================
@@ -35,6 +60,20 @@ except ImportError:
 DEFAULT_A_GRADE_DIR = Path("db/mlb_style")
 DEFAULT_CACHE_PATH = Path("db/clip_a_grade_embeddings.npz")
 CLIP_MODEL_NAME = "openai/clip-vit-base-patch32"
+CLIP_MODEL_REVISION = os.environ.get("FNF_CLIP_MODEL_REVISION", "main")
+
+# 임베딩 캐시 포맷 버전 (전처리/정규화 방식이 바뀌면 올림 → 전체 재임베딩)
+EMBEDDING_CACHE_VERSION = 2
+
+A_GRADE_EXTENSIONS = ("*.jpg", "*.jpeg", "*.png", "*.webp")
+
+# 추론 백엔드: "torch" (fp32, GPU 가능) | "onnx" (int8, CPU 전용)
+CLIP_BACKENDS = ("torch", "onnx")
+DEFAULT_BACKEND = os.environ.get("FNF_CLIP_BACKEND", "torch")
+
+# 배치 forward 크기 / 디코드+전처리 스레드 수
+DEFAULT_BATCH_SIZE = int(os.environ.get("FNF_CLIP_BATCH_SIZE", "32"))
+DEFAULT_DECODE_WORKERS = int(os.environ.get("FNF_CLIP_DECODE_WORKERS", "4"))
 
 # A급 유사도 기준
 A_GRADE_THRESHOLD = 0.75  # 코사인 유사도 0.75 이상이면 A급 수준
@@ -42,6 +81,30 @@ B_GRADE_THRESHOLD = 0.65  # 0.65~0.75는 B급
 # 0.65 미만은 C급
 
 
+def default_cache_path(backend: str = DEFAULT_BACKEND) -> Path:
+    """백엔드별 A급 임베딩 캐시 경로 (모델 식별자가 달라 캐시를 공유하지 않음)"""
+    if backend == "onnx":
+        return DEFAULT_CACHE_PATH.with_name(
+            f"{DEFAULT_CACHE_PATH.stem}.{ONNX_MODEL_TAG}{DEFAULT_CACHE_PATH.suffix}"
+        )
+    return DEFAULT_CACHE_PATH
+
+
+def clip_backend_available(backend: str = DEFAULT_BACKEND) -> bool:
+    """백엔드 실행 가능 여부 (onnx는 런타임 + 내보낸 모델 + 통과한 벤치마크 기록 필요)"""
+    if backend == "onnx":
+        return ONNX_AVAILABLE and DEFAULT_ONNX_PATH.exists() and benchmark_passed(DEFAULT_ONNX_PATH)
+    return CLIP_AVAILABLE
+
+
+def _file_sha1(path: Path) -> str:
+    digest = hashlib.sha1()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
 # ============================================================
 # CLIP VALIDATOR CLASS
 # ============================================================
@@ -51,34 +114,63 @@ class CLIPValidator:
     def __init__(
         self,
         a_grade_dir: Union[str, Path] = DEFAULT_A_GRADE_DIR,
-        cache_path: Union[str, Path] = DEFAULT_CACHE_PATH,
+        cache_path: Optional[Union[str, Path]] = None,
         device: Optional[str] = None,
+        batch_size: int = DEFAULT_BATCH_SIZE,
+        decode_workers: int = DEFAULT_DECODE_WORKERS,
+        backend: Optional[str] = None,
+        onnx_path: Union[str, Path] = DEFAULT_ONNX_PATH,
     ):
         """
         Args:
             a_grade_dir: A급 이미지 폴더 경로
-            cache_path: 임베딩 캐시 파일 경로
-            device: 'cuda' or 'cpu' (None이면 자동 선택)
+            cache_path: 임베딩 캐시 파일 경로 (None이면 백엔드별 기본 경로)
+            device: 'cuda' or 'cpu' (None이면 자동 선택, onnx는 항상 cpu)
+            batch_size: 배치 forward 크기
+            decode_workers: 이미지 디코드/전처리 스레드 수
+            backend: 'torch' or 'onnx' (None이면 FNF_CLIP_BACKEND)
+            onnx_path: int8 ONNX 모델 경로 (onnx 백엔드)
         """
-        self.a_grade_dir = Path(a_grade_dir)
-        self.cache_path = Path(cache_path)
-
-        if not CLIP_AVAILABLE:
-            raise ImportError(
-                "CLIP not available. Install with: pip install torch transformers"
-            )
+        self.backend = backend or DEFAULT_BACKEND
+        if self.backend not in CLIP_BACKENDS:
+            raise ValueError(f"Unknown CLIP backend: {self.backend} (use {CLIP_BACKENDS})")
 
-        # Device 설정
-        if device is None:
-            self.device = "cuda" if torch.cuda.is_available() else "cpu"
+        self.a_grade_dir = Path(a_grade_dir)
+        self.cache_path = Path(cache_path) if cache_path else default_cache_path(self.backend)
+        self.onnx_path = Path(onnx_path)
+        self.batch_size = max(1, batch_size)
+        self.decode_workers = max(1, decode_workers)
+
+        if self.backend == "onnx":
+            if not ONNX_AVAILABLE:
+                raise ImportError(
+                    "onnxruntime not available. Install with: pip install onnxruntime"
+                )
+            if not benchmark_passed(self.onnx_path):
+                warnings.warn(
+                    f"ONNX CLIP backend is experimental: no passing torch-vs-onnx benchmark "
+                    f"recorded for {self.onnx_path} "
+                    "(run: python -m core.brandcut.clip_onnx benchmark)"
+                )
+            self.device = "cpu"
         else:
-            self.device = device
+            if not CLIP_AVAILABLE:
+                raise ImportError(
+                    "CLIP not available. Install with: pip install torch transformers"
+                )
+
+            # Device 설정
+            if device is None:
+                self.device = "cuda" if torch.cuda.is_available() else "cpu"
+            else:
+                self.device = device
 
-        print(f"[CLIP] Using device: {self.device}")
+        print(f"[CLIP] Using backend: {self.backend} ({self.device})")
 
         # 모델 로드
         self._model = None
         self._processor = None
+        self._encoder = None
         self._a_grade_embeddings = None
         self._a_grade_paths = None
 
@@ -87,7 +179,9 @@ class CLIPValidator:
         """Lazy load CLIP model"""
         if self._model is None:
             print(f"[CLIP] Loading model: {CLIP_MODEL_NAME}")
-            self._model = CLIPModel.from_pretrained(CLIP_MODEL_NAME).to(self.device)
+            self._model = CLIPModel.from_pretrained(
+                CLIP_MODEL_NAME, revision=CLIP_MODEL_REVISION
+            ).to(self.device)
             self._model.eval()
         return self._model
 
@@ -95,82 +189,310 @@ class CLIPValidator:
     def processor(self):
         """Lazy load CLIP processor"""
         if self._processor is None:
-            self._processor = CLIPProcessor.from_pretrained(CLIP_MODEL_NAME)
+            self._processor = CLIPProcessor.from_pretrained(
+                CLIP_MODEL_NAME, revision=CLIP_MODEL_REVISION
+            )
         return self._processor
 
+    @property
+    def encoder(self):
+        """Lazy load int8 ONNX encoder (없으면 torch가 있을 때만 내보내기)"""
+        if self._encoder is None:
+            if not self.onnx_path.exists() and CLIP_AVAILABLE:
+                from .clip_onnx import export_vision_onnx
+
+                export_vision_onnx(CLIP_MODEL_NAME, CLIP_MODEL_REVISION, self.onnx_path)
+            print(f"[CLIP] Loading ONNX model: {self.onnx_path}")
+            self._encoder = get_onnx_encoder(self.onnx_path)
+        return self._encoder
+
+    @property
+    def model_id(self) -> str:
+        """임베딩을 만든 모델 식별자 (캐시 무효화 기준)"""
+        model_id = f"{CLIP_MODEL_NAME}@{CLIP_MODEL_REVISION}"
+        if self.backend == "onnx":
+            model_id += f"+{ONNX_MODEL_TAG}"
+        return model_id
+
+    def _load_backend(self) -> None:
+        """모델/프로세서 로드 (디코드 스레드 시작 전에 호출)"""
+        if self.backend == "onnx":
+            self.encoder
+        else:
+            self.model
+            self.processor
+
+    def _load_cache(self) -> Optional[Dict[str, Any]]:
+        """임베딩 캐시 로드 → {path: {"embedding", "size", "mtime_ns", "sha1"}} (없으면 None)
+
+        모델/캐시 버전이 다르면 None (전체 재임베딩). manifest가 없는 기존 캐시는
+        캐시 저장 이후 수정되지 않은 파일만 재사용하고 해시는 이번 동기화에서 기록한다.
+        """
+        if not self.cache_path.exists():
+            return None
+        try:
+            data = np.load(self.cache_path, allow_pickle=False)
+            if "model_id" not in data.files:
+                return self._load_legacy_cache()
+            if (
+                str(data["model_id"]) != self.model_id
+                or int(data["version"]) != EMBEDDING_CACHE_VERSION
+            ):
+                print(f"[CLIP] Cache built with {data['model_id']} - rebuilding")
+                return None
+            return {
+                str(path): {
+                    "embedding": emb,
+                    "size": int(size),
+                    "mtime_ns": int(mtime),
+                    "sha1": str(digest),
+                }
+                for path, emb, size, mtime, digest in zip(
+                    data["paths"], data["embeddings"], data["sizes"], data["mtimes"], data["hashes"]
+                )
+            }
+        except Exception as e:
+            print(f"[CLIP] Cache load failed: {e}, rebuilding...")
+            return None
+
+    def _load_legacy_cache(self) -> Optional[Dict[str, Any]]:
+        """manifest 없는 기존 캐시 (paths가 object 배열 - 직접 만든 로컬 파일만 대상)
+
+        크기/해시가 없으므로 캐시 파일 mtime을 기준 시각(cached_at_ns)으로 남겨,
+        그 이후 수정된 이미지는 재임베딩한다.
+        """
+        try:
+            cached_at_ns = self.cache_path.stat().st_mtime_ns
+            data = np.load(self.cache_path, allow_pickle=True)
+            print("[CLIP] Legacy cache without manifest - adopting unmodified entries")
+            return {
+                str(path): {
+                    "embedding": emb,
+                    "size": -1,
+                    "mtime_ns": -1,
+                    "sha1": "",
+                    "cached_at_ns": cached_at_ns,
+                }
+                for path, emb in zip(data["paths"], data["embeddings"])
+            }
+        except Exception as e:
+            print(f"[CLIP] Cache load failed: {e}, rebuilding...")
+            return None
+
+    def _save_cache(self, entries: Dict[str, Dict[str, Any]], paths: List[str]) -> None:
+        """임베딩 + manifest 저장 (임시 파일 → os.replace)"""
+        self.cache_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.cache_path.with_name(
+            f"{self.cache_path.stem}.{os.getpid()}.tmp.npz"
+        )
+        np.savez_compressed(
+            tmp_path,
+            embeddings=np.vstack([entries[p]["embedding"] for p in paths]),
+            paths=np.array(paths, dtype=str),
+            sizes=np.array([entries[p]["size"] for p in paths], dtype=np.int64),
+            mtimes=np.array([entries[p]["mtime_ns"] for p in paths], dtype=np.int64),
+            hashes=np.array([entries[p]["sha1"] for p in paths], dtype=str),
+            model_id=np.array(self.model_id),
+            version=np.array(EMBEDDING_CACHE_VERSION),
+        )
+        os.replace(tmp_path, self.cache_path)
+        print(f"[CLIP] Saved cache: {self.cache_path}")
+
     def _load_or_build_embeddings(self) -> Tuple[np.ndarray, List[str]]:
-        """A급 이미지 임베딩 로드 또는 빌드"""
-        # 캐시 확인
-        if self.cache_path.exists():
-            try:
-                data = np.load(self.cache_path, allow_pickle=True)
-                embeddings = data["embeddings"]
-                paths = list(data["paths"])
-                print(f"[CLIP] Loaded {len(paths)} A-grade embeddings from cache")
-                return embeddings, paths
-            except Exception as e:
-                print(f"[CLIP] Cache load failed: {e}, rebuilding...")
-
-        # 임베딩 빌드
-        return self._build_embeddings()
+        """A급 이미지 임베딩 로드 + 폴더와 동기화
+
+        - 크기/mtime이 같으면 캐시 그대로 사용 (해시 계산 없음)
+        - 크기/mtime이 바뀐 파일은 내용 해시가 같으면 재사용, 다르면 재임베딩
+        - manifest 없는 기존 캐시 항목은 캐시 저장 이후 수정되지 않았을 때만 재사용
+        - 새 파일만 임베딩, 사라진 파일은 제외
+        - 모델/캐시 버전이 바뀌면 전체 재임베딩
+        """
+        cached = self._load_cache() or {}
 
-    def _build_embeddings(self) -> Tuple[np.ndarray, List[str]]:
-        """A급 이미지 임베딩 빌드"""
         if not self.a_grade_dir.exists():
+            if cached:
+                print(f"[CLIP] A-grade directory missing - using {len(cached)} cached embeddings")
+                paths = list(cached)
+                return np.vstack([cached[p]["embedding"] for p in paths]), paths
             raise FileNotFoundError(f"A-grade directory not found: {self.a_grade_dir}")
 
+        return self._sync_embeddings(cached)
+
+    def _build_embeddings(self) -> Tuple[np.ndarray, List[str]]:
+        """A급 이미지 임베딩 전체 빌드 (캐시 무시)"""
+        return self._sync_embeddings({})
+
+    def _sync_embeddings(self, cached: Dict[str, Dict[str, Any]]) -> Tuple[np.ndarray, List[str]]:
+        """폴더 스캔 → 새/변경 파일만 임베딩 → 캐시 갱신"""
         # 이미지 파일 수집
         image_files = []
-        for ext in ["*.jpg", "*.jpeg", "*.png", "*.webp"]:
+        for ext in A_GRADE_EXTENSIONS:
             image_files.extend(self.a_grade_dir.glob(ext))
+        image_files = sorted(set(image_files))
 
         if not image_files:
             raise ValueError(f"No images found in {self.a_grade_dir}")
 
-        print(f"[CLIP] Building embeddings for {len(image_files)} A-grade images...")
-
-        embeddings = []
-        paths = []
-
-        with torch.no_grad():
-            for i, img_path in enumerate(image_files):
-                try:
-                    img = Image.open(img_path).convert("RGB")
-                    embedding = self._embed_image(img)
-                    embeddings.append(embedding)
-                    paths.append(str(img_path))
-
-                    if (i + 1) % 20 == 0:
-                        print(f"  Processed {i + 1}/{len(image_files)}...")
-
-                except Exception as e:
-                    print(f"  [WARN] Failed to process {img_path.name}: {e}")
-
-        embeddings = np.vstack(embeddings)
-        print(f"[CLIP] Built {len(embeddings)} embeddings (shape: {embeddings.shape})")
-
-        # 캐시 저장
-        self.cache_path.parent.mkdir(parents=True, exist_ok=True)
-        np.savez_compressed(
-            self.cache_path,
-            embeddings=embeddings,
-            paths=np.array(paths, dtype=object),
-        )
-        print(f"[CLIP] Saved cache: {self.cache_path}")
+        entries: Dict[str, Dict[str, Any]] = {}
+        to_embed: List[Path] = []
+        changed = False
+        for img_path in image_files:
+            path = str(img_path)
+            stat = img_path.stat()
+            entry = cached.get(path)
+            if entry and entry["size"] == stat.st_size and entry["mtime_ns"] == stat.st_mtime_ns:
+                entries[path] = entry
+                continue
+
+            digest = _file_sha1(img_path)
+            if entry and entry["sha1"]:
+                reusable = entry["sha1"] == digest
+            else:
+                # manifest 없는 기존 캐시: 캐시 저장 이후 수정되지 않은 파일만 신뢰
+                reusable = bool(entry) and stat.st_mtime_ns <= entry.get("cached_at_ns", -1)
+            if reusable:
+                # 내용 동일 → 임베딩 재사용, manifest만 갱신
+                entries[path] = {
+                    "embedding": entry["embedding"],
+                    "size": stat.st_size,
+                    "mtime_ns": stat.st_mtime_ns,
+                    "sha1": digest,
+                }
+            else:
+                entries[path] = {"size": stat.st_size, "mtime_ns": stat.st_mtime_ns, "sha1": digest}
+                to_embed.append(img_path)
+            changed = True
+
+        removed = len(set(cached) - set(entries))
+        changed = changed or removed > 0
+
+        if to_embed:
+            print(f"[CLIP] Embedding {len(to_embed)} new/changed A-grade images...")
+            embeddings, kept = self.embed_images(to_embed, skip_errors=True)
+            kept_paths = set()
+            for row, index in enumerate(kept):
+                path = str(to_embed[index])
+                entries[path]["embedding"] = embeddings[row]
+                kept_paths.add(path)
+            for img_path in to_embed:
+                if str(img_path) not in kept_paths:
+                    entries.pop(str(img_path))
+
+        if not entries:
+            raise ValueError(f"No embeddable images in {self.a_grade_dir}")
+
+        paths = list(entries)
+        if changed:
+            print(
+                f"[CLIP] Synced embeddings: {len(paths)} total, "
+                f"{len(to_embed)} embedded, {removed} removed"
+            )
+            self._save_cache(entries, paths)
+        else:
+            print(f"[CLIP] Loaded {len(paths)} A-grade embeddings from cache")
 
-        return embeddings, paths
+        return np.vstack([entries[p]["embedding"] for p in paths]), paths
 
     def _embed_image(self, image: Image.Image) -> np.ndarray:
         """단일 이미지 임베딩"""
-        inputs = self.processor(images=image, return_tensors="pt").to(self.device)
+        return self._forward([self._preprocess(image)])
 
+    def _preprocess(self, image: Union[Image.Image, str, Path]) -> Any:
+        """이미지 로드 + CLIP 전처리 → pixel_values (3, H, W) (스레드 풀에서 실행)"""
+        if isinstance(image, (str, Path)):
+            with Image.open(image) as img:
+                image = img.convert("RGB")
+        elif image.mode != "RGB":
+            image = image.convert("RGB")
+        if self.backend == "onnx":
+            return preprocess_image(image)
+        return self.processor(images=image, return_tensors="pt")["pixel_values"][0]
+
+    def _forward(self, pixel_values: List[Any]) -> np.ndarray:
+        """전처리된 배치 forward → L2 정규화 임베딩 (B, D)"""
+        if self.backend == "onnx":
+            return self.encoder(np.stack(pixel_values))
+        batch = torch.stack(pixel_values).to(self.device)
         with torch.no_grad():
-            features = self.model.get_image_features(**inputs)
+            features = self.model.get_image_features(pixel_values=batch)
             # L2 정규화
             features = features / features.norm(dim=-1, keepdim=True)
-
         return features.cpu().numpy()
 
+    def _iter_batches(
+        self,
+        images: Sequence[Union[Image.Image, str, Path]],
+        skip_errors: bool = False,
+    ) -> Iterator[Tuple[List[int], List[Any]]]:
+        """디코드/전처리를 스레드 풀에서 앞서 돌리며 (인덱스, pixel_values) 배치 생성
+
+        미리 처리하는 이미지는 배치 2개 분량으로 제한 (대형 배치의 메모리 상한).
+        """
+        # 모델/프로세서는 스레드 시작 전에 로드
+        self._load_backend()
+
+        window = self.batch_size * 2
+        with ThreadPoolExecutor(
+            max_workers=self.decode_workers, thread_name_prefix="clip-decode"
+        ) as pool:
+            pending: deque = deque()
+            next_index = 0
+            indices: List[int] = []
+            batch: List[Any] = []
+
+            while pending or next_index < len(images):
+                while next_index < len(images) and len(pending) < window:
+                    pending.append(
+                        (next_index, pool.submit(self._preprocess, images[next_index]))
+                    )
+                    next_index += 1
+
+                index, future = pending.popleft()
+                try:
+                    pixel_values = future.result()
+                except Exception as e:
+                    if not skip_errors:
+                        raise
+                    name = Path(images[index]).name if isinstance(images[index], (str, Path)) else index
+                    print(f"  [WARN] Failed to process {name}: {e}")
+                    continue
+
+                indices.append(index)
+                batch.append(pixel_values)
+                if len(batch) == self.batch_size:
+                    yield indices, batch
+                    indices, batch = [], []
+
+            if batch:
+                yield indices, batch
+
+    def embed_images(
+        self,
+        images: Sequence[Union[Image.Image, str, Path]],
+        skip_errors: bool = False,
+    ) -> Tuple[np.ndarray, List[int]]:
+        """
+        여러 이미지 배치 임베딩
+
+        Args:
+            images: PIL Image 또는 이미지 경로 리스트
+            skip_errors: True면 로드/전처리 실패 이미지를 건너뜀 (False면 예외 전파)
+
+        Returns:
+            (L2 정규화 임베딩 (M, D), 임베딩된 입력 인덱스 리스트)
+        """
+        embeddings = []
+        kept: List[int] = []
+        for indices, batch in self._iter_batches(images, skip_errors=skip_errors):
+            embeddings.append(self._forward(batch))
+            kept.extend(indices)
+            if len(images) > self.batch_size:
+                print(f"  Processed {len(kept)}/{len(images)}...")
+
+        if not embeddings:
+            return np.zeros((0, 0), dtype=np.float32), kept
+        return np.vstack(embeddings), kept
+
     def _ensure_embeddings(self):
         """임베딩이 로드되었는지 확인"""
         if self._a_grade_embeddings is None:
@@ -199,20 +521,39 @@ class CLIPValidator:
                 "recommendation": str
             }
         """
-        self._ensure_embeddings()
+        return self.score_images([image], top_k=top_k)[0]
 
-        # 이미지 로드
-        if isinstance(image, (str, Path)):
-            image = Image.open(image).convert("RGB")
+    def score_images(
+        self,
+        images: Sequence[Union[Image.Image, str, Path]],
+        top_k: int = 5,
+    ) -> List[dict]:
+        """
+        여러 이미지의 A급 유사도 점수 (배치 임베딩 + 유사도 행렬곱 1회)
+
+        Args:
+            images: PIL Image 또는 이미지 경로 리스트
+            top_k: 이미지별 가장 유사한 상위 k개
+
+        Returns:
+            이미지 순서대로 score_image와 같은 형식의 dict 리스트
+        """
+        if not images:
+            return []
+        self._ensure_embeddings()
 
-        # 임베딩
-        query_embedding = self._embed_image(image)
+        query_embeddings, _ = self.embed_images(images)
 
-        # 코사인 유사도 계산
-        similarities = np.dot(self._a_grade_embeddings, query_embedding.T).flatten()
+        # 코사인 유사도 (M, N)
+        similarities = query_embeddings @ self._a_grade_embeddings.T
+        return [self._score_from_similarities(row, top_k) for row in similarities]
 
+    def _score_from_similarities(self, similarities: np.ndarray, top_k: int) -> dict:
+        """A급 DB 유사도 벡터 (N,) → 점수 dict"""
         # 상위 k개
-        top_indices = np.argsort(similarities)[-top_k:][::-1]
+        k = min(top_k, len(similarities))
+        top_indices = np.argpartition(-similarities, k - 1)[:k]
+        top_indices = top_indices[np.argsort(-similarities[top_indices], kind="stable")]
         top_matches = [
             (self._a_grade_paths[i], float(similarities[i])) for i in top_indices
         ]
@@ -269,11 +610,9 @@ class CLIPValidator:
         if labels is None:
             labels = [f"image_{i}" for i in range(len(images))]
 
-        results = []
-        for img, label in zip(images, labels):
-            result = self.score_image(img)
+        results = self.score_images(images)
+        for result, label in zip(results, labels):
             result["label"] = label
-            results.append(result)
 
         # 정렬
         scores = [r["score"] for r in results]
@@ -28,22 +28,16 @@ Usage:
 import time
 from io import BytesIO
 from PIL import Image
-from google import genai
 from google.genai import types
 
 from core.config import IMAGE_MODEL
+from core.api import get_client
+from core.utils import encode_image_part
 
 
 def pil_to_part(img: Image.Image, max_size: int = 1200) -> types.Part:
     """PIL Image를 Gemini Part로 변환"""
-    if max(img.size) > max_size:
-        img = img.copy()
-        img.thumbnail((max_size, max_size), Image.LANCZOS)
-    buffer = BytesIO()
-    img.save(buffer, format="PNG")
-    return types.Part(
-        inline_data=types.Blob(mime_type="image/png", data=buffer.getvalue())
-    )
+    return encode_image_part(img, max_size=max_size)
 
 
 def build_edit_prompt(
@@ -129,7 +123,7 @@ def edit_brandcut(
     Returns:
         편집된 이미지 또는 None
     """
-    client = genai.Client(api_key=api_key)
+    client = get_client(api_key)
 
     parts = []
 
@@ -224,7 +218,7 @@ def edit_with_validation(
     best_image = None
     best_score = 0
 
-    client = genai.Client(api_key=api_key)
+    client = get_client(api_key)
     validator = BrandcutValidator(client)
 
     for attempt in range(max_retries + 1):
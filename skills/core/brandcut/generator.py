@@ -6,30 +6,23 @@
 """
 
 import json
-import time
 from io import BytesIO
 from typing import Optional, List, Union
 from pathlib import Path
 
 from PIL import Image
-from google import genai
 from google.genai import types
 
 from core.config import IMAGE_MODEL
+from core.api import get_client
+from core.utils import encode_image_part
+from core.payload import PayloadBuilder
+from core.retry_policy import get_retry_policy
 
 
 def pil_to_part(img: Image.Image, max_size: int = 1024) -> types.Part:
     """PIL Image를 Gemini Part로 변환"""
-    if max(img.size) > max_size:
-        img = img.copy()
-        img.thumbnail((max_size, max_size), Image.LANCZOS)
-
-    buffer = BytesIO()
-    img.save(buffer, format="PNG")
-
-    return types.Part(
-        inline_data=types.Blob(mime_type="image/png", data=buffer.getvalue())
-    )
+    return encode_image_part(img, max_size=max_size)
 
 
 def generate_brandcut(
@@ -103,14 +96,7 @@ def generate_brandcut(
         )
 
     # 단일 모드
-    # API 키 처리
-    if api_key is None:
-        from core.api import _get_next_api_key
-
-        api_key = _get_next_api_key()
-
-    # 클라이언트 생성
-    client = genai.Client(api_key=api_key)
+    # API 키: None이면 재시도 정책이 스케줄러에서 선택
 
     # 프롬프트 텍스트 (한국어 레이어 우선)
     if "_korean_prompt" in prompt_json:
@@ -129,7 +115,7 @@ def generate_brandcut(
     # 4. 얼굴 이미지
     # 5. 착장 이미지
 
-    parts = []
+    parts = PayloadBuilder()
 
     # ============================================================
     # 1. 포즈 레퍼런스 (최우선 - 맨 앞에 배치!)
@@ -174,7 +160,7 @@ YOU MUST MATCH EXACTLY:
 NOW STUDY THIS REFERENCE IMAGE:"""
             )
         )
-        parts.append(pil_to_part(pose_reference))
+        parts.add_image(pose_reference, role="pose")
         parts.append(
             types.Part(
                 text="""
@@ -249,7 +235,7 @@ FROM THIS REFERENCE IMAGE, YOU MUST COPY:
 NOW STUDY THIS EXPRESSION REFERENCE:"""
             )
         )
-        parts.append(pil_to_part(expression_reference))
+        parts.add_image(expression_reference, role="expression")
         parts.append(
             types.Part(
                 text="""
@@ -295,7 +281,7 @@ MATCH the premium street vibe and fashion magazine aesthetic.
 Capture the languid chic energy - confident but unbothered."""
             )
         )
-        parts.append(pil_to_part(style_reference))
+        parts.add_image(style_reference, role="style")
 
     # 포즈/촬영/표정 정보를 별도로 강조 (JSON에서 추출)
     pose_info = prompt_json.get("포즈", {})
@@ -437,7 +423,7 @@ FACE IDENTITY FAILURE = AUTOMATIC REJECTION
 """
             )
         )
-        parts.append(pil_to_part(img))
+        parts.add_image(img, role="face")
 
     # ============================================================
     # 착장 이미지 전체 전송 - 아이템별 상세 지시 포함
@@ -513,57 +499,39 @@ NOW STUDY EACH OUTFIT IMAGE BELOW AND COPY EVERY DETAIL:
                 text=f"[OUTFIT REFERENCE {i+1}] - Copy every detail from this image:"
             )
         )
-        parts.append(pil_to_part(img))
-
-    # 최대 3회 재시도 (API 에러용)
-    max_retries = 3
-    for attempt in range(max_retries):
-        try:
-            response = client.models.generate_content(
-                model=IMAGE_MODEL,
-                contents=[types.Content(role="user", parts=parts)],
-                config=types.GenerateContentConfig(
-                    temperature=temperature,
-                    response_modalities=["IMAGE", "TEXT"],
-                    image_config=types.ImageConfig(
-                        aspect_ratio=aspect_ratio, image_size=resolution
-                    ),
+        parts.add_image(img, role="outfit")
+
+    # 역할별 인코딩 (요청 바이트 예산 적용) - 재시도 간 재사용
+    request_parts = parts.build()
+
+    def _request(key: str):
+        return get_client(key).models.generate_content(
+            model=IMAGE_MODEL,
+            contents=[types.Content(role="user", parts=request_parts)],
+            config=types.GenerateContentConfig(
+                temperature=temperature,
+                response_modalities=["IMAGE", "TEXT"],
+                image_config=types.ImageConfig(
+                    aspect_ratio=aspect_ratio, image_size=resolution
                 ),
-            )
-
-            # 이미지 추출
-            for part in response.candidates[0].content.parts:
-                if part.inline_data:
-                    return Image.open(BytesIO(part.inline_data.data))
-
-            print("[Generator] No image in response")
-            return None
-
-        except Exception as e:
-            error_str = str(e).lower()
-
-            # 재시도 가능 에러 판별
-            is_retryable = (
-                "429" in error_str
-                or "rate" in error_str
-                or "503" in error_str
-                or "overload" in error_str
-                or "timeout" in error_str
-            )
+            ),
+        )
 
-            if not is_retryable:
-                print(f"[Generator] Error: {e}")
-                return None
+    # API 에러 재시도 (429 키 교체, 서버 힌트 기반 백오프)
+    try:
+        response = get_retry_policy().call(
+            _request, api_key=api_key, action="Generator", max_attempts=3
+        )
+    except Exception as e:
+        print(f"[Generator] Error: {e}")
+        return None
 
-            if attempt < max_retries - 1:
-                wait_time = (attempt + 1) * 5
-                print(
-                    f"[Generator] Retry {attempt + 1}/{max_retries} - waiting {wait_time}s"
-                )
-                time.sleep(wait_time)
-            else:
-                print(f"[Generator] Max retries exceeded: {e}")
+    # 이미지 추출
+    for part in response.candidates[0].content.parts:
+        if part.inline_data:
+            return Image.open(BytesIO(part.inline_data.data))
 
+    print("[Generator] No image in response")
     return None
 
 
@@ -618,10 +586,6 @@ def _generate_batch(
         else:
             print(f"[Generator] {i + 1}/{num_images} FAILED")
 
-        # Rate limit 방지 (마지막 제외)
-        if i < num_images - 1:
-            time.sleep(1)
-
     success = sum(1 for img in images if img is not None)
     print(f"[Generator] Batch complete: {success}/{num_images} success")
 
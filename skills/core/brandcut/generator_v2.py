@@ -14,24 +14,16 @@ from typing import Optional, List, Union
 from pathlib import Path
 
 from PIL import Image
-from google import genai
 from google.genai import types
 
 from core.config import IMAGE_MODEL
+from core.api import get_client
+from core.utils import encode_image_part
 
 
 def pil_to_part(img: Image.Image, max_size: int = 1024) -> types.Part:
     """PIL Image를 Gemini Part로 변환"""
-    if max(img.size) > max_size:
-        img = img.copy()
-        img.thumbnail((max_size, max_size), Image.LANCZOS)
-
-    buffer = BytesIO()
-    img.save(buffer, format="PNG")
-
-    return types.Part(
-        inline_data=types.Blob(mime_type="image/png", data=buffer.getvalue())
-    )
+    return encode_image_part(img, max_size=max_size)
 
 
 def generate_brandcut(
@@ -93,7 +85,7 @@ def generate_brandcut(
         api_key = _get_next_api_key()
 
     # 클라이언트 생성
-    client = genai.Client(api_key=api_key)
+    client = get_client(api_key)
 
     # ============================================================
     # 프롬프트 텍스트 (korean_prompt 우선)
@@ -15,13 +15,16 @@ from typing import Optional, List, Union, Tuple, TYPE_CHECKING
 from enum import Enum
 from pathlib import Path
 import json
-from io import BytesIO
 
 from PIL import Image
 from google import genai
 from google.genai import types
 
-from core.config import VISION_MODEL, IMAGE_MODEL
+from core.config import IMAGE_MODEL
+from core.structured import generate_json, schema_from_dataclass
+from core.telemetry import STEP_GATE, telemetry_context
+from core.utils import encode_image_part
+from core.validators.base import run_with_gate
 
 if TYPE_CHECKING:
     from core.outfit_analyzer import OutfitAnalysis
@@ -503,6 +506,44 @@ ENHANCEMENT_RULES = {
 }
 
 
+# 12개 채점 기준 (VLM 응답 키)
+SCORE_KEYS = [
+    "photorealism",
+    "anatomy",
+    "micro_detail",
+    "face_identity",
+    "expression",
+    "body_type",
+    "outfit_accuracy",
+    "brand_compliance",
+    "environmental_integration",
+    "lighting_mood",
+    "composition",
+    "pose_quality",
+]
+
+# VLM 채점 응답 스키마 (JSON 모드 제약 + 파싱 검증)
+VALIDATION_RESPONSE_SCHEMA = schema_from_dataclass(
+    ValidationResult,
+    fields=[*SCORE_KEYS, "issues", "strengths", "summary_kr"],
+    scored=SCORE_KEYS,
+)
+VALIDATION_RESPONSE_SCHEMA["properties"]["outfit_accuracy"]["properties"].update(
+    missing_items={"type": "array", "items": {"type": "string"}},
+    mismatched_attributes={"type": "object"},
+)
+
+# 합성티 게이트 응답 스키마
+GATE_RESPONSE_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "passed": {"type": "boolean"},
+        "failed_reasons": {"type": "array", "items": {"type": "string"}},
+    },
+    "required": ["passed", "failed_reasons"],
+}
+
+
 class MLBValidator:
     """Validator for MLB A-to-Z generation quality assessment (12 criteria)"""
 
@@ -955,28 +996,11 @@ REF와 GEN을 1:1로 비교하여 누락 아이템 카운트:
             outfit_spec: OutfitAnalysis from analyze_outfit() - 정답 스펙 기반 검증 (권장)
             shot_preset: Optional shot preset dict
             check_ai_artifacts: If True, run AI artifact detection (default: False)
-            check_gate: If True, run synthesis gate check first (default: True)
+            check_gate: If True, run synthesis gate check concurrently with scoring (default: False)
 
         Returns:
             ValidationResult with all metrics and quality tier classification
         """
-        # Step 0: 합성티 게이트 (check_gate=True일 때)
-        gate_passed = True
-        gate_failed_reasons = []
-
-        if check_gate:
-            # 게이트 체크는 이미지만 필요
-            gen_img_pil = self._load_image(generated_img)
-            gate_result = self._check_synthesis_gate(gen_img_pil)
-            gate_passed = gate_result["passed"]
-            gate_failed_reasons = gate_result.get("failed_reasons", [])
-
-            # [CHANGED] Gate 실패해도 VLM 채점은 계속 진행
-            # gate_passed 변수에 결과 저장만 하고 early return 제거
-            # Step 6에서 gate 결과 반영
-
-        # Step 1: 기존 12개 기준 채점 (Gate 실패 여부와 무관하게 항상 수행)
-
         # 필수 참조 이미지 검증
         if not face_images or len(face_images) == 0:
             raise ValueError(
@@ -1046,31 +1070,36 @@ REF와 GEN을 1:1로 비교하여 누락 아이템 카운트:
             )
             content_parts.append(self._pil_to_part(mood_img))
 
-        # Call VLM
-        try:
-            response = self.client.models.generate_content(
-                model=VISION_MODEL,
-                contents=[types.Content(role="user", parts=content_parts)],
-                config=types.GenerateContentConfig(
-                    temperature=0.1, response_modalities=["TEXT"]
-                ),
-            )
+        def score() -> Union[dict, ValidationResult]:
+            try:
+                # JSON 모드 + 스키마 검증 (형식 오류는 텍스트 복구 1회)
+                result, _ = generate_json(
+                    self.client,
+                    [types.Content(role="user", parts=content_parts)],
+                    schema=VALIDATION_RESPONSE_SCHEMA,
+                    temperature=0.1,
+                )
+                return result
 
-            # Parse JSON response
-            raw_text = response.candidates[0].content.parts[0].text.strip()
-            if "```json" in raw_text:
-                raw_text = raw_text.split("```json")[1].split("```")[0].strip()
-            elif "```" in raw_text:
-                raw_text = raw_text.split("```")[1].split("```")[0].strip()
+            except json.JSONDecodeError as e:
+                print(f"[Validator] JSON parse error: {e}")
+                return self._create_error_result(f"JSON parse error: {e}")
+            except Exception as e:
+                print(f"[Validator] VLM validation error: {e}")
+                return self._create_error_result(f"VLM error: {e}")
 
-            result_dict = json.loads(raw_text)
+        # Call VLM - 12개 기준 채점 + 합성티 게이트 동시 실행
+        # Gate 실패해도 채점은 계속 진행하므로 (Step 6에서 반영) 순서 의존 없음
+        gate = (lambda: self._check_synthesis_gate(gen_img)) if check_gate else None
+        result_dict, gate_result = run_with_gate(score, gate)
+        if isinstance(result_dict, ValidationResult):
+            return result_dict
 
-        except json.JSONDecodeError as e:
-            print(f"[Validator] JSON parse error: {e}")
-            return self._create_error_result(f"JSON parse error: {e}")
-        except Exception as e:
-            print(f"[Validator] VLM validation error: {e}")
-            return self._create_error_result(f"VLM error: {e}")
+        gate_passed = True
+        gate_failed_reasons = []
+        if gate_result is not None:
+            gate_passed = gate_result["passed"]
+            gate_failed_reasons = gate_result.get("failed_reasons", [])
 
         # Process result (레퍼런스 제공 여부 및 게이트 결과 전달)
         return self._process_result(
@@ -1107,21 +1136,6 @@ REF와 GEN을 1:1로 비교하여 누락 아이템 카운트:
         Returns:
             (scores: dict, reasons: dict, outfit_structural: dict)
         """
-        score_keys = [
-            "photorealism",
-            "anatomy",
-            "micro_detail",
-            "face_identity",
-            "expression",
-            "body_type",
-            "outfit_accuracy",
-            "brand_compliance",
-            "environmental_integration",
-            "lighting_mood",
-            "composition",
-            "pose_quality",
-        ]
-
         scores = {}
         reasons = {}
         outfit_structural = {
@@ -1129,7 +1143,7 @@ REF와 GEN을 1:1로 비교하여 누락 아이템 카운트:
             "mismatched_attributes": {},
         }
 
-        for key in score_keys:
+        for key in SCORE_KEYS:
             value = result_dict.get(key, 0)
             score, reason = self._extract_score_and_reason(value)
             scores[key] = score
@@ -1308,14 +1322,7 @@ REF와 GEN을 1:1로 비교하여 누락 아이템 카운트:
 
     def _pil_to_part(self, pil_img: Image.Image, max_size: int = 1024) -> types.Part:
         """Convert PIL Image to Gemini Part"""
-        if max(pil_img.size) > max_size:
-            pil_img = pil_img.copy()
-            pil_img.thumbnail((max_size, max_size), Image.LANCZOS)
-        buffer = BytesIO()
-        pil_img.save(buffer, format="PNG")
-        return types.Part(
-            inline_data=types.Blob(mime_type="image/png", data=buffer.getvalue())
-        )
+        return encode_image_part(pil_img, max_size=max_size)
 
     def _build_outfit_spec_section(self, outfit_spec: "OutfitAnalysis") -> str:
         """
@@ -1422,26 +1429,18 @@ REF와 GEN을 1:1로 비교하여 누락 아이템 카운트:
 """
 
         try:
-            response = self.client.models.generate_content(
-                model=VISION_MODEL,
-                contents=[
-                    types.Content(
-                        role="user", parts=[types.Part(text=gate_prompt), img_part]
-                    )
-                ],
-                config=types.GenerateContentConfig(
-                    temperature=0.1, response_modalities=["TEXT"]
-                ),
-            )
-
-            # JSON 파싱
-            raw_text = response.candidates[0].content.parts[0].text.strip()
-            if "```json" in raw_text:
-                raw_text = raw_text.split("```json")[1].split("```")[0].strip()
-            elif "```" in raw_text:
-                raw_text = raw_text.split("```")[1].split("```")[0].strip()
+            with telemetry_context(step=STEP_GATE):
+                result, _ = generate_json(
+                    self.client,
+                    [
+                        types.Content(
+                            role="user", parts=[types.Part(text=gate_prompt), img_part]
+                        )
+                    ],
+                    schema=GATE_RESPONSE_SCHEMA,
+                    temperature=0.1,
+                )
 
-            result = json.loads(raw_text)
             return {
                 "passed": result.get("passed", False),
                 "failed_reasons": result.get("failed_reasons", []),
@@ -13,7 +13,13 @@ from typing import Optional, List, Union
 from pathlib import Path
 
 from PIL import Image
-from google import genai
+
+from core.api import get_client
+from core.metering import allow_attempt, effective_check_gate, effective_resolution
+from core.validators.base import ReferenceBundle, WorkflowType
+from core.validators.prefilter import build_prefilter
+from core.generators.prefetch import AttemptPrefetcher
+from core.telemetry import STEP_GENERATE, STEP_VALIDATE, telemetry_context
 
 from typing import TYPE_CHECKING
 
@@ -44,6 +50,8 @@ def generate_with_validation(
     outfit_spec: Optional["OutfitAnalysis"] = None,  # NEW: 정답 스펙 기반 검증
     check_ai_artifacts: bool = False,
     check_gate: bool = True,
+    use_prefilter: bool = True,
+    pipelined: bool = False,
 ) -> dict:
     """
     단일 이미지 생성 + 검증 + 재생성 루프
@@ -75,6 +83,10 @@ def generate_with_validation(
             - mismatched_attributes: 색상/로고 불일치 → 50점 이하
         check_ai_artifacts: AI 티 검사 수행 여부
         check_gate: 합성티 게이트 체크 수행 여부
+        use_prefilter: VLM 검증 전 로컬 사전 필터 사용 여부
+            (core.validators.prefilter, 탈락 시 검증 없이 재생성)
+        pipelined: 시도 N 검증 중에 시도 N+1을 미리 생성 (core.generators.prefetch)
+            N이 통과하면 N+1은 버리고, 실패하면 N+1을 그대로 다음 시도로 사용
 
     Returns:
         dict: {
@@ -87,9 +99,28 @@ def generate_with_validation(
         }
     """
     # Validator 초기화
-    client = genai.Client(api_key=api_key)
+    client = get_client(api_key)
     validator = MLBValidator(client)
 
+    # 레퍼런스는 한 번만 디코딩 → 모든 시도의 생성/검증이 같은 이미지(인코딩 캐시) 사용
+    refs = ReferenceBundle(
+        {
+            "face": face_images,
+            "outfit": outfit_images,
+            "pose": pose_reference,
+            "style": style_reference,
+            "mood": mood_reference,
+        }
+    )
+    face_images = refs.images("face")
+    outfit_images = refs.images("outfit")
+    pose_reference = refs.first("pose")
+    style_reference = refs.first("style")
+    mood_reference = refs.first("mood")
+
+    # 로컬 사전 필터 (해상도/빈 이미지/중복/CLIP A급 유사도)
+    prefilter = build_prefilter(WorkflowType.BRANDCUT) if use_prefilter else None
+
     best_image = None
     best_score = -1  # -1로 초기화하여 점수 0인 이미지도 저장
     best_result = None
@@ -98,27 +129,53 @@ def generate_with_validation(
     current_prompt = prompt_json.copy()
     current_temp = initial_temperature
 
+    workflow_name = WorkflowType.BRANDCUT.value
+
+    def generate(prompt: dict, temperature: float) -> Optional[Image.Image]:
+        # 프리페치 스레드에서도 태그가 붙도록 함수 안에서 컨텍스트 지정
+        with telemetry_context(workflow=workflow_name, step=STEP_GENERATE):
+            return generate_brandcut(
+                prompt_json=prompt,
+                face_images=face_images,
+                outfit_images=outfit_images,
+                pose_reference=pose_reference,
+                style_reference=style_reference,
+                api_key=api_key,
+                aspect_ratio=aspect_ratio,
+                resolution=effective_resolution(resolution),
+                temperature=temperature,
+            )
+
+    # 파이프라인 모드: 검증 중에 다음 시도를 미리 생성
+    prefetcher = AttemptPrefetcher(max_retries, enabled=pipelined)
+
     for attempt in range(max_retries + 1):
+        # 예산 소진/축소 시 중단 (core.metering)
+        if not allow_attempt(attempt, max_retries):
+            print(f"[RetryGen] Budget limit reached - stopping at attempt {attempt + 1}")
+            break
+
+        # 이전 시도 검증 중에 미리 생성된 이미지가 있으면 사용
+        prefetched = prefetcher.take(attempt)
+        if prefetched is not None:
+            current_temp = prefetched.temperature
+
         print(f"\n{'#' * 60}")
         print(
             f"# ATTEMPT {attempt + 1}/{max_retries + 1} | Temperature: {current_temp:.2f}"
+            + (" | prefetched" if prefetched is not None else "")
         )
         print(f"{'#' * 60}")
 
         # =============================================
         # 1. 이미지 생성 (generator.py 호출)
         # =============================================
-        image = generate_brandcut(
-            prompt_json=current_prompt,
-            face_images=face_images,
-            outfit_images=outfit_images,
-            pose_reference=pose_reference,
-            style_reference=style_reference,
-            api_key=api_key,
-            aspect_ratio=aspect_ratio,
-            resolution=resolution,
-            temperature=current_temp,
-        )
+        if prefetched is not None:
+            image = prefetched.image
+            if prefetched.error is not None:
+                print(f"[RetryGen] X Prefetched generation error: {prefetched.error}")
+        else:
+            image = generate(current_prompt, current_temp)
 
         if image is None:
             print(f"[RetryGen] X Generation failed (attempt {attempt + 1})")
@@ -131,20 +188,38 @@ def generate_with_validation(
             )
             continue
 
+        # 다음 시도를 현재 프롬프트 + 다음 온도로 미리 생성 (이번 검증 결과는 N+2부터 반영)
+        next_temp = max(0.15, current_temp - 0.03)
+        prefetcher.start(attempt + 1, next_temp, generate, current_prompt, next_temp)
+
+        # 로컬 사전 필터 - 명백한 불량은 VLM 검증 없이 재생성
+        if prefilter:
+            precheck = prefilter.check(image, refs, aspect_ratio=aspect_ratio)
+            if not precheck.passed:
+                history.append(
+                    {
+                        "attempt": attempt + 1,
+                        "temperature": current_temp,
+                        **precheck.to_history(),
+                    }
+                )
+                continue
+
         # =============================================
         # 2. 검증 (mlb_validator.py 호출)
         # =============================================
         try:
-            validation_result = validator.validate(
-                generated_img=image,
-                face_images=face_images,
-                outfit_images=outfit_images,
-                pose_reference=pose_reference,
-                mood_reference=mood_reference,
-                outfit_spec=outfit_spec,  # NEW: 정답 스펙 기반 검증
-                check_ai_artifacts=check_ai_artifacts,
-                check_gate=check_gate,
-            )
+            with telemetry_context(workflow=workflow_name, step=STEP_VALIDATE):
+                validation_result = validator.validate(
+                    generated_img=image,
+                    face_images=face_images,
+                    outfit_images=outfit_images,
+                    pose_reference=pose_reference,
+                    mood_reference=mood_reference,
+                    outfit_spec=outfit_spec,  # NEW: 정답 스펙 기반 검증
+                    check_ai_artifacts=check_ai_artifacts,
+                    check_gate=effective_check_gate(check_gate),
+                )
         except Exception as e:
             print(f"[RetryGen] X Validation failed: {e}")
             history.append(
@@ -164,6 +239,7 @@ def generate_with_validation(
             {
                 "attempt": attempt + 1,
                 "temperature": current_temp,
+                "prefetched": prefetched is not None,
                 "total_score": validation_result.total_score,
                 "grade": validation_result.grade,
                 "passed": validation_result.passed,
@@ -190,6 +266,7 @@ def generate_with_validation(
         # 4. 통과 조건 체크
         if validation_result.passed:
             print(f"[RetryGen] PASSED at attempt {attempt + 1}!")
+            prefetcher.discard()
             break
 
         # =============================================
@@ -203,10 +280,13 @@ def generate_with_validation(
                 attempt=attempt,
             )
 
-        # Rate limit 방지 대기
-        if attempt < max_retries:
+        # Rate limit 방지 대기 (파이프라인 모드는 다음 시도가 이미 진행 중)
+        if attempt < max_retries and not pipelined:
             time.sleep(2)
 
+    # 남은 선행 생성 정리 (예산 중단 등)
+    prefetcher.discard()
+
     # 최종 결과 반환
     return _build_result(best_image, best_result, history, max_retries)
 
@@ -12,7 +12,8 @@ from typing import Optional, List, Union, TYPE_CHECKING
 from pathlib import Path
 
 from PIL import Image
-from google import genai
+
+from core.api import get_client
 
 from .generator_v2 import generate_brandcut
 from .validator_v2 import (
@@ -70,7 +71,7 @@ def generate_with_validation(
         }
     """
     # Validator 초기화
-    client = genai.Client(api_key=api_key)
+    client = get_client(api_key)
     validator = BrandcutValidator(client)
 
     best_image = None
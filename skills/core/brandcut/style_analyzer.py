@@ -5,14 +5,14 @@ db/mlb_style/ 이미지들을 분석하여 스타일 DNA 프로파일 생성.
 """
 
 import json
-import re
 from pathlib import Path
 from typing import List, Dict, Any, Optional
 from concurrent.futures import ThreadPoolExecutor, as_completed
 from PIL import Image
-from google import genai
 
 from core.config import VISION_MODEL
+from core.structured import json_config, parse_or_repair
+from core.api import get_client
 
 
 # ============================================================
@@ -124,6 +124,7 @@ class StyleAnalyzer:
             response = self.client.models.generate_content(
                 model=VISION_MODEL,
                 contents=[STYLE_ANALYSIS_PROMPT, pil_image],
+                config=json_config(),
             )
 
             result = self._parse_json_response(response.text.strip())
@@ -180,27 +181,10 @@ class StyleAnalyzer:
         return results
 
     def _parse_json_response(self, response_text: str) -> dict:
-        """JSON 응답 파싱 (마크다운 코드 블록 제거)"""
-        # markdown code block 제거
-        json_match = re.search(
-            r"```(?:json)?\s*(\{.*?\})\s*```", response_text, re.DOTALL
-        )
-        if json_match:
-            response_text = json_match.group(1)
-
+        """JSON 응답 파싱 (코드 블록/설명문 제거, 실패 시 형식 복구 1회 후 빈 dict)"""
         try:
-            return json.loads(response_text)
-        except json.JSONDecodeError:
-            # JSON 객체 찾기
-            start_idx = response_text.find("{")
-            end_idx = response_text.rfind("}")
-
-            if start_idx != -1 and end_idx != -1 and start_idx < end_idx:
-                try:
-                    return json.loads(response_text[start_idx : end_idx + 1])
-                except json.JSONDecodeError:
-                    pass
-
+            return parse_or_repair(self.client, response_text)
+        except Exception:
             return {}
 
     def _validate_result(self, result: dict) -> bool:
@@ -432,7 +416,7 @@ def run_batch_analysis(
     if api_key is None:
         api_key = _get_next_api_key()
 
-    client = genai.Client(api_key=api_key)
+    client = get_client(api_key)
 
     # 이미지 파일 수집
     style_path = Path(style_dir)
@@ -496,7 +480,6 @@ def run_batch_analysis(
 # ============================================================
 if __name__ == "__main__":
     import sys
-    from pathlib import Path
 
     # 프로젝트 루트 추가
     project_root = Path(__file__).parent.parent.parent
@@ -1,14 +1,26 @@
 """
 MLB Style Index - VLM Categorical Encoding 기반 유사도 인덱스
 
-numpy + scipy만 사용 (FAISS 미사용 - 176개 이미지는 소규모)
+numpy만 사용 (FAISS 미사용). L2 정규화 행렬을 미리 만들어 두고 쿼리 여러 개를
+행렬곱 한 번 + argpartition으로 검색한다 (수만 장 규모까지 선택 비용이 무시할 수준).
+
+디스크 포맷 (StyleIndexStore):
+    db/mlb_style_index.manifest.json   - 세대, 차원, sources, 분석 해시, 벡터 파일명
+    db/mlb_style_index.<세대>.npy       - L2 정규화 float32 (N, 52), mmap 로드
+
+- 로드: manifest 읽고 .npy를 mmap → 압축 해제/피클 없음, 워커 프로세스끼리 페이지 공유
+- 갱신: upsert/delete는 기존 행 + 변경분만 인코딩해 새 세대 .npy를 쓰고 manifest를
+  os.replace로 교체 (읽는 쪽은 항상 완전한 세대 하나만 봄, 이전 세대 mmap은 그대로 유효)
+- 기존 .npz 인덱스는 처음 로드할 때 새 포맷으로 변환
 """
 
+import hashlib
 import json
+import os
+import threading
 import numpy as np
 from pathlib import Path
-from typing import List, Dict, Any, Tuple, Optional
-from scipy.spatial.distance import cosine
+from typing import List, Dict, Any, Tuple, Optional, Sequence, Union
 
 
 # ============================================================
@@ -66,6 +78,13 @@ VIBE_KEYWORDS = [
 # vibe_keywords(10) = 52차원
 TOTAL_DIMENSIONS = 52
 
+# 카테고리 필터용 one-hot 구간 (analysis_to_feature_vector 순서와 동일)
+STANCE_OFFSET = len(ARM_POSITIONS)
+FRAMING_OFFSET = TOTAL_DIMENSIONS - len(VIBE_KEYWORDS) - len(FRAMINGS)
+
+# 검색 결과 (index, similarity, source_path)
+SearchResult = Tuple[int, float, str]
+
 
 # ============================================================
 # ENCODING FUNCTIONS
@@ -157,6 +176,14 @@ def analysis_to_feature_vector(analysis: Dict[str, Any]) -> np.ndarray:
     return np.array(vector, dtype=np.float32)
 
 
+def _category_ids(vectors: np.ndarray, offset: int, size: int) -> np.ndarray:
+    """one-hot 구간 → 카테고리 인덱스 (해당 없음은 -1)"""
+    block = vectors[:, offset : offset + size]
+    ids = np.argmax(block, axis=1)
+    ids[block.max(axis=1) <= 0] = -1
+    return ids
+
+
 # ============================================================
 # STYLE INDEX CLASS
 # ============================================================
@@ -168,6 +195,28 @@ class StyleIndex:
         self.vectors: Optional[np.ndarray] = None  # (N, 52)
         self.sources: List[str] = []  # 이미지 경로 리스트
         self.analyses: List[Dict[str, Any]] = []  # 원본 분석 결과
+        self._normed: Optional[np.ndarray] = None  # (N, 52) L2 정규화 float32
+        self._stances: Optional[np.ndarray] = None  # (N,) STANCES 인덱스 (-1: 없음)
+        self._framings: Optional[np.ndarray] = None  # (N,) FRAMINGS 인덱스 (-1: 없음)
+        self._store: Optional["StyleIndexStore"] = None  # StyleIndexStore.open()으로 연 경우
+        self._store_mtime: Optional[int] = None
+
+    def _set_vectors(self, vectors: np.ndarray, normalized: bool = False) -> None:
+        """벡터 설정 + 정규화 행렬/카테고리 라벨 준비
+
+        normalized=True면 이미 L2 정규화된 행렬(mmap 포함)을 복사 없이 그대로 사용
+        """
+        if normalized:
+            self.vectors = vectors
+            self._normed = vectors
+        else:
+            self.vectors = np.asarray(vectors, dtype=np.float32)
+            norms = np.linalg.norm(self.vectors, axis=1, keepdims=True)
+            self._normed = np.divide(
+                self.vectors, norms, out=np.zeros_like(self.vectors), where=norms > 0
+            )
+        self._stances = _category_ids(self.vectors, STANCE_OFFSET, len(STANCES))
+        self._framings = _category_ids(self.vectors, FRAMING_OFFSET, len(FRAMINGS))
 
     def build_from_analyses(self, analyses: List[Dict[str, Any]]) -> None:
         """
@@ -190,7 +239,7 @@ class StyleIndex:
             valid_analyses.append(analysis)
 
         if vectors:
-            self.vectors = np.vstack(vectors)
+            self._set_vectors(np.vstack(vectors))
             self.sources = sources
             self.analyses = valid_analyses
             print(
@@ -201,7 +250,7 @@ class StyleIndex:
 
     def save(self, path: str) -> None:
         """
-        인덱스 저장 (numpy 압축 포맷)
+        인덱스 저장 (기존 .npz 포맷, 공유/증분 갱신은 StyleIndexStore 사용)
 
         Args:
             path: 저장 경로 (.npz)
@@ -229,7 +278,7 @@ class StyleIndex:
         """
         try:
             data = np.load(path, allow_pickle=True)
-            self.vectors = data["vectors"]
+            self._set_vectors(data["vectors"])
             self.sources = list(data["sources"])
             print(f"[LOADED] Index: {len(self.sources)} vectors from {path}")
             return True
@@ -237,71 +286,199 @@ class StyleIndex:
             print(f"[ERROR] Failed to load index: {e}")
             return False
 
+    def refresh(self) -> bool:
+        """저장소에 새 세대가 있으면 다시 연다 (manifest mtime 비교)
+
+        Returns:
+            다시 열었으면 True
+        """
+        if self._store is None or self._store.manifest_mtime() == self._store_mtime:
+            return False
+        reopened = self._store.open()
+        if reopened is None:
+            return False
+        self.__dict__.update(reopened.__dict__)
+        return True
+
+    def _filter_mask(
+        self,
+        framing: Optional[Union[str, Sequence[str]]] = None,
+        stance: Optional[Union[str, Sequence[str]]] = None,
+    ) -> Optional[np.ndarray]:
+        """카테고리 필터 → (N,) bool 마스크 (필터 없으면 None)"""
+        mask = None
+        for values, categories, ids in (
+            (framing, FRAMINGS, self._framings),
+            (stance, STANCES, self._stances),
+        ):
+            if values is None:
+                continue
+            if isinstance(values, str):
+                values = [values]
+            lowered = [c.lower() for c in categories]
+            wanted = [lowered.index(v.lower()) for v in values if v.lower() in lowered]
+            category_mask = np.isin(ids, wanted)
+            mask = category_mask if mask is None else mask & category_mask
+        return mask
+
+    def find_similar_batch(
+        self,
+        query_vectors: np.ndarray,
+        top_k: int = 3,
+        framing: Optional[Union[str, Sequence[str]]] = None,
+        stance: Optional[Union[str, Sequence[str]]] = None,
+    ) -> List[List[SearchResult]]:
+        """
+        여러 쿼리의 유사 스타일을 한 번에 검색 (행렬곱 1회 + argpartition)
+
+        Args:
+            query_vectors: 쿼리 특징 벡터 (M, 52)
+            top_k: 쿼리당 반환할 결과 수
+            framing: 프레이밍 필터 (예: "MFS" 또는 ["MS", "MFS"])
+            stance: 스탠스 필터 (예: "confident")
+
+        Returns:
+            쿼리별 [(index, similarity, source_path), ...] (유사도 내림차순)
+        """
+        queries = np.atleast_2d(np.asarray(query_vectors, dtype=np.float32))
+        if self._normed is None or len(self._normed) == 0 or top_k <= 0:
+            return [[] for _ in range(len(queries))]
+
+        norms = np.linalg.norm(queries, axis=1, keepdims=True)
+        queries = np.divide(queries, norms, out=np.zeros_like(queries), where=norms > 0)
+
+        # 코사인 유사도 (M, N)
+        similarities = queries @ self._normed.T
+
+        candidates = np.arange(len(self._normed))
+        mask = self._filter_mask(framing, stance)
+        if mask is not None:
+            candidates = candidates[mask]
+            similarities = similarities[:, mask]
+        if len(candidates) == 0:
+            return [[] for _ in range(len(queries))]
+
+        k = min(top_k, len(candidates))
+        if k < len(candidates):
+            top = np.argpartition(-similarities, k - 1, axis=1)[:, :k]
+        else:
+            top = np.tile(np.arange(len(candidates)), (len(queries), 1))
+        top_scores = np.take_along_axis(similarities, top, axis=1)
+        order = np.argsort(-top_scores, axis=1, kind="stable")
+        top = np.take_along_axis(top, order, axis=1)
+
+        results = []
+        for row, columns in enumerate(top):
+            results.append(
+                [
+                    (
+                        int(candidates[col]),
+                        float(similarities[row, col]),
+                        self.sources[candidates[col]],
+                    )
+                    for col in columns
+                ]
+            )
+        return results
+
     def find_similar(
         self,
         query_vector: np.ndarray,
         top_k: int = 3,
-    ) -> List[Tuple[int, float, str]]:
+        framing: Optional[Union[str, Sequence[str]]] = None,
+        stance: Optional[Union[str, Sequence[str]]] = None,
+    ) -> List[SearchResult]:
         """
         가장 유사한 스타일 찾기
 
         Args:
             query_vector: 쿼리 특징 벡터 (52,)
             top_k: 반환할 결과 수
+            framing: 프레이밍 필터
+            stance: 스탠스 필터
 
         Returns:
             [(index, similarity, source_path), ...]
         """
-        if self.vectors is None or len(self.vectors) == 0:
-            return []
-
-        # 코사인 유사도 계산
-        similarities = np.array([1 - cosine(query_vector, sv) for sv in self.vectors])
-
-        # 상위 k개
-        top_indices = np.argsort(similarities)[-top_k:][::-1]
-
-        return [
-            (int(idx), float(similarities[idx]), self.sources[idx])
-            for idx in top_indices
-        ]
+        return self.find_similar_batch(
+            np.asarray(query_vector)[None, :], top_k, framing=framing, stance=stance
+        )[0]
 
     def find_similar_from_analysis(
         self,
         analysis: Dict[str, Any],
         top_k: int = 3,
-    ) -> List[Tuple[int, float, str]]:
+        framing: Optional[Union[str, Sequence[str]]] = None,
+        stance: Optional[Union[str, Sequence[str]]] = None,
+    ) -> List[SearchResult]:
         """
         분석 결과로 유사한 스타일 찾기
 
         Args:
             analysis: VLM 분석 결과 dict
             top_k: 반환할 결과 수
+            framing: 프레이밍 필터
+            stance: 스탠스 필터
 
         Returns:
             [(index, similarity, source_path), ...]
         """
         query_vector = analysis_to_feature_vector(analysis)
-        return self.find_similar(query_vector, top_k)
+        return self.find_similar(query_vector, top_k, framing=framing, stance=stance)
 
     def find_similar_from_prompt(
         self,
         prompt_json: Dict[str, Any],
         top_k: int = 3,
-    ) -> List[Tuple[int, float, str]]:
+        framing: Optional[Union[str, Sequence[str]]] = None,
+        stance: Optional[Union[str, Sequence[str]]] = None,
+    ) -> List[SearchResult]:
         """
         프롬프트 JSON으로 유사한 스타일 찾기
 
         Args:
             prompt_json: 브랜드컷 프롬프트 JSON
             top_k: 반환할 결과 수
+            framing: 프레이밍 필터
+            stance: 스탠스 필터
 
         Returns:
             [(index, similarity, source_path), ...]
         """
         # 프롬프트 JSON → 분석 포맷 변환
         analysis = self._prompt_to_analysis(prompt_json)
-        return self.find_similar_from_analysis(analysis, top_k)
+        return self.find_similar_from_analysis(
+            analysis, top_k, framing=framing, stance=stance
+        )
+
+    def find_similar_batch_from_prompts(
+        self,
+        prompt_jsons: Sequence[Dict[str, Any]],
+        top_k: int = 3,
+        framing: Optional[Union[str, Sequence[str]]] = None,
+        stance: Optional[Union[str, Sequence[str]]] = None,
+    ) -> List[List[SearchResult]]:
+        """
+        프롬프트 JSON 여러 개를 한 번에 검색
+
+        Args:
+            prompt_jsons: 브랜드컷 프롬프트 JSON 리스트
+            top_k: 프롬프트당 반환할 결과 수
+            framing: 프레이밍 필터
+            stance: 스탠스 필터
+
+        Returns:
+            프롬프트별 [(index, similarity, source_path), ...]
+        """
+        if not prompt_jsons:
+            return []
+        queries = np.vstack(
+            [
+                analysis_to_feature_vector(self._prompt_to_analysis(prompt_json))
+                for prompt_json in prompt_jsons
+            ]
+        )
+        return self.find_similar_batch(queries, top_k, framing=framing, stance=stance)
 
     def _prompt_to_analysis(self, prompt_json: Dict[str, Any]) -> Dict[str, Any]:
         """프롬프트 JSON → 분석 포맷 변환"""
@@ -350,22 +527,226 @@ class StyleIndex:
         }
 
 
+# ============================================================
+# ON-DISK STORE (mmap + manifest)
+# ============================================================
+STORE_FORMAT_VERSION = 1
+
+
+def analysis_hash(analysis: Dict[str, Any]) -> str:
+    """분석 결과 내용 해시 (_source 등 내부 키 제외)"""
+    content = {k: v for k, v in analysis.items() if not k.startswith("_")}
+    payload = json.dumps(content, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha1(payload.encode("utf-8")).hexdigest()
+
+
+def _normalize_rows(vectors: np.ndarray) -> np.ndarray:
+    vectors = np.asarray(vectors, dtype=np.float32).reshape(-1, TOTAL_DIMENSIONS)
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    return np.divide(vectors, norms, out=np.zeros_like(vectors), where=norms > 0)
+
+
+class StyleIndexStore:
+    """mmap 가능한 .npy + manifest 스타일 인덱스 저장소
+
+    Args:
+        path: 인덱스 경로 (확장자 무시, 예: "db/mlb_style_index" 또는 "...npz")
+    """
+
+    def __init__(self, path: Union[str, Path]):
+        path = Path(path)
+        self.stem = path.with_suffix("") if path.suffix in (".npz", ".npy", ".json") else path
+        self.manifest_path = self.stem.parent / f"{self.stem.name}.manifest.json"
+        # 같은 프로세스 안의 동시 갱신 직렬화 (프로세스 간 갱신은 빌드 작업 하나가 담당)
+        self._lock = threading.Lock()
+
+    def exists(self) -> bool:
+        return self.manifest_path.exists()
+
+    def read_manifest(self) -> Optional[Dict[str, Any]]:
+        """manifest (없거나 손상되면 None)"""
+        try:
+            with open(self.manifest_path, "r", encoding="utf-8") as f:
+                manifest = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if manifest.get("version") != STORE_FORMAT_VERSION:
+            return None
+        return manifest
+
+    def manifest_mtime(self) -> Optional[int]:
+        try:
+            return self.manifest_path.stat().st_mtime_ns
+        except OSError:
+            return None
+
+    def open(self) -> Optional[StyleIndex]:
+        """현재 세대를 mmap으로 연 StyleIndex (없으면 None)"""
+        mtime = self.manifest_mtime()
+        manifest = self.read_manifest()
+        if manifest is None:
+            return None
+        try:
+            vectors = np.load(self.stem.parent / manifest["vectors_file"], mmap_mode="r")
+        except (OSError, ValueError) as e:
+            print(f"[ERROR] Failed to open index vectors: {e}")
+            return None
+        if vectors.shape != (len(manifest["sources"]), manifest["dims"]):
+            print(f"[ERROR] Index vectors/manifest mismatch: {vectors.shape}")
+            return None
+
+        index = StyleIndex()
+        index._set_vectors(vectors, normalized=True)
+        index.sources = list(manifest["sources"])
+        index._store = self
+        index._store_mtime = mtime
+        return index
+
+    def write(self, index: StyleIndex) -> None:
+        """인덱스 전체를 새 세대로 기록 (StyleIndex.vectors 기준)"""
+        if index.vectors is None:
+            print("[WARN] No index to save")
+            return
+        if len(index.analyses) == len(index.sources):
+            hashes = [analysis_hash(a) for a in index.analyses]
+        else:
+            hashes = [hashlib.sha1(np.asarray(v).tobytes()).hexdigest() for v in index._normed]
+        with self._lock:
+            self._commit(np.asarray(index._normed), list(index.sources), hashes)
+
+    def upsert(self, analyses: List[Dict[str, Any]], prune: bool = False) -> Dict[str, int]:
+        """분석 결과 추가/갱신 (_source 기준, 내용 해시가 같으면 건너뜀)
+
+        Args:
+            analyses: StyleAnalyzer 분석 결과 리스트
+            prune: True면 analyses에 없는 source 행 삭제 (전체 목록 동기화)
+
+        Returns:
+            {"added": n, "updated": n, "unchanged": n, "removed": n}
+        """
+        counts = {"added": 0, "updated": 0, "unchanged": 0, "removed": 0}
+        with self._lock:
+            vectors, sources, hashes = self._current()
+            position = {source: i for i, source in enumerate(sources)}
+            replaced: Dict[int, np.ndarray] = {}
+            appended: List[np.ndarray] = []
+            seen = set()
+
+            for analysis in analyses:
+                if analysis.get("_fallback"):
+                    continue
+                source = analysis.get("_source", "")
+                seen.add(source)
+                digest = analysis_hash(analysis)
+                row = position.get(source)
+                if row is not None and hashes[row] == digest:
+                    counts["unchanged"] += 1
+                    continue
+                vector = analysis_to_feature_vector(analysis)
+                if row is None:
+                    position[source] = len(sources)
+                    sources.append(source)
+                    hashes.append(digest)
+                    appended.append(vector)
+                    counts["added"] += 1
+                else:
+                    hashes[row] = digest
+                    replaced[row] = vector
+                    counts["updated"] += 1
+
+            keep = [i for i, source in enumerate(sources) if not prune or source in seen]
+            counts["removed"] = len(sources) - len(keep)
+
+            if replaced or appended or counts["removed"]:
+                vectors = np.array(vectors, dtype=np.float32)  # mmap → 메모리 사본
+                for row, vector in replaced.items():
+                    vectors[row] = _normalize_rows(vector)[0]
+                if appended:
+                    vectors = np.vstack([vectors, _normalize_rows(np.vstack(appended))])
+                if counts["removed"]:
+                    vectors = vectors[keep]
+                    sources = [sources[i] for i in keep]
+                    hashes = [hashes[i] for i in keep]
+                self._commit(vectors, sources, hashes)
+        return counts
+
+    def delete(self, sources: Sequence[str]) -> int:
+        """source 경로로 행 삭제. 삭제한 행 수 반환"""
+        targets = set(sources)
+        with self._lock:
+            vectors, current, hashes = self._current()
+            keep = [i for i, source in enumerate(current) if source not in targets]
+            removed = len(current) - len(keep)
+            if removed:
+                self._commit(
+                    np.asarray(vectors)[keep],
+                    [current[i] for i in keep],
+                    [hashes[i] for i in keep],
+                )
+        return removed
+
+    def _current(self) -> Tuple[np.ndarray, List[str], List[str]]:
+        manifest = self.read_manifest()
+        if manifest is None:
+            return np.zeros((0, TOTAL_DIMENSIONS), dtype=np.float32), [], []
+        vectors = np.load(self.stem.parent / manifest["vectors_file"], mmap_mode="r")
+        return vectors, list(manifest["sources"]), list(manifest["hashes"])
+
+    def _commit(self, vectors: np.ndarray, sources: List[str], hashes: List[str]) -> None:
+        """새 세대 .npy 기록 후 manifest 원자적 교체, 이전 세대 정리"""
+        manifest = self.read_manifest() or {}
+        generation = int(manifest.get("generation", 0)) + 1
+        vectors_file = f"{self.stem.name}.{generation}.npy"
+        suffix = f".{os.getpid()}.{threading.get_ident()}.tmp"
+
+        self.stem.parent.mkdir(parents=True, exist_ok=True)
+        vectors_path = self.stem.parent / vectors_file
+        tmp_path = vectors_path.with_suffix(suffix)
+        with open(tmp_path, "wb") as f:
+            np.save(f, np.ascontiguousarray(vectors, dtype=np.float32))
+        os.replace(tmp_path, vectors_path)
+
+        new_manifest = {
+            "version": STORE_FORMAT_VERSION,
+            "generation": generation,
+            "dims": TOTAL_DIMENSIONS,
+            "vectors_file": vectors_file,
+            "sources": sources,
+            "hashes": hashes,
+        }
+        tmp_path = self.manifest_path.with_suffix(suffix)
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(new_manifest, f, ensure_ascii=False)
+        os.replace(tmp_path, self.manifest_path)
+
+        # 이전 세대 삭제 (열려 있는 mmap은 POSIX에서 계속 유효, 실패는 무시)
+        for old in self.stem.parent.glob(f"{self.stem.name}.*.npy"):
+            if old.name != vectors_file:
+                try:
+                    old.unlink()
+                except OSError:
+                    pass
+        print(f"[SAVED] Index: {len(sources)} vectors -> {vectors_path}")
+
+
 # ============================================================
 # INDEX BUILDER
 # ============================================================
 def build_style_index(
     analysis_json: str = "db/mlb_style_analysis.json",
-    output_index: str = "db/mlb_style_index.npz",
+    output_index: str = "db/mlb_style_index",
+    incremental: bool = True,
 ) -> StyleIndex:
     """
     분석 JSON으로 스타일 인덱스 구축
 
     Args:
         analysis_json: 분석 결과 JSON 경로
-        output_index: 인덱스 출력 경로 (.npz)
+        output_index: 인덱스 저장소 경로 (StyleIndexStore, .npz 확장자는 무시)
+        incremental: 저장소가 이미 있으면 변경된 분석만 upsert + 사라진 source 삭제
 
     Returns:
-        StyleIndex 인스턴스
+        StyleIndex 인스턴스 (mmap)
     """
     # 분석 결과 로드
     with open(analysis_json, "r", encoding="utf-8") as f:
@@ -373,42 +754,53 @@ def build_style_index(
 
     print(f"[LOAD] {len(analyses)} analyses from {analysis_json}")
 
-    # 인덱스 구축
-    index = StyleIndex()
-    index.build_from_analyses(analyses)
-
-    # 저장
-    index.save(output_index)
+    store = StyleIndexStore(output_index)
+    if incremental and store.exists():
+        counts = store.upsert(analyses, prune=True)
+        print(f"[INDEX] Incremental update: {counts}")
+    else:
+        # 인덱스 구축
+        index = StyleIndex()
+        index.build_from_analyses(analyses)
+        store.write(index)
 
-    return index
+    return store.open() or StyleIndex()
 
 
 # ============================================================
 # CONVENIENCE FUNCTIONS
 # ============================================================
 def get_style_index(
-    index_path: str = "db/mlb_style_index.npz",
+    index_path: str = "db/mlb_style_index",
     analysis_path: str = "db/mlb_style_analysis.json",
 ) -> StyleIndex:
     """
     스타일 인덱스 로드 (없으면 생성)
 
+    저장소(manifest + .npy) → 기존 .npz (새 포맷으로 변환) → 분석 JSON 재구축 순.
+
     Args:
-        index_path: 인덱스 파일 경로
+        index_path: 인덱스 저장소 경로 (.npz 확장자는 무시)
         analysis_path: 분석 결과 JSON 경로
 
     Returns:
         StyleIndex 인스턴스
     """
-    index = StyleIndex()
+    store = StyleIndexStore(index_path)
+    index = store.open()
+    if index is not None:
+        print(f"[LOADED] Index: {len(index.sources)} vectors from {store.manifest_path}")
+        return index
 
-    if Path(index_path).exists():
-        if index.load(index_path):
-            return index
+    legacy_path = store.stem.parent / f"{store.stem.name}.npz"
+    index = StyleIndex()
+    if legacy_path.exists() and index.load(str(legacy_path)):
+        store.write(index)
+        return store.open() or index
 
     # 인덱스 파일이 없거나 로드 실패 시 재생성
     if Path(analysis_path).exists():
-        return build_style_index(analysis_path, index_path)
+        return build_style_index(analysis_path, index_path, incremental=False)
 
     print(f"[ERROR] No analysis file: {analysis_path}")
     print("[HINT] Run style_analyzer.py first to generate analysis")
@@ -427,7 +819,7 @@ if __name__ == "__main__":
     # 인덱스 구축
     index = build_style_index(
         analysis_json=str(project_root / "db" / "mlb_style_analysis.json"),
-        output_index=str(project_root / "db" / "mlb_style_index.npz"),
+        output_index=str(project_root / "db" / "mlb_style_index"),
     )
 
     # 테스트 쿼리
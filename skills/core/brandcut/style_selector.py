@@ -15,7 +15,7 @@ from .style_index import StyleIndex, get_style_index
 # ============================================================
 # DEFAULT PATHS
 # ============================================================
-DEFAULT_INDEX_PATH = "db/mlb_style_index.npz"
+DEFAULT_INDEX_PATH = "db/mlb_style_index"
 DEFAULT_ANALYSIS_PATH = "db/mlb_style_analysis.json"
 DEFAULT_STYLE_DIR = "db/mlb_style"
 
@@ -34,7 +34,7 @@ class StyleSelector:
     ):
         """
         Args:
-            index_path: 스타일 인덱스 파일 경로
+            index_path: 스타일 인덱스 저장소 경로 (manifest + .npy)
             analysis_path: 분석 결과 JSON 경로
             style_dir: 스타일 이미지 폴더 경로
         """
@@ -48,6 +48,9 @@ class StyleSelector:
         """인덱스 lazy 로드"""
         if self._index is None:
             self._index = get_style_index(self._index_path, self._analysis_path)
+        else:
+            # 다른 프로세스가 인덱스를 갱신했으면 새 세대로 교체
+            self._index.refresh()
         return self._index
 
     def select(
@@ -18,14 +18,14 @@ from dataclasses import dataclass, field
 from typing import Optional, List, Union, TYPE_CHECKING
 from enum import Enum
 from pathlib import Path
-import json
-from io import BytesIO
 
 from PIL import Image
 from google import genai
 from google.genai import types
 
 from core.config import VISION_MODEL
+from core.structured import json_config, parse_or_repair
+from core.utils import encode_image_part
 
 if TYPE_CHECKING:
     from core.outfit_analyzer import OutfitAnalysis
@@ -441,17 +441,11 @@ class BrandcutValidator:
             response = self.client.models.generate_content(
                 model=VISION_MODEL,
                 contents=[types.Content(role="user", parts=parts)],
-                config=types.GenerateContentConfig(temperature=0.1),
+                config=json_config(temperature=0.1),
             )
 
-            # JSON 파싱
-            response_text = response.text.strip()
-            if response_text.startswith("```"):
-                response_text = response_text.split("```")[1]
-                if response_text.startswith("json"):
-                    response_text = response_text[4:]
-
-            scores = json.loads(response_text)
+            # JSON 파싱 (형식 오류면 복구 1회)
+            scores = parse_or_repair(self.client, response.text)
 
         except Exception as e:
             print(f"[Validator] Error: {e}")
@@ -584,16 +578,7 @@ class BrandcutValidator:
 
     def _pil_to_part(self, img: Image.Image, max_size: int = 1024) -> types.Part:
         """PIL Image를 Gemini Part로 변환"""
-        if max(img.size) > max_size:
-            img = img.copy()
-            img.thumbnail((max_size, max_size), Image.LANCZOS)
-
-        buffer = BytesIO()
-        img.save(buffer, format="PNG")
-
-        return types.Part(
-            inline_data=types.Blob(mime_type="image/png", data=buffer.getvalue())
-        )
+        return encode_image_part(img, max_size=max_size)
 
 
 # ============================================================
@@ -18,6 +18,12 @@ VISION_MODEL = "gemini-3-flash-preview"  # Vision analysis (text + image input)
 PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 OUTPUT_BASE_DIR = os.path.join(PROJECT_ROOT, "Fnf_studio_outputs")
 
+# ============================================================
+# 요청 페이로드 예산 (core.payload.PayloadBuilder 기본값)
+# ============================================================
+# 인라인 요청 한도(20MB, base64 포함)보다 충분히 낮게 잡아 업로드 지연을 줄임
+REQUEST_BYTE_BUDGET = int(float(os.getenv("FNF_REQUEST_BYTE_BUDGET_MB", "8")) * 1024 * 1024)
+
 
 @dataclass
 class PipelineConfig:
@@ -7,10 +7,9 @@
 
 from typing import Any
 from PIL import Image
-import json
-import re
 
 from core.config import VISION_MODEL
+from core.structured import StructuredOutputError, extract_json
 from .templates import OUTFIT_ANALYSIS_PROMPT
 
 
@@ -42,24 +41,11 @@ def _load_image(image: "Image.Image | str") -> "Image.Image | None":
 
 
 def _parse_json(text: str) -> dict:
-    """VLM 응답에서 JSON 파싱. 마크다운 코드 블록 제거 후 시도."""
-    # 마크다운 코드 블록 제거
-    match = re.search(r"```(?:json)?\s*(\{.*?\})\s*```", text, re.DOTALL)
-    if match:
-        text = match.group(1)
-
+    """VLM 응답에서 JSON 파싱. 코드 블록/설명문 제거 후 시도, 실패 시 빈 dict."""
     try:
-        return json.loads(text)
-    except json.JSONDecodeError:
-        # { ... } 범위 직접 추출 시도
-        start = text.find("{")
-        end = text.rfind("}")
-        if start != -1 and end != -1 and start < end:
-            try:
-                return json.loads(text[start : end + 1])
-            except json.JSONDecodeError:
-                pass
-    return {}
+        return extract_json(text)
+    except StructuredOutputError:
+        return {}
 
 
 def analyze_outfit_for_ecommerce(
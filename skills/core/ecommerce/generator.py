@@ -16,10 +16,11 @@ from pathlib import Path
 from typing import Any, Optional, Union
 
 from PIL import Image
-from google import genai
 from google.genai import types
 
 from core.config import IMAGE_MODEL
+from core.api import get_client
+from core.utils import encode_image_part
 from .analyzer import analyze_outfit_for_ecommerce, analyze_face_for_model
 from .prompt_builder import build_ecommerce_prompt
 from .presets import POSE_PRESETS, BACKGROUND_PRESETS, VALID_ECOMMERCE_BACKGROUNDS
@@ -44,14 +45,7 @@ def _load_pil(image: "Image.Image | str | Path") -> "Image.Image | None":
 
 def _pil_to_part(img: Image.Image, max_size: int = 1024) -> types.Part:
     """PIL Image를 Gemini API Part로 변환. 필요 시 리사이즈."""
-    if max(img.size) > max_size:
-        img = img.copy()
-        img.thumbnail((max_size, max_size), Image.LANCZOS)
-    buf = BytesIO()
-    img.save(buf, format="PNG")
-    return types.Part(
-        inline_data=types.Blob(mime_type="image/png", data=buf.getvalue())
-    )
+    return encode_image_part(img, max_size=max_size)
 
 
 def _validate_background(background: str) -> str:
@@ -80,7 +74,7 @@ def _get_client(client: Any | None, api_key: str | None) -> Any:
         from core.api import _get_next_api_key
 
         api_key = _get_next_api_key()
-    return genai.Client(api_key=api_key)
+    return get_client(api_key)
 
 
 def _build_generation_parts(
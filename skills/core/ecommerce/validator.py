@@ -21,7 +21,6 @@ total_score = outfit_accuracy * 0.40 + face_identity * 0.20
 
 import json
 import re
-from io import BytesIO
 from pathlib import Path
 from typing import Dict, List, Union
 
@@ -29,6 +28,7 @@ from PIL import Image
 from google.genai import types
 
 from core.config import VISION_MODEL
+from core.utils import encode_image_part
 from core.validators.base import (
     CommonValidationResult,
     QualityTier,
@@ -264,14 +264,7 @@ class EcommerceValidator(WorkflowValidator):
         Returns:
             types.Part
         """
-        if max(img.size) > max_size:
-            img = img.copy()
-            img.thumbnail((max_size, max_size), Image.LANCZOS)
-        buf = BytesIO()
-        img.save(buf, format="PNG")
-        return types.Part(
-            inline_data=types.Blob(mime_type="image/png", data=buf.getvalue())
-        )
+        return encode_image_part(img, max_size=max_size)
 
     def _run_vlm_validation(
         self,
@@ -7,14 +7,13 @@ Face Swap 소스 이미지 분석 모듈
 V2: 카테고리 기반 분석 지원 (A/B 테스트용)
 """
 
-import json
-import re
 from typing import Any, Optional
 
 from google.genai import types
 from PIL import Image
 
 from core.config import VISION_MODEL
+from core.structured import StructuredOutputError, extract_json
 from .templates import SOURCE_ANALYSIS_PROMPT, FACE_SELECTION_PROMPT
 from .templates_variants import SOURCE_ANALYSIS_PROMPT_V2, VALID_CATEGORIES
 
@@ -36,28 +35,11 @@ def _load_image(image: "Image.Image | str") -> Optional[Image.Image]:
 
 
 def _parse_json_response(response_text: str) -> dict:
-    """JSON 응답 파싱 (마크다운 코드 블록 제거)"""
-    # 마크다운 코드 블록에서 JSON 추출
-    json_match = re.search(r"```(?:json)?\s*(\{.*?\})\s*```", response_text, re.DOTALL)
-    if json_match:
-        response_text = json_match.group(1)
-
-    # JSON 파싱 시도
+    """JSON 응답 파싱 (코드 블록/설명문 제거, 실패 시 빈 dict)"""
     try:
-        return json.loads(response_text)
-    except json.JSONDecodeError as e:
+        return extract_json(response_text)
+    except StructuredOutputError as e:
         print(f"[FaceSwapAnalyzer] JSON 파싱 에러: {e}")
-
-        # JSON 객체 직접 추출 시도
-        start_idx = response_text.find("{")
-        end_idx = response_text.rfind("}")
-
-        if start_idx != -1 and end_idx != -1 and start_idx < end_idx:
-            try:
-                return json.loads(response_text[start_idx : end_idx + 1])
-            except json.JSONDecodeError:
-                pass
-
         return {}
 
 
@@ -20,11 +20,10 @@ from io import BytesIO
 from typing import Any, Optional
 
 from PIL import Image
-from google import genai
 from google.genai import types
 
 from core.config import IMAGE_MODEL
-from core.api import _get_next_api_key
+from core.api import _get_next_api_key, get_client
 from core.utils import pil_to_part
 from .analyzer import select_best_face_images
 from .templates_final import FACE_SWAP_PROMPT, GENERATION_CONFIG
@@ -215,7 +214,7 @@ def generate_with_validation(
     # 클라이언트 생성
     if client is None:
         key = api_key or _get_next_api_key()
-        client = genai.Client(api_key=key)
+        client = get_client(key)
 
     # ============================================================
     # 1. 분석 (VLM) - 최적 얼굴 이미지 선택만
@@ -253,7 +252,7 @@ def generate_with_validation(
                 print(f"  - 강화 규칙 적용: {', '.join(failed)}")
 
         # API 키 로테이션
-        next_client = genai.Client(api_key=_get_next_api_key())
+        next_client = get_client()
 
         # 2. 생성 (Image) - temperature 0.5 고정
         generated_image = generate_face_swap(
@@ -26,7 +26,7 @@ from PIL import Image
 from google.genai import types
 
 from core.config import VISION_MODEL
-from core.api import _get_next_api_key
+from core.api import get_client
 from core.utils import pil_to_part
 from core.validators.base import (
     WorkflowValidator,
@@ -461,10 +461,7 @@ def validate_face_swap_result(
     Returns:
         FaceSwapValidationResult
     """
-    from google import genai
-
-    api_key = _get_next_api_key()
-    client = genai.Client(api_key=api_key)
+    client = get_client()
 
     validator = FaceSwapValidator(client)
     return validator._run_validation(generated_img, face_imgs, source_imgs)
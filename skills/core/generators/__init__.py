@@ -16,8 +16,10 @@
     )
 """
 
+from .prefetch import AttemptPrefetcher
 from .unified import generate_with_workflow_validation
 
 __all__ = [
     "generate_with_workflow_validation",
+    "AttemptPrefetcher",
 ]
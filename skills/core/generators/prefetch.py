@@ -0,0 +1,127 @@
+"""
+파이프라인 재시도 - 시도 N을 검증하는 동안 시도 N+1 생성을 미리 시작
+
+워크플로별 재시도 루프는 생성 → 검증 → (대기) → 생성을 번갈아 실행해서
+검증 시간(게이트 포함 수십 초)만큼 생성기가 놀았다. 파이프라인 모드에서는
+시도 N의 검증 직전에 시도 N+1을 "아직 N의 결과가 반영되지 않은" 현재
+프롬프트 + 다음 온도로 먼저 생성해 둔다.
+
+- N 통과: 미리 시작한 N+1은 버림 (시작 전이면 취소, 진행 중이면 결과 무시)
+- N 실패: N+1을 정식 시도로 사용. N의 실패로 강화된 프롬프트는 N+2부터 적용
+- 통과 기준/검증은 그대로, 재시도 횟수도 그대로 (max_retries 초과분은 시작 안 함)
+- core.metering 예산이 축소/소진되면 미리 생성하지 않음
+
+사용법:
+    prefetcher = AttemptPrefetcher(max_retries, enabled=pipelined)
+    try:
+        for attempt in range(max_retries + 1):
+            prefetched = prefetcher.take(attempt)
+            if prefetched is not None:
+                image = prefetched.image          # 미리 생성된 결과
+            else:
+                image = generate(prompt, temp)
+
+            prefetcher.start(attempt + 1, next_temp, generate, prompt, next_temp)
+            result = validator.validate(image, ...)
+            if result.passed:
+                break
+    finally:
+        prefetcher.discard()
+"""
+
+import contextvars
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Any, Callable, Optional, Tuple
+
+from core.metering import allow_attempt
+
+
+# 프로세스 공유 생성 선행 풀 (동시에 여러 루프가 돌 수 있음)
+PREFETCH_MAX_WORKERS = 8
+
+
+@dataclass
+class Prefetched:
+    """미리 생성한 시도 결과"""
+
+    attempt: int
+    temperature: float
+    image: Any = None
+    error: Optional[BaseException] = None
+
+
+_prefetch_executor: Optional[ThreadPoolExecutor] = None
+_prefetch_executor_lock = threading.Lock()
+
+
+def _get_prefetch_executor() -> ThreadPoolExecutor:
+    global _prefetch_executor
+    with _prefetch_executor_lock:
+        if _prefetch_executor is None:
+            _prefetch_executor = ThreadPoolExecutor(
+                max_workers=PREFETCH_MAX_WORKERS, thread_name_prefix="prefetch"
+            )
+        return _prefetch_executor
+
+
+class AttemptPrefetcher:
+    """재시도 루프 하나의 다음 시도 생성을 검증과 겹쳐 실행
+
+    Args:
+        max_retries: 루프의 최대 재시도 횟수 (시도 인덱스 상한)
+        enabled: False면 start가 아무것도 하지 않음 (직렬 루프와 동일)
+    """
+
+    def __init__(self, max_retries: int, enabled: bool = True):
+        self.max_retries = max_retries
+        self.enabled = enabled
+        self._pending: Optional[Tuple[int, float, Future]] = None
+
+    def start(
+        self,
+        attempt: int,
+        temperature: float,
+        generate: Callable[..., Any],
+        *args: Any,
+        **kwargs: Any,
+    ) -> bool:
+        """attempt번째 시도(0부터)의 생성을 백그라운드로 시작
+
+        Returns:
+            시작했으면 True (비활성, 재시도 한도 초과, 예산 축소/소진이면 False)
+        """
+        if not self.enabled or attempt > self.max_retries:
+            return False
+        if not allow_attempt(attempt, self.max_retries):
+            return False
+
+        self.discard()
+        future = _get_prefetch_executor().submit(
+            contextvars.copy_context().run, generate, *args, **kwargs
+        )
+        self._pending = (attempt, temperature, future)
+        return True
+
+    def take(self, attempt: int) -> Optional[Prefetched]:
+        """attempt번째 시도의 미리 생성된 결과 (완료까지 대기). 없으면 None"""
+        if self._pending is None:
+            return None
+        pending_attempt, temperature, future = self._pending
+        self._pending = None
+        if pending_attempt != attempt:
+            future.cancel()
+            return None
+
+        try:
+            image = future.result()
+        except Exception as e:
+            return Prefetched(attempt=attempt, temperature=temperature, error=e)
+        return Prefetched(attempt=attempt, temperature=temperature, image=image)
+
+    def discard(self) -> None:
+        """미리 시작한 생성을 버림 (시작 전이면 취소, 진행 중이면 결과 무시)"""
+        if self._pending is not None:
+            self._pending[2].cancel()
+            self._pending = None
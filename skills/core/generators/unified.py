@@ -18,27 +18,48 @@
     )
 """
 
-from typing import Callable, Dict, List, Optional, Union
-from pathlib import Path
-from PIL import Image
+import contextvars
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Callable, List, Optional, Union
 
-from google import genai
-
-from core.validators.base import WorkflowType, CommonValidationResult, QualityTier
+from core.validators.base import (
+    WorkflowType,
+    CommonValidationResult,
+    QualityTier,
+    ReferenceBundle,
+    ReferenceInput,
+)
+from core.validators.prefilter import PrefilterCascade, build_prefilter
 from core.validators.registry import ValidatorRegistry
-from core.api import _get_next_api_key
+from core.api import _get_next_api_key, get_client
+from core.metering import (
+    DEFAULT_IMAGE_SIZE,
+    BudgetExceededError,
+    allow_attempt,
+    effective_check_gate,
+    effective_speculation,
+)
+from core.telemetry import STEP_GENERATE, STEP_VALIDATE, telemetry_context
+
+
+# 추측 라운드 후보 간 온도 간격
+SPECULATIVE_TEMPERATURE_STEP = 0.05
 
 
 def generate_with_workflow_validation(
     workflow_type: WorkflowType,
     generate_func: Callable,
     prompt: Union[str, dict],
-    reference_images: Dict[str, List[Union[str, Path, Image.Image]]],
+    reference_images: ReferenceInput,
     config: dict,
     max_retries: int = 2,
     check_ai_artifacts: bool = False,
     check_gate: bool = True,
     api_key: Optional[str] = None,
+    prefilter: Union[bool, PrefilterCascade] = True,
+    speculative: int = 1,
+    speculative_max_cost: Optional[float] = None,
 ) -> dict:
     """
     워크플로 통합 생성 + 검증 함수
@@ -51,7 +72,9 @@ def generate_with_workflow_validation(
         generate_func: 이미지 생성 함수
             - 시그니처: (prompt, reference_images, config) -> Image.Image
         prompt: 생성 프롬프트 (문자열 또는 JSON dict)
-        reference_images: 참조 이미지 딕셔너리
+        reference_images: 참조 이미지 딕셔너리 또는 ReferenceBundle
+            (딕셔너리는 시작 시 ReferenceBundle로 한 번만 로드/인코딩되어
+            모든 시도의 생성/검증에 재사용됨)
             - brandcut: {"face": [...], "outfit": [...], "style": [...]}
             - background_swap: {"original": [...]}
             - ugc: {"face": [...], "outfit": [...]}
@@ -60,6 +83,20 @@ def generate_with_workflow_validation(
         check_ai_artifacts: AI 티 검사 수행 여부 (기본 False)
         check_gate: 합성티 게이트 체크 수행 여부 (기본 True)
         api_key: API 키 (미지정 시 자동 로테이션)
+        prefilter: VLM 검증 전 로컬 사전 필터 (core.validators.prefilter)
+            - True: 워크플로 기본 캐스케이드, False: 사용 안 함
+            - PrefilterCascade: 직접 구성한 캐스케이드
+            탈락한 이미지는 VLM 검증 없이 재생성 (history에 "prefilter" 기록)
+        speculative: 첫 라운드 동시 생성 수 K (기본 1 = 직렬)
+            - K장을 온도를 달리해 동시에 생성하고 도착 순서대로 검증
+            - 하나라도 통과하면 즉시 종료 (나머지는 취소/무시)
+            - 모두 실패하면 최고 점수 후보 기준으로 프롬프트 강화 후 직렬 재시도
+        speculative_max_cost: 추측 라운드 생성 비용 상한 (원, K를 이 안으로 축소)
+
+    Note:
+        core.metering 예산이 degraded면 재시도 축소 + 게이트 생략 + 1K 생성 +
+        추측 라운드 생략, 소진되면 그때까지의 최고 결과로 종료. 추측 라운드 K는
+        남은 작업/일일 예산으로 생성 가능한 장수를 넘지 않는다.
 
     Returns:
         dict:
@@ -73,10 +110,18 @@ def generate_with_workflow_validation(
     """
     # API 클라이언트 초기화
     key = api_key or _get_next_api_key()
-    client = genai.Client(api_key=key)
+    client = get_client(key)
+
+    # 레퍼런스는 한 번만 디코딩 (재시도마다 디스크 I/O/인코딩 반복 방지)
+    reference_images = ReferenceBundle.ensure(reference_images)
 
     # 워크플로에 맞는 검증기 가져오기
     validator = ValidatorRegistry.get(workflow_type, client)
+    workflow_name = getattr(workflow_type, "value", str(workflow_type))
+
+    # 로컬 사전 필터 (해상도/빈 이미지/중복/배경 보존 등)
+    if prefilter is True:
+        prefilter = build_prefilter(workflow_type)
 
     # 추적 변수
     best_image = None
@@ -89,47 +134,62 @@ def generate_with_workflow_validation(
     current_config = config.copy()
     current_temp = current_config.get("temperature", 0.25)
 
-    for attempt in range(max_retries + 1):
+    def run_attempt(
+        attempt: int,
+        attempt_prompt: Union[str, dict],
+        temperature: float,
+        candidate: Optional[int] = None,
+        stop: Optional[threading.Event] = None,
+    ) -> tuple:
+        """생성 → 사전 필터 → 검증 1회. (image, result, history 항목, 예산 소진 여부)"""
+        entry = {"attempt": attempt + 1, "temperature": temperature}
+        if candidate is not None:
+            entry["candidate"] = candidate + 1
+
         # 1. 이미지 생성
-        current_config["temperature"] = current_temp
+        attempt_config = dict(current_config, temperature=temperature)
         try:
-            image = generate_func(current_prompt, reference_images, current_config)
+            with telemetry_context(workflow=workflow_name, step=STEP_GENERATE):
+                image = generate_func(attempt_prompt, reference_images, attempt_config)
+        except BudgetExceededError as e:
+            entry["error"] = str(e)
+            return None, None, entry, True
         except Exception as e:
-            history.append({
-                "attempt": attempt + 1,
-                "temperature": current_temp,
-                "error": str(e),
-            })
-            continue
+            entry["error"] = str(e)
+            return None, None, entry, False
 
         if image is None:
-            history.append({
-                "attempt": attempt + 1,
-                "temperature": current_temp,
-                "error": "Generation returned None",
-            })
-            continue
+            entry["error"] = "Generation returned None"
+            return None, None, entry, False
 
-        # 2. 워크플로별 검증
-        try:
-            result = validator.validate(
-                generated_img=image,
-                reference_images=reference_images,
-                check_ai_artifacts=check_ai_artifacts,
-                check_gate=check_gate,
+        # 2. 로컬 사전 필터 - 명백한 불량은 VLM 호출 없이 재생성
+        if prefilter:
+            precheck = prefilter.check(
+                image, reference_images, aspect_ratio=current_config.get("aspect_ratio")
             )
+            if not precheck.passed:
+                entry.update(precheck.to_history())
+                return image, None, entry, False
+
+        # 다른 추측 후보가 이미 통과했으면 검증 생략
+        if stop is not None and stop.is_set():
+            entry["error"] = "Skipped - another candidate passed"
+            return image, None, entry, False
+
+        # 3. 워크플로별 검증
+        try:
+            with telemetry_context(workflow=workflow_name, step=STEP_VALIDATE):
+                result = validator.validate(
+                    generated_img=image,
+                    reference_images=reference_images,
+                    check_ai_artifacts=check_ai_artifacts,
+                    check_gate=effective_check_gate(check_gate),
+                )
         except Exception as e:
-            history.append({
-                "attempt": attempt + 1,
-                "temperature": current_temp,
-                "error": f"Validation error: {str(e)}",
-            })
-            continue
+            entry["error"] = f"Validation error: {str(e)}"
+            return image, None, entry, False
 
-        # 이력 기록
-        history.append({
-            "attempt": attempt + 1,
-            "temperature": current_temp,
+        entry.update({
             "total_score": result.total_score,
             "grade": result.grade,
             "passed": result.passed,
@@ -137,20 +197,53 @@ def generate_with_workflow_validation(
             "auto_fail_reasons": result.auto_fail_reasons[:3] if result.auto_fail_reasons else [],
             "issues": result.issues[:5] if result.issues else [],
         })
+        return image, result, entry, False
 
-        # 3. 최고 점수 추적
-        if result.total_score > best_score:
-            best_image = image
-            best_score = result.total_score
-            best_result = result
+    for attempt in range(max_retries + 1):
+        # 예산 소진/축소 시 중단 (core.metering)
+        if not allow_attempt(attempt, max_retries):
+            break
+
+        width = 1
+        if attempt == 0 and speculative > 1:
+            width = effective_speculation(
+                speculative,
+                current_config.get("resolution", DEFAULT_IMAGE_SIZE),
+                max_cost=speculative_max_cost,
+            )
+        if width > 1:
+            # 추측 라운드 - 온도를 달리한 K장을 동시에 생성, 먼저 통과한 것 채택
+            temperatures = _staggered_temperatures(current_temp, width)
+            outcomes = _speculative_round(run_attempt, current_prompt, temperatures)
+        else:
+            outcomes = [run_attempt(attempt, current_prompt, current_temp)]
+
+        # 이력 기록 + 최고 점수 추적 (추측 라운드는 후보 여러 개)
+        exhausted = False
+        round_best = None
+        for image, result, entry, budget_hit in outcomes:
+            history.append(entry)
+            exhausted = exhausted or budget_hit
+            if result is None:
+                continue
 
-        # 4. 통과 시 종료
-        if result.passed:
+            if round_best is None or _rank(result) > _rank(round_best):
+                round_best = result
+            # 통과한 결과가 점수만 높은 미통과 결과보다 우선
+            if best_result is None or _rank(result) > _rank(best_result):
+                best_image = image
+                best_score = result.total_score
+                best_result = result
+
+        # 4. 통과 또는 예산 소진 시 종료
+        if (round_best is not None and round_best.passed) or exhausted:
             break
+        if round_best is None:
+            continue
 
         # 5. 재시도 준비 - 워크플로별 우선순위에 따른 프롬프트 강화
-        if attempt < max_retries and validator.should_retry(result):
-            failed_criteria = validator._extract_failed_criteria(result)
+        if attempt < max_retries and validator.should_retry(round_best):
+            failed_criteria = validator._extract_failed_criteria(round_best)
             enhancement = validator.get_enhancement_rules(failed_criteria)
 
             if enhancement:
@@ -158,8 +251,8 @@ def generate_with_workflow_validation(
                     prompt=current_prompt,
                     enhancement=enhancement,
                     attempt=attempt,
-                    prev_score=result.total_score,
-                    prev_grade=result.grade,
+                    prev_score=round_best.total_score,
+                    prev_grade=round_best.grade,
                     failed_criteria=failed_criteria,
                 )
 
@@ -177,6 +270,57 @@ def generate_with_workflow_validation(
     }
 
 
+def _rank(result: CommonValidationResult) -> tuple:
+    return (result.passed, result.total_score)
+
+
+def _staggered_temperatures(base: float, width: int) -> List[float]:
+    """추측 라운드 온도 - base부터 위아래로 번갈아 벌림 (0.25 → 0.25, 0.30, 0.20, ...)"""
+    temperatures = [base]
+    step = 1
+    while len(temperatures) < width:
+        for sign in (1, -1):
+            if len(temperatures) < width:
+                value = base + sign * step * SPECULATIVE_TEMPERATURE_STEP
+                temperatures.append(round(min(1.0, max(0.1, value)), 2))
+        step += 1
+    return temperatures
+
+
+def _speculative_round(
+    run_attempt: Callable,
+    prompt: Union[str, dict],
+    temperatures: List[float],
+) -> List[tuple]:
+    """후보 K장을 동시에 생성/검증하고 도착 순서대로 수집
+
+    하나가 통과하면 아직 시작 안 한 후보는 취소하고, 이미 생성 중인 후보는
+    검증을 건너뛰게 한 뒤 기다리지 않고 반환한다 (결과는 버림).
+    """
+    stop = threading.Event()
+    executor = ThreadPoolExecutor(
+        max_workers=len(temperatures), thread_name_prefix="speculative"
+    )
+    futures = [
+        executor.submit(
+            contextvars.copy_context().run, run_attempt, 0, prompt, temperature, i, stop
+        )
+        for i, temperature in enumerate(temperatures)
+    ]
+    outcomes = []
+    try:
+        for future in as_completed(futures):
+            outcome = future.result()
+            outcomes.append(outcome)
+            result = outcome[1]
+            if result is not None and result.passed:
+                stop.set()
+                break
+    finally:
+        executor.shutdown(wait=False, cancel_futures=True)
+    return outcomes
+
+
 def _append_enhancement(
     prompt: Union[str, dict],
     enhancement: str,
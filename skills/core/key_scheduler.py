@@ -0,0 +1,386 @@
+"""
+API 키 스케줄러 - 키별 상태(부하/한도/쿨다운)를 추적하는 단일 키 선택기
+
+core.api와 core.utils.ApiKeyManager가 같은 키 집합에 대해 하나의
+스케줄러를 공유한다.
+
+- 키별 토큰 버킷: 분당 요청 수 / 분당 토큰 수 (환경변수로 설정, 기본은 로컬 한도
+  없음 - 실제 한도는 서버 429 + 쿨다운으로 반영)
+- 429 응답 시 해당 키만 쿨다운 (연속 실패 시 지수 증가, Retry-After 우선)
+- 건강한 키 중 잔여 한도가 가장 많은 키 선택 (동률이면 가장 오래 쉰 키)
+- 모든 키가 막혔을 때만 가장 빨리 풀리는 시점까지 대기
+- 키 선택(acquire)은 버킷을 차감하지 않는다. 요청 버킷은 실제 요청 시점에
+  record_request로 차감한다 (core.api 풀 클라이언트의 generate_content가 호출)
+
+환경변수:
+    FNF_KEY_RPM: 키별 분당 요청 한도 (미설정/0이면 미적용)
+    FNF_KEY_TPM: 키별 분당 토큰 한도 (미설정/0이면 미적용)
+    FNF_KEY_COOLDOWN_SECONDS: 429 기본 쿨다운 (초, 기본 15)
+
+사용법:
+    from core.key_scheduler import get_scheduler
+
+    scheduler = get_scheduler(["key1", "key2"])
+    key = scheduler.acquire()
+    try:
+        scheduler.record_request(key)
+        ...
+        scheduler.record_success(key, tokens=1200)
+    except RateLimitError:
+        scheduler.report_rate_limit(key, retry_after=30)
+
+    print(scheduler.stats())
+"""
+
+import os
+import threading
+import time
+import warnings
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Sequence, Tuple
+
+
+# ============================================================
+# 기본 한도 (키 1개 기준)
+# ============================================================
+def _env_limit(name: str) -> Optional[int]:
+    """분당 한도 환경변수 (미설정/0/해석 불가면 None = 미적용)"""
+    value = os.getenv(name, "").strip()
+    if not value:
+        return None
+    try:
+        limit = int(value)
+    except ValueError:
+        warnings.warn(f"{name}={value!r}: 정수가 아니라 무시합니다 (로컬 한도 미적용)")
+        return None
+    return limit if limit > 0 else None
+
+
+def _env_seconds(name: str, default: float) -> float:
+    """초 단위 환경변수 (미설정/음수/해석 불가면 default)"""
+    value = os.getenv(name, "").strip()
+    if not value:
+        return default
+    try:
+        seconds = float(value)
+    except ValueError:
+        warnings.warn(f"{name}={value!r}: 숫자가 아니라 기본값 {default}초를 사용합니다")
+        return default
+    return seconds if seconds >= 0 else default
+
+
+# None이면 로컬 한도 미적용 (서버 429 → 쿨다운으로만 조절)
+DEFAULT_REQUESTS_PER_MINUTE: Optional[int] = _env_limit("FNF_KEY_RPM")
+DEFAULT_TOKENS_PER_MINUTE: Optional[int] = _env_limit("FNF_KEY_TPM")
+DEFAULT_COOLDOWN_SECONDS = _env_seconds("FNF_KEY_COOLDOWN_SECONDS", 15.0)
+MAX_COOLDOWN_SECONDS = 120.0
+
+
+@dataclass
+class _TokenBucket:
+    """초당 일정량씩 채워지는 토큰 버킷"""
+
+    capacity: float
+    level: float
+    refill_per_sec: float
+    updated_at: float = field(default_factory=time.monotonic)
+
+    def refill(self, now: float) -> None:
+        elapsed = now - self.updated_at
+        if elapsed > 0:
+            self.level = min(self.capacity, self.level + elapsed * self.refill_per_sec)
+            self.updated_at = now
+
+    def seconds_until(self, amount: float) -> float:
+        """amount만큼 쌓일 때까지 남은 시간 (refill 이후 호출)"""
+        if self.level >= amount:
+            return 0.0
+        return (amount - self.level) / self.refill_per_sec
+
+
+@dataclass
+class _KeyState:
+    """키 하나의 실시간 상태"""
+
+    index: int
+    requests: Optional[_TokenBucket]
+    tokens: Optional[_TokenBucket]
+    cooldown_until: float = 0.0
+    consecutive_rate_limits: int = 0
+    last_used: float = 0.0
+    total_requests: int = 0
+    total_tokens: int = 0
+    rate_limit_count: int = 0
+    error_count: int = 0
+
+    def load(self) -> float:
+        """사용률 (0=여유, 1=한도 소진, 한도 미적용이면 0)"""
+        load = 0.0
+        for bucket in (self.requests, self.tokens):
+            if bucket is not None:
+                load = max(load, 1.0 - bucket.level / bucket.capacity)
+        return load
+
+    def refill(self, now: float) -> None:
+        for bucket in (self.requests, self.tokens):
+            if bucket is not None:
+                bucket.refill(now)
+
+
+class KeyScheduler:
+    """스레드 안전 API 키 스케줄러
+
+    Args:
+        api_keys: API 키 목록
+        requests_per_minute: 키별 분당 요청 한도 (None이면 미적용)
+        tokens_per_minute: 키별 분당 토큰 한도 (None이면 미적용)
+        cooldown_seconds: 429 발생 시 기본 쿨다운 (연속 발생 시 2배씩 증가)
+    """
+
+    def __init__(
+        self,
+        api_keys: Sequence[str],
+        requests_per_minute: Optional[int] = DEFAULT_REQUESTS_PER_MINUTE,
+        tokens_per_minute: Optional[int] = DEFAULT_TOKENS_PER_MINUTE,
+        cooldown_seconds: float = DEFAULT_COOLDOWN_SECONDS,
+    ):
+        if not api_keys:
+            raise ValueError("KeyScheduler requires at least one API key")
+
+        self._keys: List[str] = list(api_keys)
+        self._cooldown_seconds = cooldown_seconds
+        self._lock = threading.Lock()
+
+        now = time.monotonic()
+        self._states: Dict[str, _KeyState] = {}
+        for i, key in enumerate(self._keys):
+            self._states[key] = _KeyState(
+                index=i,
+                requests=self._bucket(requests_per_minute, now),
+                tokens=self._bucket(tokens_per_minute, now),
+            )
+
+    @staticmethod
+    def _bucket(per_minute: Optional[int], now: float) -> Optional[_TokenBucket]:
+        if not per_minute:
+            return None
+        return _TokenBucket(
+            capacity=per_minute,
+            level=per_minute,
+            refill_per_sec=per_minute / 60.0,
+            updated_at=now,
+        )
+
+    @property
+    def keys(self) -> List[str]:
+        return list(self._keys)
+
+    @property
+    def key_count(self) -> int:
+        return len(self._keys)
+
+    def key_index(self, api_key: str) -> int:
+        """키의 인덱스 반환 (로그/통계용, 키 자체를 남기지 않기 위함)"""
+        state = self._states.get(api_key)
+        return state.index if state else -1
+
+    # ------------------------------------------------------------
+    # 키 선택
+    # ------------------------------------------------------------
+
+    def acquire(self, estimated_tokens: int = 0, timeout: Optional[float] = None) -> str:
+        """사용 가능한 키 중 가장 여유 있는 키를 선택해 반환 (버킷 차감 없음)
+
+        모든 키가 쿨다운/한도 소진 상태이면 가장 빨리 풀리는 키까지 대기한다.
+        로컬 한도가 없으면(기본) 429 쿨다운 중일 때만 대기한다.
+
+        Args:
+            estimated_tokens: 이번 요청의 예상 토큰 수 (토큰 한도 사용 시)
+            timeout: 최대 대기 시간 (초). None이면 무제한
+
+        Returns:
+            선택된 API 키
+
+        Raises:
+            TimeoutError: timeout 내에 사용 가능한 키가 없을 때
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+
+        while True:
+            key, wait = self.try_acquire(estimated_tokens)
+            if key is not None:
+                return key
+
+            if deadline is not None:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    raise TimeoutError("No API key available within timeout")
+                wait = min(wait, remaining)
+            time.sleep(max(wait, 0.01))
+
+    def try_acquire(
+        self, estimated_tokens: int = 0, exclude: Sequence[str] = ()
+    ) -> Tuple[Optional[str], float]:
+        """대기 없이 키 선택 시도 (요청 버킷은 record_request에서 차감)
+
+        Args:
+            estimated_tokens: 이번 요청의 예상 토큰 수
+            exclude: 선택에서 제외할 키 (헤지 요청을 다른 키로 보낼 때)
+
+        Returns:
+            (선택된 키, 0.0) 또는 (None, 다음 키가 풀릴 때까지 남은 초)
+        """
+        with self._lock:
+            now = time.monotonic()
+            best: Optional[_KeyState] = None
+            best_key = None
+            min_wait = float("inf")
+
+            for key in self._keys:
+                if key in exclude:
+                    continue
+                state = self._states[key]
+                state.refill(now)
+
+                wait = max(
+                    state.cooldown_until - now,
+                    state.requests.seconds_until(1) if state.requests is not None else 0.0,
+                    state.tokens.seconds_until(min(estimated_tokens, state.tokens.capacity))
+                    if state.tokens is not None
+                    else 0.0,
+                )
+                if wait > 0:
+                    min_wait = min(min_wait, wait)
+                    continue
+
+                if best is None or (state.load(), state.last_used) < (best.load(), best.last_used):
+                    best, best_key = state, key
+
+            if best is None:
+                return None, min_wait
+
+            best.last_used = now
+            return best_key, 0.0
+
+    # ------------------------------------------------------------
+    # 요청/결과 보고
+    # ------------------------------------------------------------
+
+    def record_request(self, api_key: str) -> None:
+        """실제 요청 1건 보고 - 요청 버킷 차감 (키 선택 시점이 아니라 전송 시점)"""
+        with self._lock:
+            state = self._states.get(api_key)
+            if state is None:
+                return
+            now = time.monotonic()
+            if state.requests is not None:
+                state.requests.refill(now)
+                state.requests.level -= 1
+            state.last_used = now
+            state.total_requests += 1
+
+    def record_success(self, api_key: str, tokens: int = 0) -> None:
+        """성공 보고 - 연속 429 카운트 초기화 및 토큰 사용량 반영"""
+        with self._lock:
+            state = self._states.get(api_key)
+            if state is None:
+                return
+            state.consecutive_rate_limits = 0
+            if tokens:
+                state.total_tokens += tokens
+                if state.tokens is not None:
+                    state.tokens.refill(time.monotonic())
+                    state.tokens.level -= tokens
+
+    def report_rate_limit(self, api_key: str, retry_after: Optional[float] = None) -> float:
+        """429 보고 - 해당 키를 쿨다운에 넣음
+
+        Args:
+            api_key: 429를 받은 키
+            retry_after: 서버가 알려준 재시도 대기 시간 (초)
+
+        Returns:
+            적용된 쿨다운 시간 (초)
+        """
+        with self._lock:
+            state = self._states.get(api_key)
+            if state is None:
+                return 0.0
+            state.rate_limit_count += 1
+            state.consecutive_rate_limits += 1
+            if retry_after is not None and retry_after > 0:
+                cooldown = float(retry_after)
+            else:
+                cooldown = min(
+                    self._cooldown_seconds * (2 ** (state.consecutive_rate_limits - 1)),
+                    MAX_COOLDOWN_SECONDS,
+                )
+            state.cooldown_until = max(state.cooldown_until, time.monotonic() + cooldown)
+            return cooldown
+
+    def report_error(self, api_key: str) -> None:
+        """429 외 에러 보고 (통계용)"""
+        with self._lock:
+            state = self._states.get(api_key)
+            if state is not None:
+                state.error_count += 1
+
+    # ------------------------------------------------------------
+    # 통계
+    # ------------------------------------------------------------
+
+    def healthy_count(self) -> int:
+        """현재 쿨다운이 아닌 키 수"""
+        now = time.monotonic()
+        with self._lock:
+            return sum(1 for s in self._states.values() if s.cooldown_until <= now)
+
+    def stats(self) -> List[Dict]:
+        """키별 실시간 상태 (키 값 대신 인덱스로 표시)"""
+        now = time.monotonic()
+        result = []
+        with self._lock:
+            for key in self._keys:
+                state = self._states[key]
+                state.refill(now)
+                result.append({
+                    "key_index": state.index,
+                    "healthy": state.cooldown_until <= now,
+                    "cooldown_remaining": round(max(0.0, state.cooldown_until - now), 1),
+                    "load": round(state.load(), 3),
+                    "requests_available": int(state.requests.level) if state.requests is not None else None,
+                    "tokens_available": int(state.tokens.level) if state.tokens is not None else None,
+                    "total_requests": state.total_requests,
+                    "total_tokens": state.total_tokens,
+                    "rate_limits": state.rate_limit_count,
+                    "errors": state.error_count,
+                })
+        return result
+
+
+# ============================================================
+# 프로세스 공유 스케줄러
+# ============================================================
+
+_schedulers: Dict[Tuple[str, ...], KeyScheduler] = {}
+_schedulers_lock = threading.Lock()
+
+
+def get_scheduler(api_keys: Sequence[str], **limits) -> KeyScheduler:
+    """키 집합별 공유 스케줄러 반환 (같은 키 집합이면 같은 인스턴스)
+
+    Args:
+        api_keys: API 키 목록
+        **limits: 처음 생성할 때의 KeyScheduler 옵션 (requests_per_minute,
+            tokens_per_minute, cooldown_seconds). 없으면 환경변수 기본값
+
+    Returns:
+        KeyScheduler 인스턴스
+    """
+    signature = tuple(api_keys)
+    with _schedulers_lock:
+        scheduler = _schedulers.get(signature)
+        if scheduler is None:
+            scheduler = KeyScheduler(signature, **limits)
+            _schedulers[signature] = scheduler
+        return scheduler
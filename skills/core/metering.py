@@ -0,0 +1,487 @@
+"""
+비용 계량 - 실제 발생한 Gemini 호출의 이미지/토큰 비용 집계 + 작업/일 단위 예산
+
+options.COST_TABLE/get_cost는 예상 비용 표시용이라 재시도/검증/게이트 호출로
+실제 얼마가 나갔는지는 알 수 없었다. core.api.get_client가 만드는 풀 클라이언트를
+감싸서 모든 호출을 집계하고, 예산에 가까워지면 품질보다 비용을 우선하도록
+단계적으로 낮춘다 (대량 배치의 재시도 폭주 방지).
+
+- 집계: 해상도 티어별 생성 이미지 수, VLM 입력/출력 토큰, 원 단위 비용
+- 예산: 작업 단위 (metering_job) + 하루 단위 (프로세스 간 공유 파일)
+- 단계:
+  * ok: 그대로
+  * degraded (예산의 degrade_ratio 이상 사용): 게이트 생략, 재시도 축소,
+    추측 병렬 생성 중단, 이미지 해상도 1K로 강제 (요청 config의 image_size를
+    호출 직전에 교체)
+  * exhausted (예산 소진 또는 다음 이미지 비용이 남은 예산 초과):
+    호출 전에 BudgetExceededError (재시도 불가로 분류되어 루프가 즉시 종료)
+
+환경변수:
+    FNF_JOB_BUDGET_KRW: metering_job의 기본 예산 (미지정 시 무제한)
+    FNF_DAILY_BUDGET_KRW: 하루 예산 (미지정 시 무제한)
+    FNF_BUDGET_DEGRADE_RATIO: degraded 전환 비율 (기본 0.8)
+    FNF_METERING_DIR: 일일 사용량 파일 위치
+
+사용법:
+    from core.metering import metering_job
+
+    with metering_job("mlb_batch_0317", budget=50000) as job:
+        for prompt in prompts:
+            generate_with_workflow_validation(...)
+    print(job.summary())
+"""
+
+import contextvars
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional
+
+from core.config import IMAGE_MODEL, PROJECT_ROOT
+from core.options import RESOLUTIONS, get_cost, get_token_cost
+
+
+# ============================================================
+# 설정
+# ============================================================
+DEFAULT_DEGRADE_RATIO = 0.8
+DEGRADED_MAX_RETRIES = 0  # degraded 상태의 재생성 횟수
+DEGRADED_RESOLUTION = "1K"
+DEFAULT_IMAGE_SIZE = "1K"  # image_config 미지정 시 API 기본 해상도
+DEFAULT_METERING_DIR = os.path.join(PROJECT_ROOT, ".cache", "metering")
+
+STATE_OK = "ok"
+STATE_DEGRADED = "degraded"
+STATE_EXHAUSTED = "exhausted"
+
+_STATE_ORDER = {STATE_OK: 0, STATE_DEGRADED: 1, STATE_EXHAUSTED: 2}
+
+
+def _env_float(name: str) -> Optional[float]:
+    value = os.getenv(name, "").strip()
+    return float(value) if value else None
+
+
+class BudgetExceededError(Exception):
+    """예산 소진으로 호출 차단 (core.retry_policy에서 재시도 불가로 분류)"""
+
+    error_code = "BUDGET_EXCEEDED"
+    retryable = False
+
+
+# ============================================================
+# 사용량
+# ============================================================
+
+
+@dataclass
+class Usage:
+    """누적 사용량"""
+
+    images: Dict[str, int] = field(default_factory=dict)  # {"1K": 3, "2K": 1}
+    image_calls: int = 0
+    vlm_calls: int = 0
+    prompt_tokens: int = 0
+    output_tokens: int = 0
+    image_cost: float = 0.0
+    token_cost: float = 0.0
+
+    @property
+    def cost(self) -> float:
+        return self.image_cost + self.token_cost
+
+    def add(self, other: "Usage") -> None:
+        for tier, count in other.images.items():
+            self.images[tier] = self.images.get(tier, 0) + count
+        self.image_calls += other.image_calls
+        self.vlm_calls += other.vlm_calls
+        self.prompt_tokens += other.prompt_tokens
+        self.output_tokens += other.output_tokens
+        self.image_cost += other.image_cost
+        self.token_cost += other.token_cost
+
+    def to_dict(self) -> Dict[str, Any]:
+        data = asdict(self)
+        data["cost"] = round(self.cost, 2)
+        return data
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "Usage":
+        return cls(
+            images=dict(data.get("images", {})),
+            image_calls=data.get("image_calls", 0),
+            vlm_calls=data.get("vlm_calls", 0),
+            prompt_tokens=data.get("prompt_tokens", 0),
+            output_tokens=data.get("output_tokens", 0),
+            image_cost=data.get("image_cost", 0.0),
+            token_cost=data.get("token_cost", 0.0),
+        )
+
+
+# ============================================================
+# 예산 계량기
+# ============================================================
+
+
+class Meter:
+    """예산 하나에 대한 누적 사용량 (스레드 안전)
+
+    Args:
+        name: 이름 (로그용)
+        budget: 예산 (원). None이면 무제한 (집계만)
+        degrade_ratio: 예산 대비 이 비율 이상 사용 시 degraded
+    """
+
+    def __init__(
+        self,
+        name: str,
+        budget: Optional[float] = None,
+        degrade_ratio: Optional[float] = None,
+    ):
+        self.name = name
+        self.budget = budget
+        if degrade_ratio is None:
+            degrade_ratio = _env_float("FNF_BUDGET_DEGRADE_RATIO") or DEFAULT_DEGRADE_RATIO
+        self.degrade_ratio = degrade_ratio
+        self.usage = Usage()
+        self.blocked_calls = 0
+        self._lock = threading.Lock()
+
+    @property
+    def spent(self) -> float:
+        return self.usage.cost
+
+    @property
+    def remaining(self) -> Optional[float]:
+        if self.budget is None:
+            return None
+        return max(0.0, self.budget - self.spent)
+
+    def state(self, next_cost: float = 0.0) -> str:
+        """현재 단계. next_cost: 곧 발생할 호출의 예상 비용"""
+        if self.budget is None:
+            return STATE_OK
+        spent = self.spent
+        if spent >= self.budget or (next_cost and spent + next_cost > self.budget):
+            return STATE_EXHAUSTED
+        if spent >= self.budget * self.degrade_ratio:
+            return STATE_DEGRADED
+        return STATE_OK
+
+    def charge(self, usage: Usage) -> None:
+        with self._lock:
+            self.usage.add(usage)
+
+    def summary(self) -> str:
+        usage = self.usage
+        images = ", ".join(f"{tier} x{n}" for tier, n in sorted(usage.images.items())) or "-"
+        budget = f"₩{self.budget:,.0f}" if self.budget is not None else "unlimited"
+        return (
+            f"[Metering] {self.name}: ₩{self.spent:,.0f} / {budget} ({self.state()})"
+            f" | images {images} | VLM {usage.vlm_calls} calls,"
+            f" {usage.prompt_tokens:,} in / {usage.output_tokens:,} out tokens"
+            f" | blocked {self.blocked_calls}"
+        )
+
+
+class DailyMeter(Meter):
+    """하루 예산 계량기 - 사용량을 날짜별 JSON 파일에 누적 (프로세스 간 공유)
+
+    charge 시 파일을 다시 읽어 다른 프로세스의 사용량을 반영한 뒤 저장한다.
+    파일 잠금은 하지 않으므로 동시 기록 시 일부 누락될 수 있다 (근사치).
+    """
+
+    def __init__(
+        self,
+        budget: Optional[float] = None,
+        degrade_ratio: Optional[float] = None,
+        directory: Optional[str] = None,
+    ):
+        super().__init__("daily", budget=budget, degrade_ratio=degrade_ratio)
+        self.directory = Path(directory or os.getenv("FNF_METERING_DIR", DEFAULT_METERING_DIR))
+        self._day = ""
+        self._refresh()
+
+    @staticmethod
+    def _today() -> str:
+        return time.strftime("%Y-%m-%d")
+
+    def _path(self, day: str) -> Path:
+        return self.directory / f"usage_{day}.json"
+
+    def _load(self, day: str) -> Usage:
+        try:
+            with open(self._path(day), "r", encoding="utf-8") as f:
+                return Usage.from_dict(json.load(f))
+        except (OSError, ValueError):
+            return Usage()
+
+    def _refresh(self) -> None:
+        day = self._today()
+        if day != self._day:
+            self._day = day
+            self.usage = self._load(day)
+
+    def state(self, next_cost: float = 0.0) -> str:
+        with self._lock:
+            self._refresh()
+        return super().state(next_cost)
+
+    def charge(self, usage: Usage) -> None:
+        with self._lock:
+            self._refresh()
+            total = self._load(self._day)
+            total.add(usage)
+            self.usage = total
+            path = self._path(self._day)
+            try:
+                path.parent.mkdir(parents=True, exist_ok=True)
+                tmp_path = path.with_suffix(f".{os.getpid()}.{threading.get_ident()}.tmp")
+                with open(tmp_path, "w", encoding="utf-8") as f:
+                    json.dump(total.to_dict(), f, ensure_ascii=False)
+                os.replace(tmp_path, path)
+            except OSError as e:
+                print(f"[Metering] 일일 사용량 저장 실패: {e}")
+
+
+_job: contextvars.ContextVar[Optional[Meter]] = contextvars.ContextVar("fnf_metering_job", default=None)
+_daily: Optional[DailyMeter] = None
+_daily_lock = threading.Lock()
+
+
+def get_daily_meter() -> DailyMeter:
+    """프로세스 공유 일일 계량기 (FNF_DAILY_BUDGET_KRW)"""
+    global _daily
+    with _daily_lock:
+        if _daily is None:
+            _daily = DailyMeter(budget=_env_float("FNF_DAILY_BUDGET_KRW"))
+        return _daily
+
+
+def configure_daily_budget(
+    budget: Optional[float],
+    degrade_ratio: Optional[float] = None,
+    directory: Optional[str] = None,
+) -> DailyMeter:
+    """일일 예산 재설정 (None이면 무제한)"""
+    global _daily
+    with _daily_lock:
+        _daily = DailyMeter(budget=budget, degrade_ratio=degrade_ratio, directory=directory)
+        return _daily
+
+
+@contextmanager
+def metering_job(
+    name: str,
+    budget: Optional[float] = None,
+    degrade_ratio: Optional[float] = None,
+) -> Iterator[Meter]:
+    """블록 안의 모든 호출을 작업 하나로 집계하고 작업 예산 적용
+
+    core.api의 배치/헤징 워커 스레드도 호출자의 컨텍스트를 이어받으므로
+    같은 작업으로 집계된다.
+
+    Args:
+        name: 작업 이름
+        budget: 작업 예산 (원). None이면 FNF_JOB_BUDGET_KRW, 그것도 없으면 무제한
+        degrade_ratio: degraded 전환 비율
+    """
+    if budget is None:
+        budget = _env_float("FNF_JOB_BUDGET_KRW")
+    meter = Meter(name, budget=budget, degrade_ratio=degrade_ratio)
+    token = _job.set(meter)
+    try:
+        yield meter
+    finally:
+        _job.reset(token)
+        print(meter.summary())
+
+
+def current_job() -> Optional[Meter]:
+    """현재 컨텍스트의 작업 계량기 (작업 밖이면 None)"""
+    return _job.get()
+
+
+def _active_meters() -> List[Meter]:
+    meters: List[Meter] = [get_daily_meter()]
+    job = _job.get()
+    if job is not None:
+        meters.append(job)
+    return meters
+
+
+def budget_state(next_cost: float = 0.0) -> str:
+    """작업/일일 예산 중 가장 나쁜 단계"""
+    states = [meter.state(next_cost) for meter in _active_meters()]
+    return max(states, key=_STATE_ORDER.__getitem__)
+
+
+# ============================================================
+# 단계별 조정 (생성 루프에서 사용)
+# ============================================================
+
+
+def effective_max_retries(max_retries: int) -> int:
+    """degraded면 재시도 축소"""
+    if budget_state() == STATE_OK:
+        return max_retries
+    return min(max_retries, DEGRADED_MAX_RETRIES)
+
+
+def effective_check_gate(check_gate: bool) -> bool:
+    """degraded면 합성티 게이트 생략"""
+    return check_gate and budget_state() == STATE_OK
+
+
+def effective_resolution(resolution: str) -> str:
+    """degraded면 1K로 강제"""
+    if budget_state() == STATE_OK:
+        return resolution
+    return DEGRADED_RESOLUTION
+
+
+def effective_speculation(
+    width: int,
+    resolution: str = DEFAULT_IMAGE_SIZE,
+    max_cost: Optional[float] = None,
+) -> int:
+    """동시에 띄울 추측 생성 수 (1 = 직렬)
+
+    degraded/exhausted면 1. 남은 작업/일일 예산과 max_cost(원)가 허용하는
+    장수까지만 늘린다 (검증 비용은 별도라 생성 비용 기준 상한).
+    """
+    if width <= 1 or budget_state() != STATE_OK:
+        return 1
+    unit_cost = get_cost(resolution if resolution in RESOLUTIONS else DEFAULT_IMAGE_SIZE)
+    caps = [meter.remaining for meter in _active_meters() if meter.remaining is not None]
+    if max_cost is not None:
+        caps.append(max_cost)
+    if unit_cost > 0 and caps:
+        width = min(width, int(min(caps) // unit_cost))
+    return max(1, width)
+
+
+def allow_attempt(attempt: int, max_retries: int) -> bool:
+    """생성 루프의 attempt번째 시도(0부터)를 진행할지 여부
+
+    예산이 소진됐거나 degraded 상태에서 축소된 재시도 횟수를 넘으면 False.
+    """
+    state = budget_state()
+    if state == STATE_EXHAUSTED:
+        return False
+    if state == STATE_DEGRADED:
+        return attempt <= min(max_retries, DEGRADED_MAX_RETRIES)
+    return attempt <= max_retries
+
+
+# ============================================================
+# 클라이언트 계측
+# ============================================================
+
+
+def _image_size(config: Any) -> str:
+    image_config = getattr(config, "image_config", None)
+    if image_config is None and isinstance(config, dict):
+        image_config = config.get("image_config")
+    if isinstance(image_config, dict):
+        size = image_config.get("image_size")
+    else:
+        size = getattr(image_config, "image_size", None)
+    return size if size in RESOLUTIONS else DEFAULT_IMAGE_SIZE
+
+
+def _with_image_size(config: Any, size: str) -> Any:
+    """config의 image_size를 바꾼 사본 (원본 config는 재시도 간 공유되므로 수정하지 않음)"""
+    if isinstance(config, dict):
+        config = dict(config)
+        image_config = dict(config.get("image_config") or {})
+        image_config["image_size"] = size
+        config["image_config"] = image_config
+        return config
+    image_config = getattr(config, "image_config", None)
+    if image_config is None:
+        return config
+    return config.model_copy(update={"image_config": image_config.model_copy(update={"image_size": size})})
+
+
+def _count_images(response: Any) -> int:
+    count = 0
+    for candidate in getattr(response, "candidates", None) or []:
+        content = getattr(candidate, "content", None)
+        for part in getattr(content, "parts", None) or []:
+            if getattr(part, "inline_data", None) is not None:
+                count += 1
+    return count
+
+
+def _before_call(model: str, kwargs: Dict[str, Any]) -> Optional[str]:
+    """예산 확인 + degraded 시 해상도 교체. 이미지 호출이면 적용 해상도 반환"""
+    is_image = model == IMAGE_MODEL
+    size = None
+    next_cost = 0.0
+    if is_image:
+        size = _image_size(kwargs.get("config"))
+        # degraded이거나 원래 해상도로는 남은 예산을 넘으면 1K로 낮춰서 시도
+        if size != DEGRADED_RESOLUTION and (
+            budget_state() != STATE_OK or budget_state(get_cost(size)) == STATE_EXHAUSTED
+        ):
+            kwargs["config"] = _with_image_size(kwargs.get("config"), DEGRADED_RESOLUTION)
+            size = DEGRADED_RESOLUTION
+        next_cost = get_cost(size)
+
+    for meter in _active_meters():
+        if meter.state(next_cost) == STATE_EXHAUSTED:
+            meter.blocked_calls += 1
+            raise BudgetExceededError(
+                f"{meter.name} budget exhausted: ₩{meter.spent:,.0f} / ₩{meter.budget:,.0f}"
+            )
+    return size
+
+
+def _after_call(model: str, size: Optional[str], response: Any) -> None:
+    usage = Usage()
+    meta = getattr(response, "usage_metadata", None)
+    prompt_tokens = getattr(meta, "prompt_token_count", None) or 0
+    output_tokens = getattr(meta, "candidates_token_count", None) or 0
+    usage.prompt_tokens = prompt_tokens
+    usage.output_tokens = output_tokens
+    usage.token_cost = get_token_cost(model, prompt_tokens, output_tokens)
+    if size is not None:
+        images = _count_images(response)
+        usage.image_calls = 1
+        if images:
+            usage.images[size] = images
+            usage.image_cost = float(get_cost(size, images))
+    else:
+        usage.vlm_calls = 1
+    for meter in _active_meters():
+        meter.charge(usage)
+
+
+def instrument_client(client: Any) -> Any:
+    """풀 클라이언트의 models.generate_content / aio.models.generate_content 계량"""
+    models = client.models
+    sync_generate = models.generate_content
+
+    def generate_content(*, model: str, contents: Any, **kwargs: Any) -> Any:
+        size = _before_call(model, kwargs)
+        response = sync_generate(model=model, contents=contents, **kwargs)
+        _after_call(model, size, response)
+        return response
+
+    aio_models = client.aio.models
+    async_generate = aio_models.generate_content
+
+    async def generate_content_async(*, model: str, contents: Any, **kwargs: Any) -> Any:
+        size = _before_call(model, kwargs)
+        response = await async_generate(model=model, contents=contents, **kwargs)
+        _after_call(model, size, response)
+        return response
+
+    models.generate_content = generate_content
+    aio_models.generate_content = generate_content_async
+    return client
@@ -9,14 +9,14 @@ VLM(VISION_MODEL)을 사용하여 단체 사진에서 모든 인물을 감지하
     map_faces(detected_faces, face_mapping) -> dict
 """
 
-import json
 import logging
-from io import BytesIO
 from typing import Any, Union
 
 from PIL import Image
 
 from core.config import VISION_MODEL
+from core.structured import StructuredOutputError, parse_or_repair
+from core.utils import encode_image_part
 from core.multi_face_swap.templates import FACE_DETECTION_PROMPT
 
 logger = logging.getLogger(__name__)
@@ -32,17 +32,7 @@ def _pil_to_part(img: Image.Image, max_size: int = 1024):
     Returns:
         google.genai.types.Part 객체
     """
-    from google.genai import types
-
-    # 크기 제한 (VLM 분석용이므로 1024px 충분)
-    if max(img.size) > max_size:
-        img = img.copy()
-        img.thumbnail((max_size, max_size), Image.LANCZOS)
-    buf = BytesIO()
-    img.save(buf, format="PNG")
-    return types.Part(
-        inline_data=types.Blob(mime_type="image/png", data=buf.getvalue())
-    )
+    return encode_image_part(img, max_size=max_size)
 
 
 def _load_image(source: Union[Image.Image, str]) -> Image.Image:
@@ -61,11 +51,12 @@ def _load_image(source: Union[Image.Image, str]) -> Image.Image:
     raise TypeError(f"지원하지 않는 이미지 타입: {type(source)}")
 
 
-def _parse_json_response(text: str) -> dict:
+def _parse_json_response(text: str, client: Any = None) -> dict:
     """VLM 응답 텍스트에서 JSON 파싱
 
     Args:
         text: VLM 응답 텍스트
+        client: Gemini API 클라이언트 (있으면 파싱 실패 시 형식 복구 1회)
 
     Returns:
         파싱된 딕셔너리
@@ -73,16 +64,10 @@ def _parse_json_response(text: str) -> dict:
     Raises:
         ValueError: JSON 파싱 실패 시
     """
-    # 마크다운 코드블록 제거
-    if "```json" in text:
-        text = text.split("```json")[1].split("```")[0]
-    elif "```" in text:
-        text = text.split("```")[1].split("```")[0]
-
     try:
-        return json.loads(text.strip())
-    except json.JSONDecodeError as e:
-        raise ValueError(f"VLM 응답 JSON 파싱 실패: {e}\n원본 텍스트:\n{text[:500]}")
+        return parse_or_repair(client, text)
+    except StructuredOutputError as e:
+        raise ValueError(f"VLM 응답 JSON 파싱 실패: {e}\n원본 텍스트:\n{(text or '')[:500]}")
 
 
 def detect_faces(
@@ -143,13 +128,13 @@ def detect_faces(
         ],
         config=types.GenerateContentConfig(
             temperature=0.1,  # 감지 정확도를 위해 낮게 설정
-            response_modalities=["TEXT"],
+            response_mime_type="application/json",
         ),
     )
 
     # 응답 텍스트 추출
-    raw_text = response.candidates[0].content.parts[0].text
-    result = _parse_json_response(raw_text)
+    raw_text = response.text or ""
+    result = _parse_json_response(raw_text, client)
 
     # 인물 수 검증
     total_persons = result.get("total_persons", 0)
@@ -15,13 +15,16 @@
 """
 
 import logging
-import time
 from io import BytesIO
 from typing import Any, Union
 
 from PIL import Image
 
 from core.config import IMAGE_MODEL
+from core.api import get_client
+from core.retry_policy import get_retry_policy
+from core.telemetry import STEP_ANALYSIS, STEP_GENERATE, STEP_VALIDATE, telemetry_context
+from core.validators.base import WorkflowType
 from .analyzer import analyze_group_photo, analyze_replacement_faces
 from .detector import detect_faces, map_faces, _load_image, _pil_to_part
 from .prompt_builder import build_multi_swap_prompt
@@ -29,6 +32,9 @@ from .validator import MultiFaceSwapValidator
 
 logger = logging.getLogger(__name__)
 
+# 텔레메트리 workflow 태그
+WORKFLOW_NAME = WorkflowType.MULTI_FACE_SWAP.value
+
 # ============================================================
 # 인원 수 제한 상수
 # ============================================================
@@ -150,51 +156,36 @@ def _generate_simultaneous(
 
     parts = _build_api_parts(source_image, prompt_text, face_mapping_loaded)
 
-    for attempt in range(max_api_retries):
-        try:
-            response = client.models.generate_content(
-                model=IMAGE_MODEL,
-                contents=[types.Content(role="user", parts=parts)],
-                config=types.GenerateContentConfig(
-                    temperature=temperature,
-                    response_modalities=["IMAGE", "TEXT"],
-                    image_config=types.ImageConfig(
-                        aspect_ratio=aspect_ratio,
-                        image_size=resolution,
-                    ),
+    def _request(api_client: Any) -> Any:
+        return api_client.models.generate_content(
+            model=IMAGE_MODEL,
+            contents=[types.Content(role="user", parts=parts)],
+            config=types.GenerateContentConfig(
+                temperature=temperature,
+                response_modalities=["IMAGE", "TEXT"],
+                image_config=types.ImageConfig(
+                    aspect_ratio=aspect_ratio,
+                    image_size=resolution,
                 ),
-            )
-            img = _extract_image_from_response(response)
-            if img is not None:
-                return img
-            logger.warning(
-                "[MULTI_FACE_SWAP] 동시 스왑 응답에 이미지 없음 (시도 %d)", attempt + 1
-            )
-
-        except Exception as e:
-            error_str = str(e).lower()
-            is_retryable = any(
-                kw in error_str for kw in ("429", "rate", "503", "overload", "timeout")
-            )
-
-            if not is_retryable:
-                logger.error("[MULTI_FACE_SWAP] 동시 스왑 비재시도 에러: %s", e)
-                return None
+            ),
+        )
 
-            if attempt < max_api_retries - 1:
-                wait_time = (attempt + 1) * 5
-                logger.warning(
-                    "[MULTI_FACE_SWAP] 동시 스왑 API 에러 (재시도 %d/%d, %ds 대기): %s",
-                    attempt + 1,
-                    max_api_retries,
-                    wait_time,
-                    e,
-                )
-                time.sleep(wait_time)
-            else:
-                logger.error("[MULTI_FACE_SWAP] 동시 스왑 최대 재시도 초과: %s", e)
+    # API 에러 재시도/키 교체/백오프는 공유 재시도 정책이 처리
+    try:
+        response = get_retry_policy().call_client(
+            client,
+            _request,
+            action="동시 스왑",
+            max_attempts=max_api_retries,
+        )
+    except Exception as e:
+        logger.error("[MULTI_FACE_SWAP] 동시 스왑 API 에러: %s", e)
+        return None
 
-    return None
+    img = _extract_image_from_response(response)
+    if img is None:
+        logger.warning("[MULTI_FACE_SWAP] 동시 스왑 응답에 이미지 없음")
+    return img
 
 
 def _generate_sequential(
@@ -281,8 +272,8 @@ def _generate_sequential(
         for face_img in entry["face_images"][:3]:
             parts.append(_pil_to_part(face_img))
 
-        try:
-            response = client.models.generate_content(
+        def _request(api_client: Any, parts=parts) -> Any:
+            return api_client.models.generate_content(
                 model=IMAGE_MODEL,
                 contents=[types.Content(role="user", parts=parts)],
                 config=types.GenerateContentConfig(
@@ -294,6 +285,11 @@ def _generate_sequential(
                     ),
                 ),
             )
+
+        try:
+            response = get_retry_policy().call_client(
+                client, _request, action="순차 스왑"
+            )
             result_img = _extract_image_from_response(response)
             if result_img is not None:
                 current_image = result_img
@@ -383,8 +379,10 @@ def generate_multi_swap(
     source_img = _load_image(source_image)
 
     # ── STEP 3: 인물 감지 (11명 이상이면 ValueError)
+    # 감지/분석 호출은 생성 단계 태그 안에서 불려도 analysis로 기록
     logger.info("[MULTI_FACE_SWAP] STEP 1 — 인물 감지 시작")
-    detected_faces = detect_faces(source_image, client)
+    with telemetry_context(step=STEP_ANALYSIS):
+        detected_faces = detect_faces(source_image, client)
     logger.info("[MULTI_FACE_SWAP] STEP 1 — %d명 감지 완료", len(detected_faces))
 
     # ── STEP 4: 얼굴 매핑
@@ -399,11 +397,13 @@ def generate_multi_swap(
 
     # ── STEP 5: 단체 사진 장면 분석
     logger.info("[MULTI_FACE_SWAP] STEP 3 — 단체 사진 컨텍스트 분석")
-    group_analysis = analyze_group_photo(source_image, detected_faces, client)
+    with telemetry_context(step=STEP_ANALYSIS):
+        group_analysis = analyze_group_photo(source_image, detected_faces, client)
 
     # ── STEP 6: 교체 얼굴 특징 분석
     logger.info("[MULTI_FACE_SWAP] STEP 4 — 교체 얼굴 분석")
-    face_analyses = analyze_replacement_faces(face_mapping, client)
+    with telemetry_context(step=STEP_ANALYSIS):
+        face_analyses = analyze_replacement_faces(face_mapping, client)
 
     # ── STEP 7: 프롬프트 조립
     logger.info("[MULTI_FACE_SWAP] STEP 5 — 프롬프트 조립")
@@ -443,8 +443,6 @@ def generate_multi_swap(
             return result_img
 
         logger.warning("[MULTI_FACE_SWAP] 동시 스왑 시도 %d 실패", attempt + 1)
-        if attempt < SIMULTANEOUS_ATTEMPTS - 1:
-            time.sleep(3)  # 다음 시도 전 짧은 대기
 
     # ── STEP 9: 동시 스왑 전부 실패 → 순차 스왑 폴백
     logger.warning(
@@ -525,7 +523,7 @@ def generate_with_validation(
     Raises:
         ValueError: 인원 11명 이상, client/api_key 모두 없음, 감지 실패 시
     """
-    from google import genai
+    from core.api import _get_next_api_key
 
     # ── 인원 수 사전 체크
     num_requested = len(face_mapping)
@@ -547,12 +545,10 @@ def generate_with_validation(
     if client is None:
         if api_key is None:
             try:
-                from core.api import get_next_api_key
-
-                api_key = get_next_api_key()
+                api_key = _get_next_api_key()
             except Exception:
                 raise ValueError("client 또는 api_key 중 하나를 제공해야 합니다.")
-        client = genai.Client(api_key=api_key)
+        client = get_client(api_key)
 
     # ── 검증기 초기화
     validator = MultiFaceSwapValidator(client=client)
@@ -585,14 +581,15 @@ def generate_with_validation(
 
         # 생성
         try:
-            generated_img = generate_multi_swap(
-                source_image=source_image,
-                face_mapping=face_mapping,
-                client=client,
-                temperature=attempt_temperature,
-                aspect_ratio=aspect_ratio,
-                resolution=resolution,
-            )
+            with telemetry_context(workflow=WORKFLOW_NAME, step=STEP_GENERATE):
+                generated_img = generate_multi_swap(
+                    source_image=source_image,
+                    face_mapping=face_mapping,
+                    client=client,
+                    temperature=attempt_temperature,
+                    aspect_ratio=aspect_ratio,
+                    resolution=resolution,
+                )
         except ValueError:
             # 인원 수 제한 등 복구 불가 에러 — 즉시 전파
             raise
@@ -607,8 +604,6 @@ def generate_with_validation(
                     "error": str(e),
                 }
             )
-            if attempt < total_attempts - 1:
-                time.sleep((attempt + 1) * 5)
             continue
 
         if generated_img is None:
@@ -622,16 +617,15 @@ def generate_with_validation(
                     "error": "생성 결과 없음",
                 }
             )
-            if attempt < total_attempts - 1:
-                time.sleep((attempt + 1) * 5)
             continue
 
         # 검증
         try:
-            validation_result = validator.validate(
-                generated_img=generated_img,
-                reference_images=reference_images,
-            )
+            with telemetry_context(workflow=WORKFLOW_NAME, step=STEP_VALIDATE):
+                validation_result = validator.validate(
+                    generated_img=generated_img,
+                    reference_images=reference_images,
+                )
         except Exception as e:
             logger.error("[MULTI_FACE_SWAP] 검증 에러 (시도 %d): %s", attempt + 1, e)
             history.append(
@@ -647,8 +641,6 @@ def generate_with_validation(
             if best_score < 0:
                 best_image = generated_img
                 best_score = 0
-            if attempt < total_attempts - 1:
-                time.sleep((attempt + 1) * 5)
             continue
 
         score = validation_result.total_score
@@ -696,7 +688,6 @@ def generate_with_validation(
                 "[MULTI_FACE_SWAP] 재시도 준비 — 실패 기준: %s",
                 failed_criteria,
             )
-            time.sleep((attempt + 1) * 5)
 
     # ── 결과 구성
     # best_result가 없으면 (모든 시도에서 검증 에러) 기본값
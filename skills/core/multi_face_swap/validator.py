@@ -18,15 +18,15 @@ Auto-Fail 조건:
     - 체형 변경됨
 """
 
-import json
 import logging
-from io import BytesIO
 from pathlib import Path
 from typing import Any, Dict, List, Union
 
 from PIL import Image
 
 from core.config import VISION_MODEL
+from core.structured import StructuredOutputError, parse_or_repair
+from core.utils import encode_image_part
 from core.multi_face_swap.templates import VALIDATION_PROMPT
 from core.validators.base import (
     CommonValidationResult,
@@ -42,16 +42,7 @@ logger = logging.getLogger(__name__)
 
 def _pil_to_part(img: Image.Image, max_size: int = 1024):
     """PIL 이미지를 Gemini API Part로 변환"""
-    from google.genai import types
-
-    if max(img.size) > max_size:
-        img = img.copy()
-        img.thumbnail((max_size, max_size), Image.LANCZOS)
-    buf = BytesIO()
-    img.save(buf, format="PNG")
-    return types.Part(
-        inline_data=types.Blob(mime_type="image/png", data=buf.getvalue())
-    )
+    return encode_image_part(img, max_size=max_size)
 
 
 def _load_image(img: Union[str, Path, Image.Image]) -> Image.Image:
@@ -63,16 +54,12 @@ def _load_image(img: Union[str, Path, Image.Image]) -> Image.Image:
     raise TypeError(f"지원하지 않는 이미지 타입: {type(img)}")
 
 
-def _parse_json_response(text: str) -> dict:
-    """VLM 응답에서 JSON 파싱"""
-    if "```json" in text:
-        text = text.split("```json")[1].split("```")[0]
-    elif "```" in text:
-        text = text.split("```")[1].split("```")[0]
+def _parse_json_response(text: str, client: Any = None) -> dict:
+    """VLM 응답에서 JSON 파싱 (client가 있으면 형식 복구 1회)"""
     try:
-        return json.loads(text.strip())
-    except json.JSONDecodeError as e:
-        raise ValueError(f"VLM 응답 JSON 파싱 실패: {e}\n텍스트:\n{text[:400]}")
+        return parse_or_repair(client, text)
+    except StructuredOutputError as e:
+        raise ValueError(f"VLM 응답 JSON 파싱 실패: {e}\n텍스트:\n{(text or '')[:400]}")
 
 
 def _compute_grade(score: int) -> str:
@@ -235,11 +222,11 @@ class MultiFaceSwapValidator(WorkflowValidator):
             contents=[types.Content(role="user", parts=parts)],
             config=types.GenerateContentConfig(
                 temperature=0.1,
-                response_modalities=["TEXT"],
+                response_mime_type="application/json",
             ),
         )
 
-        raw_text = response.candidates[0].content.parts[0].text
+        raw_text = response.text or ""
 
         # 응답 파싱 및 결과 변환
         return self._parse_validation_response(raw_text)
@@ -254,7 +241,7 @@ class MultiFaceSwapValidator(WorkflowValidator):
             CommonValidationResult
         """
         try:
-            data = _parse_json_response(raw_text)
+            data = _parse_json_response(raw_text, self.client)
         except ValueError as e:
             logger.error("[MULTI_FACE_SWAP] 검증 응답 파싱 실패: %s", e)
             # 파싱 실패 시 최저점 반환
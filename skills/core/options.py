@@ -6,9 +6,9 @@
 
 사용법:
     from core.options import (
-        ASPECT_RATIOS, RESOLUTIONS, COST_TABLE,
+        ASPECT_RATIOS, RESOLUTIONS, COST_TABLE, TOKEN_COST_TABLE,
         DEFAULT_ASPECT_RATIO, DEFAULT_RESOLUTION,
-        get_cost, get_resolution_px
+        get_cost, get_token_cost, get_resolution_px
     )
 """
 
@@ -57,6 +57,16 @@ COST_TABLE: Dict[str, int] = {
     "premium": 380,  # 4K (원/장)
 }
 
+# VLM 토큰 비용 (원 / 100만 토큰) - 2026.02 Gemini API 기준
+# 이미지 모델의 출력(이미지)은 COST_TABLE 장당 비용으로 계산하므로 output 0
+TOKEN_COST_TABLE: Dict[str, Dict[str, int]] = {
+    "gemini-3-flash-preview": {"input": 700, "output": 4200},
+    "gemini-3-pro-image-preview": {"input": 2800, "output": 0},
+}
+
+# 표에 없는 모델은 보수적으로 Pro 단가 적용
+DEFAULT_TOKEN_COST: Dict[str, int] = {"input": 2800, "output": 16800}
+
 # 수량별 총 비용 계산 헬퍼
 QUANTITY_PRESETS: List[int] = [1, 3, 5, 10]
 
@@ -136,6 +146,21 @@ def get_cost(resolution: str, quantity: int = 1) -> int:
     return unit_cost * quantity
 
 
+def get_token_cost(model: str, prompt_tokens: int, output_tokens: int = 0) -> float:
+    """모델과 토큰 수에 따른 비용 계산
+
+    Args:
+        model: 모델명 (TOKEN_COST_TABLE 키)
+        prompt_tokens: 입력 토큰 수
+        output_tokens: 출력 토큰 수
+
+    Returns:
+        비용 (원, 소수)
+    """
+    rates = TOKEN_COST_TABLE.get(model, DEFAULT_TOKEN_COST)
+    return (prompt_tokens * rates["input"] + output_tokens * rates["output"]) / 1_000_000
+
+
 def validate_aspect_ratio(aspect_ratio: str) -> bool:
     """비율 유효성 검사
 
@@ -10,6 +10,7 @@ from PIL import Image
 from google import genai
 from google.genai import types
 from core.config import VISION_MODEL
+from core.vlm_cache import cached_generate_text, is_json_response
 import json
 import re
 
@@ -119,12 +120,13 @@ CRITICAL:
 - blind_spot에 AI가 놓치기 쉬운 핵심 특징 반드시 포함
 """
 
-    def analyze(self, outfit_images: List[str]) -> OutfitAnalysis:
+    def analyze(self, outfit_images: List[str], use_cache: bool = True) -> OutfitAnalysis:
         """
         Analyze outfit images and return structured result.
 
         Args:
             outfit_images: List of paths to outfit images
+            use_cache: Reuse cached VLM responses for identical images
 
         Returns:
             OutfitAnalysis with all extracted information
@@ -146,11 +148,15 @@ CRITICAL:
 
         # Call VLM
         try:
-            response = self.client.models.generate_content(
-                model=VISION_MODEL, contents=[self._analysis_prompt, *pil_images]
+            response_text = cached_generate_text(
+                self.client,
+                model=VISION_MODEL,
+                contents=[self._analysis_prompt, *pil_images],
+                use_cache=use_cache,
+                cache_if=is_json_response,
             )
 
-            response_text = response.text.strip()
+            response_text = response_text.strip()
 
             # Parse response
             data = self._parse_response(response_text)
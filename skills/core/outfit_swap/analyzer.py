@@ -5,7 +5,6 @@ Outfit Swap Source Analyzer
 """
 
 import json
-from io import BytesIO
 from typing import Any, Optional
 
 from PIL import Image
@@ -13,19 +12,15 @@ from google import genai
 from google.genai import types
 
 from core.config import VISION_MODEL
+from core.structured import json_config, parse_or_repair
+from core.utils import encode_image_part
+from core.vlm_cache import cached_generate_text, is_json_response
 from .templates import SOURCE_ANALYSIS_PROMPT, OUTFIT_ANALYSIS_PROMPT
 
 
 def pil_to_part(img: Image.Image, max_size: int = 1024) -> types.Part:
     """PIL 이미지를 API Part로 변환"""
-    if max(img.size) > max_size:
-        img = img.copy()
-        img.thumbnail((max_size, max_size), Image.LANCZOS)
-    buf = BytesIO()
-    img.save(buf, format="PNG")
-    return types.Part(
-        inline_data=types.Blob(mime_type="image/png", data=buf.getvalue())
-    )
+    return encode_image_part(img, max_size=max_size)
 
 
 class SourceAnalysisResult:
@@ -136,22 +131,12 @@ def analyze_source(
                 ],
             )
         ],
-        config=types.GenerateContentConfig(
-            temperature=0.1,
-            response_modalities=["TEXT"],
-        ),
+        config=json_config(temperature=0.1),
     )
 
-    text = response.candidates[0].content.parts[0].text
-
-    # JSON 파싱
-    if "```json" in text:
-        text = text.split("```json")[1].split("```")[0]
-    elif "```" in text:
-        text = text.split("```")[1].split("```")[0]
-
+    # JSON 파싱 (형식 오류면 복구 1회)
     try:
-        data = json.loads(text.strip())
+        data = parse_or_repair(client, response.text)
     except json.JSONDecodeError:
         # 기본값 반환
         data = {
@@ -192,6 +177,7 @@ def analyze_source_from_path(
 def analyze_source_for_swap(
     source_image: "Image.Image | str",
     client: Any,
+    use_cache: bool = True,
 ) -> dict:
     """
     소스 이미지를 분석하여 착장 스왑 시 보존해야 할 요소를 추출
@@ -202,6 +188,7 @@ def analyze_source_for_swap(
     Args:
         source_image: PIL 이미지 객체 또는 이미지 파일 경로
         client: Gemini API 클라이언트 (genai.Client)
+        use_cache: VLM 응답 캐시 사용 여부
 
     Returns:
         dict with keys:
@@ -217,7 +204,8 @@ def analyze_source_for_swap(
         pil_img = source_image
 
     # VLM 호출 — SOURCE_ANALYSIS_PROMPT 사용
-    response = client.models.generate_content(
+    text = cached_generate_text(
+        client,
         model=VISION_MODEL,
         contents=[
             types.Content(
@@ -228,22 +216,14 @@ def analyze_source_for_swap(
                 ],
             )
         ],
-        config=types.GenerateContentConfig(
-            temperature=0.1,
-            response_modalities=["TEXT"],
-        ),
-    )
-
-    text = response.candidates[0].content.parts[0].text
-
-    # JSON 파싱
-    if "```json" in text:
-        text = text.split("```json")[1].split("```")[0]
-    elif "```" in text:
-        text = text.split("```")[1].split("```")[0]
+        config=json_config(temperature=0.1),
+        use_cache=use_cache,
+        cache_if=is_json_response,
+    ) or ""
 
+    # JSON 파싱 (형식 오류면 복구 1회)
     try:
-        raw = json.loads(text.strip())
+        raw = parse_or_repair(client, text)
     except json.JSONDecodeError:
         raw = {}
 
@@ -297,6 +277,7 @@ def analyze_source_for_swap(
 def analyze_outfit_items(
     outfit_images: "list[Image.Image | str]",
     client: Any,
+    use_cache: bool = True,
 ) -> list[dict]:
     """
     착장 이미지 목록을 개별 분석하여 아이템 정보를 반환
@@ -307,6 +288,7 @@ def analyze_outfit_items(
     Args:
         outfit_images: PIL 이미지 또는 파일 경로 목록 (최대 10개)
         client: Gemini API 클라이언트 (genai.Client)
+        use_cache: VLM 응답 캐시 사용 여부
 
     Returns:
         list of dicts, each with keys:
@@ -336,7 +318,8 @@ def analyze_outfit_items(
 
         # VLM 호출 — OUTFIT_ANALYSIS_PROMPT 사용
         try:
-            response = client.models.generate_content(
+            text = cached_generate_text(
+                client,
                 model=VISION_MODEL,
                 contents=[
                     types.Content(
@@ -347,21 +330,13 @@ def analyze_outfit_items(
                         ],
                     )
                 ],
-                config=types.GenerateContentConfig(
-                    temperature=0.1,
-                    response_modalities=["TEXT"],
-                ),
+                config=json_config(temperature=0.1),
+                use_cache=use_cache,
+                cache_if=is_json_response,
             )
 
-            text = response.candidates[0].content.parts[0].text
-
-            # JSON 파싱
-            if "```json" in text:
-                text = text.split("```json")[1].split("```")[0]
-            elif "```" in text:
-                text = text.split("```")[1].split("```")[0]
-
-            raw = json.loads(text.strip())
+            # JSON 파싱 (형식 오류면 복구 1회)
+            raw = parse_or_repair(client, text)
 
         except json.JSONDecodeError:
             print(f"[outfit_swap] 착장 {idx + 1} JSON 파싱 실패, 폴백 사용")
@@ -13,20 +13,24 @@ Pass 기준: total_score >= 92
 착장 이미지 최대: 10개
 """
 
-import time
 from io import BytesIO
 from typing import Any, Optional
 
 from PIL import Image
-from google import genai
 from google.genai import types
 
 from core.config import IMAGE_MODEL
-from core.api import _get_next_api_key
+from core.api import _get_next_api_key, get_client
+from core.retry_policy import get_retry_policy
 from core.options import detect_aspect_ratio
+from core.validators.base import ReferenceBundle, WorkflowType
+from core.validators.prefilter import build_prefilter
+from core.validators.registry import ValidatorRegistry
+from core.generators.prefetch import AttemptPrefetcher
+from core.telemetry import STEP_GENERATE, STEP_VALIDATE, telemetry_context
 from .analyzer import analyze_source_for_swap, analyze_outfit_items, pil_to_part
 from .prompt_builder import build_outfit_swap_prompt
-from .validator import OutfitSwapValidator, PASS_TOTAL, ENHANCEMENT_RULES
+from .validator import PASS_TOTAL, ENHANCEMENT_RULES
 
 
 # ============================================================
@@ -94,8 +98,8 @@ def _generate_single(
         )
         parts.append(pil_to_part(outfit_img))
 
-    try:
-        response = client.models.generate_content(
+    def _request(api_client: Any) -> Any:
+        return api_client.models.generate_content(
             model=IMAGE_MODEL,
             contents=[types.Content(role="user", parts=parts)],
             config=types.GenerateContentConfig(
@@ -108,6 +112,12 @@ def _generate_single(
             ),
         )
 
+    try:
+        # API 에러 재시도/429 키 교체는 공유 재시도 정책이 처리
+        response = get_retry_policy().call_client(
+            client, _request, action="outfit_swap 생성"
+        )
+
         # 이미지 파트 추출
         for part in response.candidates[0].content.parts:
             if part.inline_data:
@@ -249,6 +259,8 @@ def generate_with_validation(
     temperature: float = 0.2,
     aspect_ratio: str = "3:4",
     resolution: str = "2K",
+    use_prefilter: bool = True,
+    pipelined: bool = False,
 ) -> dict:
     """
     착장 스왑 이미지 생성 + 검증 루프 (공개 API)
@@ -270,6 +282,9 @@ def generate_with_validation(
         temperature: 생성 온도 (기본값 0.2)
         aspect_ratio: 이미지 비율 (기본값 "3:4")
         resolution: 해상도 (기본값 "2K")
+        use_prefilter: 검수 전 로컬 사전 필터 사용 여부 (기본값 True)
+        pipelined: 시도 N 검수 중에 시도 N+1을 미리 생성 (기본값 False)
+            N이 통과하면 N+1은 버리고, 실패하면 N+1을 다음 시도로 사용
 
     Returns:
         dict with keys:
@@ -300,11 +315,17 @@ def generate_with_validation(
     # 클라이언트 초기화
     if client is None:
         key = api_key or _get_next_api_key()
-        client = genai.Client(api_key=key)
+        client = get_client(key)
 
-    # 소스/착장 이미지 로드
-    source_pil = _load_image(source_image)
-    outfit_pils = [_load_image(img) for img in outfit_images]
+    # 소스/착장 이미지 로드 (1회만 - 모든 시도의 생성/검수가 같은 인코딩 재사용)
+    references = ReferenceBundle(
+        {
+            "source": [_load_image(source_image)],
+            "outfit": [_load_image(img) for img in outfit_images],
+        }
+    )
+    source_pil = references.first("source")
+    outfit_pils = references.images("outfit")
 
     history = []
     last_generated: Optional[Image.Image] = None
@@ -327,60 +348,92 @@ def generate_with_validation(
     print(f"[outfit_swap] 프롬프트 완성 ({len(base_prompt)}자)")
 
     # 검증기 초기화
-    validator = OutfitSwapValidator(client)
+    validator = ValidatorRegistry.get(WorkflowType.OUTFIT_SWAP, client)
+    prefilter = build_prefilter(WorkflowType.OUTFIT_SWAP) if use_prefilter else None
 
     # 4. 생성 + 검수 루프
     current_prompt = base_prompt
     current_temperature = temperature
     failed_criteria: list = []
 
+    workflow_name = WorkflowType.OUTFIT_SWAP.value
+
+    def generate(prompt: str, temp: float, gen_client: Any) -> Optional[Image.Image]:
+        # 프리페치 스레드에서도 태그가 붙도록 함수 안에서 컨텍스트 지정
+        with telemetry_context(workflow=workflow_name, step=STEP_GENERATE):
+            return _generate_single(
+                source_image=source_pil,
+                outfit_images=outfit_pils,
+                prompt=prompt,
+                client=gen_client,
+                temperature=temp,
+                aspect_ratio=aspect_ratio,
+                resolution=resolution,
+            )
+
+    # 파이프라인 모드: 검수 중에 다음 시도를 미리 생성
+    prefetcher = AttemptPrefetcher(max_retries, enabled=pipelined)
+
     for attempt in range(max_retries + 1):
         print(f"\n[outfit_swap] 시도 {attempt + 1}/{max_retries + 1}...")
 
         # 키 로테이션 (1회 이상 재시도 시)
         if attempt > 0:
-            client = genai.Client(api_key=_get_next_api_key())
-            validator = OutfitSwapValidator(client)
+            client = get_client()
+            validator = ValidatorRegistry.get(WorkflowType.OUTFIT_SWAP, client)
             # 실패 기준 기반 프롬프트 강화
             current_prompt = _build_enhanced_prompt(base_prompt, failed_criteria)
             # 온도 미세 조정 (너무 높지 않게)
             current_temperature = min(current_temperature + 0.05, 0.4)
 
-        # 생성
-        generated = _generate_single(
-            source_image=source_pil,
-            outfit_images=outfit_pils,
-            prompt=current_prompt,
-            client=client,
-            temperature=current_temperature,
-            aspect_ratio=aspect_ratio,
-            resolution=resolution,
-        )
+        # 생성 (이전 시도 검수 중에 미리 생성된 이미지가 있으면 사용)
+        prefetched = prefetcher.take(attempt)
+        if prefetched is not None:
+            print(f"  [Prefetch] 미리 생성된 이미지 사용 (온도 {prefetched.temperature:.2f})")
+            generated = prefetched.image
+        else:
+            generated = generate(current_prompt, current_temperature, client)
 
         if generated is None:
             history.append({"attempt": attempt + 1, "status": "generation_failed"})
             print(f"  [FAIL] 생성 실패")
-            # 재시도 전 대기
-            if attempt < max_retries:
-                wait = (attempt + 1) * 5
-                print(f"  {wait}초 대기 후 재시도...")
-                time.sleep(wait)
             continue
 
+        # 다음 시도를 현재 프롬프트 + 다음 온도로 미리 생성 (다른 키로 로테이션)
+        if pipelined:
+            next_temperature = min(current_temperature + 0.05, 0.4)
+            prefetcher.start(
+                attempt + 1,
+                next_temperature,
+                generate,
+                current_prompt,
+                next_temperature,
+                get_client(),
+            )
+
+        # 로컬 사전 필터 - 빈 이미지/중복/배경 미보존은 검수 없이 재생성
+        if prefilter:
+            precheck = prefilter.check(generated, references, aspect_ratio=aspect_ratio)
+            if not precheck.passed:
+                history.append(
+                    {
+                        "attempt": attempt + 1,
+                        "status": "prefilter_rejected",
+                        **precheck.to_history(),
+                    }
+                )
+                continue
+
         last_generated = generated
 
         # 검수
         print("[outfit_swap] 검수 중...")
         try:
-            from pathlib import Path as _Path
-
-            validation_result = validator.validate(
-                generated_img=generated,
-                reference_images={
-                    "source": [source_pil],
-                    "outfit": outfit_pils,
-                },
-            )
+            with telemetry_context(workflow=workflow_name, step=STEP_VALIDATE):
+                validation_result = validator.validate(
+                    generated_img=generated,
+                    reference_images=references,
+                )
 
             score = validation_result.total_score
             passed = validation_result.passed
@@ -412,6 +465,7 @@ def generate_with_validation(
                     "passed": passed,
                     "criteria": criteria,
                     "issues": issues + auto_fail_reasons,
+                    "prefetched": prefetched is not None,
                 }
             )
 
@@ -421,6 +475,7 @@ def generate_with_validation(
 
             if passed:
                 print(f"[outfit_swap] 검수 통과 (시도 {attempt + 1})")
+                prefetcher.discard()
                 return {
                     "image": generated,
                     "score": score,
@@ -441,13 +496,8 @@ def generate_with_validation(
                 }
             )
 
-        # 재시도 전 대기
-        if attempt < max_retries:
-            wait = (attempt + 1) * 5
-            print(f"  {wait}초 대기 후 재시도...")
-            time.sleep(wait)
-
     # 최대 재시도 후에도 미통과 - 마지막 결과 반환
+    prefetcher.discard()
     print(f"[outfit_swap] 최대 재시도 초과. 마지막 이미지 반환.")
     return {
         "image": last_generated,
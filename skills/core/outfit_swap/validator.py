@@ -16,7 +16,6 @@ Pass 조건: total_score >= 92 AND 각 필수 기준 통과
 import json
 from dataclasses import dataclass, field
 from enum import Enum
-from io import BytesIO
 from pathlib import Path
 from typing import Any, Dict, List, Optional, Union
 
@@ -25,6 +24,8 @@ from google import genai
 from google.genai import types
 
 from core.config import VISION_MODEL
+from core.structured import json_config, parse_or_repair
+from core.utils import encode_image_part
 from core.validators.base import (
     CommonValidationResult,
     QualityTier,
@@ -198,21 +199,11 @@ class OutfitSwapValidator(WorkflowValidator):
             response = self.client.models.generate_content(
                 model=VISION_MODEL,
                 contents=[types.Content(role="user", parts=parts)],
-                config=types.GenerateContentConfig(
-                    temperature=0.1,
-                    response_modalities=["TEXT"],
-                ),
+                config=json_config(temperature=0.1),
             )
 
-            response_text = response.candidates[0].content.parts[0].text.strip()
-
-            # JSON 블록 추출
-            if "```json" in response_text:
-                response_text = response_text.split("```json")[1].split("```")[0]
-            elif "```" in response_text:
-                response_text = response_text.split("```")[1].split("```")[0]
-
-            data = json.loads(response_text.strip())
+            # JSON 파싱 (형식 오류면 복구 1회)
+            data = parse_or_repair(self.client, response.text)
 
         except json.JSONDecodeError as e:
             print(f"[OutfitSwapValidator] JSON 파싱 실패: {e}")
@@ -419,16 +410,7 @@ class OutfitSwapValidator(WorkflowValidator):
 
     def _pil_to_part(self, img: Image.Image, max_size: int = 1024) -> types.Part:
         """PIL Image를 Gemini API Part로 변환"""
-        if max(img.size) > max_size:
-            img = img.copy()
-            img.thumbnail((max_size, max_size), Image.LANCZOS)
-
-        buffer = BytesIO()
-        img.save(buffer, format="PNG")
-
-        return types.Part(
-            inline_data=types.Blob(mime_type="image/png", data=buffer.getvalue())
-        )
+        return encode_image_part(img, max_size=max_size)
 
 
 # ============================================================
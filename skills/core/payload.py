@@ -0,0 +1,342 @@
+"""
+요청 페이로드 인코더 - 레퍼런스 역할별 포맷/품질/해상도 선택 + 요청 단위 바이트 예산
+
+생성 요청 하나에 얼굴/착장/포즈/배경/스타일 레퍼런스가 8~12장씩 실리므로
+업로드 크기가 지연시간을 좌우한다. 역할마다 필요한 디테일이 다르므로
+(얼굴/착장 디테일은 무손실 우선, 포즈/배경은 손실 압축으로 충분)
+역할별 인코딩 단계(ladder)를 두고, 요청 전체가 예산을 넘으면
+덜 중요한 역할부터 한 단계씩 낮춰 예산 안에 맞춘다.
+
+- 인코딩은 core.utils.encode_image_part 캐시를 공유 (재시도 시 재인코딩 없음)
+- 예산: config.REQUEST_BYTE_BUDGET (환경변수 FNF_REQUEST_BYTE_BUDGET_MB)
+- 결과 리포트: 역할별 포맷/품질/크기, 총 바이트, 절감 바이트
+
+사용법:
+    from core.payload import PayloadBuilder
+
+    parts = PayloadBuilder()
+    parts.append(types.Part(text="[FACE 1]"))
+    parts.add_image(face_img, role="face")
+    parts.append(types.Part(text=prompt))
+    contents = [types.Content(role="user", parts=parts.build())]
+    print(parts.report.summary())
+"""
+
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Union
+
+from PIL import Image
+from google.genai import types
+
+from core.config import REQUEST_BYTE_BUDGET
+from core.utils import encode_image_part
+
+
+# ============================================================
+# 역할별 인코딩 단계
+# ============================================================
+
+
+@dataclass(frozen=True)
+class EncodeStep:
+    """인코딩 단계 하나 (포맷, 품질, 긴 변 최대 크기)"""
+
+    image_format: str
+    quality: Optional[int]
+    max_size: int
+
+
+# 첫 단계가 예산이 충분할 때의 기본 인코딩. 뒤로 갈수록 작아진다.
+ROLE_LADDERS: Dict[str, List[EncodeStep]] = {
+    # 얼굴: 동일인 판정에 피부/이목구비 디테일이 중요 → 무손실 우선, 해상도는 최후에 낮춤
+    "face": [
+        EncodeStep("PNG", None, 1024),
+        EncodeStep("WEBP", 95, 1024),
+        EncodeStep("JPEG", 92, 1024),
+        EncodeStep("WEBP", 90, 896),
+        EncodeStep("JPEG", 88, 768),
+    ],
+    # 착장: 로고/텍스트/소재 디테일 → 얼굴과 같은 수준
+    "outfit": [
+        EncodeStep("PNG", None, 1024),
+        EncodeStep("WEBP", 95, 1024),
+        EncodeStep("JPEG", 92, 1024),
+        EncodeStep("WEBP", 88, 896),
+        EncodeStep("JPEG", 85, 768),
+    ],
+    # 표정: 얼굴 영역만 참고 → 얼굴보다 먼저 낮춤
+    "expression": [
+        EncodeStep("JPEG", 92, 1024),
+        EncodeStep("WEBP", 88, 896),
+        EncodeStep("JPEG", 85, 768),
+        EncodeStep("WEBP", 80, 640),
+    ],
+    # 포즈: 실루엣/앵글/프레이밍만 필요 → 손실 압축 + 낮은 해상도로 충분
+    "pose": [
+        EncodeStep("JPEG", 90, 1024),
+        EncodeStep("WEBP", 85, 768),
+        EncodeStep("JPEG", 80, 640),
+        EncodeStep("WEBP", 75, 512),
+    ],
+    # 배경: 장소/조명/색감 → 손실 압축으로 충분
+    "background": [
+        EncodeStep("JPEG", 90, 1024),
+        EncodeStep("WEBP", 85, 1024),
+        EncodeStep("WEBP", 80, 768),
+        EncodeStep("JPEG", 75, 640),
+    ],
+    # 스타일: 무드/조명만 참고
+    "style": [
+        EncodeStep("JPEG", 88, 1024),
+        EncodeStep("WEBP", 82, 768),
+        EncodeStep("JPEG", 75, 640),
+        EncodeStep("WEBP", 70, 512),
+    ],
+    # 역할 미지정 레퍼런스 (core.api generate_image 등)
+    "reference": [
+        EncodeStep("JPEG", 90, 2048),
+        EncodeStep("WEBP", 88, 1536),
+        EncodeStep("JPEG", 85, 1024),
+        EncodeStep("WEBP", 80, 768),
+    ],
+}
+
+# 예산 초과 시 낮추는 우선순위 가중치 (클수록 먼저 낮춤)
+ROLE_WEIGHTS: Dict[str, float] = {
+    "background": 1.0,
+    "style": 1.0,
+    "pose": 0.8,
+    "expression": 0.6,
+    "reference": 0.5,
+    "outfit": 0.3,
+    "face": 0.2,
+}
+
+ImageInput = Union[str, Path, Image.Image]
+
+
+@dataclass
+class _ImageEntry:
+    position: int
+    image: ImageInput
+    role: str
+    ladder: List[EncodeStep]
+    step: int = 0
+    part: Optional[types.Part] = None
+
+    @property
+    def size(self) -> int:
+        return len(self.part.inline_data.data) if self.part is not None else 0
+
+    @property
+    def current(self) -> EncodeStep:
+        return self.ladder[self.step]
+
+    def can_degrade(self) -> bool:
+        return self.step < len(self.ladder) - 1
+
+
+@dataclass
+class PayloadReport:
+    """인코딩 결과 리포트"""
+
+    budget_bytes: int
+    total_bytes: int = 0
+    text_bytes: int = 0
+    baseline_bytes: int = 0
+    items: List[Dict] = field(default_factory=list)
+
+    @property
+    def image_bytes(self) -> int:
+        return self.total_bytes - self.text_bytes
+
+    @property
+    def saved_bytes(self) -> int:
+        return max(0, self.baseline_bytes - self.image_bytes)
+
+    @property
+    def within_budget(self) -> bool:
+        return self.total_bytes <= self.budget_bytes
+
+    @property
+    def degraded_count(self) -> int:
+        return sum(1 for item in self.items if item["step"] > 0)
+
+    def to_dict(self) -> Dict:
+        return {
+            "budget_bytes": self.budget_bytes,
+            "total_bytes": self.total_bytes,
+            "image_bytes": self.image_bytes,
+            "baseline_bytes": self.baseline_bytes,
+            "saved_bytes": self.saved_bytes,
+            "within_budget": self.within_budget,
+            "items": self.items,
+        }
+
+    def summary(self) -> str:
+        mb = 1024 * 1024
+        return (
+            f"[Payload] {len(self.items)} images {self.total_bytes / mb:.2f}MB"
+            f" / budget {self.budget_bytes / mb:.2f}MB"
+            f" (saved {self.saved_bytes / mb:.2f}MB, degraded {self.degraded_count})"
+        )
+
+
+class PayloadBuilder:
+    """텍스트/이미지 Part를 순서대로 모아 예산 안에서 인코딩
+
+    list처럼 append/extend로 임의 Part를 넣을 수 있고, 이미지는 add_image로
+    역할과 함께 넣는다. build() 시점에 전체 크기를 보고 인코딩 단계를 정한다.
+
+    Args:
+        byte_budget: 요청 전체 바이트 예산 (None이면 config.REQUEST_BYTE_BUDGET)
+        measure_baseline: True면 기존 방식(PNG 1024) 인코딩 크기를 따로 측정해
+            절감량 기준으로 사용. False면 역할별 첫 단계 크기를 기준으로 사용
+        verbose: 단계를 낮췄을 때 요약 출력
+    """
+
+    LEGACY_MAX_SIZE = 1024
+
+    def __init__(
+        self,
+        byte_budget: Optional[int] = None,
+        measure_baseline: bool = False,
+        verbose: bool = True,
+    ):
+        self.byte_budget = byte_budget if byte_budget is not None else REQUEST_BYTE_BUDGET
+        self.measure_baseline = measure_baseline
+        self.verbose = verbose
+        self._parts: List[Optional[types.Part]] = []
+        self._images: List[_ImageEntry] = []
+        self.report = PayloadReport(budget_bytes=self.byte_budget)
+
+    def __len__(self) -> int:
+        return len(self._parts)
+
+    def append(self, part: types.Part) -> None:
+        """이미 만들어진 Part 추가 (텍스트 등, 예산 계산에 포함)"""
+        self._parts.append(part)
+
+    def extend(self, parts: Sequence[types.Part]) -> None:
+        for part in parts:
+            self.append(part)
+
+    def add_image(
+        self,
+        image: ImageInput,
+        role: str = "reference",
+        max_size: Optional[int] = None,
+    ) -> None:
+        """역할이 지정된 이미지 추가
+
+        Args:
+            image: 이미지 경로 또는 PIL Image
+            role: ROLE_LADDERS 키 (face/outfit/expression/pose/background/style/reference)
+            max_size: 호출부 해상도 상한 (역할 단계의 max_size보다 작으면 적용)
+        """
+        if role not in ROLE_LADDERS:
+            raise ValueError(f"Unknown payload role: {role} (available: {list(ROLE_LADDERS)})")
+
+        ladder = ROLE_LADDERS[role]
+        if max_size is not None:
+            ladder = [
+                EncodeStep(s.image_format, s.quality, min(s.max_size, max_size))
+                for s in ladder
+            ]
+
+        self._images.append(
+            _ImageEntry(position=len(self._parts), image=image, role=role, ladder=ladder)
+        )
+        self._parts.append(None)
+
+    # ------------------------------------------------------------
+    # 인코딩
+    # ------------------------------------------------------------
+
+    @staticmethod
+    def _encode(entry: _ImageEntry) -> None:
+        step = entry.current
+        entry.part = encode_image_part(
+            entry.image,
+            max_size=step.max_size,
+            image_format=step.image_format,
+            quality=step.quality,
+            convert_rgb=True,
+        )
+
+    def _text_bytes(self) -> int:
+        total = 0
+        for part in self._parts:
+            if part is None:
+                continue
+            if part.text is not None:
+                total += len(part.text.encode("utf-8"))
+            elif part.inline_data is not None and part.inline_data.data:
+                total += len(part.inline_data.data)
+        return total
+
+    def build(self) -> List[types.Part]:
+        """예산에 맞춰 이미지를 인코딩하고 최종 Part 목록 반환
+
+        예산을 넘으면 (현재 크기 × 역할 가중치)가 가장 큰 이미지부터
+        한 단계씩 낮춘다. 모든 이미지가 마지막 단계여도 넘으면 그대로 반환하고
+        report.within_budget=False로 표시한다.
+        """
+        for entry in self._images:
+            entry.step = 0
+            self._encode(entry)
+
+        fixed_bytes = self._text_bytes()
+        baseline = sum(entry.size for entry in self._images)
+        total = fixed_bytes + baseline
+
+        while total > self.byte_budget:
+            candidates = [e for e in self._images if e.can_degrade()]
+            if not candidates:
+                break
+            target = max(candidates, key=lambda e: e.size * ROLE_WEIGHTS.get(e.role, 0.5))
+            before = target.size
+            target.step += 1
+            self._encode(target)
+            total += target.size - before
+
+        if self.measure_baseline:
+            baseline = sum(
+                len(
+                    encode_image_part(
+                        entry.image, max_size=self.LEGACY_MAX_SIZE, convert_rgb=True
+                    ).inline_data.data
+                )
+                for entry in self._images
+            )
+
+        parts = list(self._parts)
+        for entry in self._images:
+            parts[entry.position] = entry.part
+
+        self.report = PayloadReport(
+            budget_bytes=self.byte_budget,
+            total_bytes=total,
+            text_bytes=fixed_bytes,
+            baseline_bytes=baseline,
+            items=[
+                {
+                    "role": entry.role,
+                    "format": entry.current.image_format,
+                    "quality": entry.current.quality,
+                    "max_size": entry.current.max_size,
+                    "step": entry.step,
+                    "bytes": entry.size,
+                }
+                for entry in self._images
+            ],
+        )
+
+        if self.verbose and (self.report.degraded_count or not self.report.within_budget):
+            print(self.report.summary())
+            if not self.report.within_budget:
+                print("[Payload] WARNING: 최저 단계로도 예산 초과")
+
+        return parts
+
@@ -5,15 +5,14 @@
 목표 포즈의 물리적 타당성을 검증한다.
 """
 
-import json
-import re
-from io import BytesIO
 from typing import Any, Union
 
 from PIL import Image
 from google.genai import types
 
 from core.config import VISION_MODEL
+from core.structured import extract_json
+from core.utils import encode_image_part
 from .templates import SOURCE_ANALYSIS_PROMPT
 
 
@@ -24,14 +23,7 @@ from .templates import SOURCE_ANALYSIS_PROMPT
 
 def _pil_to_part(img: Image.Image, max_size: int = 1024) -> types.Part:
     """PIL 이미지를 Gemini API Part로 변환 (크기 제한 포함)."""
-    if max(img.size) > max_size:
-        img = img.copy()
-        img.thumbnail((max_size, max_size), Image.LANCZOS)
-    buf = BytesIO()
-    img.save(buf, format="PNG")
-    return types.Part(
-        inline_data=types.Blob(mime_type="image/png", data=buf.getvalue())
-    )
+    return encode_image_part(img, max_size=max_size)
 
 
 def _load_image(image: Union[str, Image.Image]) -> Image.Image:
@@ -43,26 +35,7 @@ def _load_image(image: Union[str, Image.Image]) -> Image.Image:
 
 def _parse_json_response(text: str) -> dict:
     """VLM 응답에서 JSON 추출 및 파싱."""
-    # 마크다운 코드 블록 제거
-    json_match = re.search(r"```(?:json)?\s*(\{.*?\})\s*```", text, re.DOTALL)
-    if json_match:
-        text = json_match.group(1)
-    elif "```json" in text:
-        text = text.split("```json")[1].split("```")[0]
-    elif "```" in text:
-        text = text.split("```")[1].split("```")[0]
-
-    text = text.strip()
-
-    try:
-        return json.loads(text)
-    except json.JSONDecodeError:
-        # JSON 객체 직접 추출 시도
-        start_idx = text.find("{")
-        end_idx = text.rfind("}")
-        if start_idx != -1 and end_idx != -1 and start_idx < end_idx:
-            return json.loads(text[start_idx : end_idx + 1])
-        raise
+    return extract_json(text)
 
 
 # =============================================================================
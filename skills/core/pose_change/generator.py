@@ -11,11 +11,11 @@ from io import BytesIO
 from typing import Any, Union
 
 from PIL import Image
-from google import genai
 from google.genai import types
 
 from core.config import IMAGE_MODEL
-from core.api import _get_next_api_key
+from core.utils import encode_image_part
+from core.api import _get_next_api_key, get_client
 from .analyzer import analyze_source_for_pose_change, validate_target_pose
 from .prompt_builder import build_pose_change_prompt
 from .presets import POSE_PRESETS, get_pose_description
@@ -29,14 +29,7 @@ from .validator import PoseChangeValidator
 
 def _pil_to_part(img: Image.Image, max_size: int = 1024) -> types.Part:
     """PIL 이미지를 Gemini API Part로 변환 (크기 제한 포함)."""
-    if max(img.size) > max_size:
-        img = img.copy()
-        img.thumbnail((max_size, max_size), Image.LANCZOS)
-    buf = BytesIO()
-    img.save(buf, format="PNG")
-    return types.Part(
-        inline_data=types.Blob(mime_type="image/png", data=buf.getvalue())
-    )
+    return encode_image_part(img, max_size=max_size)
 
 
 def _load_image(image: Union[str, Image.Image]) -> Image.Image:
@@ -224,7 +217,7 @@ def generate_with_validation(
     if client is None:
         if api_key is None:
             api_key = _get_next_api_key()
-        client = genai.Client(api_key=api_key)
+        client = get_client(api_key)
 
     # Temperature 시퀀스
     temperature_schedule = [0.2, 0.15, 0.1]
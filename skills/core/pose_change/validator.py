@@ -14,7 +14,6 @@
 """
 
 import json
-from io import BytesIO
 from typing import Any, Dict, List, Union
 from pathlib import Path
 
@@ -22,6 +21,8 @@ from PIL import Image
 from google.genai import types
 
 from core.config import VISION_MODEL
+from core.structured import parse_or_repair
+from core.utils import encode_image_part
 from core.validators.base import (
     CommonValidationResult,
     QualityTier,
@@ -35,23 +36,12 @@ from core.pose_change.templates import VALIDATION_PROMPT
 
 def _pil_to_part(img: Image.Image, max_size: int = 1024) -> types.Part:
     """PIL 이미지를 Gemini API Part로 변환 (크기 제한 포함)."""
-    if max(img.size) > max_size:
-        img = img.copy()
-        img.thumbnail((max_size, max_size), Image.LANCZOS)
-    buf = BytesIO()
-    img.save(buf, format="PNG")
-    return types.Part(
-        inline_data=types.Blob(mime_type="image/png", data=buf.getvalue())
-    )
+    return encode_image_part(img, max_size=max_size)
 
 
-def _parse_json_response(text: str) -> dict:
-    """VLM 응답에서 JSON 추출 및 파싱."""
-    if "```json" in text:
-        text = text.split("```json")[1].split("```")[0]
-    elif "```" in text:
-        text = text.split("```")[1].split("```")[0]
-    return json.loads(text.strip())
+def _parse_json_response(text: str, client: Any = None) -> dict:
+    """VLM 응답에서 JSON 추출 및 파싱 (client가 있으면 형식 복구 1회)."""
+    return parse_or_repair(client, text)
 
 
 def _compute_total_score(scores: Dict[str, int], weights: Dict[str, float]) -> int:
@@ -314,12 +304,11 @@ class PoseChangeValidator(WorkflowValidator):
             contents=contents,
             config=types.GenerateContentConfig(
                 temperature=0.1,
-                response_modalities=["TEXT"],
+                response_mime_type="application/json",
             ),
         )
 
-        text = response.candidates[0].content.parts[0].text
-        return _parse_json_response(text)
+        return _parse_json_response(response.text, self.client)
 
     def _build_summary_kr(
         self,
@@ -11,10 +11,15 @@ from io import BytesIO
 from typing import Any, Optional, Union
 
 from PIL import Image
-from google import genai
 from google.genai import types
 
 from core.config import IMAGE_MODEL
+from core.api import get_client
+from core.utils import encode_image_part
+from core.validators.base import ReferenceBundle, WorkflowType
+from core.validators.prefilter import build_prefilter
+from core.generators.prefetch import AttemptPrefetcher
+from core.telemetry import STEP_GENERATE, STEP_VALIDATE, telemetry_context
 from .analyzer import analyze_reference_pose, analyze_source_person
 from .prompt_builder import build_pose_copy_prompt
 from .validator import PoseCopyValidator
@@ -33,15 +38,7 @@ _TEMPERATURE_SCHEDULE = [0.20, 0.15, 0.10]
 
 def _pil_to_part(img: Image.Image, max_size: int = 1024) -> types.Part:
     """PIL Image를 Gemini API Part로 변환"""
-    if max(img.size) > max_size:
-        img = img.copy()
-        img.thumbnail((max_size, max_size), Image.LANCZOS)
-
-    buf = BytesIO()
-    img.save(buf, format="PNG")
-    return types.Part(
-        inline_data=types.Blob(mime_type="image/png", data=buf.getvalue())
-    )
+    return encode_image_part(img, max_size=max_size)
 
 
 def _load_pil(image: Union[Image.Image, str]) -> Image.Image:
@@ -58,11 +55,9 @@ def _get_client(client: Optional[Any], api_key: Optional[str]) -> Any:
     if client is not None:
         return client
     if api_key is not None:
-        return genai.Client(api_key=api_key)
+        return get_client(api_key)
     # 환경 변수에서 API 키 로테이션
-    from core.api import _get_next_api_key
-
-    return genai.Client(api_key=_get_next_api_key())
+    return get_client()
 
 
 # ============================================================================
@@ -224,6 +219,8 @@ def generate_with_validation(
     temperature: float = 0.2,
     aspect_ratio: str = "3:4",
     resolution: str = "2K",
+    use_prefilter: bool = True,
+    pipelined: bool = False,
 ) -> dict:
     """포즈 복제 생성 + 검수 + 재생성 루프 (공개 API).
 
@@ -249,6 +246,10 @@ def generate_with_validation(
         temperature: 초기 생성 온도 (기본 0.2)
         aspect_ratio: 화면 비율 (기본 "3:4")
         resolution: 해상도 (기본 "2K")
+        use_prefilter: 검수 전 로컬 사전 필터 사용 여부 (기본 True)
+            → 빈 이미지/중복/소스 그대로 반환 등은 검수 없이 재생성
+        pipelined: 시도 N 검수 중에 시도 N+1을 미리 생성 (기본 False)
+            → N 통과 시 N+1은 버리고, 실패 시 N+1을 다음 시도로 사용
 
     Returns:
         dict: {
@@ -266,10 +267,17 @@ def generate_with_validation(
 
     # 검증기 초기화
     validator = PoseCopyValidator(active_client)
+    prefilter = build_prefilter(WorkflowType.POSE_COPY) if use_prefilter else None
 
-    # 이미지 로드 (재시도 루프 전에 1회만)
-    ref_pil = _load_pil(reference_image)
-    src_pil = _load_pil(source_image)
+    # 이미지 로드 (재시도 루프 전에 1회만 - 생성/검수가 같은 인코딩 재사용)
+    references = ReferenceBundle(
+        {
+            "reference": [_load_pil(reference_image)],
+            "source": [_load_pil(source_image)],
+        }
+    )
+    ref_pil = references.first("reference")
+    src_pil = references.first("source")
 
     best_image = None
     best_score = -1
@@ -280,31 +288,49 @@ def generate_with_validation(
     enhancement_notes = ""
     current_temp = temperature
 
+    workflow_name = WorkflowType.POSE_COPY.value
+
+    def generate(notes: str, temp: float) -> Optional[Image.Image]:
+        # 강화 노트가 있으면 custom_background에 추가하거나
+        # 별도 파트로 전달 (여기서는 generate_pose_copy 내부 프롬프트에 주입)
+        # 프리페치 스레드에서도 태그가 붙도록 함수 안에서 컨텍스트 지정
+        with telemetry_context(workflow=workflow_name, step=STEP_GENERATE):
+            return _generate_with_enhancement(
+                source_image=src_pil,
+                reference_image=ref_pil,
+                client=active_client,
+                background_mode=background_mode,
+                custom_background=custom_background,
+                temperature=temp,
+                aspect_ratio=aspect_ratio,
+                resolution=resolution,
+                enhancement_notes=notes,
+            )
+
+    # 파이프라인 모드: 검수 중에 다음 시도를 미리 생성
+    prefetcher = AttemptPrefetcher(max_retries, enabled=pipelined)
+
     for attempt in range(max_retries + 1):
+        # 이전 시도 검수 중에 미리 생성된 이미지가 있으면 사용
+        prefetched = prefetcher.take(attempt)
+        if prefetched is not None:
+            current_temp = prefetched.temperature
+
         print(f"\n{'=' * 60}")
         print(
             f"[PoseCopyGen] 시도 {attempt + 1}/{max_retries + 1} "
             f"| 온도: {current_temp:.2f}"
+            + (" | 선행 생성" if prefetched is not None else "")
         )
         print(f"{'=' * 60}")
 
         # -------------------------------------------------------
         # 1. 이미지 생성
         # -------------------------------------------------------
-        # 강화 노트가 있으면 custom_background에 추가하거나
-        # 별도 파트로 전달 (여기서는 generate_pose_copy 내부 프롬프트에 주입)
-        gen_client = active_client
-        image = _generate_with_enhancement(
-            source_image=src_pil,
-            reference_image=ref_pil,
-            client=gen_client,
-            background_mode=background_mode,
-            custom_background=custom_background,
-            temperature=current_temp,
-            aspect_ratio=aspect_ratio,
-            resolution=resolution,
-            enhancement_notes=enhancement_notes,
-        )
+        if prefetched is not None:
+            image = prefetched.image
+        else:
+            image = generate(enhancement_notes, current_temp)
 
         if image is None:
             print(f"[PoseCopyGen] X 생성 실패 (시도 {attempt + 1})")
@@ -319,17 +345,34 @@ def generate_with_validation(
                 current_temp = _get_temperature(attempt + 1)
             continue
 
+        # 다음 시도를 현재 강화 노트 + 다음 온도로 미리 생성 (이번 검수 결과는 N+2부터 반영)
+        next_temp = _get_temperature(attempt + 1)
+        prefetcher.start(attempt + 1, next_temp, generate, enhancement_notes, next_temp)
+
+        # 로컬 사전 필터 - 명백한 불량은 검수 없이 재생성
+        if prefilter:
+            precheck = prefilter.check(image, references, aspect_ratio=aspect_ratio)
+            if not precheck.passed:
+                history.append(
+                    {
+                        "attempt": attempt + 1,
+                        "temperature": current_temp,
+                        **precheck.to_history(),
+                    }
+                )
+                if attempt < max_retries:
+                    current_temp = _get_temperature(attempt + 1)
+                continue
+
         # -------------------------------------------------------
         # 2. 검수
         # -------------------------------------------------------
         try:
-            validation_result = validator.validate(
-                generated_img=image,
-                reference_images={
-                    "reference": [ref_pil],
-                    "source": [src_pil],
-                },
-            )
+            with telemetry_context(workflow=workflow_name, step=STEP_VALIDATE):
+                validation_result = validator.validate(
+                    generated_img=image,
+                    reference_images=references,
+                )
         except Exception as e:
             print(f"[PoseCopyGen] X 검수 실패: {e}")
             history.append(
@@ -358,6 +401,7 @@ def generate_with_validation(
                 "auto_fail_reasons": validation_result.auto_fail_reasons,
                 "issues": validation_result.issues[:5],
                 "criteria_scores": validation_result.criteria_scores,
+                "prefetched": prefetched is not None,
             }
         )
 
@@ -371,6 +415,7 @@ def generate_with_validation(
         # 4. 통과 체크
         if validation_result.passed:
             print(f"[PoseCopyGen] PASSED! (시도 {attempt + 1})")
+            prefetcher.discard()
             break
 
         # -------------------------------------------------------
@@ -383,9 +428,11 @@ def generate_with_validation(
                 attempt=attempt,
             )
             current_temp = _get_temperature(attempt + 1)
-            time.sleep(2)  # Rate limit 방지
+            if not pipelined:
+                time.sleep(2)  # Rate limit 방지
 
     # 최종 결과 반환
+    prefetcher.discard()
     return _build_result(best_image, best_result, history, max_retries)
 
 
@@ -17,12 +17,12 @@ Pose Copy 검증기
 
 import json
 import logging
-from io import BytesIO
 from pathlib import Path
 from typing import Dict, List, Union
 
 from PIL import Image
 
+from core.utils import encode_image_part
 from core.validators.base import (
     CommonValidationResult,
     QualityTier,
@@ -247,16 +247,7 @@ class PoseCopyValidator(WorkflowValidator):
         Returns:
             google.genai.types.Part
         """
-        from google.genai import types
-
-        if max(img.size) > max_size:
-            img = img.copy()
-            img.thumbnail((max_size, max_size), Image.LANCZOS)
-        buf = BytesIO()
-        img.save(buf, format="PNG")
-        return types.Part(
-            inline_data=types.Blob(mime_type="image/png", data=buf.getvalue())
-        )
+        return encode_image_part(img, max_size=max_size)
 
     def _run_vlm_validation(
         self,
@@ -278,6 +269,7 @@ class PoseCopyValidator(WorkflowValidator):
         """
         from google.genai import types
         from core.config import VISION_MODEL
+        from core.structured import json_config
 
         try:
             response = self.client.models.generate_content(
@@ -293,13 +285,9 @@ class PoseCopyValidator(WorkflowValidator):
                         ],
                     )
                 ],
-                config=types.GenerateContentConfig(
-                    temperature=0.1,  # 검수는 일관성 최우선
-                    response_modalities=["TEXT"],
-                ),
+                config=json_config(temperature=0.1),  # 검수는 일관성 최우선
             )
-            raw_text = response.candidates[0].content.parts[0].text
-            return self._parse_json_response(raw_text)
+            return self._parse_json_response(response.text)
 
         except Exception as e:
             logger.error(f"VLM 검수 실패: {e}")
@@ -307,7 +295,7 @@ class PoseCopyValidator(WorkflowValidator):
             return self._fallback_result(str(e))
 
     def _parse_json_response(self, text: str) -> dict:
-        """VLM 응답에서 JSON 파싱
+        """VLM 응답에서 JSON 파싱 (형식 오류면 복구 1회)
 
         Args:
             text: VLM 응답 텍스트
@@ -315,14 +303,10 @@ class PoseCopyValidator(WorkflowValidator):
         Returns:
             dict: 파싱된 결과
         """
-        # JSON 블록 추출 시도
-        if "```json" in text:
-            text = text.split("```json")[1].split("```")[0]
-        elif "```" in text:
-            text = text.split("```")[1].split("```")[0]
+        from core.structured import parse_or_repair
 
         try:
-            return json.loads(text.strip())
+            return parse_or_repair(self.client, text)
         except json.JSONDecodeError as e:
             logger.warning(f"JSON 파싱 실패: {e}. 원문 응답으로 폴백")
             return self._fallback_result(f"JSON 파싱 실패: {e}")
@@ -0,0 +1,530 @@
+"""
+재시도 정책 - 에러 분류 + 지터 백오프 + 429 키 페일오버 + 전역 재시도 예산
+
+모듈마다 따로 있던 재시도 루프((attempt + 1) * 5초 고정 대기, str(e) 부분문자열
+매칭)를 하나의 정책으로 통일한다.
+
+- 에러 분류: google-genai SDK 에러 타입/상태 코드 우선, 문자열 매칭은 최후 수단
+- 대기 시간: 서버 힌트(Retry-After 헤더, RetryInfo.retryDelay, "retry in Ns")
+  우선, 없으면 full-jitter 지수 백오프
+- 429: 해당 키를 스케줄러 쿨다운에 넣고 즉시 다른 건강한 키로 재시도 (대기 없음)
+- 재시도 예산: 최근 1분간 재시도 수를 요청 수의 일정 비율로 제한 (장애 시
+  재시도 폭주로 한도를 더 소진하는 것 방지)
+
+사용법:
+    from core.retry_policy import get_retry_policy
+
+    policy = get_retry_policy()
+    response = policy.call(
+        lambda key: get_client(key).models.generate_content(...),
+        api_key=api_key,
+        action="Image generation",
+    )
+
+    # API 키와 무관한 작업 재시도
+    result = policy.run(lambda: process_func(item), action="Batch item")
+"""
+
+import asyncio
+import random
+import re
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass
+from email.utils import parsedate_to_datetime
+from typing import Any, Awaitable, Callable, Optional, TypeVar
+
+import httpx
+from google.genai import errors as genai_errors
+
+from core.telemetry import attempt_scope, set_attempt
+
+
+T = TypeVar("T")
+
+
+# ============================================================
+# 기본 설정
+# ============================================================
+DEFAULT_MAX_ATTEMPTS = 3
+DEFAULT_BASE_DELAY = 2.0  # 초
+DEFAULT_MAX_DELAY = 60.0  # 초
+DEFAULT_RETRY_RATIO = 0.2  # 요청 대비 허용 재시도 비율
+DEFAULT_MIN_RETRIES_PER_MINUTE = 10  # 요청이 적을 때도 보장되는 재시도 수
+
+
+# ============================================================
+# 에러 분류
+# ============================================================
+
+
+class ErrorClass:
+    """에러 분류 상수"""
+
+    RATE_LIMIT = "rate_limit"
+    SERVER = "server"
+    TIMEOUT = "timeout"
+    NETWORK = "network"
+    AUTH = "auth"
+    SAFETY = "safety"
+    INVALID = "invalid"
+    BUDGET = "budget"  # core.metering 예산 소진 (재시도 불가)
+    UNKNOWN = "unknown"
+
+
+RETRYABLE_CLASSES = {
+    ErrorClass.RATE_LIMIT,
+    ErrorClass.SERVER,
+    ErrorClass.TIMEOUT,
+    ErrorClass.NETWORK,
+    ErrorClass.UNKNOWN,
+}
+
+
+@dataclass
+class ErrorInfo:
+    """분류된 에러 정보"""
+
+    error_class: str
+    status_code: Optional[int] = None
+    retry_after: Optional[float] = None  # 서버가 알려준 대기 시간 (초)
+    message: str = ""
+
+    @property
+    def retryable(self) -> bool:
+        return self.error_class in RETRYABLE_CLASSES
+
+
+_RETRY_IN_PATTERN = re.compile(r"retry (?:in|after) ([\d.]+)\s*s", re.IGNORECASE)
+_DURATION_PATTERN = re.compile(r"^([\d.]+)s$")
+
+
+def _parse_retry_after_header(value: Optional[str]) -> Optional[float]:
+    """Retry-After 헤더 (초 또는 HTTP 날짜) 파싱"""
+    if not value:
+        return None
+    value = value.strip()
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+def _retry_delay_from_details(details: Any) -> Optional[float]:
+    """google.rpc.RetryInfo의 retryDelay ("34s") 추출"""
+    if isinstance(details, dict):
+        delay = details.get("retryDelay")
+        if isinstance(delay, str):
+            match = _DURATION_PATTERN.match(delay.strip())
+            if match:
+                return float(match.group(1))
+        for value in details.values():
+            found = _retry_delay_from_details(value)
+            if found is not None:
+                return found
+    elif isinstance(details, list):
+        for value in details:
+            found = _retry_delay_from_details(value)
+            if found is not None:
+                return found
+    return None
+
+
+def _class_from_status(status_code: int) -> str:
+    if status_code == 429:
+        return ErrorClass.RATE_LIMIT
+    if status_code in (401, 403):
+        return ErrorClass.AUTH
+    if status_code in (408, 504):
+        return ErrorClass.TIMEOUT
+    if status_code >= 500:
+        return ErrorClass.SERVER
+    if 400 <= status_code < 500:
+        return ErrorClass.INVALID
+    return ErrorClass.UNKNOWN
+
+
+def _class_from_message(message: str) -> str:
+    """SDK 타입/상태 코드가 없는 에러용 문자열 분류 (최후 수단)"""
+    text = message.lower()
+    if "429" in text or "rate limit" in text or "quota" in text or "resource_exhausted" in text:
+        return ErrorClass.RATE_LIMIT
+    if "401" in text or "403" in text or "api key" in text or "permission_denied" in text:
+        return ErrorClass.AUTH
+    if "safety" in text or "blocked" in text:
+        return ErrorClass.SAFETY
+    if "timeout" in text or "timed out" in text or "deadline" in text:
+        return ErrorClass.TIMEOUT
+    if "503" in text or "500" in text or "overload" in text or "unavailable" in text:
+        return ErrorClass.SERVER
+    return ErrorClass.UNKNOWN
+
+
+def classify_error(e: BaseException) -> ErrorInfo:
+    """예외를 ErrorInfo로 분류
+
+    우선순위:
+    1. google-genai APIError (code, details의 RetryInfo, 응답 헤더)
+    2. httpx 상태/타임아웃/전송 에러, 내장 TimeoutError/ConnectionError
+    3. core.api.APIError / core.metering.BudgetExceededError (error_code 속성)
+    4. 메시지 문자열 매칭
+    """
+    message = str(e)
+    retry_match = _RETRY_IN_PATTERN.search(message)
+    hinted = float(retry_match.group(1)) if retry_match else None
+
+    if isinstance(e, genai_errors.APIError):
+        status_code = e.code or None
+        error_class = _class_from_status(status_code) if status_code else ErrorClass.UNKNOWN
+        if error_class == ErrorClass.INVALID and _class_from_message(message) == ErrorClass.SAFETY:
+            error_class = ErrorClass.SAFETY
+        retry_after = _retry_delay_from_details(e.details)
+        response = getattr(e, "response", None)
+        headers = getattr(response, "headers", None)
+        if retry_after is None and headers is not None:
+            retry_after = _parse_retry_after_header(headers.get("retry-after"))
+        return ErrorInfo(error_class, status_code, retry_after or hinted, message)
+
+    if isinstance(e, httpx.HTTPStatusError):
+        status_code = e.response.status_code
+        retry_after = _parse_retry_after_header(e.response.headers.get("retry-after"))
+        return ErrorInfo(_class_from_status(status_code), status_code, retry_after or hinted, message)
+
+    if isinstance(e, (httpx.TimeoutException, TimeoutError, asyncio.TimeoutError)):
+        return ErrorInfo(ErrorClass.TIMEOUT, None, hinted, message)
+
+    if isinstance(e, (httpx.TransportError, ConnectionError)):
+        return ErrorInfo(ErrorClass.NETWORK, None, hinted, message)
+
+    error_code = getattr(e, "error_code", None)
+    if error_code == "RATE_LIMIT":
+        return ErrorInfo(ErrorClass.RATE_LIMIT, 429, hinted, message)
+    if error_code == "AUTH_ERROR":
+        return ErrorInfo(ErrorClass.AUTH, None, None, message)
+    if error_code == "SAFETY_BLOCK":
+        return ErrorInfo(ErrorClass.SAFETY, None, None, message)
+    if error_code == "BUDGET_EXCEEDED":
+        return ErrorInfo(ErrorClass.BUDGET, None, None, message)
+
+    return ErrorInfo(_class_from_message(message), None, hinted, message)
+
+
+# ============================================================
+# 전역 재시도 예산
+# ============================================================
+
+
+class RetryBudget:
+    """최근 window초 동안의 재시도 수를 요청 수 비율로 제한 (스레드 안전)
+
+    허용 재시도 = max(min_retries, 요청 수 × ratio)
+
+    Args:
+        ratio: 요청 대비 허용 재시도 비율
+        min_retries: 요청이 적을 때도 보장되는 재시도 수
+        window: 집계 구간 (초)
+    """
+
+    def __init__(
+        self,
+        ratio: float = DEFAULT_RETRY_RATIO,
+        min_retries: int = DEFAULT_MIN_RETRIES_PER_MINUTE,
+        window: float = 60.0,
+    ):
+        self.ratio = ratio
+        self.min_retries = min_retries
+        self.window = window
+        self._requests: deque = deque()
+        self._retries: deque = deque()
+        self._lock = threading.Lock()
+        self.denied = 0
+
+    def _trim(self, now: float) -> None:
+        cutoff = now - self.window
+        while self._requests and self._requests[0] < cutoff:
+            self._requests.popleft()
+        while self._retries and self._retries[0] < cutoff:
+            self._retries.popleft()
+
+    def record_request(self) -> None:
+        """첫 시도 기록"""
+        with self._lock:
+            now = time.monotonic()
+            self._trim(now)
+            self._requests.append(now)
+
+    def try_spend(self) -> bool:
+        """재시도 1회 사용 시도. 예산 초과면 False"""
+        with self._lock:
+            now = time.monotonic()
+            self._trim(now)
+            allowed = max(self.min_retries, int(len(self._requests) * self.ratio))
+            if len(self._retries) >= allowed:
+                self.denied += 1
+                return False
+            self._retries.append(now)
+            return True
+
+    def stats(self) -> dict:
+        with self._lock:
+            self._trim(time.monotonic())
+            return {
+                "requests": len(self._requests),
+                "retries": len(self._retries),
+                "allowed": max(self.min_retries, int(len(self._requests) * self.ratio)),
+                "denied": self.denied,
+            }
+
+
+# ============================================================
+# 재시도 정책
+# ============================================================
+
+
+class RetryPolicy:
+    """공유 재시도 정책
+
+    Args:
+        max_attempts: 최대 시도 횟수 (첫 시도 포함)
+        base_delay: 백오프 기본 대기 (초)
+        max_delay: 최대 대기 (초, 서버 힌트에도 적용)
+        budget: 전역 재시도 예산 (None이면 예산 제한 없음)
+    """
+
+    def __init__(
+        self,
+        max_attempts: int = DEFAULT_MAX_ATTEMPTS,
+        base_delay: float = DEFAULT_BASE_DELAY,
+        max_delay: float = DEFAULT_MAX_DELAY,
+        budget: Optional[RetryBudget] = None,
+    ):
+        self.max_attempts = max_attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.budget = budget
+
+    def backoff(self, attempt: int, info: Optional[ErrorInfo] = None) -> float:
+        """다음 시도 전 대기 시간 (서버 힌트 우선, 없으면 full jitter)"""
+        if info is not None and info.retry_after is not None:
+            return min(info.retry_after, self.max_delay) + random.uniform(0, 0.5)
+        ceiling = min(self.max_delay, self.base_delay * (2 ** attempt))
+        return random.uniform(0, ceiling)
+
+    def should_retry(self, info: ErrorInfo, attempt: int, max_attempts: Optional[int] = None) -> bool:
+        """재시도 여부 (재시도 가능 에러 + 남은 시도 + 예산)"""
+        max_attempts = max_attempts or self.max_attempts
+        if not info.retryable or attempt >= max_attempts - 1:
+            return False
+        if self.budget is not None and not self.budget.try_spend():
+            print(f"[Retry] 전역 재시도 예산 소진 - 재시도 중단 ({info.error_class})")
+            return False
+        return True
+
+    def _record_request(self) -> None:
+        if self.budget is not None:
+            self.budget.record_request()
+
+    # ------------------------------------------------------------
+    # 키 무관 재시도
+    # ------------------------------------------------------------
+
+    def run(
+        self,
+        fn: Callable[[], T],
+        action: str = "Task",
+        max_attempts: Optional[int] = None,
+    ) -> T:
+        """fn()을 정책에 따라 재시도. 재시도 불가/소진 시 마지막 예외를 그대로 raise"""
+        max_attempts = max_attempts or self.max_attempts
+        self._record_request()
+        attempt = 0
+        with attempt_scope():
+            while True:
+                try:
+                    set_attempt(attempt)
+                    return fn()
+                except Exception as e:
+                    info = classify_error(e)
+                    if not self.should_retry(info, attempt, max_attempts):
+                        raise
+                    delay = self.backoff(attempt, info)
+                    print(
+                        f"[Retry] {action} {info.error_class} - "
+                        f"{attempt + 1}/{max_attempts}, {delay:.1f}s 후 재시도"
+                    )
+                    time.sleep(delay)
+                    attempt += 1
+
+    # ------------------------------------------------------------
+    # API 키 기반 재시도 (429 페일오버)
+    # ------------------------------------------------------------
+
+    def _on_failure(self, api_key: str, info: ErrorInfo, attempt: int) -> Optional[float]:
+        """실패를 스케줄러에 보고하고 대기 시간 반환 (None이면 키 교체)"""
+        from core.api import get_key_scheduler
+
+        scheduler = get_key_scheduler()
+        if info.error_class == ErrorClass.RATE_LIMIT:
+            scheduler.report_rate_limit(api_key, retry_after=info.retry_after)
+            # 다른 키로 즉시 재시도. 모든 키가 쿨다운이면 acquire가 대기한다
+            return None
+        scheduler.report_error(api_key)
+        return self.backoff(attempt, info)
+
+    @staticmethod
+    def _on_success(api_key: str, result: Any) -> None:
+        from core.api import get_key_scheduler
+
+        usage = getattr(result, "usage_metadata", None)
+        tokens = getattr(usage, "total_token_count", None) or 0
+        get_key_scheduler().record_success(api_key, tokens=tokens)
+
+    def call(
+        self,
+        fn: Callable[[str], T],
+        api_key: Optional[str] = None,
+        action: str = "API call",
+        max_attempts: Optional[int] = None,
+        report_success: bool = True,
+    ) -> T:
+        """fn(api_key)를 정책에 따라 재시도
+
+        첫 시도는 api_key(없으면 스케줄러 선택)를 사용한다. 429면 해당 키를
+        쿨다운에 넣고 다음 시도에서 다른 키로 바꾸고, 그 외 재시도 가능
+        에러는 같은 키로 백오프 후 재시도한다.
+
+        report_success=False면 성공 보고를 fn에 맡긴다 (헤지 요청처럼 실제로
+        응답한 키가 api_key와 다를 수 있는 경우).
+
+        Raises:
+            마지막 예외 (재시도 불가 에러, 시도 소진, 예산 소진)
+        """
+        from core.api import get_key_scheduler
+
+        max_attempts = max_attempts or self.max_attempts
+        key = api_key or get_key_scheduler().acquire()
+        self._record_request()
+        attempt = 0
+        with attempt_scope():
+            while True:
+                try:
+                    set_attempt(attempt)
+                    result = fn(key)
+                    if report_success:
+                        self._on_success(key, result)
+                    return result
+                except Exception as e:
+                    info = classify_error(e)
+                    delay = self._on_failure(key, info, attempt)
+                    if not self.should_retry(info, attempt, max_attempts):
+                        raise
+                    if delay is None:
+                        key = get_key_scheduler().acquire()
+                        print(f"[Retry] {action} 429 - 키 교체 후 재시도 ({attempt + 1}/{max_attempts})")
+                    else:
+                        print(
+                            f"[Retry] {action} {info.error_class} - "
+                            f"{attempt + 1}/{max_attempts}, {delay:.1f}s 후 재시도"
+                        )
+                        time.sleep(delay)
+                    attempt += 1
+
+    def call_client(
+        self,
+        client: Any,
+        fn: Callable[[Any], T],
+        action: str = "API call",
+        max_attempts: Optional[int] = None,
+    ) -> T:
+        """fn(client)를 정책에 따라 재시도
+
+        client가 풀(get_client)에서 온 것이면 call()로 429 키 교체를 하고,
+        호출자가 직접 만든 클라이언트면 키를 바꾸지 않고 그 클라이언트로만
+        run() 재시도한다 (호출자의 키/설정을 무시하지 않도록).
+        """
+        from core.api import get_client, get_client_key
+
+        api_key = get_client_key(client)
+        if api_key is None:
+            return self.run(lambda: fn(client), action=action, max_attempts=max_attempts)
+        return self.call(
+            lambda key: fn(get_client(key)),
+            api_key=api_key,
+            action=action,
+            max_attempts=max_attempts,
+        )
+
+    async def call_async(
+        self,
+        fn: Callable[[str], Awaitable[T]],
+        api_key: Optional[str] = None,
+        action: str = "API call",
+        max_attempts: Optional[int] = None,
+        report_success: bool = True,
+    ) -> T:
+        """call()의 async 버전 (대기는 asyncio.sleep, 키 선택은 이벤트 루프 비차단)"""
+        from core.api import _get_next_api_key_async
+
+        max_attempts = max_attempts or self.max_attempts
+        key = api_key or await _get_next_api_key_async()
+        self._record_request()
+        attempt = 0
+        with attempt_scope():
+            while True:
+                try:
+                    set_attempt(attempt)
+                    result = await fn(key)
+                    if report_success:
+                        self._on_success(key, result)
+                    return result
+                except Exception as e:
+                    info = classify_error(e)
+                    delay = self._on_failure(key, info, attempt)
+                    if not self.should_retry(info, attempt, max_attempts):
+                        raise
+                    if delay is None:
+                        key = await _get_next_api_key_async()
+                    else:
+                        await asyncio.sleep(delay)
+                    attempt += 1
+
+
+# ============================================================
+# 프로세스 공유 정책
+# ============================================================
+
+_policy: Optional[RetryPolicy] = None
+_policy_lock = threading.Lock()
+
+
+def get_retry_policy() -> RetryPolicy:
+    """프로세스 공유 재시도 정책 반환 (전역 재시도 예산 포함)"""
+    global _policy
+    with _policy_lock:
+        if _policy is None:
+            _policy = RetryPolicy(budget=RetryBudget())
+        return _policy
+
+
+def configure_retry_policy(
+    max_attempts: int = DEFAULT_MAX_ATTEMPTS,
+    base_delay: float = DEFAULT_BASE_DELAY,
+    max_delay: float = DEFAULT_MAX_DELAY,
+    retry_ratio: float = DEFAULT_RETRY_RATIO,
+    min_retries_per_minute: int = DEFAULT_MIN_RETRIES_PER_MINUTE,
+) -> RetryPolicy:
+    """공유 재시도 정책 교체 (배치 작업 시작 시 호출)"""
+    global _policy
+    with _policy_lock:
+        _policy = RetryPolicy(
+            max_attempts=max_attempts,
+            base_delay=base_delay,
+            max_delay=max_delay,
+            budget=RetryBudget(ratio=retry_ratio, min_retries=min_retries_per_minute),
+        )
+        return _policy
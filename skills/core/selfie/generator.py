@@ -15,10 +15,18 @@ from typing import Optional, List, Union, Dict, Tuple
 from pathlib import Path
 
 from PIL import Image
-from google import genai
 from google.genai import types
 
 from core.config import IMAGE_MODEL
+from core.api import get_client
+from core.utils import encode_image_part
+from core.selfie_validator import SelfieValidator
+from core.telemetry import STEP_GENERATE, STEP_VALIDATE, telemetry_context
+from core.validators import WorkflowValidator, cached_validate_batch
+from core.validators.base import WorkflowType
+
+# 텔레메트리 workflow 태그
+WORKFLOW_NAME = WorkflowType.SELFIE.value
 
 
 def pil_to_part(img: Image.Image, max_size: int = 1024) -> types.Part:
@@ -32,19 +40,7 @@ def pil_to_part(img: Image.Image, max_size: int = 1024) -> types.Part:
     Returns:
         types.Part: Gemini API에 전달 가능한 Part 객체
     """
-    # 크기 조정 (필요 시)
-    if max(img.size) > max_size:
-        img = img.copy()
-        img.thumbnail((max_size, max_size), Image.LANCZOS)
-
-    # PNG로 변환하여 BytesIO에 저장
-    buffer = BytesIO()
-    img.save(buffer, format="PNG")
-
-    # Gemini Part 객체 생성
-    return types.Part(
-        inline_data=types.Blob(mime_type="image/png", data=buffer.getvalue())
-    )
+    return encode_image_part(img, max_size=max_size)
 
 
 def generate_selfie(
@@ -84,7 +80,7 @@ def generate_selfie(
         api_key = _get_next_api_key()
 
     # 클라이언트 생성
-    client = genai.Client(api_key=api_key)
+    client = get_client(api_key)
 
     # API 파트 구성
     parts = [types.Part(text=prompt)]
@@ -556,7 +552,9 @@ def generate_batch_v3(
         api_key: Gemini API 키
         use_reference_image: 레퍼런스 이미지 사용 여부
         use_expression_reference: 표정 레퍼런스 이미지 사용 여부
-        validator: SelfieValidator 인스턴스 (선택)
+        validator: SelfieValidator 또는 SelfieWorkflowValidator 인스턴스 (선택)
+            라운드마다 미통과 항목을 모두 생성한 뒤 validate_batch로 함께 채점
+            (얼굴 레퍼런스 1회 + 후보 최대 max_batch_candidates장, 검증 결과 캐시 사용)
         max_retries: 검증 실패 시 재시도 횟수
 
     Returns:
@@ -620,117 +618,161 @@ def generate_batch_v3(
         # 단일 프리셋이면 모든 이미지에 동일 적용
         expressions = [expression] * count
 
-    results = []
-
+    # 항목별 상태 (포즈/씬/표정 조합 1개 = 항목 1개)
+    items = []
     for i, (pose, scene) in enumerate(zip(poses, scenes)):
-        # 표정 선택
-        current_expression = expressions[i] if expressions else expression
-        expr_id = (
-            current_expression.get("id", "text")
-            if isinstance(current_expression, dict)
-            else current_expression
-        )
-
-        print(f"\n{'=' * 60}")
-        print(
-            f"[{i + 1}/{count}] Pose: {pose['id']} | Scene: {scene['id']} | Expression: {expr_id}"
-        )
-        print(f"{'=' * 60}")
-
         # API 키 처리
         if api_key is None:
             from core.api import _get_next_api_key
 
-            current_api_key = _get_next_api_key()
+            item_api_key = _get_next_api_key()
         else:
-            current_api_key = api_key
-
-        # 생성 + 검증 루프
-        best_image = None
-        best_score = 0
-        attempts = 0
-        current_temp = temperature
-
-        for attempt in range(max_retries + 1):
-            attempts = attempt + 1
-            print(f"  Attempt {attempts}/{max_retries + 1} (temp={current_temp:.2f})")
-
-            image = generate_selfie_v3(
-                face_images=face_images,
-                pose=pose,
-                scene=scene,
-                outfit_images=outfit_images,
-                gender=gender,
-                expression=current_expression,
-                makeup=makeup,
-                outfit_analysis=outfit_analysis,
-                aspect_ratio=aspect_ratio,
-                resolution=resolution,
-                temperature=current_temp,
-                api_key=current_api_key,
-                use_reference_image=use_reference_image,
-                use_expression_reference=use_expression_reference,
+            item_api_key = api_key
+
+        items.append(
+            {
+                "index": i + 1,
+                "pose": pose,
+                "scene": scene,
+                "expression": expressions[i] if expressions else expression,
+                "api_key": item_api_key,
+                "temperature": temperature,
+                "best_image": None,
+                "best_score": 0,
+                "attempts": 0,
+                "done": False,
+            }
+        )
+
+    workflow_validator = _as_workflow_validator(validator)
+    references = {"face": face_images}
+
+    # 생성 + 검증 라운드: 미통과 항목을 모두 생성한 뒤 함께 검증
+    for round_index in range(max_retries + 1):
+        pending = [item for item in items if not item["done"]]
+        if not pending:
+            break
+        if round_index > 0:
+            time.sleep(2)
+
+        generated = []
+        for item in pending:
+            item["attempts"] += 1
+            current_expression = item["expression"]
+            expr_id = (
+                current_expression.get("id", "text")
+                if isinstance(current_expression, dict)
+                else current_expression
             )
 
+            print(f"\n{'=' * 60}")
+            print(
+                f"[{item['index']}/{count}] Pose: {item['pose']['id']} | Scene: {item['scene']['id']}"
+                f" | Expression: {expr_id}"
+            )
+            print(f"{'=' * 60}")
+            print(
+                f"  Attempt {item['attempts']}/{max_retries + 1} (temp={item['temperature']:.2f})"
+            )
+
+            with telemetry_context(workflow=WORKFLOW_NAME, step=STEP_GENERATE):
+                image = generate_selfie_v3(
+                    face_images=face_images,
+                    pose=item["pose"],
+                    scene=item["scene"],
+                    outfit_images=outfit_images,
+                    gender=gender,
+                    expression=current_expression,
+                    makeup=makeup,
+                    outfit_analysis=outfit_analysis,
+                    aspect_ratio=aspect_ratio,
+                    resolution=resolution,
+                    temperature=item["temperature"],
+                    api_key=item["api_key"],
+                    use_reference_image=use_reference_image,
+                    use_expression_reference=use_expression_reference,
+                )
+
             if image is None:
-                print(f"  [FAIL] Generation failed")
-                current_temp = max(0.3, current_temp - 0.1)
-                time.sleep(2)
+                print("  [FAIL] Generation failed")
+                item["temperature"] = max(0.3, item["temperature"] - 0.1)
                 continue
 
-            # 검증
-            if validator:
-                try:
-                    validation_result = validator.validate(
-                        generated_img=image,
-                        face_images=face_images,
-                    )
-                    if hasattr(validation_result, "total_score"):
-                        score = validation_result.total_score
-                        passed = validation_result.passed
-                    else:
-                        score = validation_result.get("total_score", 0)
-                        passed = validation_result.get("passed", False)
-
-                    print(f"  Score: {score}/100 | {'PASS' if passed else 'FAIL'}")
-
-                    if score > best_score:
-                        best_image = image
-                        best_score = score
-
-                    if passed:
-                        break
-
-                except Exception as e:
-                    print(f"  [WARN] Validation error: {e}")
-                    if best_image is None:
-                        best_image = image
-                        best_score = 75  # 기본 점수
-            else:
+            if workflow_validator is None:
                 # 검증 없으면 첫 성공 이미지 사용
-                best_image = image
-                best_score = 100
-                break
+                item.update(best_image=image, best_score=100, done=True)
+                continue
 
-            # 재시도 준비
-            current_temp = max(0.3, current_temp - 0.1)
-            time.sleep(2)
+            generated.append((item, image))
 
-        results.append(
-            {
-                "image": best_image,
-                "pose": pose,
-                "scene": scene,
-                "expression": current_expression,
-                "score": best_score,
-                "passed": best_score >= 80 or validator is None,
-                "attempts": attempts,
-            }
-        )
+        # 이번 라운드 후보를 레퍼런스 1회 + 후보 N장 단위로 채점 (캐시 적중분은 VLM 호출 없음)
+        chunk_size = workflow_validator.max_batch_candidates if workflow_validator else 1
+        for chunk_start in range(0, len(generated), chunk_size):
+            chunk = generated[chunk_start : chunk_start + chunk_size]
+            try:
+                with telemetry_context(workflow=WORKFLOW_NAME, step=STEP_VALIDATE):
+                    batch = cached_validate_batch(
+                        workflow_validator, [image for _, image in chunk], references
+                    )
+            except Exception as e:
+                print(f"  [WARN] Validation error: {e}")
+                for item, image in chunk:
+                    if item["best_image"] is None:
+                        item["best_image"] = image
+                        item["best_score"] = 75  # 기본 점수
+                    item["temperature"] = max(0.3, item["temperature"] - 0.1)
+                continue
+
+            for (item, image), validation_result in zip(chunk, batch.results):
+                score = validation_result.total_score
+                passed = validation_result.passed
+                print(
+                    f"  [{item['index']}/{count}] Score: {score}/100 | {'PASS' if passed else 'FAIL'}"
+                )
+
+                if score > item["best_score"]:
+                    item["best_image"] = image
+                    item["best_score"] = score
+
+                if passed:
+                    item["done"] = True
+                else:
+                    # 재시도 준비
+                    item["temperature"] = max(0.3, item["temperature"] - 0.1)
+
+    results = [
+        {
+            "image": item["best_image"],
+            "pose": item["pose"],
+            "scene": item["scene"],
+            "expression": item["expression"],
+            "score": item["best_score"],
+            "passed": item["best_score"] >= 80 or validator is None,
+            "attempts": item["attempts"],
+        }
+        for item in items
+    ]
 
     return results
 
 
+def _as_workflow_validator(validator) -> Optional[WorkflowValidator]:
+    """generate_batch_v3 검증기 → WorkflowValidator
+
+    SelfieValidator는 임계값을 유지한 채 SelfieWorkflowValidator로 감싸
+    배치 검증(validate_batch)과 검증 결과 캐시를 쓸 수 있게 한다.
+    """
+    if validator is None or isinstance(validator, WorkflowValidator):
+        return validator
+    if isinstance(validator, SelfieValidator):
+        from .validator import SelfieWorkflowValidator
+
+        return SelfieWorkflowValidator(validator.client, selfie_validator=validator)
+    raise TypeError(
+        f"validator는 SelfieValidator 또는 WorkflowValidator여야 합니다: {type(validator).__name__}"
+    )
+
+
 def get_random_combinations(
     pose_category: str,
     scene_category: str,
@@ -12,13 +12,16 @@ SelfieValidator를 래핑하여 WorkflowValidator 인터페이스 구현.
 5. 자연스러움 (natural_feel)
 """
 
-from typing import List, Dict, Union
+import hashlib
+from dataclasses import asdict
+from typing import List, Dict, Optional, Union
 from pathlib import Path
 from PIL import Image
 
 from core.selfie_validator import (
     SelfieValidator,
     SelfieValidationResult,
+    SelfieValidationThresholds,
     SelfieQualityTier,
 )
 from core.validators.base import (
@@ -26,6 +29,7 @@ from core.validators.base import (
     ValidationConfig, QualityTier
 )
 from core.validators.registry import ValidatorRegistry
+from core.validators.tournament import TournamentRubric
 
 
 @ValidatorRegistry.register(WorkflowType.SELFIE)
@@ -99,13 +103,20 @@ class SelfieWorkflowValidator(WorkflowValidator):
         ],
     }
 
-    def __init__(self, client):
+    def __init__(self, client, selfie_validator: Optional[SelfieValidator] = None):
         """
         Args:
             client: Initialized Gemini API client (google.genai.Client)
+            selfie_validator: 래핑할 기존 SelfieValidator (임계값 유지용, 없으면 새로 생성)
         """
         super().__init__(client)
-        self._selfie_validator = SelfieValidator(client)
+        self._selfie_validator = selfie_validator or SelfieValidator(client)
+
+        # 커스텀 임계값은 판정이 달라지므로 검증 결과 캐시 키를 분리
+        thresholds = self._selfie_validator.thresholds
+        if thresholds != SelfieValidationThresholds():
+            digest = hashlib.sha1(repr(asdict(thresholds)).encode("utf-8")).hexdigest()[:8]
+            self.version = f"{self.version}-{digest}"
 
     def validate(
         self,
@@ -133,7 +144,10 @@ class SelfieWorkflowValidator(WorkflowValidator):
             outfit_images=reference_images.get("outfit", []),
             scenario_options=kwargs.get("scenario_options"),
         )
+        return self._to_common(result)
 
+    def _to_common(self, result: SelfieValidationResult) -> CommonValidationResult:
+        """SelfieValidationResult → CommonValidationResult"""
         # SelfieQualityTier → QualityTier 변환
         tier_map = {
             SelfieQualityTier.RELEASE_READY: QualityTier.RELEASE_READY,
@@ -165,6 +179,21 @@ class SelfieWorkflowValidator(WorkflowValidator):
             raw_response=result.raw_response,
         )
 
+    def tournament_rubric(self) -> TournamentRubric:
+        """토너먼트 채점 루브릭 - validate와 같은 프롬프트/항목/판정"""
+        selfie_validator = self._selfie_validator
+        return TournamentRubric(
+            prompt=selfie_validator.VALIDATION_PROMPT,
+            criteria=list(selfie_validator.thresholds.weights),
+            text_fields=["summary_kr"],
+            list_fields=["auto_fail_detected"],
+            build_result=lambda data, raw: self._to_common(selfie_validator._process_result(data)),
+            reference_labels={
+                "face": "FACE REFERENCE - 얼굴 비교용",
+                "outfit": "OUTFIT REFERENCE - 착장 참고용 (선택)",
+            },
+        )
+
     def get_enhancement_rules(self, failed_criteria: List[str]) -> str:
         """셀피 프롬프트 강화 규칙
 
@@ -14,13 +14,14 @@ from typing import Optional, List, Union, Tuple
 from enum import Enum
 from pathlib import Path
 import json
-from io import BytesIO
 
 from PIL import Image
 from google import genai
 from google.genai import types
 
 from core.config import VISION_MODEL
+from core.structured import json_config, parse_or_repair
+from core.utils import encode_image_part
 
 
 class SelfieQualityTier(Enum):
@@ -349,19 +350,11 @@ UGC/셀카는 약간의 "결점"이 오히려 자연스럽습니다.
             response = self.client.models.generate_content(
                 model=VISION_MODEL,
                 contents=[types.Content(role="user", parts=content_parts)],
-                config=types.GenerateContentConfig(
-                    temperature=0.1, response_modalities=["TEXT"]
-                ),
+                config=json_config(temperature=0.1),
             )
 
-            # JSON 파싱
-            raw_text = response.candidates[0].content.parts[0].text.strip()
-            if "```json" in raw_text:
-                raw_text = raw_text.split("```json")[1].split("```")[0].strip()
-            elif "```" in raw_text:
-                raw_text = raw_text.split("```")[1].split("```")[0].strip()
-
-            result_dict = json.loads(raw_text)
+            # JSON 파싱 (형식 오류면 복구 1회)
+            result_dict = parse_or_repair(self.client, response.text)
 
         except json.JSONDecodeError as e:
             print(f"[SelfieValidator] JSON 파싱 오류: {e}")
@@ -473,14 +466,7 @@ UGC/셀카는 약간의 "결점"이 오히려 자연스럽습니다.
 
     def _pil_to_part(self, pil_img: Image.Image, max_size: int = 1024) -> types.Part:
         """PIL Image를 Gemini Part로 변환"""
-        if max(pil_img.size) > max_size:
-            pil_img = pil_img.copy()
-            pil_img.thumbnail((max_size, max_size), Image.LANCZOS)
-        buffer = BytesIO()
-        pil_img.save(buffer, format="PNG")
-        return types.Part(
-            inline_data=types.Blob(mime_type="image/png", data=buffer.getvalue())
-        )
+        return encode_image_part(pil_img, max_size=max_size)
 
     def _calculate_total_score(self, result: dict) -> int:
         """가중 총점 계산"""
@@ -34,18 +34,17 @@ v0.4 (2026-02-20):
 """
 
 import io
-import time
 from dataclasses import dataclass
 from pathlib import Path
 from typing import List, Optional, Dict, Any, Tuple
 
 import numpy as np
 from PIL import Image
-from google import genai
 from google.genai import types
 
 from core.config import IMAGE_MODEL, VISION_MODEL
-from core.api import _get_next_api_key as get_next_api_key
+from core.api import _get_next_api_key as get_next_api_key, get_client
+from core.retry_policy import get_retry_policy
 
 from .templates import (
     get_stage_prompt,
@@ -394,6 +393,17 @@ def _flip_shoes_if_needed(
     return shoe_images
 
 
+def _generate_content(api_key: Optional[str], contents: list, config) -> Any:
+    """이미지 생성 호출 (공유 재시도 정책: 429 키 교체 + 서버 힌트/지터 백오프)"""
+    return get_retry_policy().call(
+        lambda key: get_client(key).models.generate_content(
+            model=IMAGE_MODEL, contents=contents, config=config
+        ),
+        api_key=api_key,
+        action="Shoe rack",
+    )
+
+
 def composite_single_stage(
     input_image: Image.Image,
     shoe_images: List[Image.Image],
@@ -461,9 +471,6 @@ def composite_single_stage(
             custom_instructions=custom_instructions,
         )
 
-    # Gemini 클라이언트 생성
-    client = genai.Client(api_key=api_key)
-
     # 원본 이미지 비율 계산
     original_ratio = input_image.width / input_image.height
     aspect_ratio = _get_closest_aspect_ratio(original_ratio)
@@ -488,8 +495,8 @@ def composite_single_stage(
         contents.append(shoe)
 
     try:
-        response = client.models.generate_content(
-            model=IMAGE_MODEL,
+        response = _generate_content(
+            api_key,
             contents=contents,
             config=types.GenerateContentConfig(
                 temperature=temperature,
@@ -699,11 +706,6 @@ def composite_with_retry(
             if last_result and last_result.error:
                 issues.append(last_result.error)
 
-            # 재시도 대기
-            wait_time = (attempt + 1) * 5
-            print(f"[RETRY] Waiting {wait_time}s before retry {attempt + 1}...")
-            time.sleep(wait_time)
-
             result = composite_single_stage(
                 input_image=input_image,
                 shoe_images=shoe_images,
@@ -946,9 +948,6 @@ def composite_single_pass(
         print(f"  Mirror mode: {mirror_side} side is mirror")
     print(f"  View type: {view_type}")
 
-    # Gemini 클라이언트 생성
-    client = genai.Client(api_key=api_key)
-
     # 원본 이미지 비율 계산
     original_ratio = input_image.width / input_image.height
     aspect_ratio = _get_closest_aspect_ratio(original_ratio)
@@ -1013,8 +1012,8 @@ def composite_single_pass(
     print(f"  [REFS] Sending {max_refs} reference shoes to API")
 
     try:
-        response = client.models.generate_content(
-            model=IMAGE_MODEL,
+        response = _generate_content(
+            api_key,
             contents=contents,
             config=types.GenerateContentConfig(
                 temperature=temperature,
@@ -1205,11 +1204,6 @@ def run_single_pass_pipeline(
         last_result = result
         print(f"[SINGLE PASS] Attempt {attempt + 1} failed")
 
-        if attempt < max_retries:
-            wait_time = (attempt + 1) * 5
-            print(f"  Waiting {wait_time}s before retry...")
-            time.sleep(wait_time)
-
     # 모든 재시도 실패
     print("\n" + "=" * 60)
     print("SINGLE PASS PIPELINE FAILED")
@@ -1307,7 +1301,6 @@ def composite_single_slot(
     )
 
     # 5. API 호출
-    client = genai.Client(api_key=api_key)
     contents = [
         prompt,
         padded_crop,
@@ -1318,8 +1311,8 @@ def composite_single_slot(
     ]
 
     try:
-        response = client.models.generate_content(
-            model=IMAGE_MODEL,
+        response = _generate_content(
+            api_key,
             contents=contents,
             config=types.GenerateContentConfig(
                 temperature=temperature,
@@ -1464,11 +1457,6 @@ def run_slot_by_slot_pipeline(
             last_result = result
             print(f"[SLOT {slot.position_id}] Attempt {attempt + 1} failed")
 
-            if attempt < max_retries:
-                wait_time = (attempt + 1) * 3
-                print(f"  Waiting {wait_time}s...")
-                time.sleep(wait_time)
-
         return slot, last_result or CompositeResult(
             image=None,
             success=False,
@@ -26,6 +26,7 @@ from google import genai
 from google.genai import types
 
 from core.config import VISION_MODEL
+from core.api import get_client
 
 
 @dataclass
@@ -141,7 +142,7 @@ def analyze_silhouette(
             from core.api import _get_next_api_key as get_next_api_key
 
             api_key = get_next_api_key()
-        client = genai.Client(api_key=api_key)
+        client = get_client(api_key)
 
     try:
         response = client.models.generate_content(
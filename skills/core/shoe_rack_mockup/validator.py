@@ -11,11 +11,10 @@ from typing import Dict, List, Optional, Any
 
 import numpy as np
 from PIL import Image
-from google import genai
-from google.genai import types
 
 from core.config import VISION_MODEL
-from core.api import _get_next_api_key as get_next_api_key
+from core.structured import json_config, parse_or_repair
+from core.api import _get_next_api_key as get_next_api_key, get_client
 
 from .templates import get_verification_prompt
 from .slot_config import DEFAULT_SLOT_COLORS, COLOR_TOLERANCE
@@ -63,7 +62,7 @@ def validate_stage(
     if api_key is None:
         api_key = get_next_api_key()
 
-    client = genai.Client(api_key=api_key)
+    client = get_client(api_key)
 
     prompt = get_verification_prompt(stage)
 
@@ -73,22 +72,12 @@ def validate_stage(
         response = client.models.generate_content(
             model=VISION_MODEL,
             contents=[prompt, image],
-            config=types.GenerateContentConfig(
-                temperature=0.1,
-                response_modalities=["TEXT"],
-            ),
+            config=json_config(temperature=0.1),
         )
 
-        # JSON 파싱 시도
-        text = response.text
-        # JSON 블록 추출
-        if "```json" in text:
-            text = text.split("```json")[1].split("```")[0]
-        elif "```" in text:
-            text = text.split("```")[1].split("```")[0]
-
+        # JSON 파싱 (형식 오류면 복구 1회)
         try:
-            result_data = json.loads(text.strip())
+            result_data = parse_or_repair(client, response.text)
         except json.JSONDecodeError:
             # 파싱 실패 시 기본값
             result_data = {
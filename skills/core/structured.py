@@ -0,0 +1,342 @@
+"""
+구조화 JSON 응답 - 스키마 제약 출력 + 빠른 검증 파서 + 1회 복구
+
+검증기/분석기는 VLM 자유 텍스트를 "```json"으로 잘라 파싱했고, 파싱 실패는
+에러 결과/폴백이 되어 비싼 생성+검증 재시도로 이어졌다.
+
+- 요청: response_mime_type="application/json" + response_json_schema
+  (스키마는 결과 dataclass에서 생성 - schema_from_dataclass)
+- 파싱: json.loads 우선 (JSON 모드 응답은 여기서 끝남), 실패 시 코드블록/
+  앞뒤 설명문/후행 쉼표 정리 후 재시도, 스키마가 있으면 필수 키/타입 검증
+- 복구: 그래도 실패하면 원문 + 오류 + 스키마를 텍스트 전용으로 한 번만 보내
+  형식만 고친 JSON을 받는다 (이미지 재업로드/재생성 없음)
+
+StructuredOutputError는 json.JSONDecodeError 하위 클래스라 기존
+`except json.JSONDecodeError` / `except ValueError` 처리가 그대로 동작한다.
+
+사용법:
+    from core.structured import generate_json, schema_from_dataclass
+
+    schema = schema_from_dataclass(HairAnalysisResult, fields=["style", "color"])
+    data, raw_text = generate_json(client, contents, schema=schema)
+"""
+
+import dataclasses
+import json
+import re
+import types as pytypes
+import typing
+from enum import Enum
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from google.genai import types
+
+from core.config import VISION_MODEL
+
+
+class StructuredOutputError(json.JSONDecodeError):
+    """JSON 파싱/스키마 검증 실패"""
+
+    def __init__(self, msg: str, doc: str = "", pos: int = 0):
+        super().__init__(msg, doc, pos)
+        self.msg = msg
+
+    def __str__(self) -> str:
+        return self.msg
+
+
+# ============================================================
+# 스키마
+# ============================================================
+
+# VLM 채점 항목 ({"score": 0-100, "reason": "..."})
+SCORED_CRITERION_SCHEMA: Dict[str, Any] = {
+    "type": "object",
+    "properties": {
+        "score": {"type": "integer"},
+        "reason": {"type": "string"},
+    },
+    "required": ["score", "reason"],
+}
+
+_PRIMITIVES = {int: "integer", float: "number", str: "string", bool: "boolean"}
+_UNION_ORIGINS = (typing.Union, getattr(pytypes, "UnionType", typing.Union))
+
+
+def _type_schema(tp: Any) -> Dict[str, Any]:
+    """타입 힌트 → JSON Schema"""
+    origin = typing.get_origin(tp)
+    args = typing.get_args(tp)
+
+    if origin in _UNION_ORIGINS:
+        non_null = [a for a in args if a is not type(None)]
+        return _type_schema(non_null[0]) if len(non_null) == 1 else {}
+    if tp in _PRIMITIVES:
+        return {"type": _PRIMITIVES[tp]}
+    if isinstance(tp, type) and issubclass(tp, Enum):
+        return {"type": "string", "enum": [str(m.value) for m in tp]}
+    if dataclasses.is_dataclass(tp):
+        return schema_from_dataclass(tp)
+    if tp in (list, tuple) or origin in (list, tuple, typing.Sequence):
+        return {"type": "array", "items": _type_schema(args[0]) if args else {}}
+    if tp is dict or origin is dict:
+        schema: Dict[str, Any] = {"type": "object"}
+        if len(args) == 2 and args[1] is not Any:
+            schema["additionalProperties"] = _type_schema(args[1])
+        return schema
+    return {}
+
+
+def schema_from_dataclass(
+    cls: type,
+    fields: Optional[Sequence[str]] = None,
+    scored: Sequence[str] = (),
+    required: Optional[Sequence[str]] = None,
+) -> Dict[str, Any]:
+    """결과 dataclass에서 응답 JSON Schema 생성
+
+    Args:
+        cls: 결과 dataclass
+        fields: 포함할 필드 (None이면 전체, raw_response 등 내부 필드는 직접 제외)
+        scored: {"score", "reason"} 객체로 받을 채점 항목 필드 (int 필드)
+        required: 필수 필드 (None이면 기본값 없는 필드 + scored)
+
+    Returns:
+        response_json_schema에 넣을 JSON Schema 딕셔너리
+    """
+    hints = typing.get_type_hints(cls)
+    all_fields = {f.name: f for f in dataclasses.fields(cls)}
+    names = list(fields) if fields is not None else list(all_fields)
+
+    properties: Dict[str, Any] = {}
+    for name in names:
+        if name in scored:
+            properties[name] = json.loads(json.dumps(SCORED_CRITERION_SCHEMA))
+        else:
+            properties[name] = _type_schema(hints[name])
+
+    if required is None:
+        required = [
+            name
+            for name in names
+            if name in scored
+            or (
+                all_fields[name].default is dataclasses.MISSING
+                and all_fields[name].default_factory is dataclasses.MISSING
+            )
+        ]
+    return {"type": "object", "properties": properties, "required": list(required)}
+
+
+def json_config(
+    schema: Optional[Dict[str, Any]] = None,
+    **kwargs: Any,
+) -> types.GenerateContentConfig:
+    """JSON 모드 GenerateContentConfig (schema가 있으면 스키마 제약)"""
+    kwargs.setdefault("response_mime_type", "application/json")
+    if schema is not None:
+        kwargs.setdefault("response_json_schema", schema)
+    return types.GenerateContentConfig(**kwargs)
+
+
+# ============================================================
+# 파싱 + 검증
+# ============================================================
+
+_FENCE = re.compile(r"```(?:json|JSON)?\s*(.*?)```", re.DOTALL)
+_TRAILING_COMMA = re.compile(r",\s*([}\]])")
+
+
+def _outermost(text: str) -> Optional[str]:
+    """처음 나오는 {…} 또는 […] 구간 (앞뒤 설명문 제거)"""
+    starts = [i for i in (text.find("{"), text.find("[")) if i != -1]
+    if not starts:
+        return None
+    start = min(starts)
+    end = text.rfind("}" if text[start] == "{" else "]")
+    return text[start : end + 1] if end > start else None
+
+
+def extract_json(text: Optional[str]) -> Any:
+    """응답 텍스트에서 JSON 추출 (스키마 검증 없음)
+
+    Raises:
+        StructuredOutputError: JSON을 찾지 못함
+    """
+    if not text or not text.strip():
+        raise StructuredOutputError("빈 응답")
+    text = text.strip()
+    try:
+        return json.loads(text)
+    except ValueError:
+        pass
+
+    candidates = [m.group(1).strip() for m in _FENCE.finditer(text)]
+    if text.startswith("```"):
+        # 닫는 펜스 없이 잘린 응답
+        candidates.append(text.split("\n", 1)[-1].rstrip("`").strip())
+    outer = _outermost(text)
+    if outer:
+        candidates.append(outer)
+
+    for candidate in candidates:
+        for attempt in (candidate, _TRAILING_COMMA.sub(r"\1", candidate)):
+            try:
+                return json.loads(attempt)
+            except ValueError:
+                continue
+    raise StructuredOutputError(f"JSON 파싱 실패: {text[:200]}", text)
+
+
+def _matches(value: Any, expected: str) -> bool:
+    if expected == "integer":
+        return isinstance(value, int) and not isinstance(value, bool) or (
+            isinstance(value, float) and value.is_integer()
+        )
+    if expected == "number":
+        return isinstance(value, (int, float)) and not isinstance(value, bool)
+    if expected == "string":
+        return isinstance(value, str)
+    if expected == "boolean":
+        return isinstance(value, bool)
+    if expected == "array":
+        return isinstance(value, list)
+    if expected == "object":
+        return isinstance(value, dict)
+    return True
+
+
+def validate_json(data: Any, schema: Dict[str, Any], path: str = "$") -> List[str]:
+    """JSON Schema 부분집합(type/properties/required/items/enum) 검증
+
+    Returns:
+        오류 목록 (비어 있으면 통과)
+    """
+    errors: List[str] = []
+    expected = schema.get("type")
+    if expected and not _matches(data, expected):
+        return [f"{path}: {expected} 필요 ({type(data).__name__})"]
+    if "enum" in schema and data not in schema["enum"]:
+        errors.append(f"{path}: 허용값 아님 ({data!r})")
+
+    if isinstance(data, dict):
+        for key in schema.get("required", []):
+            if key not in data:
+                errors.append(f"{path}.{key}: 누락")
+        for key, sub in schema.get("properties", {}).items():
+            if key in data and data[key] is not None:
+                errors.extend(validate_json(data[key], sub, f"{path}.{key}"))
+        extra = schema.get("additionalProperties")
+        if isinstance(extra, dict):
+            for key, value in data.items():
+                if key not in schema.get("properties", {}):
+                    errors.extend(validate_json(value, extra, f"{path}.{key}"))
+    elif isinstance(data, list) and isinstance(schema.get("items"), dict):
+        for i, item in enumerate(data):
+            errors.extend(validate_json(item, schema["items"], f"{path}[{i}]"))
+    return errors
+
+
+def parse_json(text: Optional[str], schema: Optional[Dict[str, Any]] = None) -> Any:
+    """JSON 추출 + 스키마 검증
+
+    Raises:
+        StructuredOutputError: 파싱 실패 또는 스키마 불일치
+    """
+    data = extract_json(text)
+    if schema is not None:
+        errors = validate_json(data, schema)
+        if errors:
+            raise StructuredOutputError(
+                f"스키마 불일치: {'; '.join(errors[:5])}", text or ""
+            )
+    return data
+
+
+# ============================================================
+# 복구 + 호출 래퍼
+# ============================================================
+
+REPAIR_PROMPT = """The text below was supposed to be a single JSON value but could not be used.
+Error: {error}
+
+Fix ONLY the formatting/structure so it becomes valid JSON{schema_hint}.
+Keep every value and wording exactly as in the original. Output the JSON only.
+
+--- ORIGINAL ---
+{text}
+"""
+
+
+def repair_json(
+    client: Any,
+    text: str,
+    error: Exception,
+    schema: Optional[Dict[str, Any]] = None,
+    model: str = VISION_MODEL,
+) -> Any:
+    """형식이 깨진 응답을 텍스트 전용 호출 1회로 복구
+
+    Raises:
+        StructuredOutputError: 복구 응답도 파싱/검증 실패
+    """
+    schema_hint = ""
+    if schema is not None:
+        schema_hint = " matching this JSON Schema:\n" + json.dumps(schema, ensure_ascii=False)
+    prompt = REPAIR_PROMPT.format(error=error, schema_hint=schema_hint, text=text[:20000])
+    response = client.models.generate_content(
+        model=model,
+        contents=[types.Content(role="user", parts=[types.Part(text=prompt)])],
+        config=json_config(schema, temperature=0.0),
+    )
+    return parse_json(response.text, schema)
+
+
+def parse_or_repair(
+    client: Any,
+    text: Optional[str],
+    schema: Optional[Dict[str, Any]] = None,
+    repair: bool = True,
+) -> Any:
+    """parse_json, 실패 시 repair_json 1회 (client가 None이면 복구 생략)"""
+    try:
+        return parse_json(text, schema)
+    except StructuredOutputError as e:
+        if not repair or client is None or not text:
+            raise
+        print(f"[Structured] 응답 복구 시도: {e}")
+        return repair_json(client, text, e, schema)
+
+
+def generate_json(
+    client: Any,
+    contents: Any,
+    schema: Optional[Dict[str, Any]] = None,
+    model: str = VISION_MODEL,
+    repair: bool = True,
+    **config_kwargs: Any,
+) -> Tuple[Any, str]:
+    """JSON 모드로 generate_content 호출 후 검증된 JSON 반환
+
+    Args:
+        client: Gemini API 클라이언트
+        contents: generate_content contents
+        schema: 응답 JSON Schema (response_json_schema + 파싱 검증에 사용)
+        model: 모델명
+        repair: 파싱/검증 실패 시 복구 호출 1회 여부
+        **config_kwargs: GenerateContentConfig 추가 옵션 (temperature 등)
+
+    Returns:
+        (파싱된 JSON, 원본 응답 텍스트)
+
+    Raises:
+        StructuredOutputError: 복구 후에도 실패
+    """
+    config_kwargs.pop("response_modalities", None)
+    response = client.models.generate_content(
+        model=model,
+        contents=contents,
+        config=json_config(schema, **config_kwargs),
+    )
+    raw_text = response.text or ""
+    return parse_or_repair(client, raw_text, schema, repair=repair), raw_text
@@ -0,0 +1,403 @@
+"""
+호출 텔레메트리 - 모든 Gemini 요청의 지연/크기/토큰/에러 기록 + JSONL 내보내기
+
+core.api.get_client가 만드는 풀 클라이언트의 generate_content(동기/비동기)를
+감싸므로, 생성기/검증기/분석기 코드를 고치지 않아도 모든 호출이 기록된다.
+
+기록 항목 (호출 1건 = 1레코드):
+- model, workflow, step (analysis / generate / validate / gate)
+- key_index (키 값은 남기지 않음)
+- image_parts, image_bytes, prompt_chars
+- ttfb_ms (응답 헤더 수신까지), latency_ms (전체)
+- attempt (재시도 정책의 시도 번호, 0 = 첫 시도), error_class
+- prompt_tokens, output_tokens, total_tokens (usage_metadata)
+
+workflow/step은 telemetry_context로 지정하고, 지정이 없으면 step은 모델로
+추정한다 (IMAGE_MODEL → generate, 그 외 → analysis).
+
+사용법:
+    from core.telemetry import telemetry_context, configure_telemetry
+
+    configure_telemetry(path="runs/telemetry.jsonl")  # 또는 FNF_TELEMETRY_PATH
+    with telemetry_context(workflow="brandcut", step="validate"):
+        validator.validate(...)
+
+    # 요약 (워크플로별/단계별 p50/p95/p99)
+    python -m core.telemetry runs/telemetry.jsonl
+"""
+
+import contextvars
+import json
+import os
+import sys
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple, Union
+
+from PIL import Image
+from google.genai import types
+
+from core.config import IMAGE_MODEL
+
+
+# ============================================================
+# 설정
+# ============================================================
+DEFAULT_BUFFER_SIZE = 10000  # 메모리에 보관하는 최근 레코드 수
+
+STEP_ANALYSIS = "analysis"
+STEP_GENERATE = "generate"
+STEP_VALIDATE = "validate"
+STEP_GATE = "gate"
+
+
+@dataclass
+class CallRecord:
+    """Gemini 호출 1건의 기록"""
+
+    timestamp: float
+    model: str
+    workflow: Optional[str]
+    step: str
+    key_index: int
+    image_parts: int = 0
+    image_bytes: int = 0
+    prompt_chars: int = 0
+    ttfb_ms: Optional[float] = None
+    latency_ms: float = 0.0
+    attempt: int = 0
+    error_class: Optional[str] = None
+    prompt_tokens: int = 0
+    output_tokens: int = 0
+    total_tokens: int = 0
+    is_async: bool = False
+
+    def to_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+
+# ============================================================
+# 호출 컨텍스트 (workflow/step/시도 번호)
+# ============================================================
+
+_context: contextvars.ContextVar[Dict[str, Optional[str]]] = contextvars.ContextVar(
+    "fnf_telemetry_context", default={}
+)
+_attempt: contextvars.ContextVar[int] = contextvars.ContextVar("fnf_telemetry_attempt", default=0)
+_start: contextvars.ContextVar[Optional[List[Optional[float]]]] = contextvars.ContextVar(
+    "fnf_telemetry_start", default=None
+)
+
+
+@contextmanager
+def telemetry_context(workflow: Optional[str] = None, step: Optional[str] = None) -> Iterator[None]:
+    """블록 안의 호출에 workflow/step 태그 지정 (중첩 시 지정한 값만 덮어씀)"""
+    current = dict(_context.get())
+    if workflow is not None:
+        current["workflow"] = workflow
+    if step is not None:
+        current["step"] = step
+    token = _context.set(current)
+    try:
+        yield
+    finally:
+        _context.reset(token)
+
+
+def set_attempt(attempt: int) -> None:
+    """재시도 정책이 현재 시도 번호를 알림 (core.retry_policy에서 호출)"""
+    _attempt.set(attempt)
+
+
+@contextmanager
+def attempt_scope() -> Iterator[None]:
+    """재시도 루프 범위. 블록을 벗어나면 시도 번호를 이전 값으로 되돌린다"""
+    token = _attempt.set(0)
+    try:
+        yield
+    finally:
+        _attempt.reset(token)
+
+
+# ============================================================
+# 레코더
+# ============================================================
+
+
+class TelemetryRecorder:
+    """레코드 버퍼 + JSONL 파일 기록 (스레드 안전)
+
+    Args:
+        path: JSONL 경로 (None이면 메모리에만 보관)
+        buffer_size: 메모리 보관 레코드 수
+    """
+
+    def __init__(self, path: Optional[Union[str, Path]] = None, buffer_size: int = DEFAULT_BUFFER_SIZE):
+        self.path = Path(path) if path else None
+        self.enabled = True
+        self._records: deque = deque(maxlen=buffer_size)
+        self._lock = threading.Lock()
+
+    def record(self, record: CallRecord) -> None:
+        if not self.enabled:
+            return
+        line = json.dumps(record.to_dict(), ensure_ascii=False)
+        with self._lock:
+            self._records.append(record)
+            if self.path is not None:
+                try:
+                    self.path.parent.mkdir(parents=True, exist_ok=True)
+                    with open(self.path, "a", encoding="utf-8") as f:
+                        f.write(line + "\n")
+                except OSError as e:
+                    print(f"[Telemetry] 기록 실패: {e}")
+
+    def records(self) -> List[CallRecord]:
+        with self._lock:
+            return list(self._records)
+
+    def export_jsonl(self, path: Union[str, Path]) -> int:
+        """메모리 버퍼를 JSONL로 저장. 저장한 레코드 수 반환"""
+        records = self.records()
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(path, "w", encoding="utf-8") as f:
+            for record in records:
+                f.write(json.dumps(record.to_dict(), ensure_ascii=False) + "\n")
+        return len(records)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._records.clear()
+
+
+_recorder = TelemetryRecorder(path=os.getenv("FNF_TELEMETRY_PATH") or None)
+
+
+def get_recorder() -> TelemetryRecorder:
+    """프로세스 공유 레코더"""
+    return _recorder
+
+
+def configure_telemetry(path: Optional[Union[str, Path]] = None, enabled: bool = True) -> TelemetryRecorder:
+    """JSONL 경로 지정 / 기록 on-off"""
+    _recorder.path = Path(path) if path else None
+    _recorder.enabled = enabled
+    return _recorder
+
+
+# ============================================================
+# 클라이언트 계측
+# ============================================================
+
+
+def _measure_contents(contents: Any) -> Tuple[int, int, int]:
+    """contents에서 (이미지 Part 수, 이미지 바이트, 프롬프트 글자 수) 집계"""
+    image_parts = image_bytes = prompt_chars = 0
+    stack = [contents]
+    while stack:
+        item = stack.pop()
+        if item is None:
+            continue
+        if isinstance(item, (list, tuple)):
+            stack.extend(item)
+        elif isinstance(item, str):
+            prompt_chars += len(item)
+        elif isinstance(item, Image.Image):
+            image_parts += 1  # 바이트는 SDK 인코딩 후 결정되므로 집계하지 않음
+        elif isinstance(item, types.Content):
+            stack.extend(item.parts or [])
+        elif isinstance(item, types.Part):
+            if item.text is not None:
+                prompt_chars += len(item.text)
+            elif item.inline_data is not None:
+                image_parts += 1
+                image_bytes += len(item.inline_data.data or b"")
+    return image_parts, image_bytes, prompt_chars
+
+
+def _new_record(model: str, key_index: int, contents: Any, is_async: bool) -> CallRecord:
+    ctx = _context.get()
+    step = ctx.get("step") or (STEP_GENERATE if model == IMAGE_MODEL else STEP_ANALYSIS)
+    image_parts, image_bytes, prompt_chars = _measure_contents(contents)
+    return CallRecord(
+        timestamp=time.time(),
+        model=model,
+        workflow=ctx.get("workflow"),
+        step=step,
+        key_index=key_index,
+        image_parts=image_parts,
+        image_bytes=image_bytes,
+        prompt_chars=prompt_chars,
+        attempt=_attempt.get(),
+        is_async=is_async,
+    )
+
+
+def _finish_record(record: CallRecord, start: List[Optional[float]], response: Any, error: Optional[BaseException]) -> None:
+    record.latency_ms = round((time.monotonic() - start[0]) * 1000, 1)
+    if start[1] is not None:
+        record.ttfb_ms = round((start[1] - start[0]) * 1000, 1)
+    if error is not None:
+        from core.retry_policy import classify_error
+
+        record.error_class = classify_error(error).error_class
+    usage = getattr(response, "usage_metadata", None)
+    if usage is not None:
+        record.prompt_tokens = getattr(usage, "prompt_token_count", None) or 0
+        record.output_tokens = getattr(usage, "candidates_token_count", None) or 0
+        record.total_tokens = getattr(usage, "total_token_count", None) or 0
+    _recorder.record(record)
+
+
+def instrument_client(client: Any, key_index: int) -> Any:
+    """풀 클라이언트의 models.generate_content / aio.models.generate_content 계측"""
+    models = client.models
+    sync_generate = models.generate_content
+
+    def generate_content(*, model: str, contents: Any, **kwargs: Any) -> Any:
+        record = _new_record(model, key_index, contents, is_async=False)
+        start: List[Optional[float]] = [time.monotonic(), None]
+        token = _start.set(start)
+        response, error = None, None
+        try:
+            response = sync_generate(model=model, contents=contents, **kwargs)
+            return response
+        except BaseException as e:
+            error = e
+            raise
+        finally:
+            _start.reset(token)
+            _finish_record(record, start, response, error)
+
+    aio_models = client.aio.models
+    async_generate = aio_models.generate_content
+
+    async def generate_content_async(*, model: str, contents: Any, **kwargs: Any) -> Any:
+        record = _new_record(model, key_index, contents, is_async=True)
+        start: List[Optional[float]] = [time.monotonic(), None]
+        token = _start.set(start)
+        response, error = None, None
+        try:
+            response = await async_generate(model=model, contents=contents, **kwargs)
+            return response
+        except BaseException as e:
+            error = e
+            raise
+        finally:
+            _start.reset(token)
+            _finish_record(record, start, response, error)
+
+    models.generate_content = generate_content
+    aio_models.generate_content = generate_content_async
+    return client
+
+
+def _mark_first_byte() -> None:
+    start = _start.get()
+    if start is not None and start[1] is None:
+        start[1] = time.monotonic()
+
+
+def _on_response(response: Any) -> None:
+    _mark_first_byte()
+
+
+async def _on_response_async(response: Any) -> None:
+    _mark_first_byte()
+
+
+def http_event_hooks() -> Tuple[Dict[str, list], Dict[str, list]]:
+    """httpx event_hooks (동기용, 비동기용) - 응답 헤더 수신 시각(TTFB) 기록"""
+    return {"response": [_on_response]}, {"response": [_on_response_async]}
+
+
+# ============================================================
+# 요약
+# ============================================================
+
+
+def load_jsonl(path: Union[str, Path]) -> List[Dict[str, Any]]:
+    """JSONL 레코드 로드 (깨진 줄은 건너뜀)"""
+    records = []
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                records.append(json.loads(line))
+            except ValueError:
+                continue
+    return records
+
+
+def _percentile(values: List[float], q: float) -> float:
+    if not values:
+        return 0.0
+    values = sorted(values)
+    index = min(len(values) - 1, int(round(q * (len(values) - 1))))
+    return values[index]
+
+
+def summarize(records: Iterable[Union[CallRecord, Dict[str, Any]]]) -> Dict[Tuple[str, str], Dict[str, Any]]:
+    """(workflow, step)별 호출 수/지연 분위수/재시도/에러/토큰 집계"""
+    groups: Dict[Tuple[str, str], List[Dict[str, Any]]] = {}
+    for record in records:
+        data = record.to_dict() if isinstance(record, CallRecord) else record
+        key = (data.get("workflow") or "-", data.get("step") or "-")
+        groups.setdefault(key, []).append(data)
+
+    summary = {}
+    for key, items in sorted(groups.items()):
+        latencies = [r.get("latency_ms") or 0.0 for r in items]
+        ttfbs = [r["ttfb_ms"] for r in items if r.get("ttfb_ms") is not None]
+        summary[key] = {
+            "calls": len(items),
+            "p50_ms": _percentile(latencies, 0.50),
+            "p95_ms": _percentile(latencies, 0.95),
+            "p99_ms": _percentile(latencies, 0.99),
+            "ttfb_p50_ms": _percentile(ttfbs, 0.50) if ttfbs else None,
+            "total_s": round(sum(latencies) / 1000, 1),
+            "retries": sum(1 for r in items if (r.get("attempt") or 0) > 0),
+            "errors": sum(1 for r in items if r.get("error_class")),
+            "tokens": sum(r.get("total_tokens") or 0 for r in items),
+            "image_mb": round(sum(r.get("image_bytes") or 0 for r in items) / (1024 * 1024), 2),
+        }
+    return summary
+
+
+def print_summary(source: Union[str, Path, Iterable, None] = None) -> None:
+    """요약 표 출력 (source: JSONL 경로, 레코드 목록, None이면 메모리 버퍼)"""
+    if source is None:
+        records = _recorder.records()
+    elif isinstance(source, (str, Path)):
+        records = load_jsonl(source)
+    else:
+        records = list(source)
+
+    summary = summarize(records)
+    header = (
+        f"{'workflow':<18} {'step':<10} {'calls':>6} {'p50':>8} {'p95':>8} {'p99':>8}"
+        f" {'ttfb50':>8} {'total_s':>8} {'retry':>6} {'err':>5} {'tokens':>9} {'img_MB':>7}"
+    )
+    print(header)
+    print("-" * len(header))
+    for (workflow, step), s in summary.items():
+        ttfb = f"{s['ttfb_p50_ms']:.0f}" if s["ttfb_p50_ms"] is not None else "-"
+        print(
+            f"{workflow:<18} {step:<10} {s['calls']:>6} {s['p50_ms']:>8.0f} {s['p95_ms']:>8.0f}"
+            f" {s['p99_ms']:>8.0f} {ttfb:>8} {s['total_s']:>8.1f} {s['retries']:>6}"
+            f" {s['errors']:>5} {s['tokens']:>9} {s['image_mb']:>7.2f}"
+        )
+
+
+if __name__ == "__main__":
+    if len(sys.argv) != 2:
+        print("Usage: python -m core.telemetry <telemetry.jsonl>")
+        sys.exit(1)
+    print_summary(sys.argv[1])
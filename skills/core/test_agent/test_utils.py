@@ -433,17 +433,16 @@ def classify_outfit(
     Returns:
         OutfitCategory enum 값
     """
-    from google import genai
     from google.genai import types
     from core.config import VISION_MODEL
-    from core.api import _get_next_api_key
+    from core.api import _get_next_api_key, get_client
     from core.utils import pil_to_part
 
     # 클라이언트 생성
     if client is None:
         if api_key is None:
             api_key = _get_next_api_key()
-        client = genai.Client(api_key=api_key)
+        client = get_client(api_key)
 
     try:
         # PIL Image 로드 후 pil_to_part 사용
@@ -503,13 +502,12 @@ def classify_outfit_batch(
     Returns:
         {이미지 경로: 카테고리} 딕셔너리
     """
-    from google import genai
-    from core.api import _get_next_api_key
+    from core.api import _get_next_api_key, get_client
 
     if client is None:
         if api_key is None:
             api_key = _get_next_api_key()
-        client = genai.Client(api_key=api_key)
+        client = get_client(api_key)
 
     results = {}
     for i, path in enumerate(image_paths):
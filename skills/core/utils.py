@@ -3,14 +3,173 @@
 """
 
 import os
-import json
+import hashlib
 import threading
+import weakref
+from collections import OrderedDict
 from io import BytesIO
+from pathlib import Path
 from PIL import Image
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Optional, Tuple, Union
 
 from google.genai import types
 
+from core.key_scheduler import get_scheduler
+from core.structured import extract_json
+
+
+# ============================================================
+# 인코딩된 이미지 Part 캐시
+# ============================================================
+# 같은 레퍼런스(얼굴/착장 등)를 재시도/생성/검수마다 다시 리사이즈+인코딩하지
+# 않도록, (이미지 식별자, max_size, 포맷, 품질) 단위로 인코딩 결과를 재사용한다.
+PART_CACHE_MAX_BYTES = 512 * 1024 * 1024  # 512MB
+
+_part_cache: "OrderedDict[tuple, types.Part]" = OrderedDict()
+_part_cache_bytes = 0
+_part_cache_lock = threading.Lock()
+
+
+# 고정된 PIL 이미지 식별자 {id(image): (weakref, fingerprint)}
+# PIL Image는 __eq__가 픽셀 비교라 해시 불가 → id + weakref로 동일 객체 확인
+_pinned_fingerprints: Dict[int, Tuple["weakref.ref", str]] = {}
+_pinned_lock = threading.Lock()
+
+
+def _compute_fingerprint(image: Image.Image) -> str:
+    h = hashlib.blake2b(digest_size=16)
+    h.update(f"{image.mode}:{image.size}".encode("utf-8"))
+    h.update(image.tobytes())
+    return f"pil:{h.hexdigest()}"
+
+
+def pin_fingerprint(image: Image.Image) -> str:
+    """변경하지 않을 PIL 이미지의 식별자를 한 번만 계산해 고정
+
+    고정된 이미지는 이후 image_fingerprint가 픽셀 해시 없이 바로 반환한다.
+    이미지가 GC되면 자동으로 해제된다. 고정 후 이미지를 수정하면 안 된다.
+    """
+    key = id(image)
+    with _pinned_lock:
+        entry = _pinned_fingerprints.get(key)
+        if entry is not None and entry[0]() is image:
+            return entry[1]
+
+    fingerprint = _compute_fingerprint(image)
+
+    def _release(_ref, key=key):
+        with _pinned_lock:
+            current = _pinned_fingerprints.get(key)
+            if current is not None and current[0] is _ref:
+                del _pinned_fingerprints[key]
+
+    with _pinned_lock:
+        _pinned_fingerprints[key] = (weakref.ref(image, _release), fingerprint)
+    return fingerprint
+
+
+def image_fingerprint(image: Union[str, Path, Image.Image]) -> str:
+    """이미지 식별자 반환
+
+    - 경로: 절대경로 + 수정시각 + 파일크기 (디코딩 없이)
+    - PIL Image: 모드/크기/픽셀 해시 (리사이즈+인코딩보다 훨씬 저렴),
+      pin_fingerprint로 고정된 이미지는 해시 없이 반환
+    """
+    if isinstance(image, (str, Path)):
+        path = Path(image).resolve()
+        st = path.stat()
+        return f"path:{path}:{st.st_mtime_ns}:{st.st_size}"
+
+    entry = _pinned_fingerprints.get(id(image))
+    if entry is not None and entry[0]() is image:
+        return entry[1]
+    return _compute_fingerprint(image)
+
+
+def _encode_image(
+    img: Image.Image,
+    max_size: int,
+    image_format: str,
+    quality: Optional[int],
+    convert_rgb: bool,
+) -> bytes:
+    """리사이즈 + 인코딩 → 이미지 바이트"""
+    if convert_rgb or image_format == "JPEG":
+        if img.mode != "RGB":
+            img = img.convert("RGB")
+    if max(img.size) > max_size:
+        img = img.copy()
+        img.thumbnail((max_size, max_size), Image.LANCZOS)
+
+    buffer = BytesIO()
+    save_kwargs = {"format": image_format}
+    if quality is not None and image_format != "PNG":
+        save_kwargs["quality"] = quality
+    img.save(buffer, **save_kwargs)
+    return buffer.getvalue()
+
+
+def encode_image_part(
+    image: Union[str, Path, Image.Image],
+    max_size: int = 1024,
+    image_format: str = "PNG",
+    quality: Optional[int] = None,
+    convert_rgb: bool = False,
+) -> types.Part:
+    """이미지를 리사이즈 + 인코딩하여 Gemini Part로 변환 (결과 캐시)
+
+    같은 이미지/설정이면 두 번째 호출부터 리사이즈와 인코딩 없이
+    캐시된 Part를 반환한다.
+
+    Args:
+        image: 이미지 경로 또는 PIL Image
+        max_size: 긴 변 최대 크기 (LANCZOS 다운샘플링)
+        image_format: "PNG" | "JPEG" | "WEBP"
+        quality: JPEG/WEBP 품질 (PNG는 무시)
+        convert_rgb: RGB 변환 여부 (JPEG는 항상 변환)
+
+    Returns:
+        types.Part(inline_data=types.Blob(...))
+    """
+    global _part_cache_bytes
+
+    image_format = image_format.upper()
+    key: Tuple = (image_fingerprint(image), max_size, image_format, quality, convert_rgb)
+
+    with _part_cache_lock:
+        part = _part_cache.get(key)
+        if part is not None:
+            _part_cache.move_to_end(key)
+            return part
+
+    if isinstance(image, (str, Path)):
+        with Image.open(image) as img:
+            img.load()
+            data = _encode_image(img, max_size, image_format, quality, convert_rgb)
+    else:
+        data = _encode_image(image, max_size, image_format, quality, convert_rgb)
+
+    part = types.Part(
+        inline_data=types.Blob(mime_type=f"image/{image_format.lower()}", data=data)
+    )
+
+    with _part_cache_lock:
+        if key not in _part_cache:
+            _part_cache[key] = part
+            _part_cache_bytes += len(data)
+            while _part_cache_bytes > PART_CACHE_MAX_BYTES and len(_part_cache) > 1:
+                _, evicted = _part_cache.popitem(last=False)
+                _part_cache_bytes -= len(evicted.inline_data.data)
+    return part
+
+
+def clear_part_cache() -> None:
+    """인코딩된 Part 캐시 비우기 (작업 종료 시)"""
+    global _part_cache_bytes
+    with _part_cache_lock:
+        _part_cache.clear()
+        _part_cache_bytes = 0
+
 
 def pil_to_part(image_pil: Image.Image, max_size: int = 1024) -> types.Part:
     """
@@ -23,14 +182,7 @@ def pil_to_part(image_pil: Image.Image, max_size: int = 1024) -> types.Part:
     Returns:
         types.Part(inline_data=types.Blob(...))
     """
-    img = image_pil.copy().convert("RGB")
-    if max(img.size) > max_size:
-        img.thumbnail((max_size, max_size), Image.LANCZOS)
-    buffer = BytesIO()
-    img.save(buffer, format="PNG")
-    return types.Part(
-        inline_data=types.Blob(mime_type="image/png", data=buffer.getvalue())
-    )
+    return encode_image_part(image_pil, max_size=max_size, convert_rgb=True)
 
 
 class ImageUtils:
@@ -71,16 +223,11 @@ class ImageUtils:
 
     @staticmethod
     def parse_json(text: str) -> Dict[str, Any]:
-        """LLM 응답에서 JSON 파싱 (마크다운 코드블록 처리)"""
-        text = text.strip()
-        if text.startswith("```"):
-            lines = text.split("\n")
-            text = "\n".join(lines[1:-1] if lines[-1] == "```" else lines[1:])
-
+        """LLM 응답에서 JSON 파싱 (마크다운 코드블록/설명문 처리)"""
         try:
-            return json.loads(text)
-        except Exception:
-            return {"error": "JSON parse error", "raw": text}
+            return extract_json(text)
+        except ValueError:
+            return {"error": "JSON parse error", "raw": (text or "").strip()}
 
     @staticmethod
     def resize_output(
@@ -96,21 +243,30 @@ class ImageUtils:
 
 
 class ApiKeyManager:
-    """스레드 안전 API 키 로테이션 관리자"""
+    """스레드 안전 API 키 관리자
+
+    키 선택은 core.key_scheduler의 공유 스케줄러에 위임한다.
+    (같은 키 집합이면 core.api와 같은 스케줄러를 사용)
+    """
 
     def __init__(self, api_keys: List[str] = None):
         self._api_keys = api_keys or self._load_keys()
-        self._lock = threading.Lock()
-        self._index = 0
+        self._scheduler = get_scheduler(self._api_keys) if self._api_keys else None
 
     def get_key(self) -> str:
-        """다음 API 키 반환 (라운드 로빈)"""
-        if not self._api_keys:
+        """가장 여유 있는 정상 키 반환 (쿨다운 중인 키 제외)"""
+        if self._scheduler is None:
             raise ValueError("GEMINI_API_KEY 없음. .env 파일을 확인하세요.")
-        with self._lock:
-            key = self._api_keys[self._index % len(self._api_keys)]
-            self._index += 1
-            return key
+        return self._scheduler.acquire()
+
+    def report_rate_limit(self, key: str, retry_after: float = None) -> None:
+        """429 발생 키를 쿨다운에 넣음"""
+        if self._scheduler is not None:
+            self._scheduler.report_rate_limit(key, retry_after)
+
+    def stats(self) -> List[Dict[str, Any]]:
+        """키별 실시간 상태"""
+        return self._scheduler.stats() if self._scheduler is not None else []
 
     @property
     def key_count(self) -> int:
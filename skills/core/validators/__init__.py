@@ -7,6 +7,10 @@ Usage:
     # 검증기 가져오기
     validator = ValidatorRegistry.get(WorkflowType.BACKGROUND_SWAP, client)
     result = validator.validate(generated_img, reference_images)
+
+    # 같은 브리프의 후보 여러 장은 레퍼런스를 한 번만 보내 함께 채점
+    batch = validator.validate_batch([img1, img2, img3], reference_images)
+    best = batch.best
 """
 
 from .base import (
@@ -15,18 +19,19 @@ from .base import (
     ValidationConfig,
     CommonValidationResult,
     WorkflowValidator,
+    ReferenceBundle,
+    run_with_gate,
 )
 from .registry import ValidatorRegistry
+from .result_cache import cached_validate, cached_validate_batch
+from .tournament import BatchValidationResult, TournamentRubric
+from .prefilter import PrefilterCascade, PrefilterResult, build_prefilter, get_prefilter_stats
 
 # Note: Workflow validators are registered via @ValidatorRegistry.register decorator
-# when their respective modules are imported. Import from workflow modules directly:
-#   from core.face_swap import FaceSwapValidator
-#   from core.outfit_swap import OutfitSwapValidator
-#   from core.ai_influencer.validator import AIInfluencerWorkflowValidator
-#   etc.
-#
-# Or use ValidatorRegistry.get(WorkflowType.FACE_SWAP, client) after importing the workflow module.
-# For AI_INFLUENCER: import core.ai_influencer.validator to trigger registration.
+# when their modules are imported. ValidatorRegistry.get lazily imports the module
+# listed in registry.WORKFLOW_VALIDATORS, so no registration import is needed:
+#   validator = ValidatorRegistry.get(WorkflowType.FACE_SWAP, client)
+# Instances are reused per (workflow, API key) for pooled clients.
 
 __all__ = [
     "WorkflowType",
@@ -35,4 +40,14 @@ __all__ = [
     "CommonValidationResult",
     "WorkflowValidator",
     "ValidatorRegistry",
+    "ReferenceBundle",
+    "run_with_gate",
+    "cached_validate",
+    "cached_validate_batch",
+    "BatchValidationResult",
+    "TournamentRubric",
+    "PrefilterCascade",
+    "PrefilterResult",
+    "build_prefilter",
+    "get_prefilter_stats",
 ]
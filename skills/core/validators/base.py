@@ -4,13 +4,31 @@ FNF Studio 통합 검증기 기본 모듈
 이 모듈은 모든 워크플로 검증기의 기반 인터페이스를 제공합니다.
 """
 
+import contextvars
+import hashlib
+import threading
 from abc import ABC, abstractmethod
+from collections.abc import Mapping
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass, field
 from enum import Enum
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Union
+from typing import TYPE_CHECKING, Any, Callable, Dict, List, Optional, Tuple, TypeVar, Union
 
 from PIL import Image
+from google.genai import types
+
+from core.utils import encode_image_part, pin_fingerprint
+
+if TYPE_CHECKING:
+    from .tournament import BatchValidationResult, TournamentRubric
+
+
+T = TypeVar("T")
+G = TypeVar("G")
+
+# 게이트 호출 전용 스레드 풀 크기 (동시에 검증 중인 이미지 수만큼 필요)
+GATE_MAX_WORKERS = 8
 
 
 class WorkflowType(Enum):
@@ -48,6 +66,128 @@ class QualityTier(Enum):
     REGENERATE = "REGENERATE"  # C/F Grade: 재생성 필요
 
 
+ImageInput = Union[str, Path, Image.Image]
+
+
+class ReferenceBundle(Mapping):
+    """작업 레퍼런스 이미지 묶음 - 한 번 로드/인코딩해서 생성과 검증에 재사용
+
+    역할(face/outfit/pose/style/background 등)별 이미지를 생성 시점에 한 번만
+    디코딩(RGB)하고 식별자를 고정(core.utils.pin_fingerprint)한다. 이후 생성기와
+    검증기가 같은 이미지를 encode_image_part로 인코딩하면 픽셀 해시 없이 캐시를
+    찾으므로, 재시도마다 발생하던 디스크 I/O와 리사이즈/인코딩이 없어진다.
+
+    Dict[str, List[Image]]처럼 동작하므로 reference_images 딕셔너리를 받는
+    기존 생성기/검증기에 그대로 넘길 수 있다.
+
+    Usage:
+        refs = ReferenceBundle({"face": face_paths, "outfit": outfit_paths})
+        for attempt in range(max_retries + 1):
+            image = generate_func(prompt, refs, config)
+            result = validator.validate(image, refs)
+
+        parts = refs.parts("face", limit=3)  # 인코딩된 Part 재사용
+    """
+
+    def __init__(self, references: Optional[Mapping] = None):
+        self._images: Dict[str, List[Image.Image]] = {}
+        self._parts: Dict[Tuple, types.Part] = {}
+        self._fingerprints: Dict[str, List[str]] = {}
+        for role, images in (references or {}).items():
+            if images is None:
+                continue
+            if isinstance(images, (str, Path, Image.Image)):
+                images = [images]
+            self.add(role, images)
+
+    @classmethod
+    def ensure(cls, references: Optional[Mapping]) -> "ReferenceBundle":
+        """ReferenceBundle이면 그대로, 딕셔너리면 새로 만들어 반환"""
+        if isinstance(references, cls):
+            return references
+        return cls(references)
+
+    def add(self, role: str, images: List[ImageInput]) -> None:
+        """역할에 이미지 추가 (경로는 이 시점에 한 번만 디코딩)"""
+        loaded = self._images.setdefault(role, [])
+        fingerprints = self._fingerprints.setdefault(role, [])
+        for img in images:
+            if isinstance(img, (str, Path)):
+                with Image.open(img) as opened:
+                    pil = opened.convert("RGB")
+            else:
+                pil = img if img.mode == "RGB" else img.convert("RGB")
+            loaded.append(pil)
+            fingerprints.append(pin_fingerprint(pil))
+
+    # ------------------------------------------------------------
+    # Mapping 인터페이스 (role → 디코딩된 이미지 리스트)
+    # ------------------------------------------------------------
+
+    def __getitem__(self, role: str) -> List[Image.Image]:
+        return self._images[role]
+
+    def __iter__(self):
+        return iter(self._images)
+
+    def __len__(self) -> int:
+        return len(self._images)
+
+    def images(self, role: str) -> List[Image.Image]:
+        """역할의 디코딩된 이미지 (없으면 빈 리스트)"""
+        return self._images.get(role, [])
+
+    def first(self, role: str) -> Optional[Image.Image]:
+        images = self._images.get(role)
+        return images[0] if images else None
+
+    # ------------------------------------------------------------
+    # 인코딩된 Part
+    # ------------------------------------------------------------
+
+    def part(
+        self,
+        role: str,
+        index: int = 0,
+        max_size: int = 1024,
+        image_format: str = "PNG",
+        quality: Optional[int] = None,
+    ) -> types.Part:
+        """역할의 index번째 이미지를 인코딩한 Part (설정별로 한 번만 인코딩)"""
+        key = (role, index, max_size, image_format.upper(), quality)
+        part = self._parts.get(key)
+        if part is None:
+            part = encode_image_part(
+                self._images[role][index],
+                max_size=max_size,
+                image_format=image_format,
+                quality=quality,
+            )
+            self._parts[key] = part
+        return part
+
+    def parts(self, role: str, limit: Optional[int] = None, **encode_kwargs: Any) -> List[types.Part]:
+        """역할의 이미지들을 인코딩한 Part 리스트 (limit: 앞에서부터 최대 개수)"""
+        count = len(self.images(role))
+        if limit is not None:
+            count = min(count, limit)
+        return [self.part(role, i, **encode_kwargs) for i in range(count)]
+
+    def fingerprint(self) -> str:
+        """묶음 전체 식별자 (역할 + 이미지 식별자 순서 반영)"""
+        h = hashlib.blake2b(digest_size=16)
+        for role in sorted(self._fingerprints):
+            h.update(role.encode("utf-8"))
+            for fp in self._fingerprints[role]:
+                h.update(b"\x00")
+                h.update(fp.encode("utf-8"))
+            h.update(b"\x01")
+        return h.hexdigest()
+
+
+ReferenceInput = Union[ReferenceBundle, Dict[str, List[ImageInput]]]
+
+
 @dataclass
 class ValidationConfig:
     """검증 설정"""
@@ -89,6 +229,62 @@ class CommonValidationResult:
             "summary_kr": self.summary_kr,
         }
 
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "CommonValidationResult":
+        """to_dict() 결과에서 복원 (raw_response는 있으면 함께 복원)"""
+        return cls(
+            workflow_type=WorkflowType(data["workflow_type"]),
+            total_score=data["total_score"],
+            tier=QualityTier(data["tier"]),
+            grade=data["grade"],
+            passed=data["passed"],
+            auto_fail=data.get("auto_fail", False),
+            auto_fail_reasons=list(data.get("auto_fail_reasons", [])),
+            issues=list(data.get("issues", [])),
+            criteria_scores=dict(data.get("criteria_scores", {})),
+            summary_kr=data.get("summary_kr", ""),
+            raw_response=data.get("raw_response", ""),
+        )
+
+
+_gate_executor: Optional[ThreadPoolExecutor] = None
+_gate_executor_lock = threading.Lock()
+
+
+def _get_gate_executor() -> ThreadPoolExecutor:
+    global _gate_executor
+    with _gate_executor_lock:
+        if _gate_executor is None:
+            _gate_executor = ThreadPoolExecutor(
+                max_workers=GATE_MAX_WORKERS, thread_name_prefix="fnf-gate"
+            )
+        return _gate_executor
+
+
+def run_with_gate(
+    score_fn: Callable[[], T],
+    gate_fn: Optional[Callable[[], G]] = None,
+) -> Tuple[T, Optional[G]]:
+    """기준 채점 호출과 게이트 호출을 동시에 실행하고 둘 다 끝나면 반환
+
+    게이트 결과는 채점을 생략시키지 않고 채점 후 결과에 반영만 하므로
+    두 VLM 호출 사이에 순서 의존이 없다. gate_fn은 공유 스레드 풀에서
+    (호출자의 contextvars를 그대로 가지고), score_fn은 호출 스레드에서 실행한다.
+
+    Args:
+        score_fn: 기준 채점 함수
+        gate_fn: 게이트 함수 (None이면 채점만 실행)
+
+    Returns:
+        (채점 결과, 게이트 결과 또는 None)
+    """
+    if gate_fn is None:
+        return score_fn(), None
+
+    gate_future = _get_gate_executor().submit(contextvars.copy_context().run, gate_fn)
+    score = score_fn()
+    return score, gate_future.result()
+
 
 class WorkflowValidator(ABC):
     """워크플로 검증기 추상 클래스
@@ -99,6 +295,13 @@ class WorkflowValidator(ABC):
     workflow_type: WorkflowType
     config: ValidationConfig
 
+    # 프롬프트/채점 로직이 바뀌면 올려서 검증 결과 캐시 무효화
+    # (core.validators.result_cache)
+    version: str = "1"
+
+    # validate_batch에서 VLM 한 번에 채점할 최대 후보 수 (초과 시 개별 검증)
+    max_batch_candidates: int = 4
+
     def __init__(self, client):
         """검증기 초기화
 
@@ -111,14 +314,14 @@ class WorkflowValidator(ABC):
     def validate(
         self,
         generated_img: Union[str, Path, Image.Image],
-        reference_images: Dict[str, List[Union[str, Path, Image.Image]]],
+        reference_images: ReferenceInput,
         **kwargs,
     ) -> CommonValidationResult:
         """이미지 검증 수행
 
         Args:
             generated_img: 생성된 이미지 (경로 또는 PIL Image)
-            reference_images: 참조 이미지 딕셔너리
+            reference_images: 참조 이미지 딕셔너리 또는 ReferenceBundle
                 - "face": 얼굴 이미지 리스트
                 - "outfit": 착장 이미지 리스트
                 - "background": 배경 이미지 리스트
@@ -130,6 +333,51 @@ class WorkflowValidator(ABC):
         """
         pass
 
+    def validate_batch(
+        self,
+        candidates: List[Union[str, Path, Image.Image]],
+        reference_images: ReferenceInput,
+        **kwargs,
+    ) -> "BatchValidationResult":
+        """같은 브리프의 후보 여러 장을 함께 검증하고 순위 반환
+
+        레퍼런스를 한 번만 싣고 후보 N장을 단일 VLM 호출로 채점한다
+        (core.validators.tournament). 채점 기준은 tournament_rubric()이 주는
+        검증기 자체 루브릭이다. 후보가 1장이거나 max_batch_candidates를 넘거나,
+        루브릭 훅이 없거나(None), 워크플로 전용 kwargs가 있거나, 토너먼트 채점에
+        실패하면 후보별 validate로 폴백한다.
+
+        Args:
+            candidates: 후보 이미지 리스트 (경로 또는 PIL Image)
+            reference_images: 참조 이미지 딕셔너리 또는 ReferenceBundle
+            **kwargs: validate에 전달할 추가 옵션 (있으면 개별 검증)
+
+        Returns:
+            BatchValidationResult: 후보 순서의 결과 + 순위
+        """
+        from .tournament import BatchValidationResult, rank_results, validate_tournament
+
+        references = ReferenceBundle.ensure(reference_images)
+        if (
+            1 < len(candidates) <= self.max_batch_candidates
+            and not kwargs
+        ):
+            batch = validate_tournament(self, candidates, references)
+            if batch is not None:
+                return batch
+
+        results = [self.validate(c, references, **kwargs) for c in candidates]
+        return BatchValidationResult(results=results, ranking=rank_results(results))
+
+    def tournament_rubric(self) -> Optional["TournamentRubric"]:
+        """토너먼트 채점용 검증기 자체 루브릭 (core.validators.tournament.TournamentRubric)
+
+        validate와 같은 채점 프롬프트/항목 정의와 결과 생성 로직을 돌려주면
+        validate_batch가 후보 N장을 단일 호출로 채점한다. 기본값 None은 토너먼트를
+        쓰지 않고 후보별 validate로 검증한다 (판정 기준이 달라지지 않도록).
+        """
+        return None
+
     @abstractmethod
     def get_enhancement_rules(self, failed_criteria: List[str]) -> str:
         """실패 기준에 따른 프롬프트 강화 규칙 반환
@@ -157,6 +405,29 @@ class WorkflowValidator(ABC):
         # 점수가 너무 낮으면 재시도
         return result.total_score < self.config.pass_total
 
+    def _extract_failed_criteria(self, result: CommonValidationResult) -> List[str]:
+        """기준별 임계값 미달 항목 (get_enhancement_rules 입력)
+
+        임계값은 config.auto_fail_thresholds, 없으면 pass_total.
+        config.priority_order 순으로 정렬 (목록에 없는 기준은 뒤로).
+
+        Args:
+            result: 검증 결과
+
+        Returns:
+            실패한 기준 키 목록
+        """
+        failed = []
+        for criterion, value in result.criteria_scores.items():
+            score = value.get("score") if isinstance(value, dict) else value
+            if not isinstance(score, (int, float)) or isinstance(score, bool):
+                continue
+            threshold = self.config.auto_fail_thresholds.get(criterion, self.config.pass_total)
+            if score < threshold:
+                failed.append(criterion)
+        order = {criterion: i for i, criterion in enumerate(self.config.priority_order)}
+        return sorted(failed, key=lambda criterion: order.get(criterion, len(order)))
+
     def _load_image(self, img: Union[str, Path, Image.Image]) -> Image.Image:
         """이미지 로드 헬퍼
 
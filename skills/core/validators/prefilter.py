@@ -0,0 +1,533 @@
+"""
+로컬 사전 필터 - VLM 검증 전에 명백한 불량을 싸게 걸러냄
+
+생성 이미지마다 다중 레퍼런스 VLM 검증을 부르기 전에 로컬 검사를 순서대로
+돌려서, 명백한 실패는 VLM 호출 없이 바로 재생성으로 넘긴다.
+
+단계 (싼 것부터, 첫 실패에서 중단):
+    1. resolution   - 최소 해상도 + 요청 비율(aspect_ratio) 확인
+    2. blank        - 단색/빈 이미지 (그레이스케일 표준편차)
+    3. duplicate    - perceptual hash + 썸네일로 이전 시도와 중복, 또는 입력 소스와
+                      사실상 동일(편집 안 됨)한 결과 검출
+    4. clip         - A급 DB 대비 CLIP 유사도 하한 (core.brandcut.clip_validator
+                      사용 가능 + 임베딩 캐시가 있을 때만, 브랜드컷)
+    5. background   - 스왑 워크플로의 배경 픽셀 보존 (프레임 테두리 비교)
+
+스킵 비율(사전 필터가 막은 VLM 검증 비율)은 프로세스 전역
+PrefilterStats에 워크플로/단계별로 기록된다.
+
+환경변수:
+    FNF_PREFILTER: 0이면 사전 필터 비활성화
+    FNF_PREFILTER_CLIP: 0이면 CLIP 단계 비활성화
+    FNF_PREFILTER_CLIP_MIN: CLIP 평균 유사도 하한 (기본 0.5)
+
+사용법:
+    from core.validators.prefilter import build_prefilter
+
+    prefilter = build_prefilter(WorkflowType.OUTFIT_SWAP)   # 작업(루프)당 1개
+    check = prefilter.check(image, references, aspect_ratio="3:4")
+    if not check.passed:
+        ...  # VLM 검증 생략, 재생성
+"""
+
+import os
+import threading
+from abc import ABC, abstractmethod
+from collections import Counter
+from dataclasses import dataclass, field
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+from PIL import Image
+
+from .base import ReferenceBundle, ReferenceInput, WorkflowType
+
+
+def _env_flag(name: str, default: str = "1") -> bool:
+    return os.getenv(name, default).strip().lower() not in ("0", "false", "off", "no")
+
+
+def prefilter_enabled() -> bool:
+    return _env_flag("FNF_PREFILTER")
+
+
+# ============================================================
+# 결과 / 컨텍스트
+# ============================================================
+
+
+@dataclass
+class PrefilterResult:
+    """사전 필터 결과"""
+
+    passed: bool
+    stage: str = ""  # 탈락시킨 단계 이름
+    reason: str = ""
+    metrics: Dict[str, Any] = field(default_factory=dict)
+
+    def to_history(self) -> Dict[str, Any]:
+        """재시도 루프 history 항목에 합칠 필드"""
+        return {
+            "prefilter": self.stage,
+            "error": f"Prefilter rejected ({self.stage}): {self.reason}",
+        }
+
+
+@dataclass
+class PrefilterContext:
+    """단계 간 공유 정보 (캐스케이드가 check마다 생성)"""
+
+    references: ReferenceBundle
+    aspect_ratio: Optional[str] = None
+    seen: List["Signature"] = field(default_factory=list)
+    signature: Optional["Signature"] = None
+    metrics: Dict[str, Any] = field(default_factory=dict)
+
+
+# ============================================================
+# 이미지 유틸
+# ============================================================
+
+
+@lru_cache(maxsize=4)
+def _dct_matrix(n: int) -> np.ndarray:
+    """정규직교 DCT-II 행렬"""
+    k = np.arange(n)[:, None]
+    i = np.arange(n)[None, :]
+    matrix = np.sqrt(2.0 / n) * np.cos(np.pi * (2 * i + 1) * k / (2 * n))
+    matrix[0, :] = np.sqrt(1.0 / n)
+    return matrix
+
+
+def perceptual_hash(image: Image.Image, hash_size: int = 8) -> int:
+    """DCT 기반 perceptual hash (hash_size² 비트 정수)"""
+    size = hash_size * 4
+    gray = image.convert("L").resize((size, size), Image.Resampling.LANCZOS)
+    pixels = np.asarray(gray, dtype=np.float64)
+    dct = _dct_matrix(size)
+    low = (dct @ pixels @ dct.T)[:hash_size, :hash_size]
+    bits = (low > np.median(low)).flatten()
+    value = 0
+    for bit in bits:
+        value = (value << 1) | int(bit)
+    return value
+
+
+def hash_distance(a: int, b: int) -> int:
+    """두 perceptual hash의 해밍 거리"""
+    return bin(a ^ b).count("1")
+
+
+# (perceptual hash, 32x32 RGB 썸네일)
+Signature = Tuple[int, np.ndarray]
+
+
+def image_signature(image: Image.Image) -> Signature:
+    """중복 비교용 시그니처 - 해시로 1차 선별, 썸네일로 색 차이 확인
+    (그레이스케일 해시만으로는 색만 바뀐 착장을 같은 이미지로 본다)"""
+    thumb = np.asarray(
+        image.convert("RGB").resize((32, 32), Image.Resampling.BILINEAR), dtype=np.float32
+    )
+    return perceptual_hash(image), thumb
+
+
+def _same_image(
+    a: Signature, b: Signature, max_distance: int, max_pixel_diff: float
+) -> Optional[int]:
+    """같은 이미지로 볼 수 있으면 해시 거리, 아니면 None"""
+    distance = hash_distance(a[0], b[0])
+    if distance > max_distance:
+        return None
+    if float(np.abs(a[1] - b[1]).mean()) > max_pixel_diff:
+        return None
+    return distance
+
+
+def _parse_aspect_ratio(aspect_ratio: Optional[str]) -> Optional[float]:
+    """'3:4' → 0.75 (W/H). 'auto' 등 비율이 아닌 값은 None"""
+    if not aspect_ratio or ":" not in aspect_ratio:
+        return None
+    try:
+        width, height = (float(v) for v in aspect_ratio.split(":", 1))
+    except ValueError:
+        return None
+    return width / height if width > 0 and height > 0 else None
+
+
+def _load(image: Union[str, Path, Image.Image]) -> Image.Image:
+    if isinstance(image, Image.Image):
+        return image
+    with Image.open(image) as img:
+        return img.convert("RGB")
+
+
+# ============================================================
+# 단계
+# ============================================================
+
+
+class PrefilterStage(ABC):
+    """사전 필터 단계 베이스 - check가 탈락 사유를 반환하면 탈락"""
+
+    name = "stage"
+
+    @abstractmethod
+    def check(self, image: Image.Image, ctx: PrefilterContext) -> Optional[str]:
+        """탈락 사유 반환 (통과면 None)"""
+        pass
+
+
+class ResolutionStage(PrefilterStage):
+    """최소 해상도 + 요청 비율 확인"""
+
+    name = "resolution"
+
+    def __init__(self, min_side: int = 512, aspect_tolerance: float = 0.08):
+        self.min_side = min_side
+        self.aspect_tolerance = aspect_tolerance
+
+    def check(self, image: Image.Image, ctx: PrefilterContext) -> Optional[str]:
+        width, height = image.size
+        if min(width, height) < self.min_side:
+            return f"해상도 부족 {width}x{height} (최소 {self.min_side}px)"
+
+        expected = _parse_aspect_ratio(ctx.aspect_ratio)
+        if expected is not None:
+            actual = width / height
+            deviation = abs(actual - expected) / expected
+            ctx.metrics["aspect_deviation"] = round(deviation, 4)
+            if deviation > self.aspect_tolerance:
+                return f"비율 불일치 {width}x{height} (요청 {ctx.aspect_ratio})"
+        return None
+
+
+class BlankStage(PrefilterStage):
+    """단색/빈 이미지 검출"""
+
+    name = "blank"
+
+    def __init__(self, min_std: float = 4.0):
+        self.min_std = min_std
+
+    def check(self, image: Image.Image, ctx: PrefilterContext) -> Optional[str]:
+        gray = np.asarray(
+            image.convert("L").resize((64, 64), Image.Resampling.NEAREST), dtype=np.float32
+        )
+        std = float(gray.std())
+        ctx.metrics["pixel_std"] = round(std, 2)
+        if std < self.min_std:
+            return f"빈 이미지 (픽셀 표준편차 {std:.1f})"
+        return None
+
+
+class DuplicateStage(PrefilterStage):
+    """이전 시도와 중복 / 입력 소스와 동일한 결과 검출
+
+    이전 시도와 사실상 같은 이미지는 같은 점수를 받으므로 재검증할 필요가 없고,
+    소스와 동일하면 편집이 적용되지 않은 것이다. 소스 비교는 얼굴만 바뀌는
+    face swap처럼 정상 결과도 해시가 가까운 워크플로에서는 쓰지 않는다.
+    """
+
+    name = "duplicate"
+
+    def __init__(
+        self,
+        max_distance: int = 4,
+        max_pixel_diff: float = 3.0,
+        source_roles: Sequence[str] = (),
+    ):
+        self.max_distance = max_distance
+        self.max_pixel_diff = max_pixel_diff
+        self.source_roles = tuple(source_roles)
+
+    def check(self, image: Image.Image, ctx: PrefilterContext) -> Optional[str]:
+        signature = ctx.signature
+        if signature is None:
+            signature = ctx.signature = image_signature(image)
+
+        for previous in ctx.seen:
+            distance = _same_image(signature, previous, self.max_distance, self.max_pixel_diff)
+            if distance is not None:
+                ctx.metrics["duplicate_distance"] = distance
+                return f"이전 시도와 중복 (해시 거리 {distance})"
+
+        for role in self.source_roles:
+            for source in ctx.references.images(role):
+                distance = _same_image(
+                    signature, image_signature(source), self.max_distance, self.max_pixel_diff
+                )
+                if distance is not None:
+                    ctx.metrics["source_distance"] = distance
+                    return f"{role} 이미지와 동일 - 편집 미적용 (해시 거리 {distance})"
+        return None
+
+
+class ClipStage(PrefilterStage):
+    """A급 DB 대비 CLIP 유사도 하한 (core.brandcut.clip_validator)"""
+
+    name = "clip"
+
+    def __init__(self, min_similarity: Optional[float] = None):
+        if min_similarity is None:
+            min_similarity = float(os.getenv("FNF_PREFILTER_CLIP_MIN", "0.5"))
+        self.min_similarity = min_similarity
+
+    @staticmethod
+    def available() -> bool:
+        """CLIP 백엔드(torch 또는 onnx) 사용 가능 + A급 임베딩 캐시 존재 시에만 사용"""
+        if not _env_flag("FNF_PREFILTER_CLIP"):
+            return False
+        try:
+            from core.brandcut.clip_validator import (
+                clip_backend_available,
+                default_cache_path,
+            )
+        except ImportError:
+            return False
+        return clip_backend_available() and default_cache_path().exists()
+
+    def check(self, image: Image.Image, ctx: PrefilterContext) -> Optional[str]:
+        from core.brandcut.clip_validator import get_clip_validator
+
+        try:
+            score = get_clip_validator().score_image(image)
+        except Exception as e:
+            print(f"[Prefilter] CLIP 단계 생략: {e}")
+            return None
+
+        similarity = float(score["avg_similarity"])
+        ctx.metrics["clip_similarity"] = round(similarity, 4)
+        if similarity < self.min_similarity:
+            return f"A급 유사도 낮음 ({similarity:.2f} < {self.min_similarity:.2f})"
+        return None
+
+
+class BackgroundPreservationStage(PrefilterStage):
+    """스왑 결과의 배경 보존 확인 (프레임 상단/좌우 테두리 픽셀 비교)
+
+    인물/착장만 바꾸는 워크플로에서 테두리 영역은 대부분 배경이므로,
+    소스와 평균 픽셀 차이가 크면 배경이 통째로 바뀐 것으로 본다.
+    비율이 다르면 픽셀 대응이 안 되므로 판단하지 않는다.
+    """
+
+    name = "background"
+
+    def __init__(
+        self,
+        role: str = "source",
+        border: float = 0.06,
+        max_mean_diff: float = 45.0,
+        work_width: int = 256,
+    ):
+        self.role = role
+        self.border = border
+        self.max_mean_diff = max_mean_diff
+        self.work_width = work_width
+
+    def _border_pixels(self, image: Image.Image, size: tuple) -> np.ndarray:
+        pixels = np.asarray(image.convert("RGB").resize(size), dtype=np.float32)
+        height, width = pixels.shape[:2]
+        band_h = max(1, int(height * self.border))
+        band_w = max(1, int(width * self.border))
+        return np.concatenate(
+            [
+                pixels[:band_h].reshape(-1, 3),
+                pixels[band_h:, :band_w].reshape(-1, 3),
+                pixels[band_h:, -band_w:].reshape(-1, 3),
+            ]
+        )
+
+    def check(self, image: Image.Image, ctx: PrefilterContext) -> Optional[str]:
+        source = ctx.references.first(self.role)
+        if source is None:
+            return None
+
+        source_ratio = source.width / source.height
+        if abs(image.width / image.height - source_ratio) / source_ratio > 0.05:
+            return None
+
+        size = (self.work_width, max(1, round(self.work_width / source_ratio)))
+        diff = np.abs(self._border_pixels(image, size) - self._border_pixels(source, size))
+        mean_diff = float(diff.mean())
+        ctx.metrics["background_diff"] = round(mean_diff, 2)
+        if mean_diff > self.max_mean_diff:
+            return f"배경 미보존 (테두리 평균 차이 {mean_diff:.1f})"
+        return None
+
+
+# ============================================================
+# 캐스케이드
+# ============================================================
+
+
+class PrefilterCascade:
+    """단계들을 순서대로 실행. 작업(재시도 루프) 하나당 인스턴스 하나 -
+    통과한 이미지의 시그니처를 기억해 다음 시도의 중복 검출에 쓴다.
+    여러 스레드가 동시에 check를 불러도 된다 (투기적 생성 라운드)."""
+
+    def __init__(self, stages: Sequence[PrefilterStage], workflow: str = ""):
+        self.stages = list(stages)
+        self.workflow = workflow
+        self._seen: List[Signature] = []
+        self._seen_lock = threading.Lock()
+
+    def check(
+        self,
+        image: Union[str, Path, Image.Image],
+        references: Optional[ReferenceInput] = None,
+        aspect_ratio: Optional[str] = None,
+    ) -> PrefilterResult:
+        """생성 이미지 사전 검사
+
+        Args:
+            image: 생성 이미지 (경로 또는 PIL Image)
+            references: 참조 이미지 딕셔너리 또는 ReferenceBundle
+            aspect_ratio: 요청한 화면 비율 ("3:4" 등, 없으면 비율 검사 생략)
+
+        Returns:
+            PrefilterResult: passed=False면 VLM 검증 없이 재생성
+        """
+        with self._seen_lock:
+            seen = list(self._seen)
+        ctx = PrefilterContext(
+            references=ReferenceBundle.ensure(references or {}),
+            aspect_ratio=aspect_ratio,
+            seen=seen,
+        )
+        image = _load(image)
+
+        for stage in self.stages:
+            try:
+                reason = stage.check(image, ctx)
+            except Exception as e:
+                print(f"[Prefilter] {stage.name} 단계 오류 - 통과 처리: {e}")
+                continue
+            if reason:
+                get_prefilter_stats().record(self.workflow, stage.name)
+                print(f"[Prefilter] 탈락 ({stage.name}): {reason} - VLM 검증 생략")
+                return PrefilterResult(
+                    passed=False, stage=stage.name, reason=reason, metrics=ctx.metrics
+                )
+
+        if ctx.signature is not None:
+            with self._seen_lock:
+                self._seen.append(ctx.signature)
+        get_prefilter_stats().record(self.workflow, None)
+        return PrefilterResult(passed=True, metrics=ctx.metrics)
+
+
+# 워크플로별 배경 보존/소스 중복 비교에 쓸 레퍼런스 역할
+_SOURCE_ROLES: Dict[WorkflowType, str] = {
+    WorkflowType.BACKGROUND_SWAP: "original",
+    WorkflowType.OUTFIT_SWAP: "source",
+    WorkflowType.POSE_COPY: "source",
+    WorkflowType.POSE_CHANGE: "source",
+}
+
+_BACKGROUND_PRESERVING = {
+    WorkflowType.FACE_SWAP,
+    WorkflowType.MULTI_FACE_SWAP,
+    WorkflowType.OUTFIT_SWAP,
+}
+
+_CLIP_WORKFLOWS = {WorkflowType.BRANDCUT, WorkflowType.REFERENCE_BRANDCUT}
+
+
+def build_prefilter(
+    workflow_type: WorkflowType,
+    min_side: int = 512,
+) -> Optional[PrefilterCascade]:
+    """워크플로 기본 캐스케이드 생성 (FNF_PREFILTER=0이면 None)
+
+    Args:
+        workflow_type: 워크플로 타입
+        min_side: 최소 해상도 (짧은 변, px)
+    """
+    if not prefilter_enabled():
+        return None
+
+    source_role = _SOURCE_ROLES.get(workflow_type)
+    stages: List[PrefilterStage] = [
+        ResolutionStage(min_side=min_side),
+        BlankStage(),
+        DuplicateStage(source_roles=(source_role,) if source_role else ()),
+    ]
+    if workflow_type in _CLIP_WORKFLOWS and ClipStage.available():
+        stages.append(ClipStage())
+    if workflow_type in _BACKGROUND_PRESERVING:
+        stages.append(BackgroundPreservationStage())
+
+    return PrefilterCascade(stages, workflow=getattr(workflow_type, "value", str(workflow_type)))
+
+
+# ============================================================
+# 스킵 비율 통계
+# ============================================================
+
+
+class PrefilterStats:
+    """사전 필터 통과/탈락 집계 (스레드 안전)"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.checked: Counter = Counter()
+        self.rejected: Counter = Counter()
+        self.by_stage: Counter = Counter()
+
+    def record(self, workflow: str, stage: Optional[str]) -> None:
+        """stage=None이면 통과, 아니면 해당 단계에서 탈락"""
+        with self._lock:
+            self.checked[workflow] += 1
+            if stage:
+                self.rejected[workflow] += 1
+                self.by_stage[stage] += 1
+
+    def reset(self) -> None:
+        with self._lock:
+            self.checked.clear()
+            self.rejected.clear()
+            self.by_stage.clear()
+
+    def summary(self) -> Dict[str, Any]:
+        """전체/워크플로별 스킵 비율 (탈락 = 생략한 VLM 검증)"""
+        with self._lock:
+            checked = sum(self.checked.values())
+            rejected = sum(self.rejected.values())
+            return {
+                "checked": checked,
+                "rejected": rejected,
+                "skip_rate": rejected / checked if checked else 0.0,
+                "by_stage": dict(self.by_stage),
+                "by_workflow": {
+                    workflow: {
+                        "checked": count,
+                        "rejected": self.rejected[workflow],
+                        "skip_rate": self.rejected[workflow] / count,
+                    }
+                    for workflow, count in self.checked.items()
+                },
+            }
+
+    def print_summary(self) -> None:
+        data = self.summary()
+        print(
+            f"[Prefilter] 검사 {data['checked']}건, 탈락 {data['rejected']}건 "
+            f"(VLM 스킵 비율 {data['skip_rate']:.1%})"
+        )
+        for stage, count in sorted(data["by_stage"].items(), key=lambda kv: -kv[1]):
+            print(f"  {stage}: {count}")
+
+
+_stats: Optional[PrefilterStats] = None
+_stats_lock = threading.Lock()
+
+
+def get_prefilter_stats() -> PrefilterStats:
+    """프로세스 공유 사전 필터 통계"""
+    global _stats
+    with _stats_lock:
+        if _stats is None:
+            _stats = PrefilterStats()
+        return _stats
@@ -2,13 +2,39 @@
 FNF Studio 검증기 레지스트리
 
 워크플로 타입별 검증기를 등록하고 관리합니다.
+
+- 등록: 검증기 모듈의 @ValidatorRegistry.register 데코레이터
+- 지연 로드: 등록 전이면 WORKFLOW_VALIDATORS의 모듈을 import해 등록 트리거
+  (호출자가 "등록용 import"를 따로 할 필요 없음)
+- 인스턴스 캐시: (워크플로, API 키)당 검증기 1개를 재사용. 재시도/배치마다
+  검증기를 새로 만들지 않아 프롬프트/임계값 준비가 한 번만 일어난다.
+  풀링되지 않은 클라이언트(core.api.get_client 외)는 캐시하지 않음
 """
 
-from typing import Dict, List, Type
+import importlib
+import threading
+from typing import Any, Dict, List, Optional, Tuple, Type
+
+from core.api import get_client_key
 
 from .base import WorkflowType, WorkflowValidator
 
 
+# 워크플로 타입 -> 검증기 모듈 (import 시 @register로 등록됨)
+WORKFLOW_VALIDATORS: Dict[WorkflowType, str] = {
+    WorkflowType.BACKGROUND_SWAP: "core.background_swap.validator",
+    WorkflowType.FACE_SWAP: "core.face_swap.validator",
+    WorkflowType.MULTI_FACE_SWAP: "core.multi_face_swap.validator",
+    WorkflowType.POSE_CHANGE: "core.pose_change.validator",
+    WorkflowType.POSE_COPY: "core.pose_copy.validator",
+    WorkflowType.OUTFIT_SWAP: "core.outfit_swap.validator",
+    WorkflowType.SELFIE: "core.selfie.validator",
+    WorkflowType.UGC: "core.seeding_ugc.validator",
+    WorkflowType.ECOMMERCE: "core.ecommerce.validator",
+    WorkflowType.AI_INFLUENCER: "core.ai_influencer.validator",
+}
+
+
 class ValidatorRegistry:
     """검증기 레지스트리 - 워크플로 타입별 검증기 관리
 
@@ -18,11 +44,14 @@ class ValidatorRegistry:
         class BackgroundSwapWorkflowValidator(WorkflowValidator):
             ...
 
-        # 검증기 가져오기
+        # 검증기 가져오기 (모듈 지연 import + (워크플로, 키)별 인스턴스 재사용)
         validator = ValidatorRegistry.get(WorkflowType.BACKGROUND_SWAP, client)
     """
 
     _validators: Dict[WorkflowType, Type[WorkflowValidator]] = {}
+    # (워크플로, API 키) -> (클라이언트, 검증기)
+    _instances: Dict[Tuple[WorkflowType, str], Tuple[Any, WorkflowValidator]] = {}
+    _lock = threading.RLock()
 
     @classmethod
     def register(cls, workflow_type: WorkflowType):
@@ -47,12 +76,29 @@ class ValidatorRegistry:
         return decorator
 
     @classmethod
-    def get(cls, workflow_type: WorkflowType, client) -> WorkflowValidator:
+    def _resolve(cls, workflow_type: WorkflowType) -> Optional[Type[WorkflowValidator]]:
+        """등록된 검증기 클래스 (미등록이면 WORKFLOW_VALIDATORS 모듈을 import해 등록)"""
+        validator_cls = cls._validators.get(workflow_type)
+        if validator_cls is not None:
+            return validator_cls
+
+        module_path = WORKFLOW_VALIDATORS.get(workflow_type)
+        if module_path is None:
+            return None
+        with cls._lock:
+            if workflow_type not in cls._validators:
+                importlib.import_module(module_path)
+        return cls._validators.get(workflow_type)
+
+    @classmethod
+    def get(cls, workflow_type: WorkflowType, client, cached: bool = True) -> WorkflowValidator:
         """검증기 인스턴스 반환
 
         Args:
             workflow_type: 워크플로 타입
             client: Gemini API 클라이언트
+            cached: True면 (워크플로, API 키)별 인스턴스 재사용
+                (풀링된 클라이언트만 해당, False면 항상 새로 생성)
 
         Returns:
             검증기 인스턴스
@@ -60,22 +106,39 @@ class ValidatorRegistry:
         Raises:
             KeyError: 등록되지 않은 워크플로 타입
         """
-        if workflow_type not in cls._validators:
-            registered = [wt.value for wt in cls._validators.keys()]
+        validator_cls = cls._resolve(workflow_type)
+        if validator_cls is None:
+            registered = [wt.value for wt in cls.list_registered()]
             raise KeyError(
                 f"Validator not registered for {workflow_type.value}. "
                 f"Registered validators: {registered}"
             )
-        return cls._validators[workflow_type](client)
+
+        api_key = get_client_key(client) if cached else None
+        if api_key is None:
+            return validator_cls(client)
+
+        cache_key = (workflow_type, api_key)
+        entry = cls._instances.get(cache_key)
+        if entry is not None and entry[0] is client:
+            return entry[1]
+
+        with cls._lock:
+            entry = cls._instances.get(cache_key)
+            # close_clients() 후 같은 키로 새 클라이언트가 만들어졌으면 다시 생성
+            if entry is None or entry[0] is not client:
+                entry = (client, validator_cls(client))
+                cls._instances[cache_key] = entry
+        return entry[1]
 
     @classmethod
     def list_registered(cls) -> List[WorkflowType]:
         """등록된 워크플로 타입 목록 반환
 
         Returns:
-            등록된 WorkflowType 리스트
+            등록된(또는 지연 로드 가능한) WorkflowType 리스트
         """
-        return list(cls._validators.keys())
+        return list(dict.fromkeys([*cls._validators, *WORKFLOW_VALIDATORS]))
 
     @classmethod
     def is_registered(cls, workflow_type: WorkflowType) -> bool:
@@ -85,11 +148,19 @@ class ValidatorRegistry:
             workflow_type: 워크플로 타입
 
         Returns:
-            등록 여부
+            등록 여부 (지연 로드 가능한 타입 포함)
         """
-        return workflow_type in cls._validators
+        return workflow_type in cls._validators or workflow_type in WORKFLOW_VALIDATORS
+
+    @classmethod
+    def clear_instances(cls) -> None:
+        """캐시된 검증기 인스턴스 폐기 (다음 get에서 새로 생성)"""
+        with cls._lock:
+            cls._instances.clear()
 
     @classmethod
     def clear(cls) -> None:
         """레지스트리 초기화 (테스트용)"""
-        cls._validators.clear()
+        with cls._lock:
+            cls._validators.clear()
+            cls._instances.clear()
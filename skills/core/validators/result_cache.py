@@ -0,0 +1,222 @@
+"""
+검증 결과 캐시 - 이미 채점한 생성 이미지는 다시 VLM을 부르지 않음
+
+sweep 재검증, 배치 재실행, 중단 후 재시작처럼 같은 생성 이미지를 같은
+레퍼런스로 다시 검증하는 경우 CommonValidationResult를 디스크에서 바로 반환한다.
+
+- 캐시 키: (워크플로 타입, 검증기 클래스 + version, 생성 이미지 해시,
+  레퍼런스 묶음 해시, 검증 옵션)
+- 저장: core.vlm_cache.VLMCache (원자적 쓰기 + 용량 초과 시 LRU 삭제)
+- 무효화: 검증 로직이 바뀌면 WorkflowValidator.version을 올린다
+- 우회: force=True (재채점 후 덮어씀), 또는 환경변수 FNF_VALIDATION_CACHE=0
+
+사용법:
+    from core.validators.result_cache import cached_validate
+
+    validator = ValidatorRegistry.get(WorkflowType.BACKGROUND_SWAP, client)
+    result = cached_validate(validator, image, {"original": [source]})
+
+    # 같은 소스의 후보 여러 장: 캐시 미스된 후보만 validate_batch로 함께 채점
+    batch = cached_validate_batch(validator, images, {"original": [source]})
+"""
+
+import hashlib
+import json
+import os
+import threading
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, List, Optional, Union
+
+from PIL import Image
+
+from core.config import PROJECT_ROOT
+from core.utils import image_fingerprint
+from core.vlm_cache import VLMCache
+
+from .base import CommonValidationResult, ReferenceBundle, ReferenceInput, WorkflowValidator
+
+if TYPE_CHECKING:
+    from .tournament import BatchValidationResult
+
+
+DEFAULT_CACHE_DIR = os.path.join(PROJECT_ROOT, ".cache", "validation_results")
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024  # 64MB
+
+# 캐시 포맷이 바뀌면 올려서 기존 항목 무효화
+CACHE_VERSION = 1
+
+
+def _env_enabled() -> bool:
+    return os.getenv("FNF_VALIDATION_CACHE", "1").strip().lower() not in ("0", "false", "off", "no")
+
+
+def generated_image_hash(image: Union[str, Path, Image.Image]) -> str:
+    """생성 이미지 콘텐츠 해시 (경로는 파일 바이트, PIL은 픽셀 기준)"""
+    if isinstance(image, (str, Path)):
+        h = hashlib.blake2b(digest_size=16)
+        with open(image, "rb") as f:
+            for chunk in iter(lambda: f.read(1024 * 1024), b""):
+                h.update(chunk)
+        return f"file:{h.hexdigest()}"
+    return image_fingerprint(image)
+
+
+def make_key(
+    validator: WorkflowValidator,
+    generated_hash: str,
+    references: ReferenceBundle,
+    options: Optional[dict] = None,
+) -> str:
+    """검증 캐시 키 생성
+
+    options(validate에 넘기는 kwargs)는 JSON으로 직렬화해 반영한다.
+    직렬화할 수 없는 객체는 repr로 들어가므로 사실상 캐시되지 않는다.
+    """
+    cls = type(validator)
+    key_material = json.dumps(
+        {
+            "v": CACHE_VERSION,
+            "workflow": validator.workflow_type.value,
+            "validator": f"{cls.__module__}.{cls.__qualname__}",
+            "version": getattr(validator, "version", "1"),
+            "generated": generated_hash,
+            "references": references.fingerprint(),
+            "options": json.dumps(options or {}, sort_keys=True, default=repr),
+        },
+        sort_keys=True,
+    )
+    return hashlib.sha256(key_material.encode("utf-8")).hexdigest()
+
+
+_cache: Optional[VLMCache] = None
+_cache_lock = threading.Lock()
+
+
+def get_validation_cache() -> VLMCache:
+    """프로세스 공유 검증 결과 캐시
+
+    환경변수:
+        FNF_VALIDATION_CACHE_DIR: 캐시 디렉토리
+        FNF_VALIDATION_CACHE_MAX_MB: 최대 용량 (MB)
+    """
+    global _cache
+    with _cache_lock:
+        if _cache is None:
+            cache_dir = os.getenv("FNF_VALIDATION_CACHE_DIR", DEFAULT_CACHE_DIR)
+            max_mb = os.getenv("FNF_VALIDATION_CACHE_MAX_MB")
+            max_bytes = int(float(max_mb) * 1024 * 1024) if max_mb else DEFAULT_MAX_BYTES
+            _cache = VLMCache(cache_dir=cache_dir, max_bytes=max_bytes)
+        return _cache
+
+
+def _lookup(cache: VLMCache, key: str) -> Optional[CommonValidationResult]:
+    cached = cache.get(key)
+    if cached is None:
+        return None
+    try:
+        return CommonValidationResult.from_dict(json.loads(cached))
+    except (KeyError, ValueError, TypeError):
+        return None  # 깨진 항목은 재채점으로 덮어씀
+
+
+def _store(cache: VLMCache, key: str, result: CommonValidationResult) -> None:
+    # VLM 에러로 만들어진 결과는 저장하지 않음 (다음 실행에서 재시도되도록)
+    if result.total_score > 0 or result.criteria_scores:
+        data = result.to_dict()
+        data["raw_response"] = result.raw_response
+        cache.put(key, json.dumps(data, ensure_ascii=False, default=str), model=data["workflow_type"])
+
+
+def cached_validate(
+    validator: WorkflowValidator,
+    generated_img: Union[str, Path, Image.Image],
+    reference_images: ReferenceInput,
+    force: bool = False,
+    use_cache: bool = True,
+    **kwargs: Any,
+) -> CommonValidationResult:
+    """validator.validate 결과를 캐시 우선으로 반환
+
+    Args:
+        validator: 워크플로 검증기
+        generated_img: 생성된 이미지 (경로 또는 PIL Image)
+        reference_images: 참조 이미지 딕셔너리 또는 ReferenceBundle
+        force: True면 캐시를 무시하고 재채점 후 덮어씀
+        use_cache: False면 캐시를 읽지도 쓰지도 않음
+        **kwargs: validator.validate에 그대로 전달 (캐시 키에도 반영)
+
+    Returns:
+        CommonValidationResult
+    """
+    references = ReferenceBundle.ensure(reference_images)
+    if not (use_cache and _env_enabled()):
+        return validator.validate(generated_img, references, **kwargs)
+
+    cache = get_validation_cache()
+    key = make_key(validator, generated_image_hash(generated_img), references, kwargs)
+
+    if not force:
+        cached = _lookup(cache, key)
+        if cached is not None:
+            return cached
+
+    result = validator.validate(generated_img, references, **kwargs)
+    _store(cache, key, result)
+    return result
+
+
+def cached_validate_batch(
+    validator: WorkflowValidator,
+    candidates: List[Union[str, Path, Image.Image]],
+    reference_images: ReferenceInput,
+    force: bool = False,
+    use_cache: bool = True,
+    **kwargs: Any,
+) -> "BatchValidationResult":
+    """validator.validate_batch를 후보별 캐시 우선으로 실행
+
+    후보마다 캐시를 먼저 조회하고 미스된 후보만 validate_batch로 함께 채점한 뒤
+    후보별 결과를 저장한다 (키는 cached_validate와 같아 단일/배치 결과를 공유).
+
+    Args:
+        validator: 워크플로 검증기
+        candidates: 후보 이미지 리스트 (경로 또는 PIL Image)
+        reference_images: 참조 이미지 딕셔너리 또는 ReferenceBundle
+        force: True면 캐시를 무시하고 전체 재채점 후 덮어씀
+        use_cache: False면 캐시를 읽지도 쓰지도 않음
+        **kwargs: validator.validate_batch에 그대로 전달 (캐시 키에도 반영)
+
+    Returns:
+        BatchValidationResult: 후보 순서의 결과 + 순위
+    """
+    from .tournament import BatchValidationResult, rank_results
+
+    references = ReferenceBundle.ensure(reference_images)
+    if not (use_cache and _env_enabled()):
+        return validator.validate_batch(candidates, references, **kwargs)
+
+    cache = get_validation_cache()
+    keys = [
+        make_key(validator, generated_image_hash(c), references, kwargs) for c in candidates
+    ]
+    results: List[Optional[CommonValidationResult]] = [
+        None if force else _lookup(cache, key) for key in keys
+    ]
+
+    misses = [i for i, result in enumerate(results) if result is None]
+    if not misses:
+        return BatchValidationResult(results=results, ranking=rank_results(results))
+
+    batch = validator.validate_batch([candidates[i] for i in misses], references, **kwargs)
+    for i, result in zip(misses, batch.results):
+        results[i] = result
+        _store(cache, keys[i], result)
+
+    if len(misses) == len(candidates):
+        return batch
+    return BatchValidationResult(
+        results=results,
+        ranking=rank_results(results),
+        batched=batch.batched,
+        raw_response=batch.raw_response,
+    )
@@ -0,0 +1,234 @@
+"""
+토너먼트 검증 - 같은 브리프의 후보 N장을 VLM 호출 한 번으로 채점 + 순위
+
+배치 생성(셀피 배치, 배경교체 variations 등)에서 후보마다 검증 호출을 따로
+보내면 같은 레퍼런스 이미지가 N번 업로드된다. 레퍼런스를 한 번만 싣고 후보 N장을
+함께 보내 후보별 기준 점수와 순위를 받는다.
+
+- 채점 기준: 검증기의 tournament_rubric() - 단일 검증과 같은 프롬프트/항목 정의
+- 총점/등급/통과 판정: 루브릭의 build_result (검증기 자체 결과 생성 로직 재사용)
+- 폴백 (후보별 개별 validate):
+  * 후보 1장, 또는 validator.max_batch_candidates 초과
+  * tournament_rubric()이 None (루브릭 훅을 구현하지 않은 검증기)
+  * 요청 크기가 config.REQUEST_BYTE_BUDGET 초과
+  * 응답 파싱/스키마 검증 실패 (형식 복구 1회 후) / 후보 수 불일치
+
+사용법:
+    batch = validator.validate_batch([img1, img2, img3], references)
+    best = batch.best           # 최고 점수 결과
+    batch.ranking               # [2, 0, 1] (점수 높은 순 후보 인덱스)
+"""
+
+import json
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Union
+
+from PIL import Image
+from google.genai import types
+
+from core.config import REQUEST_BYTE_BUDGET, VISION_MODEL
+from core.structured import generate_json
+from core.utils import encode_image_part
+
+from .base import CommonValidationResult, ReferenceBundle, WorkflowValidator
+
+
+# 레퍼런스 역할당 최대 이미지 수
+MAX_REFERENCES_PER_ROLE = 3
+
+# 후보 이미지 인코딩 (개별 검증기들의 기본값과 동일)
+CANDIDATE_MAX_SIZE = 1024
+
+
+@dataclass
+class BatchValidationResult:
+    """후보별 검증 결과 + 순위"""
+
+    results: List[CommonValidationResult]  # 후보 입력 순서
+    ranking: List[int] = field(default_factory=list)  # 점수 높은 순 후보 인덱스
+    batched: bool = False  # True: 단일 호출 토너먼트, False: 개별 검증 폴백
+    raw_response: str = ""
+
+    @property
+    def best_index(self) -> Optional[int]:
+        return self.ranking[0] if self.ranking else None
+
+    @property
+    def best(self) -> Optional[CommonValidationResult]:
+        index = self.best_index
+        return self.results[index] if index is not None else None
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "results": [r.to_dict() for r in self.results],
+            "ranking": self.ranking,
+            "batched": self.batched,
+        }
+
+
+@dataclass
+class TournamentRubric:
+    """토너먼트 채점에 쓸 검증기 자체 루브릭 (WorkflowValidator.tournament_rubric 반환값)
+
+    prompt는 검증기의 단일 이미지 채점 프롬프트(기준 정의, 감점 규칙, 절차)를 그대로
+    쓰고, 후보별 응답은 단일 검증 응답과 같은 필드로 받아 build_result로 검증기 자체
+    결과(등급/통과 판정 포함)를 만든다. 토너먼트는 호출 수만 줄이고 판정 기준은 같다.
+    """
+
+    prompt: str  # 검증기 채점 프롬프트 (출력 형식은 토너먼트 형식으로 대체됨)
+    criteria: List[str]  # 후보별 정수 점수 필드
+    build_result: Callable[[Dict[str, Any], str], CommonValidationResult]  # (후보 응답, 원문)
+    text_fields: List[str] = field(default_factory=list)  # 점수 외 문자열 필드
+    list_fields: List[str] = field(default_factory=list)  # 문자열 배열 필드 (issues 외)
+    reference_labels: Dict[str, str] = field(default_factory=dict)  # 역할 → 레퍼런스 라벨
+
+
+def rank_results(
+    results: List[CommonValidationResult],
+    vlm_ranking: Optional[List[int]] = None,
+) -> List[int]:
+    """통과 여부 → 자동탈락 아님 → 총점 순으로 후보 인덱스 정렬
+
+    vlm_ranking(0부터 시작하는 후보 인덱스)이 있으면 총점 동점일 때 그 순서를 따른다.
+    """
+    order = {index: pos for pos, index in enumerate(vlm_ranking or [])}
+    return sorted(
+        range(len(results)),
+        key=lambda i: (
+            not results[i].passed,
+            results[i].auto_fail,
+            -results[i].total_score,
+            order.get(i, len(results)),
+        ),
+    )
+
+
+def build_tournament_prompt(rubric: TournamentRubric, num_candidates: int) -> str:
+    """검증기 루브릭을 그대로 싣고 후보 N장 비교/응답 형식만 덧붙인 채점 프롬프트"""
+    examples = (
+        [f'"{key}": 0' for key in rubric.criteria]
+        + [f'"{key}": "..."' for key in rubric.text_fields]
+        + [f'"{key}": []' for key in rubric.list_fields]
+    )
+    example_fields = ", ".join(examples)
+    lines = [
+        rubric.prompt,
+        "",
+        "## ★ 후보 비교 검수 (위 기준/절차를 후보마다 그대로 적용) ★",
+        f"[CANDIDATE 1]~[CANDIDATE {num_candidates}]는 같은 브리프로 생성된 검증 대상",
+        "이미지이고, [REFERENCE] 이미지들은 비교 기준(원본/레퍼런스)입니다.",
+        "각 후보를 위 검수 기준의 검증 대상 이미지로 보고 독립적으로 채점한 뒤",
+        "전체 순위를 매기세요. 후보끼리 점수를 맞추지 말고 각자 절대 기준으로 채점합니다.",
+        "위 출력 형식 대신 아래 형식으로, 후보별 항목에 위 출력 형식의 필드를 모두 넣으세요.",
+        "",
+        "### 응답 (JSON)",
+        "{",
+        '  "candidates": [',
+        f'    {{"index": 1, {example_fields}, "issues": ["문제점"]}}',
+        "  ],",
+        '  "ranking": [1, 2]',
+        "}",
+        "",
+        f"candidates 배열에는 {num_candidates}개 후보가 모두 index 순서대로 있어야 합니다.",
+    ]
+    return "\n".join(lines)
+
+
+def build_tournament_schema(rubric: TournamentRubric) -> Dict[str, Any]:
+    """토너먼트 응답 JSON Schema (검증기 루브릭의 항목 키 포함)"""
+    properties: Dict[str, Any] = {"index": {"type": "integer"}}
+    properties.update({key: {"type": "integer"} for key in rubric.criteria})
+    properties.update({key: {"type": "string"} for key in rubric.text_fields})
+    properties.update(
+        {key: {"type": "array", "items": {"type": "string"}} for key in rubric.list_fields}
+    )
+    properties["issues"] = {"type": "array", "items": {"type": "string"}}
+    candidate = {
+        "type": "object",
+        "properties": properties,
+        "required": ["index"] + list(rubric.criteria),
+    }
+    return {
+        "type": "object",
+        "properties": {
+            "candidates": {"type": "array", "items": candidate},
+            "ranking": {"type": "array", "items": {"type": "integer"}},
+        },
+        "required": ["candidates", "ranking"],
+    }
+
+
+def _inline_bytes(parts: List[types.Part]) -> int:
+    return sum(len(p.inline_data.data or b"") for p in parts if p.inline_data is not None)
+
+
+def validate_tournament(
+    validator: WorkflowValidator,
+    candidates: List[Union[str, Path, Image.Image]],
+    references: ReferenceBundle,
+) -> Optional[BatchValidationResult]:
+    """후보 N장을 단일 VLM 호출로 채점. 토너먼트를 쓸 수 없으면 None (호출자가 폴백)"""
+    rubric = validator.tournament_rubric()
+    if rubric is None:
+        return None
+
+    parts: List[types.Part] = [
+        types.Part(text=build_tournament_prompt(rubric, len(candidates)))
+    ]
+    for role in references:
+        ref_parts = references.parts(role, limit=MAX_REFERENCES_PER_ROLE)
+        if not ref_parts:
+            continue
+        label = rubric.reference_labels.get(role, role)
+        parts.append(types.Part(text=f"\n\n[REFERENCE - {label}]"))
+        parts.extend(ref_parts)
+    for i, candidate in enumerate(candidates):
+        parts.append(types.Part(text=f"\n\n[CANDIDATE {i + 1}]"))
+        parts.append(
+            encode_image_part(validator._load_image(candidate), max_size=CANDIDATE_MAX_SIZE)
+        )
+
+    if _inline_bytes(parts) > REQUEST_BYTE_BUDGET:
+        print("[Tournament] 요청 크기가 예산 초과 - 개별 검증으로 전환")
+        return None
+
+    try:
+        data, raw_text = generate_json(
+            validator.client,
+            [types.Content(role="user", parts=parts)],
+            schema=build_tournament_schema(rubric),
+            model=VISION_MODEL,
+            temperature=0.1,
+        )
+        entries = sorted(data.get("candidates", []), key=lambda e: int(e.get("index", 0)))
+    except Exception as e:
+        print(f"[Tournament] 채점 실패 - 개별 검증으로 전환: {e}")
+        return None
+
+    if len(entries) != len(candidates):
+        print(
+            f"[Tournament] 후보 수 불일치 ({len(entries)}/{len(candidates)}) - 개별 검증으로 전환"
+        )
+        return None
+
+    try:
+        results = [
+            rubric.build_result(entry, json.dumps(entry, ensure_ascii=False))
+            for entry in entries
+        ]
+    except Exception as e:
+        print(f"[Tournament] 결과 변환 실패 - 개별 검증으로 전환: {e}")
+        return None
+    vlm_ranking = []
+    for index in data.get("ranking", []) or []:
+        try:
+            vlm_ranking.append(int(index) - 1)
+        except (TypeError, ValueError):
+            continue
+    return BatchValidationResult(
+        results=results,
+        ranking=rank_results(results, vlm_ranking),
+        batched=True,
+        raw_response=raw_text,
+    )
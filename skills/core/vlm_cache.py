@@ -0,0 +1,322 @@
+"""
+VLM 분석 응답 캐시 - 콘텐츠 주소 기반 디스크 캐시
+
+같은 모델/프롬프트/이미지/설정으로 요청한 VLM 분석은 같은 응답을 재사용한다.
+프리셋 포즈/배경/상품 이미지처럼 수백 개 작업에서 반복되는 입력의
+분석 호출을 첫 실행 이후 0회로 줄이기 위함.
+
+- 캐시 키: (model, 프롬프트 해시, 이미지 콘텐츠 해시, temperature, 기타 config)
+- 저장: {cache_dir}/{키 앞 2자리}/{키}.json (원자적 쓰기)
+- 용량 제한: 최대 바이트 초과 시 가장 오래 사용하지 않은 항목부터 삭제 (LRU)
+- 우회: 함수별 use_cache=False, 또는 환경변수 FNF_VLM_CACHE=0 (전역)
+
+사용법:
+    from core.vlm_cache import cached_generate_text
+
+    text = cached_generate_text(
+        client,
+        model=VISION_MODEL,
+        contents=[types.Content(role="user", parts=parts)],
+        config=types.GenerateContentConfig(temperature=0.1),
+        use_cache=use_cache,
+    )
+"""
+
+import hashlib
+import json
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, Optional
+
+from PIL import Image
+from google.genai import types
+
+from core.config import PROJECT_ROOT
+from core.structured import extract_json
+
+
+# ============================================================
+# 기본 설정 (환경변수로 덮어쓰기 가능)
+# ============================================================
+DEFAULT_CACHE_DIR = os.path.join(PROJECT_ROOT, ".cache", "vlm_responses")
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024  # 256MB
+
+# 캐시 포맷이 바뀌면 올려서 기존 항목 무효화
+CACHE_VERSION = 1
+
+
+def _env_enabled() -> bool:
+    return os.getenv("FNF_VLM_CACHE", "1").strip().lower() not in ("0", "false", "off", "no")
+
+
+class VLMCache:
+    """스레드 안전 디스크 LRU 캐시
+
+    Args:
+        cache_dir: 캐시 디렉토리
+        max_bytes: 최대 총 용량 (초과 시 LRU 삭제)
+    """
+
+    def __init__(self, cache_dir: str = DEFAULT_CACHE_DIR, max_bytes: int = DEFAULT_MAX_BYTES):
+        self.cache_dir = Path(cache_dir)
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._total_bytes: Optional[int] = None
+        self.hits = 0
+        self.misses = 0
+
+    # ------------------------------------------------------------
+    # 키 생성
+    # ------------------------------------------------------------
+
+    @staticmethod
+    def make_key(model: str, contents: Any, config: Any = None) -> str:
+        """요청 내용으로 캐시 키 생성
+
+        텍스트는 프롬프트 해시, 이미지는 인코딩된 바이트(또는 픽셀) 해시로
+        반영하므로 경로가 달라도 같은 이미지면 같은 키가 된다.
+        """
+        prompt_hash = hashlib.sha256()
+        image_hashes = []
+        for kind, value in _iter_content(contents):
+            if kind == "text":
+                prompt_hash.update(value.encode("utf-8"))
+                prompt_hash.update(b"\x00")
+            else:
+                image_hashes.append(value)
+                prompt_hash.update(b"\x01")  # 텍스트/이미지 순서 보존
+
+        temperature = None
+        config_json = ""
+        if config is not None:
+            temperature = getattr(config, "temperature", None)
+            if hasattr(config, "model_dump_json"):
+                config_json = config.model_dump_json(exclude_none=True)
+            else:
+                config_json = json.dumps(config, sort_keys=True, default=str)
+
+        key_material = json.dumps(
+            {
+                "v": CACHE_VERSION,
+                "model": model,
+                "prompt": prompt_hash.hexdigest(),
+                "images": image_hashes,
+                "temperature": temperature,
+                "config": hashlib.sha256(config_json.encode("utf-8")).hexdigest(),
+            },
+            sort_keys=True,
+        )
+        return hashlib.sha256(key_material.encode("utf-8")).hexdigest()
+
+    # ------------------------------------------------------------
+    # 조회 / 저장
+    # ------------------------------------------------------------
+
+    def _path(self, key: str) -> Path:
+        return self.cache_dir / key[:2] / f"{key}.json"
+
+    def get(self, key: str) -> Optional[str]:
+        """캐시된 응답 텍스트 반환 (없으면 None). 조회 시 LRU 시각 갱신"""
+        path = self._path(key)
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                entry = json.load(f)
+            os.utime(path, None)
+        except (OSError, ValueError):
+            with self._lock:
+                self.misses += 1
+            return None
+
+        with self._lock:
+            self.hits += 1
+        return entry.get("text")
+
+    def put(self, key: str, text: str, model: str = "") -> None:
+        """응답 텍스트 저장 후 필요 시 LRU 삭제"""
+        path = self._path(key)
+        data = json.dumps(
+            {"text": text, "model": model, "created_at": time.time()},
+            ensure_ascii=False,
+        ).encode("utf-8")
+
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = path.with_suffix(f".{os.getpid()}.{threading.get_ident()}.tmp")
+            with open(tmp_path, "wb") as f:
+                f.write(data)
+            # 같은 키 덮어쓰기면 기존 파일 크기만큼 빼야 총 용량이 맞다
+            try:
+                replaced_bytes = path.stat().st_size
+            except FileNotFoundError:
+                replaced_bytes = 0
+            os.replace(tmp_path, path)
+        except OSError as e:
+            print(f"[VLMCache] 저장 실패: {e}")
+            return
+
+        with self._lock:
+            if self._total_bytes is None:
+                self._total_bytes = self._scan_size()
+            else:
+                self._total_bytes += len(data) - replaced_bytes
+            if self._total_bytes > self.max_bytes:
+                self._evict()
+
+    def _entries(self):
+        if not self.cache_dir.exists():
+            return []
+        entries = []
+        for path in self.cache_dir.glob("*/*.json"):
+            try:
+                st = path.stat()
+            except OSError:
+                continue
+            entries.append((st.st_mtime, st.st_size, path))
+        return entries
+
+    def _scan_size(self) -> int:
+        return sum(size for _, size, _ in self._entries())
+
+    def _evict(self) -> None:
+        """가장 오래 사용하지 않은 항목부터 삭제 (최대 용량의 90%까지)"""
+        entries = sorted(self._entries())
+        total = sum(size for _, size, _ in entries)
+        target = int(self.max_bytes * 0.9)
+        for _, size, path in entries:
+            if total <= target:
+                break
+            try:
+                path.unlink()
+                total -= size
+            except OSError:
+                continue
+        self._total_bytes = total
+
+    def clear(self) -> None:
+        """전체 캐시 삭제"""
+        with self._lock:
+            for _, _, path in self._entries():
+                try:
+                    path.unlink()
+                except OSError:
+                    continue
+            self._total_bytes = 0
+
+    def stats(self) -> Dict[str, Any]:
+        """캐시 통계"""
+        with self._lock:
+            entries = self._entries()
+            return {
+                "cache_dir": str(self.cache_dir),
+                "entries": len(entries),
+                "bytes": sum(size for _, size, _ in entries),
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+            }
+
+
+def is_json_response(text: str) -> bool:
+    """응답이 JSON으로 파싱 가능한지 (마크다운 코드블록 허용)"""
+    try:
+        extract_json(text)
+        return True
+    except ValueError:
+        return False
+
+
+def _iter_content(contents: Any) -> Iterable:
+    """contents를 ("text", str) / ("image", 해시) 시퀀스로 평탄화"""
+    if contents is None:
+        return
+    if isinstance(contents, (list, tuple)):
+        for item in contents:
+            yield from _iter_content(item)
+    elif isinstance(contents, str):
+        yield "text", contents
+    elif isinstance(contents, Image.Image):
+        h = hashlib.sha256()
+        h.update(f"{contents.mode}:{contents.size}".encode("utf-8"))
+        h.update(contents.tobytes())
+        yield "image", h.hexdigest()
+    elif isinstance(contents, types.Content):
+        yield from _iter_content(contents.parts)
+    elif isinstance(contents, types.Part):
+        if contents.text is not None:
+            yield "text", contents.text
+        elif contents.inline_data is not None:
+            yield "image", hashlib.sha256(contents.inline_data.data or b"").hexdigest()
+        else:
+            yield "text", contents.model_dump_json(exclude_none=True)
+    else:
+        yield "text", repr(contents)
+
+
+# ============================================================
+# 공유 캐시 + generate_content 래퍼
+# ============================================================
+
+_cache: Optional[VLMCache] = None
+_cache_lock = threading.Lock()
+
+
+def get_vlm_cache() -> VLMCache:
+    """프로세스 공유 VLM 캐시 반환
+
+    환경변수:
+        FNF_VLM_CACHE_DIR: 캐시 디렉토리
+        FNF_VLM_CACHE_MAX_MB: 최대 용량 (MB)
+    """
+    global _cache
+    with _cache_lock:
+        if _cache is None:
+            cache_dir = os.getenv("FNF_VLM_CACHE_DIR", DEFAULT_CACHE_DIR)
+            max_mb = os.getenv("FNF_VLM_CACHE_MAX_MB")
+            max_bytes = int(float(max_mb) * 1024 * 1024) if max_mb else DEFAULT_MAX_BYTES
+            _cache = VLMCache(cache_dir=cache_dir, max_bytes=max_bytes)
+        return _cache
+
+
+def cached_generate_text(
+    client: Any,
+    model: str,
+    contents: Any,
+    config: Optional[types.GenerateContentConfig] = None,
+    use_cache: bool = True,
+    cache_if: Optional[Callable[[str], bool]] = None,
+) -> Optional[str]:
+    """client.models.generate_content 호출 후 응답 텍스트 반환 (캐시 우선)
+
+    Args:
+        client: Gemini API 클라이언트
+        model: 모델명
+        contents: generate_content에 전달할 contents
+        config: GenerateContentConfig
+        use_cache: False면 캐시를 읽지도 쓰지도 않음
+        cache_if: 응답 저장 조건 (예: is_json_response). 파싱 불가 응답이
+            캐시에 고정되는 것을 막기 위함
+
+    Returns:
+        응답 텍스트 (response.text). 빈 응답은 캐시하지 않음
+    """
+    use_cache = use_cache and _env_enabled()
+
+    key = None
+    if use_cache:
+        cache = get_vlm_cache()
+        key = cache.make_key(model, contents, config)
+        cached = cache.get(key)
+        if cached is not None:
+            return cached
+
+    kwargs = {"model": model, "contents": contents}
+    if config is not None:
+        kwargs["config"] = config
+    response = client.models.generate_content(**kwargs)
+
+    text = response.text if response is not None else None
+    if use_cache and text and (cache_if is None or cache_if(text)):
+        get_vlm_cache().put(key, text, model=model)
+    return text
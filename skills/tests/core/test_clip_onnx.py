@@ -0,0 +1,97 @@
+"""
+core.brandcut.clip_onnx 단위 테스트 - numpy 전처리, 벤치마크 기록 게이트 (모델/onnxruntime 불필요)
+
+실행:
+    cd skills && python -m pytest tests/core -q
+"""
+
+import json
+import sys
+from pathlib import Path
+
+import numpy as np
+import pytest
+from PIL import Image
+
+# 프로젝트 루트 추가
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from core.brandcut import clip_onnx
+from core.brandcut.clip_onnx import (
+    CLIP_MEAN,
+    CLIP_STD,
+    benchmark_passed,
+    preprocess_image,
+    record_benchmark,
+)
+
+
+def _normalized(rgb) -> np.ndarray:
+    return (np.asarray(rgb, dtype=np.float32) / 255.0 - CLIP_MEAN) / CLIP_STD
+
+
+@pytest.mark.parametrize("size", [(500, 300), (300, 500)], ids=["wide", "tall"])
+def test_preprocess_shape_dtype_and_normalization(size):
+    pixels = preprocess_image(Image.new("RGB", size, (255, 0, 128)))
+
+    assert pixels.shape == (3, 224, 224)
+    assert pixels.dtype == np.float32
+    assert pixels.flags["C_CONTIGUOUS"]
+    np.testing.assert_allclose(pixels[:, 0, 0], [1.9303, -1.7521, 0.3399], atol=1e-3)
+    np.testing.assert_allclose(pixels[:, 112, 112], _normalized((255, 0, 128)), atol=1e-4)
+
+
+def test_preprocess_center_crops_instead_of_squashing():
+    # 300x500 세로 이미지: 위/아래 1/3 빨강, 가운데 초록
+    image = Image.new("RGB", (300, 500), (255, 0, 0))
+    image.paste((0, 255, 0), (0, 167, 300, 333))
+
+    pixels = preprocess_image(image)
+
+    # 짧은 변 224 → 224x373, 중앙 크롭 top=74 → 초록 구간은 크롭 기준 약 50~174행.
+    # 224x224로 눌렀다면 60행은 빨강이어야 한다
+    red, green = _normalized((255, 0, 0)), _normalized((0, 255, 0))
+    np.testing.assert_allclose(pixels[:, 10, 112], red, atol=0.05)
+    np.testing.assert_allclose(pixels[:, 60, 112], green, atol=0.05)
+    np.testing.assert_allclose(pixels[:, 112, 112], green, atol=0.05)
+    np.testing.assert_allclose(pixels[:, 215, 112], red, atol=0.05)
+
+
+def test_preprocess_converts_non_rgb():
+    pixels = preprocess_image(Image.new("L", (256, 240), 128))
+
+    assert pixels.shape == (3, 224, 224)
+    np.testing.assert_allclose(pixels[:, 0, 0], _normalized((128, 128, 128)), atol=1e-4)
+
+
+def test_benchmark_record_gates_backend(tmp_path):
+    model_path = tmp_path / "clip_vision_int8.onnx"
+    model_path.write_bytes(b"")
+    clip_onnx._write_export_metadata(model_path, {"model_name": "m", "quantization": "int8-dynamic"})
+
+    assert not benchmark_passed(model_path)
+
+    record_benchmark(model_path, {"max_score_diff": 5, "within_tolerance": False})
+    assert not benchmark_passed(model_path)
+
+    record_benchmark(model_path, {"max_score_diff": 1, "within_tolerance": True})
+    assert benchmark_passed(model_path)
+
+    metadata = json.loads(model_path.with_suffix(".json").read_text(encoding="utf-8"))
+    assert metadata["model_name"] == "m"
+    assert metadata["benchmark"]["max_score_diff"] == 1
+    assert "recorded_at" in metadata["benchmark"]
+
+
+def test_onnx_backend_unavailable_until_benchmark_passes(tmp_path, monkeypatch):
+    from core.brandcut import clip_validator
+
+    model_path = tmp_path / "clip_vision_int8.onnx"
+    model_path.write_bytes(b"")
+    monkeypatch.setattr(clip_validator, "ONNX_AVAILABLE", True)
+    monkeypatch.setattr(clip_validator, "DEFAULT_ONNX_PATH", model_path)
+
+    assert not clip_validator.clip_backend_available("onnx")
+    record_benchmark(model_path, {"within_tolerance": True})
+    assert clip_validator.clip_backend_available("onnx")
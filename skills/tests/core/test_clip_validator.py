@@ -0,0 +1,163 @@
+"""
+core.brandcut.clip_validator 단위 테스트 - A급 임베딩 캐시 manifest 동기화 (모델 불필요)
+
+onnx 백엔드에 가짜 인코더(채널 평균 → 정규화 벡터)를 주입해 전처리/배치 경로는
+그대로 타고 forward만 대체한다.
+
+실행:
+    cd skills && python -m pytest tests/core -q
+"""
+
+import os
+import sys
+import warnings
+from pathlib import Path
+
+import numpy as np
+import pytest
+from PIL import Image
+
+# 프로젝트 루트 추가
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from core.brandcut import clip_validator
+from core.brandcut.clip_validator import CLIPValidator
+
+
+class FakeEncoder:
+    """pixel_values (B, 3, H, W) → 채널 평균 기반 L2 정규화 임베딩 (B, 4)"""
+
+    def __init__(self):
+        self.embedded = 0
+
+    def __call__(self, pixel_values):
+        self.embedded += len(pixel_values)
+        means = pixel_values.mean(axis=(2, 3))
+        vectors = np.concatenate([means, np.ones((len(means), 1), dtype=np.float32)], axis=1)
+        return vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+
+
+@pytest.fixture
+def a_grade_dir(tmp_path):
+    directory = tmp_path / "a_grade"
+    directory.mkdir()
+    for name, color in (("a.png", (255, 0, 0)), ("b.png", (0, 255, 0)), ("c.png", (0, 0, 255))):
+        Image.new("RGB", (64, 48), color).save(directory / name)
+    return directory
+
+
+@pytest.fixture
+def make_validator(tmp_path, a_grade_dir, monkeypatch):
+    monkeypatch.setattr(clip_validator, "ONNX_AVAILABLE", True)
+    cache_path = tmp_path / "cache" / "a_grade_embeddings.npz"
+
+    def _make():
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore")  # 벤치마크 기록 없는 onnx 백엔드 경고
+            validator = CLIPValidator(
+                a_grade_dir=a_grade_dir,
+                cache_path=cache_path,
+                backend="onnx",
+                onnx_path=tmp_path / "missing.onnx",
+                decode_workers=1,
+            )
+        validator._encoder = FakeEncoder()
+        return validator
+
+    return _make
+
+
+def _sync(validator):
+    embeddings, paths = validator._load_or_build_embeddings()
+    return embeddings, [Path(p).name for p in paths]
+
+
+def _set_mtime(path: Path, mtime_ns: int) -> None:
+    os.utime(path, ns=(mtime_ns, mtime_ns))
+
+
+def test_first_build_then_size_mtime_hit(make_validator):
+    first = make_validator()
+    embeddings, names = _sync(first)
+    assert names == ["a.png", "b.png", "c.png"]
+    assert first._encoder.embedded == 3
+
+    second = make_validator()
+    cached, cached_names = _sync(second)
+    assert second._encoder.embedded == 0
+    assert cached_names == names
+    np.testing.assert_allclose(cached, embeddings, atol=1e-6)
+
+
+def test_touched_file_with_same_content_is_not_reembedded(make_validator, a_grade_dir):
+    _sync(make_validator())
+    _set_mtime(a_grade_dir / "a.png", 1_000_000_000_000_000_000)
+
+    validator = make_validator()
+    _sync(validator)
+    assert validator._encoder.embedded == 0
+
+    # manifest가 새 mtime으로 갱신되어 다음 동기화는 해시 계산 없이 적중
+    entry = validator._load_cache()[str(a_grade_dir / "a.png")]
+    assert entry["mtime_ns"] == 1_000_000_000_000_000_000
+
+
+def test_changed_file_is_reembedded(make_validator, a_grade_dir):
+    before, _ = _sync(make_validator())
+    Image.new("RGB", (64, 48), (255, 255, 0)).save(a_grade_dir / "a.png")
+
+    validator = make_validator()
+    after, names = _sync(validator)
+    assert validator._encoder.embedded == 1
+    assert not np.allclose(after[names.index("a.png")], before[0])
+    np.testing.assert_allclose(after[names.index("b.png")], before[1], atol=1e-6)
+
+
+def test_removed_and_added_files(make_validator, a_grade_dir):
+    _sync(make_validator())
+    (a_grade_dir / "b.png").unlink()
+    Image.new("RGB", (64, 48), (9, 9, 9)).save(a_grade_dir / "d.png")
+
+    validator = make_validator()
+    embeddings, names = _sync(validator)
+    assert names == ["a.png", "c.png", "d.png"]
+    assert validator._encoder.embedded == 1
+    assert len(embeddings) == 3
+    assert len(validator._load_cache()) == 3
+
+
+@pytest.mark.parametrize("attribute, value", [("CLIP_MODEL_REVISION", "other"), ("EMBEDDING_CACHE_VERSION", 99)])
+def test_model_or_version_mismatch_forces_rebuild(make_validator, monkeypatch, attribute, value):
+    _sync(make_validator())
+    monkeypatch.setattr(clip_validator, attribute, value)
+
+    validator = make_validator()
+    assert validator._load_cache() is None
+    _sync(validator)
+    assert validator._encoder.embedded == 3
+
+
+def test_legacy_cache_adopts_only_unmodified_files(make_validator, a_grade_dir):
+    validator = make_validator()
+    embeddings, _ = _sync(validator)
+    paths = [str(a_grade_dir / name) for name in ("a.png", "b.png", "c.png")]
+
+    # manifest 없는 예전 포맷 (paths object 배열 + embeddings)
+    np.savez(validator.cache_path, paths=np.array(paths, dtype=object), embeddings=embeddings)
+    cached_at = validator.cache_path.stat().st_mtime_ns
+    for path in paths:
+        _set_mtime(Path(path), cached_at - 1_000_000_000)
+    # b.png는 캐시 저장 이후 내용이 바뀜
+    Image.new("RGB", (64, 48), (255, 255, 255)).save(a_grade_dir / "b.png")
+    _set_mtime(a_grade_dir / "b.png", cached_at + 1_000_000_000)
+
+    legacy = make_validator()
+    assert all(entry["sha1"] == "" for entry in legacy._load_cache().values())
+    synced, names = _sync(legacy)
+    assert legacy._encoder.embedded == 1
+    np.testing.assert_allclose(synced[names.index("a.png")], embeddings[0], atol=1e-6)
+    assert not np.allclose(synced[names.index("b.png")], embeddings[1])
+
+    # 동기화 후에는 manifest 포맷으로 저장
+    assert all(entry["sha1"] for entry in make_validator()._load_cache().values())
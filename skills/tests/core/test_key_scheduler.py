@@ -0,0 +1,141 @@
+"""
+core.key_scheduler 단위 테스트 - 키 선택, 요청 버킷, 429 쿨다운 (네트워크 없음)
+
+실행:
+    cd skills && python -m pytest tests/core -q
+"""
+
+import sys
+import time
+from pathlib import Path
+
+import pytest
+
+# 프로젝트 루트 추가
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from core.key_scheduler import KeyScheduler, _env_limit, _env_seconds, get_scheduler
+
+
+def test_acquire_rotates_and_does_not_charge():
+    scheduler = KeyScheduler(["a", "b"])
+
+    picks = [scheduler.acquire() for _ in range(4)]
+
+    assert picks == ["a", "b", "a", "b"]
+    # 키 선택은 요청이 아님
+    assert all(s["total_requests"] == 0 for s in scheduler.stats())
+
+
+def test_no_local_request_limit_by_default():
+    scheduler = KeyScheduler(["a"])
+
+    for _ in range(500):
+        scheduler.record_request("a")
+
+    key, wait = scheduler.try_acquire()
+    assert key == "a" and wait == 0.0
+    assert scheduler.stats()[0]["requests_available"] is None
+
+
+def test_request_bucket_charged_by_record_request():
+    scheduler = KeyScheduler(["a", "b"], requests_per_minute=2)
+
+    scheduler.record_request("a")
+    scheduler.record_request("a")
+
+    # a는 한도 소진 → b 선택
+    assert scheduler.try_acquire() == ("b", 0.0)
+    scheduler.record_request("b")
+    scheduler.record_request("b")
+
+    key, wait = scheduler.try_acquire()
+    assert key is None
+    assert 0 < wait <= 30.0
+    with pytest.raises(TimeoutError):
+        scheduler.acquire(timeout=0.05)
+
+
+def test_rate_limit_cooldown_skips_key():
+    scheduler = KeyScheduler(["a", "b"], cooldown_seconds=10)
+
+    assert scheduler.report_rate_limit("a") == 10
+    assert [scheduler.acquire() for _ in range(3)] == ["b", "b", "b"]
+    assert scheduler.healthy_count() == 1
+
+
+def test_rate_limit_cooldown_grows_and_resets():
+    scheduler = KeyScheduler(["a"], cooldown_seconds=1)
+
+    assert scheduler.report_rate_limit("a") == 1
+    assert scheduler.report_rate_limit("a") == 2
+    assert scheduler.report_rate_limit("a") == 4
+    # 서버 힌트 우선
+    assert scheduler.report_rate_limit("a", retry_after=0.05) == 0.05
+
+    scheduler.record_success("a")
+    state = scheduler.stats()[0]
+    assert state["rate_limits"] == 4
+
+
+def test_all_keys_cooling_waits_for_first_release():
+    scheduler = KeyScheduler(["a", "b"])
+    scheduler.report_rate_limit("a", retry_after=5)
+    scheduler.report_rate_limit("b", retry_after=0.05)
+
+    start = time.monotonic()
+    assert scheduler.acquire(timeout=2) == "b"
+    assert time.monotonic() - start >= 0.04
+
+
+def test_token_limit_uses_reported_usage():
+    scheduler = KeyScheduler(["a", "b"], tokens_per_minute=1000)
+
+    scheduler.record_success("a", tokens=1000)
+
+    assert scheduler.try_acquire(estimated_tokens=500) == ("b", 0.0)
+    assert scheduler.stats()[0]["total_tokens"] == 1000
+
+
+def test_exclude_and_unknown_keys():
+    scheduler = KeyScheduler(["a", "b"])
+
+    assert scheduler.try_acquire(exclude=("a",)) == ("b", 0.0)
+    assert scheduler.try_acquire(exclude=("a", "b")) == (None, float("inf"))
+    # 스케줄러 밖의 키 보고는 무시
+    scheduler.record_request("zzz")
+    scheduler.report_rate_limit("zzz")
+    assert scheduler.key_index("zzz") == -1
+
+
+def test_get_scheduler_shares_instance_per_key_set():
+    first = get_scheduler(["t1", "t2"], requests_per_minute=5)
+
+    assert get_scheduler(["t1", "t2"]) is first
+    assert get_scheduler(["t2", "t1"]) is not first
+    assert first.stats()[0]["requests_available"] == 5
+
+
+def test_requires_keys():
+    with pytest.raises(ValueError):
+        KeyScheduler([])
+
+
+def test_env_limits_parse_defensively(monkeypatch):
+    monkeypatch.setenv("FNF_TEST_RPM", "60")
+    assert _env_limit("FNF_TEST_RPM") == 60
+
+    monkeypatch.setenv("FNF_TEST_RPM", "0")
+    assert _env_limit("FNF_TEST_RPM") is None
+
+    monkeypatch.setenv("FNF_TEST_RPM", "60/min")
+    with pytest.warns(UserWarning):
+        assert _env_limit("FNF_TEST_RPM") is None
+
+    monkeypatch.setenv("FNF_TEST_COOLDOWN", "2.5")
+    assert _env_seconds("FNF_TEST_COOLDOWN", 15.0) == 2.5
+
+    monkeypatch.setenv("FNF_TEST_COOLDOWN", "15s")
+    with pytest.warns(UserWarning):
+        assert _env_seconds("FNF_TEST_COOLDOWN", 15.0) == 15.0
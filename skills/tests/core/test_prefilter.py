@@ -0,0 +1,156 @@
+"""
+core.validators.prefilter 단위 테스트 - 로컬 사전 필터 단계와 캐스케이드 (네트워크 없음)
+
+실행:
+    cd skills && python -m pytest tests/core -q
+"""
+
+import sys
+import threading
+from pathlib import Path
+
+import numpy as np
+import pytest
+from PIL import Image
+
+# 프로젝트 루트 추가
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from core.validators.base import ReferenceBundle, WorkflowType
+from core.validators.prefilter import (
+    BackgroundPreservationStage,
+    BlankStage,
+    DuplicateStage,
+    PrefilterCascade,
+    PrefilterContext,
+    PrefilterStage,
+    ResolutionStage,
+    build_prefilter,
+    get_prefilter_stats,
+)
+
+
+def _noise(width: int = 600, height: int = 800, seed: int = 0) -> Image.Image:
+    rng = np.random.default_rng(seed)
+    pixels = rng.integers(0, 256, size=(height, width, 3), dtype=np.uint8)
+    return Image.fromarray(pixels, "RGB")
+
+
+def _ctx(references=None, aspect_ratio=None) -> PrefilterContext:
+    return PrefilterContext(
+        references=ReferenceBundle(references or {}), aspect_ratio=aspect_ratio
+    )
+
+
+def test_stage_base_is_abstract():
+    with pytest.raises(TypeError):
+        PrefilterStage()
+
+
+def test_resolution_stage():
+    stage = ResolutionStage(min_side=512)
+
+    assert stage.check(_noise(400, 800), _ctx()) is not None
+    assert stage.check(_noise(600, 800), _ctx(aspect_ratio="3:4")) is None
+    assert stage.check(_noise(800, 800), _ctx(aspect_ratio="3:4")) is not None
+    # 비율이 아닌 값은 비율 검사 생략
+    assert stage.check(_noise(800, 800), _ctx(aspect_ratio="auto")) is None
+
+
+def test_blank_stage():
+    stage = BlankStage()
+
+    assert stage.check(Image.new("RGB", (600, 800), (200, 200, 200)), _ctx()) is not None
+    assert stage.check(_noise(), _ctx()) is None
+
+
+def test_duplicate_stage_against_previous_and_source():
+    image = _noise(seed=1)
+    stage = DuplicateStage(source_roles=("source",))
+
+    first = _ctx()
+    assert stage.check(image, first) is None
+
+    again = _ctx()
+    again.seen = [first.signature]
+    assert "중복" in stage.check(image.copy(), again)
+
+    assert stage.check(image, _ctx({"source": [image.copy()]})) is not None
+    assert stage.check(image, _ctx({"source": [_noise(seed=2)]})) is None
+
+
+def test_background_preservation_stage():
+    source = _noise(seed=3)
+    stage = BackgroundPreservationStage(role="source")
+
+    # 중앙만 바뀐 결과는 통과
+    edited = np.asarray(source).copy()
+    edited[300:600, 200:400] = 0
+    assert stage.check(Image.fromarray(edited), _ctx({"source": [source]})) is None
+
+    # 배경 전체가 바뀐 결과는 탈락
+    replaced = Image.new("RGB", source.size, (0, 0, 0))
+    assert stage.check(replaced, _ctx({"source": [source]})) is not None
+
+    # 소스 없음 / 비율 불일치는 판단하지 않음
+    assert stage.check(replaced, _ctx()) is None
+    assert stage.check(_noise(800, 800), _ctx({"source": [source]})) is None
+
+
+def test_cascade_stops_at_first_failure_and_records_stats():
+    stats = get_prefilter_stats()
+    stats.reset()
+    cascade = PrefilterCascade([ResolutionStage(), BlankStage()], workflow="test")
+
+    result = cascade.check(Image.new("RGB", (100, 100)))
+
+    assert not result.passed and result.stage == "resolution"
+    assert cascade.check(_noise()).passed
+    summary = stats.summary()
+    assert summary["by_workflow"]["test"] == {"checked": 2, "rejected": 1, "skip_rate": 0.5}
+
+
+def test_cascade_remembers_passed_images():
+    cascade = PrefilterCascade([DuplicateStage()], workflow="test")
+    image = _noise(seed=4)
+
+    assert cascade.check(image).passed
+    result = cascade.check(image.copy())
+    assert not result.passed and result.stage == "duplicate"
+
+
+def test_cascade_treats_stage_errors_as_pass():
+    class Broken(PrefilterStage):
+        name = "broken"
+
+        def check(self, image, ctx):
+            raise RuntimeError("boom")
+
+    assert PrefilterCascade([Broken()]).check(_noise()).passed
+
+
+def test_cascade_concurrent_checks():
+    cascade = PrefilterCascade([DuplicateStage()], workflow="test")
+    images = [_noise(seed=10 + i) for i in range(8)]
+    results = [None] * len(images)
+
+    def run(i):
+        results[i] = cascade.check(images[i])
+
+    threads = [threading.Thread(target=run, args=(i,)) for i in range(len(images))]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert all(r.passed for r in results)
+    assert len(cascade._seen) == len(images)
+
+
+def test_build_prefilter_stages(monkeypatch):
+    names = [s.name for s in build_prefilter(WorkflowType.OUTFIT_SWAP).stages]
+    assert names == ["resolution", "blank", "duplicate", "background"]
+
+    monkeypatch.setenv("FNF_PREFILTER", "0")
+    assert build_prefilter(WorkflowType.OUTFIT_SWAP) is None
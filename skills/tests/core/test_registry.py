@@ -0,0 +1,146 @@
+"""
+core.validators.registry 단위 테스트 - 지연 import 등록, (워크플로, 키)별 인스턴스 캐시 (네트워크 없음)
+
+실행:
+    cd skills && python -m pytest tests/core -q
+"""
+
+import sys
+from pathlib import Path
+
+import pytest
+
+# 프로젝트 루트 추가
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+import core.api
+from core.validators import registry
+from core.validators.base import WorkflowType, WorkflowValidator
+from core.validators.registry import ValidatorRegistry
+
+# 실제 등록 딕셔너리 (fixture가 테스트마다 빈 딕셔너리로 바꾸기 전)
+_REAL_VALIDATORS = ValidatorRegistry._validators
+
+
+class CountingValidator(WorkflowValidator):
+    workflow_type = WorkflowType.FACE_SWAP
+    created = 0
+
+    def __init__(self, client):
+        super().__init__(client)
+        type(self).created += 1
+
+    def validate(self, generated_img, reference_images, **kwargs):
+        raise NotImplementedError
+
+    def get_enhancement_rules(self, failed_criteria):
+        return ""
+
+
+@pytest.fixture(autouse=True)
+def isolated_registry(monkeypatch):
+    """등록/인스턴스 캐시를 테스트마다 비우고, 풀 클라이언트는 끝나면 닫는다"""
+    monkeypatch.setattr(ValidatorRegistry, "_validators", {})
+    monkeypatch.setattr(ValidatorRegistry, "_instances", {})
+    CountingValidator.created = 0
+    ValidatorRegistry.register(WorkflowType.FACE_SWAP)(CountingValidator)
+    yield
+    core.api.close_clients()
+
+
+def test_pooled_client_reuses_instance_per_workflow_and_key():
+    client = core.api.get_client("registry-k1")
+
+    first = ValidatorRegistry.get(WorkflowType.FACE_SWAP, client)
+    assert ValidatorRegistry.get(WorkflowType.FACE_SWAP, client) is first
+    assert CountingValidator.created == 1
+
+    other = ValidatorRegistry.get(WorkflowType.FACE_SWAP, core.api.get_client("registry-k2"))
+    assert other is not first
+    assert set(ValidatorRegistry._instances) == {
+        (WorkflowType.FACE_SWAP, "registry-k1"),
+        (WorkflowType.FACE_SWAP, "registry-k2"),
+    }
+
+
+def test_rebuilds_after_close_clients():
+    client = core.api.get_client("registry-k1")
+    first = ValidatorRegistry.get(WorkflowType.FACE_SWAP, client)
+
+    core.api.close_clients()
+    reopened = core.api.get_client("registry-k1")
+    assert reopened is not client
+
+    second = ValidatorRegistry.get(WorkflowType.FACE_SWAP, reopened)
+    assert second is not first
+    assert second.client is reopened
+    assert ValidatorRegistry.get(WorkflowType.FACE_SWAP, reopened) is second
+
+
+def test_uncached_and_non_pooled_clients_are_not_cached():
+    client = core.api.get_client("registry-k1")
+
+    fresh = ValidatorRegistry.get(WorkflowType.FACE_SWAP, client, cached=False)
+    assert fresh is not ValidatorRegistry.get(WorkflowType.FACE_SWAP, client, cached=False)
+
+    own_client = object()
+    a = ValidatorRegistry.get(WorkflowType.FACE_SWAP, own_client)
+    b = ValidatorRegistry.get(WorkflowType.FACE_SWAP, own_client)
+    assert a is not b and a.client is own_client
+    assert ValidatorRegistry._instances == {}
+    assert CountingValidator.created == 4
+
+
+def test_clear_instances():
+    client = core.api.get_client("registry-k1")
+    first = ValidatorRegistry.get(WorkflowType.FACE_SWAP, client)
+
+    ValidatorRegistry.clear_instances()
+    assert ValidatorRegistry.get(WorkflowType.FACE_SWAP, client) is not first
+
+
+def test_lazy_import_registers_on_first_get(tmp_path, monkeypatch):
+    module_name = "registry_lazy_validator_fixture"
+    (tmp_path / f"{module_name}.py").write_text(
+        "from core.validators.base import WorkflowType, WorkflowValidator\n"
+        "from core.validators.registry import ValidatorRegistry\n"
+        "\n"
+        "@ValidatorRegistry.register(WorkflowType.POSE_COPY)\n"
+        "class LazyValidator(WorkflowValidator):\n"
+        "    workflow_type = WorkflowType.POSE_COPY\n"
+        "    def validate(self, generated_img, reference_images, **kwargs):\n"
+        "        raise NotImplementedError\n"
+        "    def get_enhancement_rules(self, failed_criteria):\n"
+        "        return ''\n",
+        encoding="utf-8",
+    )
+    monkeypatch.syspath_prepend(str(tmp_path))
+    monkeypatch.setitem(registry.WORKFLOW_VALIDATORS, WorkflowType.POSE_COPY, module_name)
+    monkeypatch.delitem(sys.modules, module_name, raising=False)
+
+    assert WorkflowType.POSE_COPY not in ValidatorRegistry._validators
+    assert ValidatorRegistry.is_registered(WorkflowType.POSE_COPY)
+
+    validator = ValidatorRegistry.get(WorkflowType.POSE_COPY, object())
+
+    assert type(validator).__name__ == "LazyValidator"
+    assert module_name in sys.modules
+    assert WorkflowType.POSE_COPY in ValidatorRegistry._validators
+
+
+def test_unregistered_workflow_raises(monkeypatch):
+    monkeypatch.delitem(registry.WORKFLOW_VALIDATORS, WorkflowType.ECOMMERCE)
+
+    assert not ValidatorRegistry.is_registered(WorkflowType.ECOMMERCE)
+    with pytest.raises(KeyError):
+        ValidatorRegistry.get(WorkflowType.ECOMMERCE, object())
+
+
+def test_lazy_mapping_modules_register_their_workflow(monkeypatch):
+    # 실제 매핑 모듈이 import 시 해당 워크플로로 등록하는지 (매핑 오타 방지)
+    monkeypatch.setattr(ValidatorRegistry, "_validators", _REAL_VALIDATORS)
+    for workflow_type, module_path in registry.WORKFLOW_VALIDATORS.items():
+        validator_cls = ValidatorRegistry._resolve(workflow_type)
+        assert validator_cls is not None, module_path
+        assert issubclass(validator_cls, WorkflowValidator)
@@ -0,0 +1,204 @@
+"""
+core.retry_policy 단위 테스트 - 에러 분류, 백오프, 재시도 예산, 키 페일오버 (네트워크 없음)
+
+실행:
+    cd skills && python -m pytest tests/core -q
+"""
+
+import sys
+from pathlib import Path
+
+import httpx
+import pytest
+
+# 프로젝트 루트 추가
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from google.genai import errors as genai_errors
+
+from core.retry_policy import ErrorClass, RetryBudget, RetryPolicy, classify_error
+
+
+def _http_error(status: int, headers=None) -> httpx.HTTPStatusError:
+    request = httpx.Request("POST", "https://example.invalid")
+    response = httpx.Response(status, headers=headers or {}, request=request)
+    return httpx.HTTPStatusError("error", request=request, response=response)
+
+
+@pytest.mark.parametrize(
+    "status, expected",
+    [
+        (429, ErrorClass.RATE_LIMIT),
+        (401, ErrorClass.AUTH),
+        (403, ErrorClass.AUTH),
+        (408, ErrorClass.TIMEOUT),
+        (504, ErrorClass.TIMEOUT),
+        (500, ErrorClass.SERVER),
+        (503, ErrorClass.SERVER),
+        (400, ErrorClass.INVALID),
+    ],
+)
+def test_classify_http_status(status, expected):
+    info = classify_error(_http_error(status))
+
+    assert info.error_class == expected
+    assert info.status_code == status
+
+
+def test_classify_retry_after_header():
+    info = classify_error(_http_error(429, {"retry-after": "12"}))
+
+    assert info.retry_after == 12.0
+    assert info.retryable
+
+
+def test_classify_genai_retry_info():
+    details = {
+        "error": {
+            "code": 429,
+            "details": [
+                {"@type": "type.googleapis.com/google.rpc.RetryInfo", "retryDelay": "34s"}
+            ],
+        }
+    }
+    info = classify_error(genai_errors.ClientError(429, details))
+
+    assert info.error_class == ErrorClass.RATE_LIMIT
+    assert info.retry_after == 34.0
+
+
+def test_classify_builtin_and_message_errors():
+    assert classify_error(TimeoutError()).error_class == ErrorClass.TIMEOUT
+    assert classify_error(ConnectionError()).error_class == ErrorClass.NETWORK
+
+    info = classify_error(RuntimeError("RESOURCE_EXHAUSTED, retry in 7s"))
+    assert info.error_class == ErrorClass.RATE_LIMIT
+    assert info.retry_after == 7.0
+
+    assert classify_error(RuntimeError("response blocked by safety")).error_class == ErrorClass.SAFETY
+    assert not classify_error(RuntimeError("invalid api key")).retryable
+
+
+def test_classify_error_code_attribute():
+    class BudgetError(Exception):
+        error_code = "BUDGET_EXCEEDED"
+
+    info = classify_error(BudgetError("daily budget"))
+    assert info.error_class == ErrorClass.BUDGET
+    assert not info.retryable
+
+
+def test_backoff_prefers_server_hint_and_caps():
+    policy = RetryPolicy(base_delay=1.0, max_delay=10.0)
+
+    hinted = classify_error(_http_error(429, {"retry-after": "3"}))
+    assert 3.0 <= policy.backoff(0, hinted) <= 3.5
+
+    capped = classify_error(_http_error(429, {"retry-after": "100"}))
+    assert policy.backoff(0, capped) <= 10.5
+
+    for attempt in range(6):
+        assert 0 <= policy.backoff(attempt) <= min(10.0, 2 ** attempt)
+
+
+def test_retry_budget_limits_retries():
+    budget = RetryBudget(ratio=0.5, min_retries=1)
+    for _ in range(4):
+        budget.record_request()
+
+    assert [budget.try_spend() for _ in range(3)] == [True, True, False]
+    assert budget.stats()["denied"] == 1
+
+
+def test_run_retries_retryable_and_raises_others():
+    policy = RetryPolicy(max_attempts=3, base_delay=0.0)
+    calls = []
+
+    def flaky():
+        calls.append(1)
+        if len(calls) < 3:
+            raise ConnectionError("reset")
+        return "ok"
+
+    assert policy.run(flaky) == "ok"
+    assert len(calls) == 3
+
+    def invalid():
+        raise _http_error(400)
+
+    with pytest.raises(httpx.HTTPStatusError):
+        policy.run(invalid)
+
+
+def test_run_stops_when_budget_is_spent():
+    budget = RetryBudget(ratio=0.0, min_retries=0)
+    policy = RetryPolicy(max_attempts=5, base_delay=0.0, budget=budget)
+    calls = []
+
+    def failing():
+        calls.append(1)
+        raise ConnectionError("reset")
+
+    with pytest.raises(ConnectionError):
+        policy.run(failing)
+    assert len(calls) == 1
+
+
+def test_call_fails_over_to_another_key_on_429(monkeypatch):
+    monkeypatch.setenv("GEMINI_API_KEY", "retry-k1,retry-k2")
+    import core.api
+
+    monkeypatch.setattr(core.api, "_api_keys", None)
+    policy = RetryPolicy(max_attempts=3, base_delay=0.0)
+    used = []
+
+    def request(key):
+        used.append(key)
+        if key == "retry-k1":
+            raise _http_error(429, {"retry-after": "30"})
+        return "ok"
+
+    assert policy.call(request, api_key="retry-k1") == "ok"
+    assert used == ["retry-k1", "retry-k2"]
+    stats = {s["key_index"]: s for s in core.api.get_key_stats()}
+    assert stats[0]["rate_limits"] == 1
+    assert not stats[0]["healthy"]
+
+
+def test_call_client_keeps_non_pooled_client(monkeypatch):
+    monkeypatch.setenv("GEMINI_API_KEY", "retry-k1,retry-k2")
+    import core.api
+
+    monkeypatch.setattr(core.api, "_api_keys", None)
+    policy = RetryPolicy(max_attempts=3, base_delay=0.0, max_delay=0.0)
+    own_client = object()
+    used = []
+
+    def request(client):
+        used.append(client)
+        if len(used) == 1:
+            raise _http_error(429)
+        return "ok"
+
+    assert policy.call_client(own_client, request) == "ok"
+    assert used == [own_client, own_client]
+
+
+def test_call_client_fails_over_pooled_client(monkeypatch):
+    monkeypatch.setenv("GEMINI_API_KEY", "retry-k1,retry-k2")
+    import core.api
+
+    monkeypatch.setattr(core.api, "_api_keys", None)
+    policy = RetryPolicy(max_attempts=3, base_delay=0.0)
+    used = []
+
+    def request(client):
+        key = core.api.get_client_key(client)
+        used.append(key)
+        if key == "retry-k1":
+            raise _http_error(429)
+        return "ok"
+
+    assert policy.call_client(core.api.get_client("retry-k1"), request) == "ok"
+    assert used == ["retry-k1", "retry-k2"]
@@ -0,0 +1,179 @@
+"""
+셀피 배치 검증 단위 테스트 - 토너먼트 루브릭, generate_batch_v3 라운드 배치 채점 (네트워크 없음)
+
+실행:
+    cd skills && python -m pytest tests/core -q
+"""
+
+import json
+import sys
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
+from PIL import Image
+
+# 프로젝트 루트 추가
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from core.selfie import compatibility, db_loader
+from core.selfie import generator as selfie_generator
+from core.selfie.validator import SelfieWorkflowValidator
+from core.selfie_validator import SelfieValidationThresholds, SelfieValidator
+from core.validators import result_cache
+from core.validators.tournament import build_tournament_schema
+from core.vlm_cache import VLMCache
+
+
+GOOD = {
+    "realism": 90,
+    "person_preservation": 90,
+    "scenario_fit": 85,
+    "skin_condition": 85,
+    "anti_polish_factor": 80,
+    "auto_fail_detected": [],
+    "issues": [],
+    "summary_kr": "자연스러움",
+}
+BAD = dict(GOOD, realism=30, auto_fail_detected=["plastic_skin"], issues=["플라스틱 피부"])
+
+
+def _candidate_count(contents) -> int:
+    return sum(1 for p in contents[0].parts if p.text and p.text.strip().startswith("[CANDIDATE"))
+
+
+class ScriptedModels:
+    """후보가 있으면 토너먼트 응답, 없으면 단일 검증 응답 (verdicts 순서대로 소비)"""
+
+    def __init__(self, verdicts):
+        self.verdicts = list(verdicts)
+        self.calls = []
+
+    def generate_content(self, model, contents, config=None):
+        n = _candidate_count(contents)
+        self.calls.append(n)
+        if n == 0:
+            return SimpleNamespace(text=json.dumps(self.verdicts.pop(0)))
+        entries = [dict(self.verdicts.pop(0), index=i + 1) for i in range(n)]
+        return SimpleNamespace(
+            text=json.dumps({"candidates": entries, "ranking": list(range(1, n + 1))})
+        )
+
+
+def _client(verdicts):
+    return SimpleNamespace(models=ScriptedModels(verdicts))
+
+
+@pytest.fixture(autouse=True)
+def isolated_cache(tmp_path, monkeypatch):
+    monkeypatch.setattr(result_cache, "_cache", VLMCache(cache_dir=str(tmp_path)))
+
+
+def _faces():
+    return [Image.new("RGB", (32, 32), (200, 150, 120))]
+
+
+def _images(n: int):
+    return [Image.new("RGB", (32, 32), (i * 20, 10, 10)) for i in range(n)]
+
+
+def test_rubric_matches_single_validation():
+    single = SelfieWorkflowValidator(_client([GOOD, BAD]))
+    expected = [single.validate(image, {"face": _faces()}) for image in _images(2)]
+
+    client = _client([GOOD, BAD])
+    batch = SelfieWorkflowValidator(client).validate_batch(_images(2), {"face": _faces()})
+
+    assert batch.batched
+    assert client.models.calls == [2]
+    for got, want in zip(batch.results, expected):
+        assert got.total_score == want.total_score
+        assert got.grade == want.grade
+        assert got.passed == want.passed
+        assert got.auto_fail_reasons == want.auto_fail_reasons
+        assert got.criteria_scores == want.criteria_scores
+    assert batch.ranking == [0, 1]
+
+
+def test_rubric_schema_and_threshold_cache_version():
+    validator = SelfieWorkflowValidator(_client([]))
+    schema = build_tournament_schema(validator.tournament_rubric())
+    candidate = schema["properties"]["candidates"]["items"]["properties"]
+
+    assert candidate["auto_fail_detected"] == {"type": "array", "items": {"type": "string"}}
+    assert candidate["summary_kr"] == {"type": "string"}
+    assert validator.version == "1"
+
+    strict = SelfieValidator(validator.client, SelfieValidationThresholds(pass_total=90))
+    assert SelfieWorkflowValidator(validator.client, selfie_validator=strict).version != "1"
+
+
+@pytest.fixture
+def selfie_db(monkeypatch):
+    poses = [{"id": f"pose{i}"} for i in range(5)]
+    scenes = [{"id": f"scene{i}"} for i in range(5)]
+    monkeypatch.setattr(compatibility, "is_compatible", lambda pose, scene: True)
+    monkeypatch.setattr(compatibility, "get_compatible_scenes", lambda pose, scene: scenes)
+    monkeypatch.setattr(db_loader, "get_random_poses", lambda category, count: poses[:count])
+    monkeypatch.setattr(
+        db_loader, "get_random_expressions", lambda category, count: [{"id": "chic"}] * count
+    )
+    monkeypatch.setattr(selfie_generator.time, "sleep", lambda seconds: None)
+
+    generated = []
+
+    def fake_generate(**kwargs):
+        generated.append((kwargs["pose"]["id"], kwargs["temperature"]))
+        return Image.new("RGB", (32, 32), (len(generated) * 20, 0, 0))
+
+    monkeypatch.setattr(selfie_generator, "generate_selfie_v3", fake_generate)
+    return generated
+
+
+def test_batch_v3_scores_each_round_together(selfie_db):
+    # 1라운드: 후보 4장 토너먼트 + 남은 1장 단일 검증, 2라운드: 실패한 pose1만 재생성
+    client = _client([GOOD, BAD, GOOD, GOOD, GOOD, GOOD])
+
+    results = selfie_generator.generate_batch_v3(
+        face_images=_faces(),
+        pose_category="전신",
+        scene_category="핫플카페",
+        count=5,
+        temperature=0.7,
+        api_key="k1",
+        validator=SelfieValidator(client),
+        max_retries=1,
+    )
+
+    assert client.models.calls == [4, 0, 0]
+    assert [r["attempts"] for r in results] == [1, 2, 1, 1, 1]
+    assert all(r["passed"] for r in results)
+    assert selfie_db[-1] == ("pose1", pytest.approx(0.6))
+    assert [r["pose"]["id"] for r in results] == [f"pose{i}" for i in range(5)]
+
+
+def test_batch_v3_without_validator_keeps_first_image(selfie_db):
+    results = selfie_generator.generate_batch_v3(
+        face_images=_faces(),
+        pose_category="전신",
+        scene_category="핫플카페",
+        count=2,
+        api_key="k1",
+    )
+
+    assert [r["score"] for r in results] == [100, 100]
+    assert all(r["passed"] and r["attempts"] == 1 for r in results)
+    assert len(selfie_db) == 2
+
+
+def test_batch_v3_rejects_unknown_validator(selfie_db):
+    with pytest.raises(TypeError):
+        selfie_generator.generate_batch_v3(
+            face_images=_faces(),
+            pose_category="전신",
+            scene_category="핫플카페",
+            count=1,
+            api_key="k1",
+            validator=object(),
+        )
@@ -0,0 +1,228 @@
+"""
+core.structured 단위 테스트 - JSON 추출, 스키마 검증, 스키마 생성, 1회 복구 (네트워크 없음)
+
+실행:
+    cd skills && python -m pytest tests/core -q
+"""
+
+import sys
+from dataclasses import dataclass, field
+from enum import Enum
+from pathlib import Path
+from types import SimpleNamespace
+from typing import Dict, List, Optional
+
+import pytest
+
+# 프로젝트 루트 추가
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from core.structured import (
+    StructuredOutputError,
+    extract_json,
+    generate_json,
+    parse_json,
+    parse_or_repair,
+    schema_from_dataclass,
+    validate_json,
+)
+
+
+class FakeModels:
+    """generate_content 호출을 기록하고 준비된 응답 텍스트를 순서대로 반환"""
+
+    def __init__(self, texts):
+        self.texts = list(texts)
+        self.calls = []
+
+    def generate_content(self, model, contents, config=None):
+        self.calls.append({"model": model, "contents": contents, "config": config})
+        return SimpleNamespace(text=self.texts.pop(0))
+
+
+def _client(*texts):
+    return SimpleNamespace(models=FakeModels(texts))
+
+
+# ------------------------------------------------------------
+# extract_json
+# ------------------------------------------------------------
+
+
+@pytest.mark.parametrize(
+    "text",
+    [
+        '{"score": 90}',
+        '```json\n{"score": 90}\n```',
+        'Here is the result:\n```\n{"score": 90}\n```\nDone.',
+        'Sure! {"score": 90} Hope this helps.',
+        '{"score": 90,}',
+        '```json\n{"score": 90}',
+    ],
+    ids=["plain", "fenced", "bare-fence-prose", "prose", "trailing-comma", "truncated-fence"],
+)
+def test_extract_json_variants(text):
+    assert extract_json(text) == {"score": 90}
+
+
+def test_extract_json_array_and_trailing_comma_in_list():
+    assert extract_json("result: [1, 2, 3,]") == [1, 2, 3]
+
+
+@pytest.mark.parametrize("text", [None, "", "   ", "no json here", '{"score": '])
+def test_extract_json_failures(text):
+    with pytest.raises(StructuredOutputError):
+        extract_json(text)
+
+
+# ------------------------------------------------------------
+# validate_json
+# ------------------------------------------------------------
+
+SCHEMA = {
+    "type": "object",
+    "properties": {
+        "score": {"type": "integer"},
+        "grade": {"type": "string", "enum": ["A", "B"]},
+        "tags": {"type": "array", "items": {"type": "string"}},
+        "extra": {"type": "object", "additionalProperties": {"type": "number"}},
+    },
+    "required": ["score", "grade"],
+}
+
+
+def test_validate_json_accepts_valid_document():
+    data = {"score": 90, "grade": "A", "tags": ["x"], "extra": {"a": 1.5, "b": 2}}
+    assert validate_json(data, SCHEMA) == []
+
+
+def test_validate_json_reports_each_violation():
+    data = {"score": "90", "tags": ["x", 3], "extra": {"a": "high"}}
+    errors = validate_json(data, SCHEMA)
+
+    assert any(e.startswith("$.grade") and "누락" in e for e in errors)
+    assert any(e.startswith("$.score") for e in errors)
+    assert any(e.startswith("$.tags[1]") for e in errors)
+    assert any(e.startswith("$.extra.a") for e in errors)
+
+
+def test_validate_json_enum_and_top_level_type():
+    assert validate_json({"score": 1, "grade": "C"}, SCHEMA)
+    assert validate_json([1], SCHEMA) == ["$: object 필요 (list)"]
+
+
+def test_validate_json_integer_excludes_bool():
+    schema = {"type": "integer"}
+
+    assert validate_json(3, schema) == []
+    assert validate_json(3.0, schema) == []
+    assert validate_json(True, schema)
+    assert validate_json(3.5, schema)
+    assert validate_json(True, {"type": "number"})
+    assert validate_json(True, {"type": "boolean"}) == []
+
+
+# ------------------------------------------------------------
+# schema_from_dataclass
+# ------------------------------------------------------------
+
+
+class Tier(Enum):
+    LOW = "low"
+    HIGH = "high"
+
+
+@dataclass
+class SampleResult:
+    name: str
+    quality: int
+    tier: Tier
+    ratio: Optional[float] = None
+    tags: List[str] = field(default_factory=list)
+    weights: Dict[str, float] = field(default_factory=dict)
+    raw_response: str = ""
+
+
+def test_schema_from_dataclass_types_and_required():
+    schema = schema_from_dataclass(SampleResult)
+    props = schema["properties"]
+
+    assert schema["type"] == "object"
+    assert props["name"] == {"type": "string"}
+    assert props["quality"] == {"type": "integer"}
+    assert props["tier"] == {"type": "string", "enum": ["low", "high"]}
+    assert props["ratio"] == {"type": "number"}
+    assert props["tags"] == {"type": "array", "items": {"type": "string"}}
+    assert props["weights"] == {"type": "object", "additionalProperties": {"type": "number"}}
+    assert schema["required"] == ["name", "quality", "tier"]
+
+
+def test_schema_from_dataclass_fields_and_scored():
+    schema = schema_from_dataclass(SampleResult, fields=["name", "quality"], scored=["quality"])
+
+    assert set(schema["properties"]) == {"name", "quality"}
+    assert schema["properties"]["quality"]["required"] == ["score", "reason"]
+    assert schema["required"] == ["name", "quality"]
+
+    data = {"name": "a", "quality": {"score": 80, "reason": "ok"}}
+    assert validate_json(data, schema) == []
+
+
+# ------------------------------------------------------------
+# parse_or_repair / generate_json
+# ------------------------------------------------------------
+
+SCORE_SCHEMA = {
+    "type": "object",
+    "properties": {"score": {"type": "integer"}},
+    "required": ["score"],
+}
+
+
+def test_parse_or_repair_makes_exactly_one_repair_call():
+    client = _client('{"score": 88}')
+
+    data = parse_or_repair(client, "score: 88 (looks good)", SCORE_SCHEMA)
+
+    assert data == {"score": 88}
+    assert len(client.models.calls) == 1
+    config = client.models.calls[0]["config"]
+    assert config.response_mime_type == "application/json"
+    assert config.response_json_schema == SCORE_SCHEMA
+
+
+def test_parse_or_repair_does_not_retry_failed_repair():
+    client = _client("still broken", '{"score": 1}')
+
+    with pytest.raises(StructuredOutputError):
+        parse_or_repair(client, '{"grade": "A"}', SCORE_SCHEMA)
+    assert len(client.models.calls) == 1
+
+
+def test_parse_or_repair_skips_repair_when_valid_or_disabled():
+    client = _client()
+
+    assert parse_or_repair(client, '{"score": 5}', SCORE_SCHEMA) == {"score": 5}
+    with pytest.raises(StructuredOutputError):
+        parse_or_repair(client, "broken", SCORE_SCHEMA, repair=False)
+    with pytest.raises(StructuredOutputError):
+        parse_or_repair(None, "broken", SCORE_SCHEMA)
+    assert client.models.calls == []
+
+
+def test_generate_json_uses_json_mode():
+    client = _client('```json\n{"score": 70}\n```')
+
+    data, raw = generate_json(client, ["prompt"], schema=SCORE_SCHEMA, temperature=0.2)
+
+    assert data == {"score": 70}
+    assert raw.startswith("```json")
+    config = client.models.calls[0]["config"]
+    assert config.response_mime_type == "application/json"
+    assert config.temperature == 0.2
+
+
+def test_parse_json_schema_mismatch_is_value_error():
+    with pytest.raises(ValueError):
+        parse_json('{"score": "high"}', SCORE_SCHEMA)
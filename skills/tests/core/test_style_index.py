@@ -0,0 +1,130 @@
+"""
+core.brandcut.style_index.StyleIndex 검색 단위 테스트 - 배치 top-k, 카테고리 필터 마스크
+
+실행:
+    cd skills && python -m pytest tests/core -q
+"""
+
+import sys
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+# 프로젝트 루트 추가
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from core.brandcut.style_index import (
+    FRAMING_OFFSET,
+    FRAMINGS,
+    STANCE_OFFSET,
+    STANCES,
+    TOTAL_DIMENSIONS,
+    StyleIndex,
+    analysis_to_feature_vector,
+)
+
+
+def _analysis(source: str, stance: str, framing: str, energy: int = 3) -> dict:
+    return {
+        "_source": source,
+        "pose": {"stance": stance, "energy_level": energy},
+        "camera": {"framing": framing},
+        "vibe_keywords": ["cool"] if energy % 2 else ["chic"],
+    }
+
+
+@pytest.fixture
+def index():
+    analyses = [
+        _analysis(f"{i}.jpg", STANCES[i % len(STANCES)], FRAMINGS[i % len(FRAMINGS)], energy=1 + i % 5)
+        for i in range(40)
+    ]
+    built = StyleIndex()
+    built.build_from_analyses(analyses)
+    return built
+
+
+def _brute_force(index: StyleIndex, query: np.ndarray, top_k: int, rows=None) -> list:
+    vectors = index.vectors / np.linalg.norm(index.vectors, axis=1, keepdims=True)
+    q = query / np.linalg.norm(query)
+    scores = vectors @ q
+    rows = np.arange(len(vectors)) if rows is None else np.asarray(rows)
+    order = rows[np.argsort(-scores[rows], kind="stable")]
+    return [(int(i), float(scores[i])) for i in order[:top_k]]
+
+
+def test_offsets_point_at_stance_and_framing_blocks():
+    vector = analysis_to_feature_vector(_analysis("x.jpg", "lean", "MS"))
+
+    assert len(vector) == TOTAL_DIMENSIONS
+    stance_block = vector[STANCE_OFFSET : STANCE_OFFSET + len(STANCES)]
+    framing_block = vector[FRAMING_OFFSET : FRAMING_OFFSET + len(FRAMINGS)]
+    assert stance_block.tolist() == [0.0, 0.0, 1.0, 0.0]
+    assert framing_block.tolist() == [0.0, 0.0, 1.0, 0.0, 0.0]
+
+
+def test_batch_top_k_matches_brute_force(index):
+    rng = np.random.default_rng(0)
+    queries = rng.random((6, TOTAL_DIMENSIONS)).astype(np.float32)
+
+    results = index.find_similar_batch(queries, top_k=5)
+
+    assert len(results) == len(queries)
+    for query, found in zip(queries, results):
+        expected = _brute_force(index, query, 5)
+        scores = [score for _, score, _ in found]
+        assert scores == sorted(scores, reverse=True)
+        np.testing.assert_allclose(scores, [s for _, s in expected], atol=1e-5)
+        # 동점이 있을 수 있어 인덱스는 최저 점수보다 높은 항목만 비교
+        cutoff = expected[-1][1] + 1e-5
+        assert {i for i, s in expected if s > cutoff} <= {i for i, _, _ in found}
+        assert all(source == f"{i}.jpg" for i, _, source in found)
+
+
+def test_single_query_matches_batch_row(index):
+    query = analysis_to_feature_vector(_analysis("q.jpg", "seated", "CU"))
+
+    assert index.find_similar(query, top_k=3) == index.find_similar_batch(query[None, :], top_k=3)[0]
+
+
+@pytest.mark.parametrize(
+    "framing, stance",
+    [("MS", None), (None, "relaxed"), (["CU", "FS"], None), ("mfs", "CONFIDENT")],
+)
+def test_filter_mask_selects_matching_rows(index, framing, stance):
+    mask = index._filter_mask(framing=framing, stance=stance)
+
+    framings = [framing] if isinstance(framing, str) else framing
+    for i, analysis in enumerate(index.analyses):
+        expected = True
+        if framings is not None:
+            expected &= analysis["camera"]["framing"].lower() in [f.lower() for f in framings]
+        if stance is not None:
+            expected &= analysis["pose"]["stance"] == stance.lower()
+        assert mask[i] == expected, i
+    assert mask.any()
+
+
+def test_filtered_search_only_returns_masked_rows(index):
+    rng = np.random.default_rng(1)
+    queries = rng.random((3, TOTAL_DIMENSIONS)).astype(np.float32)
+    mask = index._filter_mask(framing="MFS", stance="confident")
+    allowed = np.flatnonzero(mask)
+
+    results = index.find_similar_batch(queries, top_k=50, framing="MFS", stance="confident")
+
+    for query, found in zip(queries, results):
+        assert len(found) == len(allowed)
+        assert {i for i, _, _ in found} == set(allowed.tolist())
+        np.testing.assert_allclose(
+            [s for _, s, _ in found], [s for _, s in _brute_force(index, query, 50, allowed)], atol=1e-5
+        )
+
+
+def test_no_filter_and_unknown_or_empty_results(index):
+    assert index._filter_mask() is None
+    assert not index._filter_mask(framing="ECU").any()
+    assert index.find_similar_batch(np.ones((2, TOTAL_DIMENSIONS)), framing="ECU") == [[], []]
+    assert StyleIndex().find_similar_batch(np.ones((1, TOTAL_DIMENSIONS))) == [[]]
@@ -0,0 +1,103 @@
+"""
+core.brandcut.style_index.StyleIndexStore 단위 테스트 - upsert/prune/delete와 세대 교체
+
+실행:
+    cd skills && python -m pytest tests/core -q
+"""
+
+import sys
+from pathlib import Path
+
+import numpy as np
+
+# 프로젝트 루트 추가
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from core.brandcut.style_index import StyleIndexStore, analysis_to_feature_vector
+
+
+def _analysis(source: str, stance: str = "confident", framing: str = "MFS") -> dict:
+    return {
+        "_source": source,
+        "pose": {"stance": stance, "energy_level": 3},
+        "camera": {"framing": framing},
+        "vibe_keywords": [],
+    }
+
+
+def _generations(store: StyleIndexStore) -> list:
+    return sorted(p.name for p in store.stem.parent.glob(f"{store.stem.name}.*.npy"))
+
+
+def test_upsert_adds_then_skips_unchanged(tmp_path):
+    store = StyleIndexStore(tmp_path / "index")
+    analyses = [_analysis("a.jpg"), _analysis("b.jpg")]
+
+    assert store.upsert(analyses) == {"added": 2, "updated": 0, "unchanged": 0, "removed": 0}
+    manifest = store.read_manifest()
+    assert manifest["generation"] == 1
+    assert manifest["sources"] == ["a.jpg", "b.jpg"]
+
+    # 내용이 같으면 새 세대를 쓰지 않음
+    assert store.upsert(analyses)["unchanged"] == 2
+    assert store.read_manifest()["generation"] == 1
+
+
+def test_upsert_updates_changed_rows(tmp_path):
+    store = StyleIndexStore(tmp_path / "index")
+    store.upsert([_analysis("a.jpg"), _analysis("b.jpg")])
+
+    counts = store.upsert([_analysis("b.jpg", framing="CU"), _analysis("c.jpg")])
+
+    assert counts == {"added": 1, "updated": 1, "unchanged": 0, "removed": 0}
+    index = store.open()
+    assert index.sources == ["a.jpg", "b.jpg", "c.jpg"]
+    expected = analysis_to_feature_vector(_analysis("b.jpg", framing="CU"))
+    expected /= np.linalg.norm(expected)
+    np.testing.assert_allclose(np.asarray(index._normed[1]), expected, rtol=1e-6)
+
+
+def test_upsert_prune_removes_missing_in_one_generation(tmp_path):
+    store = StyleIndexStore(tmp_path / "index")
+    store.upsert([_analysis("a.jpg"), _analysis("b.jpg"), _analysis("c.jpg")])
+
+    counts = store.upsert([_analysis("a.jpg"), _analysis("d.jpg")], prune=True)
+
+    assert counts == {"added": 1, "updated": 0, "unchanged": 1, "removed": 2}
+    manifest = store.read_manifest()
+    assert manifest["generation"] == 2
+    assert manifest["sources"] == ["a.jpg", "d.jpg"]
+    assert len(manifest["hashes"]) == 2
+    # 이전 세대 파일은 정리됨
+    assert _generations(store) == ["index.2.npy"]
+
+
+def test_upsert_skips_fallback_analyses(tmp_path):
+    store = StyleIndexStore(tmp_path / "index")
+
+    counts = store.upsert([_analysis("a.jpg"), dict(_analysis("b.jpg"), _fallback=True)])
+
+    assert counts["added"] == 1
+    assert store.read_manifest()["sources"] == ["a.jpg"]
+
+
+def test_delete(tmp_path):
+    store = StyleIndexStore(tmp_path / "index")
+    store.upsert([_analysis("a.jpg"), _analysis("b.jpg")])
+
+    assert store.delete(["missing.jpg"]) == 0
+    assert store.delete(["a.jpg"]) == 1
+    index = store.open()
+    assert index.sources == ["b.jpg"]
+    assert index.vectors.shape[0] == 1
+
+
+def test_open_missing_or_corrupt_manifest(tmp_path):
+    store = StyleIndexStore(tmp_path / "index.npz")
+    assert store.manifest_path == tmp_path / "index.manifest.json"
+    assert store.open() is None
+
+    store.manifest_path.write_text("{not json", encoding="utf-8")
+    assert store.read_manifest() is None
+    assert store.open() is None
@@ -0,0 +1,149 @@
+"""
+core.telemetry 단위 테스트 - workflow/step 태그가 JSONL 레코드까지 전달되는지 (네트워크 없음)
+
+실행:
+    cd skills && python -m pytest tests/core -q
+"""
+
+import sys
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
+from PIL import Image
+
+# 프로젝트 루트 추가
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from core import telemetry
+from core.config import IMAGE_MODEL, VISION_MODEL
+from core.telemetry import (
+    STEP_ANALYSIS,
+    STEP_GATE,
+    STEP_GENERATE,
+    STEP_VALIDATE,
+    instrument_client,
+    load_jsonl,
+    telemetry_context,
+)
+
+
+class FakeModels:
+    def __init__(self):
+        self.calls = 0
+
+    def generate_content(self, *, model, contents, config=None):
+        self.calls += 1
+        return SimpleNamespace(
+            text="{}",
+            usage_metadata=SimpleNamespace(
+                prompt_token_count=10, candidates_token_count=5, total_token_count=15
+            ),
+        )
+
+
+class FakeAsyncModels:
+    async def generate_content(self, *, model, contents, config=None):
+        return SimpleNamespace(text="{}")
+
+
+def _fake_client(key_index: int = 0):
+    client = SimpleNamespace(models=FakeModels(), aio=SimpleNamespace(models=FakeAsyncModels()))
+    return instrument_client(client, key_index=key_index)
+
+
+@pytest.fixture
+def jsonl_path(tmp_path, monkeypatch):
+    """프로세스 공유 레코더를 tmp JSONL로 돌리고 끝나면 원래 설정으로 복구"""
+    recorder = telemetry.get_recorder()
+    path = tmp_path / "telemetry.jsonl"
+    monkeypatch.setattr(recorder, "path", path)
+    monkeypatch.setattr(recorder, "enabled", True)
+    recorder.clear()
+    yield path
+    recorder.clear()
+
+
+def test_tagged_call_reaches_jsonl(jsonl_path):
+    client = _fake_client(key_index=2)
+
+    with telemetry_context(workflow="brand_cut", step=STEP_VALIDATE):
+        client.models.generate_content(model=VISION_MODEL, contents=["prompt", Image.new("RGB", (8, 8))])
+
+    (record,) = load_jsonl(jsonl_path)
+    assert record["workflow"] == "brand_cut"
+    assert record["step"] == STEP_VALIDATE
+    assert record["key_index"] == 2
+    assert record["image_parts"] == 1
+    assert record["prompt_chars"] == len("prompt")
+    assert record["total_tokens"] == 15
+    assert record["error_class"] is None
+
+
+def test_untagged_step_is_inferred_from_model(jsonl_path):
+    client = _fake_client()
+
+    client.models.generate_content(model=IMAGE_MODEL, contents="p")
+    client.models.generate_content(model=VISION_MODEL, contents="p")
+
+    records = load_jsonl(jsonl_path)
+    assert [(r["workflow"], r["step"]) for r in records] == [
+        (None, STEP_GENERATE),
+        (None, STEP_ANALYSIS),
+    ]
+
+
+def test_nested_context_overrides_only_given_fields(jsonl_path):
+    client = _fake_client()
+
+    with telemetry_context(workflow="multi_face_swap", step=STEP_GENERATE):
+        with telemetry_context(step=STEP_ANALYSIS):
+            client.models.generate_content(model=VISION_MODEL, contents="detect")
+        with telemetry_context(step=STEP_GATE):
+            client.models.generate_content(model=VISION_MODEL, contents="gate")
+        client.models.generate_content(model=IMAGE_MODEL, contents="swap")
+
+    records = load_jsonl(jsonl_path)
+    assert [(r["workflow"], r["step"]) for r in records] == [
+        ("multi_face_swap", STEP_ANALYSIS),
+        ("multi_face_swap", STEP_GATE),
+        ("multi_face_swap", STEP_GENERATE),
+    ]
+
+
+def test_workflow_loop_tags_generate_and_validate(jsonl_path, monkeypatch):
+    # 워크플로 재시도 루프(background_swap)가 생성/검증 호출에 태그를 붙이는지
+    from core.background_swap import generator as bg_generator
+    from core.background_swap import validator as bg_validator
+
+    client = _fake_client()
+
+    def fake_generate(source_image, prompt, api_key, temperature, image_size):
+        client.models.generate_content(model=IMAGE_MODEL, contents=[prompt, source_image])
+        return Image.new("RGB", (8, 8))
+
+    class FakeValidator:
+        def set_vfx_analysis(self, analysis):
+            pass
+
+        def validate(self, image, source_image):
+            client.models.generate_content(model=VISION_MODEL, contents=[image, source_image])
+            return SimpleNamespace(
+                total_score=95, passed=True, grade="S", issues=[], format_korean=lambda: ""
+            )
+
+    monkeypatch.setattr(bg_generator, "analyze_model_physics", lambda image, key: {"data": {}})
+    monkeypatch.setattr(bg_generator, "analyze_for_background_swap", lambda image, key: {})
+    monkeypatch.setattr(bg_generator, "detect_source_type", lambda image, key: "person")
+    monkeypatch.setattr(bg_generator, "generate_background_swap", fake_generate)
+    monkeypatch.setattr(bg_validator, "get_validator", lambda source_type, key: (FakeValidator(), "fake"))
+
+    result = bg_generator.generate_with_validation(Image.new("RGB", (8, 8)), "beach", "k1", max_retries=0)
+
+    assert result["passed"]
+    records = load_jsonl(jsonl_path)
+    assert [(r["workflow"], r["step"]) for r in records] == [
+        ("background_swap", STEP_GENERATE),
+        ("background_swap", STEP_VALIDATE),
+    ]
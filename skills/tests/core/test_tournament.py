@@ -0,0 +1,182 @@
+"""
+core.validators.tournament / result_cache 단위 테스트 - 루브릭 훅, 폴백, 배치 캐시 (네트워크 없음)
+
+실행:
+    cd skills && python -m pytest tests/core -q
+"""
+
+import json
+import sys
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
+from PIL import Image
+
+# 프로젝트 루트 추가
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from core.validators.base import (
+    CommonValidationResult,
+    QualityTier,
+    ValidationConfig,
+    WorkflowType,
+    WorkflowValidator,
+)
+from core.validators import result_cache
+from core.validators.result_cache import cached_validate_batch
+from core.validators.tournament import TournamentRubric
+from core.vlm_cache import VLMCache
+
+
+RUBRIC_PROMPT = "테스트 루브릭: sharpness 70점 미만이면 FAIL"
+
+
+class FakeModels:
+    def __init__(self, reply):
+        self.reply = reply
+        self.calls = []
+
+    def generate_content(self, model, contents, config=None):
+        self.calls.append(contents)
+        return SimpleNamespace(text=self.reply(contents))
+
+
+def _candidate_count(contents) -> int:
+    return sum(1 for p in contents[0].parts if p.text and p.text.strip().startswith("[CANDIDATE"))
+
+
+def _tournament_reply(scores):
+    def reply(contents):
+        entries = [
+            {"index": i + 1, "sharpness": score, "issues": []} for i, score in enumerate(scores)
+        ]
+        return json.dumps({"candidates": entries, "ranking": list(range(1, len(scores) + 1))})
+
+    return reply
+
+
+class FakeValidator(WorkflowValidator):
+    workflow_type = WorkflowType.BRANDCUT
+    config = ValidationConfig(pass_total=70, weights={"sharpness": 1.0})
+
+    def __init__(self, client, rubric=True):
+        super().__init__(client)
+        self.rubric = rubric
+        self.validated = []
+
+    def _result(self, score: int, raw: str = "") -> CommonValidationResult:
+        passed = score >= 70
+        return CommonValidationResult(
+            workflow_type=self.workflow_type,
+            total_score=score,
+            tier=QualityTier.RELEASE_READY if passed else QualityTier.REGENERATE,
+            grade="A" if passed else "F",
+            passed=passed,
+            criteria_scores={"sharpness": score},
+            raw_response=raw,
+        )
+
+    def validate(self, generated_img, reference_images, **kwargs):
+        self.validated.append(generated_img)
+        return self._result(80)
+
+    def tournament_rubric(self):
+        if not self.rubric:
+            return None
+        return TournamentRubric(
+            prompt=RUBRIC_PROMPT,
+            criteria=["sharpness"],
+            build_result=lambda data, raw: self._result(int(data["sharpness"]), raw),
+        )
+
+    def get_enhancement_rules(self, failed_criteria):
+        return ""
+
+
+def _images(n: int):
+    return [Image.new("RGB", (32, 32), (i * 10, 0, 0)) for i in range(n)]
+
+
+def _client(reply):
+    return SimpleNamespace(models=FakeModels(reply))
+
+
+def test_tournament_uses_validator_rubric_and_result():
+    client = _client(_tournament_reply([90, 50]))
+    validator = FakeValidator(client)
+
+    batch = validator.validate_batch(_images(2), {"original": _images(1)})
+
+    assert batch.batched
+    assert [r.passed for r in batch.results] == [True, False]
+    assert [r.grade for r in batch.results] == ["A", "F"]
+    assert batch.ranking == [0, 1]
+    assert not validator.validated
+    prompt = client.models.calls[0][0].parts[0].text
+    assert prompt.startswith(RUBRIC_PROMPT)
+
+
+def test_no_rubric_falls_back_to_validate():
+    client = _client(_tournament_reply([90, 50]))
+    validator = FakeValidator(client, rubric=False)
+
+    batch = validator.validate_batch(_images(2), {})
+
+    assert not batch.batched
+    assert len(validator.validated) == 2
+    assert not client.models.calls
+
+
+@pytest.mark.parametrize(
+    "reply",
+    [
+        lambda contents: "not json at all",
+        _tournament_reply([90]),  # 후보 수 불일치
+    ],
+)
+def test_bad_tournament_response_falls_back(reply):
+    validator = FakeValidator(_client(reply))
+
+    batch = validator.validate_batch(_images(2), {})
+
+    assert not batch.batched
+    assert len(validator.validated) == 2
+
+
+def test_single_candidate_and_kwargs_skip_tournament():
+    client = _client(_tournament_reply([90, 90]))
+    validator = FakeValidator(client)
+
+    validator.validate_batch(_images(1), {})
+    validator.validate_batch(_images(2), {}, strict=True)
+
+    assert not client.models.calls
+    assert len(validator.validated) == 3
+
+
+def test_cached_batch_scores_only_misses(tmp_path, monkeypatch):
+    monkeypatch.setattr(result_cache, "_cache", VLMCache(cache_dir=str(tmp_path)))
+    counts = []
+
+    def reply(contents):
+        n = _candidate_count(contents)
+        counts.append(n)
+        return _tournament_reply([90] * n)(contents)
+
+    validator = FakeValidator(_client(reply))
+    images = _images(3)
+
+    first = cached_validate_batch(validator, images[:2], {})
+    second = cached_validate_batch(validator, images[:2], {})
+    third = cached_validate_batch(validator, images, {})
+
+    assert first.batched
+    assert counts == [2]  # 두 번째는 전부 캐시, 세 번째는 미스 1장만 validate
+    assert all(r.passed for r in second.results)
+    assert validator.validated == [images[2]]
+    assert len(third.results) == 3
+
+    cached_validate_batch(validator, images[:2], {}, force=True)
+    assert counts == [2, 2]
@@ -0,0 +1,208 @@
+"""
+core.generators.unified 추측 라운드 단위 테스트 - 조기 종료, 검증 생략, 비용 상한, 직렬 폴백 (네트워크 없음)
+
+실행:
+    cd skills && python -m pytest tests/core -q
+"""
+
+import sys
+import threading
+import time
+from pathlib import Path
+
+import pytest
+from PIL import Image
+
+# 프로젝트 루트 추가
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from core.generators import unified
+from core.generators.unified import _staggered_temperatures, generate_with_workflow_validation
+from core.metering import effective_speculation, metering_job
+from core.options import get_cost
+from core.validators.base import (
+    CommonValidationResult,
+    QualityTier,
+    ValidationConfig,
+    WorkflowType,
+    WorkflowValidator,
+)
+
+
+class ScriptedValidator(WorkflowValidator):
+    """온도별로 정해 둔 점수를 돌려주는 검증기 (이미지 색에 온도를 실어 보냄)"""
+
+    workflow_type = WorkflowType.BRANDCUT
+    config = ValidationConfig(
+        pass_total=80,
+        weights={"face": 0.5, "outfit": 0.5},
+        priority_order=["outfit", "face"],
+    )
+
+    def __init__(self, scores):
+        super().__init__(client=None)
+        self.scores = scores
+        self.validated = []
+        self.lock = threading.Lock()
+
+    def validate(self, generated_img, reference_images, **kwargs):
+        temperature = round(generated_img.info["temperature"], 2)
+        with self.lock:
+            self.validated.append(temperature)
+        score = self.scores.get(temperature, 50)
+        passed = score >= self.config.pass_total
+        return CommonValidationResult(
+            workflow_type=self.workflow_type,
+            total_score=score,
+            tier=QualityTier.RELEASE_READY if passed else QualityTier.REGENERATE,
+            grade="A" if passed else "C",
+            passed=passed,
+            criteria_scores={"face": 90, "outfit": score},
+        )
+
+    def get_enhancement_rules(self, failed_criteria):
+        return "FIX: " + ", ".join(failed_criteria)
+
+
+class ScriptedGenerator:
+    """generate_func 대역 - slow 온도는 release 전까지 블록
+
+    wait_started=N이면 나머지 온도는 N개 생성이 모두 시작된 뒤 반환
+    (시작 전 후보가 취소되지 않고 "생성 중"인 상태를 만들기 위함)
+    """
+
+    def __init__(self, slow=(), wait_started=0):
+        self.slow = set(slow)
+        self.wait_started = wait_started
+        self.release = threading.Event()
+        self.calls = []
+        self.lock = threading.Lock()
+
+    def __call__(self, prompt, reference_images, config):
+        temperature = config["temperature"]
+        with self.lock:
+            self.calls.append((prompt, temperature))
+        if temperature in self.slow:
+            self.release.wait(timeout=10)
+        else:
+            deadline = time.monotonic() + 10
+            while len(self.calls) < self.wait_started and time.monotonic() < deadline:
+                time.sleep(0.005)
+        image = Image.new("RGB", (64, 64))
+        image.info["temperature"] = temperature
+        return image
+
+
+@pytest.fixture
+def run(monkeypatch):
+    def _run(validator, generator, **kwargs):
+        monkeypatch.setattr(unified, "get_client", lambda key: object())
+        monkeypatch.setattr(unified.ValidatorRegistry, "get", lambda workflow, client: validator)
+        kwargs.setdefault("max_retries", 0)
+        return generate_with_workflow_validation(
+            workflow_type=WorkflowType.BRANDCUT,
+            generate_func=generator,
+            prompt="base prompt",
+            reference_images={},
+            config={"temperature": 0.25, "resolution": "2K"},
+            api_key="spec-k1",
+            prefilter=False,
+            **kwargs,
+        )
+
+    return _run
+
+
+def _wait_for_speculative_threads(timeout: float = 5.0) -> None:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if not any(t.name.startswith("speculative") for t in threading.enumerate()):
+            return
+        time.sleep(0.01)
+    raise AssertionError("speculative workers did not finish")
+
+
+def test_staggered_temperatures():
+    assert _staggered_temperatures(0.25, 1) == [0.25]
+    assert _staggered_temperatures(0.25, 5) == [0.25, 0.3, 0.2, 0.35, 0.15]
+    assert _staggered_temperatures(0.12, 3) == [0.12, 0.17, 0.1]
+    assert _staggered_temperatures(0.98, 2) == [0.98, 1.0]
+
+
+def test_round_stops_at_first_passing_candidate(run):
+    validator = ScriptedValidator({0.3: 92})
+    generator = ScriptedGenerator(slow=[0.25, 0.2], wait_started=3)
+
+    try:
+        result = run(validator, generator, speculative=3)
+    finally:
+        generator.release.set()
+
+    assert result["passed"]
+    assert result["score"] == 92
+    assert result["attempts"] == 1
+    assert result["history"][0]["candidate"] == 2
+    assert result["history"][0]["temperature"] == 0.3
+
+    # 남은 후보는 생성이 끝나도 stop이 걸려 있어 검증하지 않는다
+    _wait_for_speculative_threads()
+    assert sorted(t for _, t in generator.calls) == [0.2, 0.25, 0.3]
+    assert validator.validated == [0.3]
+
+
+def test_effective_speculation_caps_width_under_max_cost(run):
+    unit = get_cost("2K")
+
+    assert effective_speculation(4, "2K") == 4
+    assert effective_speculation(4, "2K", max_cost=unit * 2.5) == 2
+    assert effective_speculation(4, "2K", max_cost=unit * 0.5) == 1
+    with metering_job("speculation-test", budget=unit * 3.2):
+        assert effective_speculation(8, "2K") == 3
+
+    generator = ScriptedGenerator()
+    result = run(ScriptedValidator({}), generator, speculative=4, speculative_max_cost=unit * 2.5)
+
+    assert sorted(t for _, t in generator.calls) == [0.25, 0.3]
+    assert sorted(entry["candidate"] for entry in result["history"]) == [1, 2]
+
+
+def test_falls_back_to_enhanced_serial_retries(run):
+    # 추측 라운드 전부 실패 → 최고 후보(0.3, 70점) 기준 강화 후
+    # 직렬 재시도(기본 온도 0.25 - 0.03)에서 통과
+    validator = ScriptedValidator({0.3: 70, 0.2: 60, 0.22: 85})
+    generator = ScriptedGenerator()
+
+    result = run(validator, generator, speculative=3, max_retries=2)
+
+    assert result["passed"]
+    assert result["score"] == 85
+    candidates = [entry for entry in result["history"] if "candidate" in entry]
+    serial = [entry for entry in result["history"] if "candidate" not in entry]
+    assert len(candidates) == 3
+    assert [entry["attempt"] for entry in serial] == [2]
+    assert serial[0]["temperature"] == pytest.approx(0.22)
+
+    serial_prompt = generator.calls[-1][0]
+    assert "RETRY ENHANCEMENT" in serial_prompt
+    assert "Previous score: 70/100" in serial_prompt
+    assert "FIX: outfit" in serial_prompt
+
+
+def test_extract_failed_criteria_uses_thresholds_and_priority():
+    validator = ScriptedValidator({})
+    validator.config = ValidationConfig(
+        pass_total=80,
+        auto_fail_thresholds={"face": 95},
+        priority_order=["outfit", "face"],
+    )
+    result = CommonValidationResult(
+        workflow_type=WorkflowType.BRANDCUT,
+        total_score=70,
+        tier=QualityTier.REGENERATE,
+        grade="C",
+        passed=False,
+        criteria_scores={"face": {"score": 90}, "pose": 70, "outfit": 79, "light": 99, "note": "n/a"},
+    )
+
+    assert validator._extract_failed_criteria(result) == ["outfit", "face", "pose"]
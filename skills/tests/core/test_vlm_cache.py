@@ -0,0 +1,67 @@
+"""
+core.vlm_cache 단위 테스트 - 저장/조회, 덮어쓰기 용량 계산, LRU 삭제 (네트워크 없음)
+
+실행:
+    cd skills && python -m pytest tests/core -q
+"""
+
+import os
+import sys
+import time
+from pathlib import Path
+
+# 프로젝트 루트 추가
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from core.vlm_cache import VLMCache
+
+
+def _key(n: int) -> str:
+    return f"{n:064x}"
+
+
+def test_put_get_roundtrip_and_stats(tmp_path):
+    cache = VLMCache(cache_dir=str(tmp_path))
+
+    assert cache.get(_key(1)) is None
+    cache.put(_key(1), '{"score": 90}', model="m")
+
+    assert cache.get(_key(1)) == '{"score": 90}'
+    stats = cache.stats()
+    assert stats["entries"] == 1
+    assert (stats["hits"], stats["misses"]) == (1, 1)
+
+
+def test_overwrite_does_not_double_count(tmp_path):
+    cache = VLMCache(cache_dir=str(tmp_path))
+    cache.put(_key(1), "a")  # 첫 저장은 디스크 스캔으로 초기화
+    for _ in range(5):
+        cache.put(_key(1), "b" * 100)
+
+    assert cache._total_bytes == cache._scan_size()
+    assert cache.stats()["entries"] == 1
+
+
+def test_evicts_least_recently_used(tmp_path):
+    cache = VLMCache(cache_dir=str(tmp_path))
+    text = "x" * 200
+    for n in range(3):
+        cache.put(_key(n), text)
+    entry_bytes = cache._scan_size() // 3
+
+    # 0번을 가장 오래된 항목으로 만들고 1번은 최근 조회
+    old = time.time() - 100
+    os.utime(cache._path(_key(0)), (old, old))
+    os.utime(cache._path(_key(2)), (old + 10, old + 10))
+    assert cache.get(_key(1)) == text
+
+    # 2.5개 용량에서 4번째 저장 → 90%(2개 이하)까지 LRU 삭제
+    cache.max_bytes = entry_bytes * 2 + entry_bytes // 2
+    cache.put(_key(3), text)
+
+    assert cache.get(_key(0)) is None
+    assert cache.get(_key(2)) is None
+    assert cache.get(_key(1)) == text
+    assert cache.get(_key(3)) == text
+    assert cache._total_bytes == cache._scan_size()